@@ -107,9 +107,65 @@ class AgentMetadata:
     extra: Dict[str, Any] = field(default_factory=dict)
 
 
+class _VersionedRegistry(dict):
+    """Dict that bumps a version counter on every mutation.
+
+    Lets caches derived from the registry (compiled tool schemas, agent
+    descriptions) detect changes in O(1) instead of re-walking every entry.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def _bump(self) -> None:
+        self.version += 1
+
+    def __setitem__(self, key: str, value: "AgentMetadata") -> None:
+        super().__setitem__(key, value)
+        self._bump()
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._bump()
+
+    def clear(self) -> None:
+        super().clear()
+        self._bump()
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self._bump()
+
+    def __ior__(self, other: Any) -> "_VersionedRegistry":
+        super().__ior__(other)
+        self._bump()
+        return self
+
+    def pop(self, *args: Any) -> Any:
+        result = super().pop(*args)
+        self._bump()
+        return result
+
+    def popitem(self) -> Any:
+        result = super().popitem()
+        self._bump()
+        return result
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        result = super().setdefault(key, default)
+        self._bump()
+        return result
+
+
 # Global registry for decorated agents
 # Key: agent class name, Value: AgentMetadata
-AGENT_REGISTRY: Dict[str, AgentMetadata] = {}
+AGENT_REGISTRY: Dict[str, AgentMetadata] = _VersionedRegistry()
+
+
+def get_registry_version() -> int:
+    """Return a counter that changes whenever AGENT_REGISTRY is mutated."""
+    return AGENT_REGISTRY.version
 
 
 def _extract_fields(cls: Type) -> tuple[List[InputSpec], List[OutputSpec]]:
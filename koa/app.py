@@ -20,6 +20,9 @@ import re
 from typing import Any, AsyncIterator, Dict, List, Optional
 
 from .config.schema import validate_config
+from .http_pool import close_http_pool
+from .llm.response_cache import configure_response_cache
+from .llm.scheduler import configure_provider_scheduler
 from .result import AgentResult
 from .streaming.models import AgentEvent
 
@@ -282,6 +285,32 @@ class Koa:
                 f"{len(rules or [])} rules"
             )
 
+        # Response cache for repetitive helper calls (routing scores,
+        # summaries, field extraction)
+        cache_cfg = cfg.get("llm_cache", {})
+        if cache_cfg.get("enabled", True):
+            from .llm.response_cache import ResponseCache
+
+            configure_response_cache(
+                ResponseCache(
+                    max_entries=cache_cfg.get("max_entries", 2048),
+                    ttl_s=cache_cfg.get("ttl_s", 600.0),
+                )
+            )
+
+        # Adaptive per-provider concurrency limits (off unless configured)
+        concurrency_cfg = cfg.get("llm_concurrency", {})
+        if concurrency_cfg.get("enabled", False):
+            from .llm.scheduler import ProviderScheduler
+
+            configure_provider_scheduler(
+                ProviderScheduler(
+                    initial_limit=concurrency_cfg.get("initial_limit", 16),
+                    min_limit=concurrency_cfg.get("min_limit", 1),
+                    max_limit=concurrency_cfg.get("max_limit", 128),
+                )
+            )
+
         # 7. TriggerEngine + Notifications
         from .triggers import (
             CallbackNotification,
@@ -400,14 +429,31 @@ class Koa:
             run_log=cron_run_log,
             delivery=cron_delivery,
         )
+        # Multi-node mode: partition and lease jobs across replicas
+        cron_cfg = cfg.get("cron") or {}
+        cron_cluster = None
+        if cron_cfg.get("cluster"):
+            from .triggers.cron.cluster import HEARTBEAT_INTERVAL_S, CronCluster
+
+            cron_cluster = CronCluster(
+                db=self._database,
+                node_id=cron_cfg.get("node_id"),
+                heartbeat_interval_s=float(
+                    cron_cfg.get("heartbeat_interval_s", HEARTBEAT_INTERVAL_S)
+                ),
+            )
         self._cron_service = CronService(
             store=cron_store,
             executor=cron_executor,
             run_log=cron_run_log,
+            cluster=cron_cluster,
         )
         self._trigger_engine.set_cron_service(self._cron_service)
         await self._cron_service.start()
-        logger.info("CronService initialized and started (store: PostgreSQL)")
+        logger.info(
+            "CronService initialized and started (store: PostgreSQL"
+            f"{', cluster node ' + cron_cluster.node_id if cron_cluster else ''})"
+        )
 
         # ShipmentPoller — DISABLED: 17TRACK webhooks handle status updates in real-time.
         # Keeping the code but not starting it to avoid unnecessary API calls.
@@ -725,15 +771,23 @@ class Koa:
                 await self._calendar_sync.stop()
             if self._cron_service:
                 await self._cron_service.stop()
+            if self._email_handler:
+                await self._email_handler.aclose()
             if self._mcp_manager:
                 await self._mcp_manager.disconnect_all()
             if self._orchestrator:
                 await self._orchestrator.shutdown()
             if self._database:
                 await self._database.close()
+            configure_response_cache(None)
+            configure_provider_scheduler(None)
         except Exception as e:
             logger.warning(f"Error during shutdown: {e}")
         finally:
+            try:
+                await close_http_pool()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP pool: {e}")
             self._initialized = False
             self._llm_client = None
             self._database = None
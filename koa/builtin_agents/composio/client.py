@@ -10,7 +10,7 @@ import logging
 import os
 from typing import Any, Dict, Optional
 
-import httpx
+from ...http_pool import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -53,7 +53,7 @@ class ComposioClient:
         if use_case:
             params["useCase"] = use_case
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.get(
                 f"{BASE_URL}/v2/actions",
                 headers=self._headers,
@@ -90,7 +90,7 @@ class ComposioClient:
             app_name = action_name.split("_")[0].lower()
             body["appName"] = app_name
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.post(
                 f"{BASE_URL}/v2/actions/{action_name}/execute",
                 headers=self._headers,
@@ -107,7 +107,7 @@ class ComposioClient:
 
         The v1 API now requires UUIDs instead of plain app names.
         """
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.get(
                 f"{BASE_URL}/v1/integrations",
                 headers=self._headers,
@@ -169,7 +169,7 @@ class ComposioClient:
         if redirect_url:
             body["redirectUrl"] = redirect_url
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.post(
                 f"{BASE_URL}/v1/connectedAccounts",
                 headers=self._headers,
@@ -188,7 +188,7 @@ class ComposioClient:
 
         Returns dict with 'status' (INITIATED, ACTIVE, FAILED, etc.) and account details.
         """
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.get(
                 f"{BASE_URL}/v1/connectedAccounts/{connected_account_id}",
                 headers=self._headers,
@@ -207,7 +207,7 @@ class ComposioClient:
         Args:
             entity_id: Entity ID to list connections for.
         """
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.get(
                 f"{BASE_URL}/v1/connectedAccounts",
                 headers=self._headers,
@@ -5,8 +5,7 @@ import os
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Tuple
 
-import httpx
-
+from koa.http_pool import http_client
 from koa.models import AgentToolContext
 
 logger = logging.getLogger(__name__)
@@ -179,7 +178,7 @@ async def _refresh_token(refresh_token: str) -> Tuple[Optional[dict], Optional[s
         return None, "Google OAuth not configured. Set Google OAuth App credentials in Settings."
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             response = await client.post(
                 TOKEN_URL,
                 data={
@@ -7,7 +7,7 @@ Shared by ReAct tools and agent-tools.
 import logging
 from typing import Any, Dict, List, Optional
 
-import httpx
+from ...http_pool import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +62,7 @@ class GoogleWorkspaceClient:
             "orderBy": "modifiedTime desc",
         }
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.get(
                 f"{DRIVE_API}/files",
                 headers=self._headers,
@@ -74,7 +74,7 @@ class GoogleWorkspaceClient:
 
     async def drive_get_file(self, file_id: str) -> Dict[str, Any]:
         """Get file metadata."""
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.get(
                 f"{DRIVE_API}/files/{file_id}",
                 headers=self._headers,
@@ -88,7 +88,7 @@ class GoogleWorkspaceClient:
 
     async def docs_get(self, document_id: str) -> Dict[str, Any]:
         """Get full document content."""
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.get(
                 f"{DOCS_API}/documents/{document_id}",
                 headers=self._headers,
@@ -100,7 +100,7 @@ class GoogleWorkspaceClient:
     async def docs_create(self, title: str, body_text: str = "") -> Dict[str, Any]:
         """Create a new Google Doc with optional body text."""
         # Step 1: Create empty doc
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.post(
                 f"{DOCS_API}/documents",
                 headers=self._headers,
@@ -126,7 +126,7 @@ class GoogleWorkspaceClient:
                 }
             }
         ]
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.post(
                 f"{DOCS_API}/documents/{document_id}:batchUpdate",
                 headers=self._headers,
@@ -140,7 +140,7 @@ class GoogleWorkspaceClient:
 
     async def sheets_get_metadata(self, spreadsheet_id: str) -> Dict[str, Any]:
         """Get spreadsheet metadata (sheet names, etc.)."""
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.get(
                 f"{SHEETS_API}/spreadsheets/{spreadsheet_id}",
                 headers=self._headers,
@@ -152,7 +152,7 @@ class GoogleWorkspaceClient:
 
     async def sheets_get_values(self, spreadsheet_id: str, range_: str) -> Dict[str, Any]:
         """Get cell values from a spreadsheet range."""
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.get(
                 f"{SHEETS_API}/spreadsheets/{spreadsheet_id}/values/{range_}",
                 headers=self._headers,
@@ -165,7 +165,7 @@ class GoogleWorkspaceClient:
         self, spreadsheet_id: str, range_: str, values: List[List[Any]]
     ) -> Dict[str, Any]:
         """Write values to a spreadsheet range."""
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.put(
                 f"{SHEETS_API}/spreadsheets/{spreadsheet_id}/values/{range_}",
                 headers=self._headers,
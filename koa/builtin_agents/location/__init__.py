@@ -8,8 +8,7 @@ location-based (geofence) reminders via the koiai backend API.
 import logging
 from typing import Optional
 
-import httpx
-
+from koa.http_pool import http_client
 from koa.models import AgentToolContext
 
 logger = logging.getLogger(__name__)
@@ -90,7 +89,7 @@ async def set_location_reminder_executor(args: dict, context: AgentToolContext =
         return "Cannot create location reminder: backend URL not configured."
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_client(timeout=10.0) as client:
             resp = await client.post(
                 f"{koiai_url}/api/location/geofences",
                 json={
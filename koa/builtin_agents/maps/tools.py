@@ -14,6 +14,7 @@ from typing import Annotated, Any, Dict, Optional
 
 import httpx
 
+from koa.http_pool import http_client
 from koa.models import AgentToolContext, ToolOutput
 from koa.tool_decorator import tool
 
@@ -34,7 +35,7 @@ async def _geocode_location(location: str) -> Optional[Dict[str, Any]]:
     try:
         url = "https://maps.googleapis.com/maps/api/geocode/json"
         params = {"address": location, "key": google_api_key}
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             response = await client.get(url, params=params, timeout=10.0)
             response.raise_for_status()
             data = response.json()
@@ -141,7 +142,7 @@ async def search_places(
                 "languageCode": "en",
             }
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             response = await client.post(url, headers=headers, json=request_body, timeout=15.0)
             response.raise_for_status()
             data = response.json()
@@ -310,7 +311,7 @@ async def get_directions(
             "key": api_key,
         }
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             response = await client.get(url, params=params, timeout=15.0)
             response.raise_for_status()
             data = response.json()
@@ -428,7 +429,7 @@ async def check_air_quality(
         }
         params = {"key": api_key}
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             response = await client.post(
                 url, headers=headers, json=request_body, params=params, timeout=15.0
             )
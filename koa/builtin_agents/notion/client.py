@@ -9,7 +9,7 @@ import logging
 import os
 from typing import Any, Dict, List, Optional
 
-import httpx
+from ...http_pool import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -53,7 +53,7 @@ class NotionClient:
         if filter_type in ("page", "database"):
             body["filter"] = {"value": filter_type, "property": "object"}
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.post(
                 f"{BASE_URL}/search",
                 headers=self._headers,
@@ -67,7 +67,7 @@ class NotionClient:
 
     async def get_page(self, page_id: str) -> Dict[str, Any]:
         """Get page metadata."""
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.get(
                 f"{BASE_URL}/pages/{page_id}",
                 headers=self._headers,
@@ -108,7 +108,7 @@ class NotionClient:
         if content:
             body["children"] = self.text_to_blocks(content)
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.post(
                 f"{BASE_URL}/pages",
                 headers=self._headers,
@@ -120,7 +120,7 @@ class NotionClient:
 
     async def update_page(self, page_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
         """Update page properties."""
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.patch(
                 f"{BASE_URL}/pages/{page_id}",
                 headers=self._headers,
@@ -137,7 +137,7 @@ class NotionClient:
         blocks: List[Dict[str, Any]] = []
         start_cursor: Optional[str] = None
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             while True:
                 params: Dict[str, Any] = {"page_size": 100}
                 if start_cursor:
@@ -162,7 +162,7 @@ class NotionClient:
 
     async def append_blocks(self, block_id: str, children: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Append child blocks to a page/block."""
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.patch(
                 f"{BASE_URL}/blocks/{block_id}/children",
                 headers=self._headers,
@@ -188,7 +188,7 @@ class NotionClient:
         if sorts:
             body["sorts"] = sorts
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.post(
                 f"{BASE_URL}/databases/{database_id}/query",
                 headers=self._headers,
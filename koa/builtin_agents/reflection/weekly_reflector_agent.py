@@ -3,7 +3,9 @@
 Triggered by CronService at Monday 03:00 local per user. Wraps
 ``koa.memory.lifecycle.weekly_reflector.run_weekly_reflection`` so that the
 result is fed back into the standard ``true_memory_proposals`` pipeline.
-Episodes are persisted as Momex entries with ``kind=episode``.
+Episodes are persisted as Momex entries with ``kind=episode``.  When a
+``db`` hint is present, the week's health stats come from the daily health
+rollup.
 """
 
 from __future__ import annotations
@@ -12,6 +14,7 @@ import logging
 from datetime import timedelta
 
 from koa import valet
+from koa.memory.lifecycle import health_rollup
 from koa.memory.lifecycle.episode_memory import EpisodeMemory
 from koa.memory.lifecycle.weekly_reflector import run_weekly_reflection
 from koa.standard_agent import StandardAgent
@@ -33,9 +36,12 @@ class WeeklyReflectorAgent(StandardAgent):
         if not momex or not user_id:
             return self.make_result(status="skipped", reason="no_context")
 
-        now, _tz = self._user_now()
+        now, tz_name = self._user_now()
         # Reflect over the previous full week ending yesterday.
         week_end = now.date() - timedelta(days=1)
+        health_days = await self._health_days(
+            hints.get("db"), user_id, week_end - timedelta(days=6), week_end, tz_name
+        )
 
         llm_client = self.llm_client
         if llm_client is None:
@@ -58,6 +64,7 @@ class WeeklyReflectorAgent(StandardAgent):
             week_end,
             llm_call=_llm_call,
             episode_memory=episode_memory,
+            health_days=health_days,
         )
         if reflection is None:
             return self.make_result(status="skipped", reason="no_data_or_llm_failed")
@@ -79,3 +86,14 @@ class WeeklyReflectorAgent(StandardAgent):
             highlight=reflection.highlight,
             episodes_written=reflection.episodes_written,
         )
+
+    @staticmethod
+    async def _health_days(db, user_id, start, end, tz_name):
+        if db is None:
+            return None
+        try:
+            days = await health_rollup.fetch_days(db, user_id, start, end, tz_name)
+        except Exception as e:
+            logger.debug("health rollup read failed for %s: %s", user_id, e)
+            return None
+        return {d.isoformat(): health_rollup.metric_stats(m) for d, m in days.items()}
@@ -7,6 +7,8 @@ enabling contextual conversations like "what did I do yesterday?"
 
 import json
 import logging
+import time
+from typing import Any, List, Tuple
 
 from koa.models import AgentToolContext
 
@@ -72,39 +74,70 @@ async def recall_recent_actions_executor(args: dict, context: AgentToolContext =
         return f"Error retrieving action history: {e}"
 
 
-async def save_tool_call_history(db, tenant_id: str, tool_calls: list) -> None:
-    """Persist tool call records to the database.
+_INTERNAL_TOOLS = {"complete_task", "generate_plan", "recall_memory", "recall_recent_actions"}
+
+_INSERT_SQL = """
+    INSERT INTO tool_call_history
+        (tenant_id, tool_name, agent_name, summary, args_summary,
+         success, result_status, result_chars, duration_ms, created_at)
+    SELECT tenant_id, tool_name, agent_name, summary, args_summary::jsonb,
+           success, result_status, result_chars, duration_ms,
+           to_timestamp(created_s)
+    FROM unnest($1::text[], $2::text[], $3::text[], $4::text[], $5::text[],
+                $6::bool[], $7::text[], $8::int[], $9::int[], $10::float8[])
+        AS t(tenant_id, tool_name, agent_name, summary, args_summary,
+             success, result_status, result_chars, duration_ms, created_s)
+"""
 
-    Called by the orchestrator after ReAct loop completion.
-    Filters out internal tools (complete_task, generate_plan).
-    """
-    INTERNAL_TOOLS = {"complete_task", "generate_plan", "recall_memory", "recall_recent_actions"}
 
+def tool_call_history_rows(tenant_id: str, tool_calls: list) -> List[Tuple[Any, ...]]:
+    """Turn the orchestrator's tool call records into ``tool_call_history`` rows.
+
+    Filters out internal tools (complete_task, generate_plan).  Each row
+    carries its creation time, so rows written later in a batch keep the
+    time the call actually finished.
+    """
+    now = time.time()
+    rows = []
     for tc in tool_calls:
         name = tc.get("name", "")
-        if name in INTERNAL_TOOLS:
+        if name in _INTERNAL_TOOLS:
             continue
-
-        try:
-            await db.execute(
-                """
-                INSERT INTO tool_call_history
-                    (tenant_id, tool_name, agent_name, summary, args_summary,
-                     success, result_status, result_chars, duration_ms)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-                """,
+        args = tc.get("args_summary", {})
+        rows.append(
+            (
                 tenant_id,
                 name,
                 tc.get("agent_name"),
-                _make_summary(name, tc.get("args_summary", {})),
-                json.dumps(tc.get("args_summary", {})),
+                _make_summary(name, args),
+                json.dumps(args),
                 tc.get("success", True),
                 tc.get("result_status"),
                 tc.get("result_chars", 0),
                 tc.get("duration_ms", 0),
+                now,
             )
-        except Exception as e:
-            logger.error(f"Failed to save tool call '{name}': {e}")
+        )
+    return rows
+
+
+async def insert_tool_call_history_rows(db, rows: List[Tuple[Any, ...]]) -> None:
+    """Insert rows from :func:`tool_call_history_rows` in one statement."""
+    if not rows:
+        return
+    await db.execute(_INSERT_SQL, *(list(column) for column in zip(*rows)))
+
+
+async def save_tool_call_history(db, tenant_id: str, tool_calls: list) -> None:
+    """Persist tool call records to the database.
+
+    The orchestrator batches rows through its write-behind sink instead;
+    this is the direct path for callers without one.
+    """
+    try:
+        await insert_tool_call_history_rows(db, tool_call_history_rows(tenant_id, tool_calls))
+    except Exception as e:
+        logger.error(f"Failed to save tool call history: {e}")
 
 
 def _make_summary(tool_name: str, args: dict) -> str:
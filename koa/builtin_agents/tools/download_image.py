@@ -10,6 +10,7 @@ import logging
 
 import httpx
 
+from koa.http_pool import http_client
 from koa.models import AgentToolContext, ToolOutput
 
 logger = logging.getLogger(__name__)
@@ -44,7 +45,7 @@ async def download_image_executor(args: dict, context: AgentToolContext = None):
         return "Error: cannot download from internal or private network URLs."
 
     try:
-        async with httpx.AsyncClient(
+        async with http_client(
             follow_redirects=True,
             timeout=_TIMEOUT,
             headers={"User-Agent": _USER_AGENT},
@@ -16,6 +16,7 @@ from typing import Any, Dict, List, Tuple
 
 import httpx
 
+from koa.http_pool import http_client
 from koa.models import AgentToolContext, ToolOutput
 
 logger = logging.getLogger(__name__)
@@ -43,7 +44,7 @@ async def _download_thumbnails(
     urls: List[str],
 ) -> List[Tuple[str, str]]:
     """Download multiple thumbnails concurrently."""
-    async with httpx.AsyncClient(
+    async with http_client(
         follow_redirects=True,
         headers={"User-Agent": "Koa/1.0"},
     ) as client:
@@ -58,7 +59,7 @@ async def _brave_search_fallback(query: str, num_results: int = 5) -> str:
         return ""
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             response = await client.get(
                 "https://api.search.brave.com/res/v1/web/search",
                 params={"q": query, "count": min(num_results, 10)},
@@ -130,7 +131,7 @@ async def google_search_executor(args: dict, context: AgentToolContext = None):
         params["searchType"] = "image"
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             response = await client.get(
                 "https://www.googleapis.com/customsearch/v1",
                 params=params,
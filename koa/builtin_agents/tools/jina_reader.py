@@ -14,6 +14,8 @@ from typing import Optional
 
 import httpx
 
+from ...http_pool import http_client
+
 logger = logging.getLogger(__name__)
 
 _JINA_BASE = "https://r.jina.ai/"
@@ -40,7 +42,7 @@ async def jina_fetch(
         headers["Authorization"] = f"Bearer {api_key}"
 
     try:
-        async with httpx.AsyncClient(follow_redirects=True) as client:
+        async with http_client(follow_redirects=True) as client:
             resp = await client.get(jina_url, headers=headers, timeout=timeout)
 
         if resp.status_code >= 400:
@@ -96,7 +96,7 @@ GET_USER_PROFILE_SCHEMA = {
 
 async def update_user_profile_executor(args: dict, context: AgentToolContext = None) -> str:
     """Save or update the user's profile information via koi-backend API."""
-    import httpx
+    from koa.http_pool import http_client
 
     if not context or not context.tenant_id:
         return "Error: User ID not available"
@@ -130,7 +130,7 @@ async def update_user_profile_executor(args: dict, context: AgentToolContext = N
         return "Error: Backend URL not configured — cannot save profile."
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_client(timeout=10.0) as client:
             resp = await client.post(
                 f"{koiai_url}/api/profile/update-field",
                 json={
@@ -14,6 +14,7 @@ from typing import Dict, Optional, Tuple
 import httpx
 import trafilatura
 
+from koa.http_pool import http_client
 from koa.models import AgentToolContext
 
 logger = logging.getLogger(__name__)
@@ -89,7 +90,7 @@ async def web_fetch_executor(args: dict, context: AgentToolContext = None) -> st
         return cached
 
     try:
-        async with httpx.AsyncClient(
+        async with http_client(
             follow_redirects=True,
             timeout=20.0,
             headers={"User-Agent": _USER_AGENT},
@@ -13,6 +13,7 @@ from typing import Annotated
 import httpx
 
 from koa.builtin_agents.tools.jina_reader import jina_fetch
+from koa.http_pool import http_client
 from koa.models import AgentToolContext
 from koa.tool_decorator import tool
 
@@ -172,7 +173,7 @@ async def get_weather(
         days = 0
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             if days == 0:
                 url = "http://api.weatherapi.com/v1/current.json"
                 params = {"key": api_key, "q": location, "aqi": "no"}
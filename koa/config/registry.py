@@ -4,8 +4,11 @@ Agent Registry - Runtime registry that manages agents/MCP
 Agents are registered via @valet decorator only.
 """
 
+import copy
 import logging
-from typing import Any, Callable, Dict, List, Optional, Set, Type
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple, Type
 
 from ..base_agent import BaseAgent
 from ..llm.registry import LLMRegistry
@@ -24,6 +27,70 @@ def register_validator(name: str, func: Callable[[str], bool]) -> None:
     VALIDATORS[name] = func
 
 
+# Max distinct (domains, tenant services) keys kept in the compiled index
+_INDEX_MAX_ENTRIES = 256
+
+
+def _read_only(self, *args: Any, **kwargs: Any) -> None:
+    raise TypeError("compiled tool schemas are shared; copy an entry before modifying it")
+
+
+class _FrozenDict(dict):
+    """Read-only dict for compiled schemas shared across requests.
+
+    Still a ``dict``, so JSON encoders and LLM clients accept it as is.
+    ``copy.deepcopy`` returns plain, mutable containers.
+    """
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, Any]:
+        return {k: copy.deepcopy(v, memo) for k, v in self.items()}
+
+    def __reduce__(self) -> Any:
+        return (dict, (dict(self),))
+
+
+class _FrozenList(list):
+    """Read-only list counterpart of :class:`_FrozenDict`."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __copy__(self) -> List[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> List[Any]:
+        return [copy.deepcopy(v, memo) for v in self]
+
+    def __reduce__(self) -> Any:
+        return (list, (list(self),))
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return _FrozenDict({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return _FrozenList(_freeze(v) for v in value)
+    return value
+
+
+@dataclass(frozen=True)
+class _CompiledAgent:
+    """Precompiled routing data for one registered agent."""
+
+    name: str
+    metadata: Any
+    domain: Optional[str]
+    schema: Optional[Dict[str, Any]]
+    schema_version: int
+    description: str
+
+
 class AgentRegistry:
     """
     Runtime registry for agents and MCP servers
@@ -58,6 +125,13 @@ class AgentRegistry:
         self.mcp_client_factory = mcp_client_factory
         self.mcp_manager = MCPManager()
 
+        # Compiled index, rebuilt only when the decorator registry changes
+        self._compiled: Tuple[_CompiledAgent, ...] = ()
+        self._compiled_by_name: Dict[str, _CompiledAgent] = {}
+        self._compiled_version: Optional[int] = None
+        self._schema_index: "OrderedDict[Any, Tuple[Dict[str, Any], ...]]" = OrderedDict()
+        self._description_index: "OrderedDict[Any, str]" = OrderedDict()
+
         self._initialized = False
 
     async def initialize(self) -> None:
@@ -187,29 +261,136 @@ class AgentRegistry:
         # Agent is available if tenant has at least one required service
         return bool(set(required) & tenant_services)
 
+    # ===== Compiled tool-schema / description index =====
+
+    def _compiled_agents(self) -> Tuple[_CompiledAgent, ...]:
+        """Return per-agent compiled entries, recompiling if the registry changed.
+
+        The decorator registry bumps a version counter on every mutation, so
+        the staleness check is O(1). Schema versions are captured at compile
+        time; they can only change when an agent class is re-registered.
+        """
+        from ..agents.decorator import get_registry_version
+
+        version = get_registry_version()
+        if self._compiled_version == version:
+            return self._compiled
+
+        from ..agents.decorator import (
+            enhance_agent_tool_schema,
+            generate_tool_schema,
+            get_schema_version,
+        )
+
+        compiled = []
+        for name, metadata in self._get_agent_registry().items():
+            expose = getattr(metadata, "expose_as_tool", True)
+            schema = None
+            if expose:
+                schema = generate_tool_schema(metadata.agent_class)
+                schema = _freeze(enhance_agent_tool_schema(metadata.agent_class, schema))
+            compiled.append(
+                _CompiledAgent(
+                    name=name,
+                    metadata=metadata,
+                    domain=getattr(metadata, "domain", None),
+                    schema=schema,
+                    schema_version=get_schema_version(metadata.agent_class),
+                    description=self._describe_agent(name, metadata),
+                )
+            )
+
+        self._compiled = tuple(compiled)
+        self._compiled_by_name = {entry.name: entry for entry in compiled}
+        self._compiled_version = version
+        self._schema_index.clear()
+        self._description_index.clear()
+        logger.debug(f"[AgentRegistry] compiled {len(compiled)} agents (version={version})")
+        return self._compiled
+
+    def invalidate_tool_index(self) -> None:
+        """Drop compiled schemas/descriptions; the next lookup recompiles."""
+        self._compiled = ()
+        self._compiled_by_name = {}
+        self._compiled_version = None
+        self._schema_index.clear()
+        self._description_index.clear()
+
+    @staticmethod
+    def _index_get(index: "OrderedDict[Any, Any]", key: Any) -> Any:
+        value = index.get(key)
+        if value is not None:
+            index.move_to_end(key)
+        return value
+
+    @staticmethod
+    def _index_put(index: "OrderedDict[Any, Any]", key: Any, value: Any) -> None:
+        index[key] = value
+        if len(index) > _INDEX_MAX_ENTRIES:
+            index.popitem(last=False)
+
+    def _get_compiled_schemas(
+        self,
+        domains: Optional[FrozenSet[str]],
+        tenant_services: Optional[Set[str]],
+    ) -> Tuple[Dict[str, Any], ...]:
+        """Return the shared schema tuple for a (domains, tenant services) key.
+
+        ``domains=None`` means no domain filtering.
+        """
+        compiled = self._compiled_agents()
+        services_key = frozenset(tenant_services) if tenant_services is not None else None
+        key = (domains, services_key)
+        cached = self._index_get(self._schema_index, key)
+        if cached is not None:
+            return cached
+
+        schemas = []
+        matched = []
+        skipped = []
+        for entry in compiled:
+            if entry.schema is None:
+                continue
+            if domains is not None and entry.domain not in domains:
+                skipped.append(f"{entry.name}(domain={entry.domain})")
+                continue
+            if not self._agent_available_for_tenant(entry.metadata, tenant_services):
+                skipped.append(f"{entry.name}(requires_service)")
+                continue
+            matched.append(entry.name)
+            schemas.append(entry.schema)
+
+        if domains is not None:
+            logger.info(
+                "[AgentRegistry] domain_filter=%s matched=%s skipped=%s",
+                sorted(domains),
+                matched,
+                skipped,
+            )
+
+        result = tuple(schemas)
+        self._index_put(self._schema_index, key, result)
+        return result
+
     async def get_all_agent_tool_schemas(
         self,
         tenant_id: Optional[str] = None,
         credential_store: Optional[Any] = None,
-    ) -> List[Dict[str, Any]]:
-        """Return enhanced tool schemas for all agents with expose_as_tool=True."""
-        from ..agents.decorator import enhance_agent_tool_schema, generate_tool_schema
+    ) -> Tuple[Dict[str, Any], ...]:
+        """Return enhanced tool schemas for all agents with expose_as_tool=True.
 
-        schemas = []
-        for name, metadata in self._get_agent_registry().items():
-            if not getattr(metadata, "expose_as_tool", True):
-                continue
-            schema = generate_tool_schema(metadata.agent_class)
-            schema = enhance_agent_tool_schema(metadata.agent_class, schema)
-            schemas.append(schema)
-        return schemas
+        The result is a precompiled tuple shared between callers.  The schemas
+        are read-only; ``copy.deepcopy`` an entry to get a mutable version.
+        """
+        tenant_services = await self._get_tenant_services(tenant_id, credential_store)
+        return self._get_compiled_schemas(None, tenant_services)
 
     async def get_domain_agent_tool_schemas(
         self,
         domains: List[str],
         tenant_id: Optional[str] = None,
         credential_store: Optional[Any] = None,
-    ) -> List[Dict[str, Any]]:
+    ) -> Tuple[Dict[str, Any], ...]:
         """Return tool schemas filtered to specific domains.
 
         Uses ``metadata.domain`` declared on each agent via ``@valet(domain=...)``.
@@ -219,42 +400,16 @@ class AgentRegistry:
         if "all" in domains:
             return await self.get_all_agent_tool_schemas(tenant_id, credential_store)
 
-        from ..agents.decorator import enhance_agent_tool_schema, generate_tool_schema
-
-        domain_set = set(domains)
-
-        schemas = []
-        matched = []
-        skipped = []
-        for name, metadata in self._get_agent_registry().items():
-            if not getattr(metadata, "expose_as_tool", True):
-                continue
-            # Filter by domain declared on the agent
-            agent_domain = getattr(metadata, "domain", None)
-            if agent_domain not in domain_set:
-                skipped.append(f"{name}(domain={agent_domain})")
-                continue
-            matched.append(name)
-            schema = generate_tool_schema(metadata.agent_class)
-            schema = enhance_agent_tool_schema(metadata.agent_class, schema)
-            schemas.append(schema)
-
-        logger.info(
-            "[AgentRegistry] domain_filter=%s matched=%s skipped=%s",
-            domains,
-            matched,
-            skipped,
-        )
-        return schemas
+        tenant_services = await self._get_tenant_services(tenant_id, credential_store)
+        return self._get_compiled_schemas(frozenset(domains), tenant_services)
 
     def get_schema_version(self, agent_type: str) -> Optional[int]:
         """Return schema version for a registered agent type."""
-        from ..agents.decorator import get_schema_version
-
-        agent_class = self.get_agent_class(agent_type)
-        if agent_class is None:
+        self._compiled_agents()
+        entry = self._compiled_by_name.get(agent_type)
+        if entry is None:
             return None
-        return get_schema_version(agent_class)
+        return entry.schema_version
 
     async def get_agent_descriptions(
         self,
@@ -265,24 +420,40 @@ class AgentRegistry:
         Get formatted agent descriptions for LLM routing prompt.
 
         Includes descriptions, capabilities, available tools, and inputs/outputs.
+        Cached per tenant service set until the registry changes.
         """
-        lines = []
-
-        for name, metadata in self._get_agent_registry().items():
-            description = metadata.description or metadata.agent_class.__doc__ or ""
-            lines.append(f"- **{name}**: {description}")
-
-            # Domain for routing
-            if metadata.domain:
-                lines.append(f"  Domain: {metadata.domain}")
-
-            # Tools available to this agent
-            agent_tools = getattr(metadata.agent_class, "tools", ())
-            if agent_tools:
-                tool_names = []
-                for t in agent_tools:
-                    tname = getattr(t, "name", None) or getattr(t, "__name__", str(t))
-                    tool_names.append(tname)
-                lines.append(f"  Tools: {', '.join(tool_names)}")
+        compiled = self._compiled_agents()
+        tenant_services = await self._get_tenant_services(tenant_id, credential_store)
+        key = frozenset(tenant_services) if tenant_services is not None else None
+        cached = self._index_get(self._description_index, key)
+        if cached is not None:
+            return cached
+
+        result = "\n".join(
+            entry.description
+            for entry in compiled
+            if self._agent_available_for_tenant(entry.metadata, tenant_services)
+        )
+        self._index_put(self._description_index, key, result)
+        return result
+
+    @staticmethod
+    def _describe_agent(name: str, metadata: Any) -> str:
+        """Render the routing-prompt description block for one agent."""
+        description = metadata.description or metadata.agent_class.__doc__ or ""
+        lines = [f"- **{name}**: {description}"]
+
+        # Domain for routing
+        if metadata.domain:
+            lines.append(f"  Domain: {metadata.domain}")
+
+        # Tools available to this agent
+        agent_tools = getattr(metadata.agent_class, "tools", ())
+        if agent_tools:
+            tool_names = []
+            for t in agent_tools:
+                tname = getattr(t, "name", None) or getattr(t, "__name__", str(t))
+                tool_names.append(tname)
+            lines.append(f"  Tools: {', '.join(tool_names)}")
 
         return "\n".join(lines)
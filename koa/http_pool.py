@@ -0,0 +1,390 @@
+"""Process-wide pooled HTTP clients.
+
+Providers, tools and triggers used to open a fresh ``httpx.AsyncClient`` per
+call, paying a TCP + TLS handshake every time.  This module keeps a single
+routing transport with one connection pool per upstream host, shared by a
+small set of lightweight client "profiles" (timeout / redirect / default
+header combinations).
+
+- Per-host pools: each host gets its own ``AsyncHTTPTransport`` with its own
+  keep-alive limits, so one slow upstream cannot starve the others.
+- HTTP/2 is negotiated for hosts in :data:`HTTP2_HOSTS` when the optional
+  ``h2`` package is installed (``pip install koa[http2]``).
+- Connection reuse is tracked per host via httpcore trace events and exposed
+  through :meth:`HTTPClientPool.stats` and the ``koa_http_requests_total``
+  counter.
+- Pooled clients are shared by every tenant, so they never persist cookies:
+  a ``Set-Cookie`` from one caller's response must not ride along on
+  another caller's request.  An explicit ``Cookie`` header still works.
+
+Usage::
+
+    from koa.http_pool import http_client
+
+    async with http_client(timeout=10.0) as client:
+        response = await client.get(url)
+
+The context manager borrows a shared client; leaving the block does NOT close
+it.  :func:`close_http_pool` is called from ``Koa.shutdown``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from http.cookiejar import CookieJar
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple, Union
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# httpx's own default, kept so migrated call sites behave the same
+DEFAULT_TIMEOUT = httpx.Timeout(5.0)
+
+# Limits applied to each per-host pool
+PER_HOST_LIMITS = httpx.Limits(
+    max_connections=50,
+    max_keepalive_connections=20,
+    keepalive_expiry=30.0,
+)
+
+# Upper bound on distinct per-host pools (web_fetch can hit arbitrary hosts)
+MAX_HOSTS = 256
+
+# Upstreams known to speak HTTP/2
+HTTP2_HOSTS = frozenset(
+    {
+        "gmail.googleapis.com",
+        "www.googleapis.com",
+        "oauth2.googleapis.com",
+        "tasks.googleapis.com",
+        "places.googleapis.com",
+        "routes.googleapis.com",
+        "maps.googleapis.com",
+        "customsearch.googleapis.com",
+        "graph.microsoft.com",
+        "login.microsoftonline.com",
+        "api.todoist.com",
+        "api.notion.com",
+        "api.dropboxapi.com",
+        "content.dropboxapi.com",
+        "r.jina.ai",
+    }
+)
+
+_H2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+TimeoutTypes = Union[float, None, httpx.Timeout]
+
+
+class _HostStats:
+    __slots__ = ("requests", "new_connections")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.new_connections = 0
+
+
+class _DiscardingCookieJar(CookieJar):
+    """Cookie jar that never stores anything (see module docstring)."""
+
+    def set_cookie(self, cookie) -> None:
+        pass
+
+    def extract_cookies(self, response, request) -> None:
+        pass
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    """Response body that runs ``on_close`` once the body is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close) -> None:
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            on_close, self._on_close = self._on_close, None
+            if on_close is not None:
+                on_close()
+
+
+class _HostRoutingTransport(httpx.AsyncBaseTransport):
+    """Route each request to a lazily created per-host transport.
+
+    Idle host pools are evicted LRU-first once :data:`MAX_HOSTS` is reached.
+    """
+
+    def __init__(
+        self,
+        *,
+        limits: httpx.Limits,
+        http2_hosts: frozenset,
+        max_hosts: int,
+    ) -> None:
+        self._limits = limits
+        self._http2_hosts = http2_hosts
+        self._max_hosts = max_hosts
+        self._transports: "OrderedDict[str, httpx.AsyncHTTPTransport]" = OrderedDict()
+        self._in_flight: Dict[str, int] = {}
+        self._stats: Dict[str, _HostStats] = {}
+        self._closing: Set[asyncio.Future] = set()
+
+    def _transport_for(self, host: str) -> httpx.AsyncHTTPTransport:
+        transport = self._transports.get(host)
+        if transport is not None:
+            self._transports.move_to_end(host)
+            return transport
+
+        transport = httpx.AsyncHTTPTransport(
+            http2=_H2_AVAILABLE and host in self._http2_hosts,
+            limits=self._limits,
+        )
+        self._transports[host] = transport
+        self._evict_idle()
+        return transport
+
+    def _evict_idle(self) -> None:
+        if len(self._transports) <= self._max_hosts:
+            return
+        for host in list(self._transports):
+            if len(self._transports) <= self._max_hosts:
+                break
+            if self._in_flight.get(host):
+                continue
+            transport = self._transports.pop(host)
+            self._stats.pop(host, None)
+            self._closing.add(asyncio.ensure_future(transport.aclose()))
+            for task in [t for t in self._closing if t.done()]:
+                self._closing.discard(task)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        transport = self._transport_for(host)
+        stats = self._stats.setdefault(host, _HostStats())
+        new_connection = False
+        outer_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            nonlocal new_connection
+            if event_name == "connection.connect_tcp.complete":
+                new_connection = True
+            if outer_trace is not None:
+                await outer_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        self._in_flight[host] = self._in_flight.get(host, 0) + 1
+        try:
+            response = await transport.handle_async_request(request)
+        except BaseException:
+            self._release(host)
+            raise
+        finally:
+            stats.requests += 1
+            if new_connection:
+                stats.new_connections += 1
+            _record_request(new_connection)
+        # The connection stays busy until the body has been read or closed
+        # (httpx closes it after reading a non-streamed body).
+        response.stream = _TrackedStream(response.stream, lambda: self._release(host))
+        return response
+
+    def _release(self, host: str) -> None:
+        if self._in_flight.get(host):
+            self._in_flight[host] -= 1
+
+    def in_flight(self, host: str) -> int:
+        """Requests to ``host`` whose response body is still open."""
+        return self._in_flight.get(host, 0)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            host: {
+                "requests": s.requests,
+                "new_connections": s.new_connections,
+                "reused_connections": s.requests - s.new_connections,
+            }
+            for host, s in self._stats.items()
+        }
+
+    async def aclose(self) -> None:
+        transports = list(self._transports.values())
+        self._transports.clear()
+        self._in_flight.clear()
+        for transport in transports:
+            try:
+                await transport.aclose()
+            except Exception as e:
+                logger.debug(f"[HTTPPool] Error closing transport: {e}")
+
+
+def _record_request(new_connection: bool) -> None:
+    try:
+        from .observability.metrics import counter
+
+        counter(
+            "koa_http_requests_total",
+            {"connection": "new" if new_connection else "reused"},
+        )
+    except Exception:
+        pass
+
+
+class HTTPClientPool:
+    """Registry of shared ``httpx.AsyncClient`` profiles over per-host pools.
+
+    All profiles share one :class:`_HostRoutingTransport`, so connections to
+    a given host are reused regardless of which timeout/header profile
+    issued the request.  The pool is bound to the event loop it was first
+    used on; if a different loop shows up (e.g. between test cases) the old
+    connections are closed and fresh pools are created.
+    """
+
+    def __init__(
+        self,
+        *,
+        limits: httpx.Limits = PER_HOST_LIMITS,
+        http2_hosts: frozenset = HTTP2_HOSTS,
+        max_hosts: int = MAX_HOSTS,
+    ) -> None:
+        self._limits = limits
+        self._http2_hosts = http2_hosts
+        self._max_hosts = max_hosts
+        self._transport: Optional[_HostRoutingTransport] = None
+        self._clients: Dict[Tuple[Any, ...], httpx.AsyncClient] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing: Set[asyncio.Future] = set()
+
+    def _ensure_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._transport is not None:
+            return
+        if self._transport is not None:
+            logger.debug("[HTTPPool] Event loop changed; closing pooled connections")
+            self._discard_transport(self._transport, self._loop)
+        self._loop = loop
+        self._clients.clear()
+        self._transport = _HostRoutingTransport(
+            limits=self._limits,
+            http2_hosts=self._http2_hosts,
+            max_hosts=self._max_hosts,
+        )
+
+    def _discard_transport(
+        self,
+        transport: _HostRoutingTransport,
+        owner: Optional[asyncio.AbstractEventLoop],
+    ) -> None:
+        """Close a transport left behind by a previous event loop.
+
+        If the owning loop is still running (another thread), the close is
+        handed to it; otherwise it runs in the background on the current loop.
+        """
+        if owner is not None and owner.is_running():
+            asyncio.run_coroutine_threadsafe(transport.aclose(), owner)
+            return
+        task = asyncio.ensure_future(transport.aclose())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def get_client(
+        self,
+        *,
+        timeout: TimeoutTypes = DEFAULT_TIMEOUT,
+        follow_redirects: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.AsyncClient:
+        """Return the shared client for this option profile.
+
+        Must be called from within a running event loop.  Callers must not
+        close the returned client.
+        """
+        self._ensure_loop()
+        timeout_obj = timeout if isinstance(timeout, httpx.Timeout) else httpx.Timeout(timeout)
+        key = (
+            tuple(sorted(timeout_obj.as_dict().items())),
+            follow_redirects,
+            tuple(sorted(headers.items())) if headers else (),
+        )
+        client = self._clients.get(key)
+        if client is None:
+            client = httpx.AsyncClient(
+                transport=self._transport,
+                timeout=timeout_obj,
+                follow_redirects=follow_redirects,
+                headers=headers,
+                cookies=_DiscardingCookieJar(),
+            )
+            self._clients[key] = client
+        return client
+
+    @asynccontextmanager
+    async def client(
+        self,
+        *,
+        timeout: TimeoutTypes = DEFAULT_TIMEOUT,
+        follow_redirects: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> AsyncIterator[httpx.AsyncClient]:
+        """Borrow a shared client; exiting the block leaves it open."""
+        yield self.get_client(
+            timeout=timeout,
+            follow_redirects=follow_redirects,
+            headers=headers,
+        )
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-host request and connection reuse counters."""
+        if self._transport is None:
+            return {}
+        return self._transport.stats()
+
+    async def aclose(self) -> None:
+        """Close every pooled connection.  The pool can be reused afterwards."""
+        transport = self._transport
+        self._transport = None
+        self._clients.clear()
+        self._loop = None
+        if transport is not None:
+            await transport.aclose()
+            logger.info("[HTTPPool] Closed pooled HTTP connections")
+
+
+_default_pool = HTTPClientPool()
+
+
+def get_http_pool() -> HTTPClientPool:
+    """Return the process-wide HTTP client pool."""
+    return _default_pool
+
+
+def http_client(
+    *,
+    timeout: TimeoutTypes = DEFAULT_TIMEOUT,
+    follow_redirects: bool = False,
+    headers: Optional[Dict[str, str]] = None,
+):
+    """Borrow a pooled client from the process-wide pool.
+
+    Drop-in replacement for ``async with httpx.AsyncClient(...) as client``.
+    """
+    return _default_pool.client(
+        timeout=timeout,
+        follow_redirects=follow_redirects,
+        headers=headers,
+    )
+
+
+async def close_http_pool() -> None:
+    """Close the process-wide pool (called on application shutdown)."""
+    await _default_pool.aclose()
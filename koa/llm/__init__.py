@@ -21,9 +21,15 @@ Usage:
         print(chunk.content)
 """
 
-from .base import BaseLLMClient, LLMConfig, LLMResponse, StreamChunk
+from .base import BaseLLMClient, LLMConfig, LLMResponse, StreamChunk, ToolCallDelta
 from .litellm_client import LiteLLMClient
 from .registry import LLMProviderConfig, LLMRegistry
+from .response_cache import (
+    ResponseCache,
+    cached_completion,
+    configure_response_cache,
+    get_response_cache,
+)
 from .router import ModelRouter, RoutingDecision, RoutingRule
 
 __all__ = [
@@ -31,10 +37,15 @@ __all__ = [
     "LLMConfig",
     "LLMResponse",
     "StreamChunk",
+    "ToolCallDelta",
     "LiteLLMClient",
     "LLMRegistry",
     "LLMProviderConfig",
     "ModelRouter",
     "RoutingRule",
     "RoutingDecision",
+    "ResponseCache",
+    "cached_completion",
+    "configure_response_cache",
+    "get_response_cache",
 ]
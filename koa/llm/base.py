@@ -10,11 +10,16 @@ This module provides:
 
 from __future__ import annotations
 
+import copy
+import hashlib
+import json
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Union
 
+from ..single_flight import SingleFlight
+
 if TYPE_CHECKING:
     from ..models import AgentTool
 
@@ -45,6 +50,8 @@ class LLMConfig:
         timeout: Request timeout in seconds
         max_retries: Maximum number of retries on failure
         default_headers: Additional headers to send with requests
+        coalesce_requests: Share one API call among concurrent identical
+            ``chat_completion`` requests (see :mod:`koa.single_flight`)
     """
 
     api_key: Optional[str] = None
@@ -63,6 +70,9 @@ class LLMConfig:
     # Cost tracking
     track_costs: bool = True
 
+    # Request coalescing
+    coalesce_requests: bool = True
+
     # Extra provider-specific config (e.g., api_version for Azure)
     extra: Dict[str, Any] = field(default_factory=dict)
 
@@ -92,6 +102,20 @@ class ToolCall:
         }
 
 
+@dataclass
+class ToolCallDelta:
+    """A fragment of a streamed tool call.
+
+    Fragments with the same ``index`` belong to one call: ``id`` and
+    ``name`` arrive once, ``arguments`` is a piece of the JSON text.
+    """
+
+    index: int
+    id: str = ""
+    name: str = ""
+    arguments: str = ""
+
+
 @dataclass
 class Usage:
     """Token usage information"""
@@ -173,6 +197,8 @@ class StreamChunk:
 
     content: str = ""
     tool_calls: Optional[List[ToolCall]] = None
+    # Raw tool-call fragments in this chunk (for incremental assembly)
+    tool_call_deltas: Optional[List[ToolCallDelta]] = None
     is_final: bool = False
     stop_reason: Optional[StopReason] = None
     usage: Optional[Usage] = None
@@ -383,14 +409,38 @@ class BaseLLMClient(ABC):
         if config:
             merged_kwargs.update(config)
 
-        # Make the API call
-        response = await self._call_api(messages, tool_schemas, **merged_kwargs)
+        async def call() -> LLMResponse:
+            response = await self._call_api(messages, tool_schemas, **merged_kwargs)
+
+            # Calculate cost if tracking enabled
+            if self.config.track_costs and response.usage:
+                response.usage.cost = self._calculate_cost(response.usage, response.model)
+
+            return response
 
-        # Calculate cost if tracking enabled
-        if self.config.track_costs and response.usage:
-            response.usage.cost = self._calculate_cost(response.usage, response.model)
+        if not getattr(self.config, "coalesce_requests", True):
+            return await call()
 
-        return response
+        # Concurrent identical requests share one API call
+        key = self._request_key(messages, tool_schemas, merged_kwargs)
+        return await self._get_single_flight().do(key, call)
+
+    def _get_single_flight(self) -> SingleFlight:
+        flight = self.__dict__.get("_single_flight")
+        if flight is None:
+            flight = self._single_flight = SingleFlight(f"llm:{self.provider}", share=copy.deepcopy)
+        return flight
+
+    @staticmethod
+    def _request_key(
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]],
+        params: Dict[str, Any],
+    ) -> str:
+        payload = {"messages": messages, "tools": tools, "params": params}
+        return hashlib.sha256(
+            json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        ).hexdigest()
 
     async def stream_completion(
         self,
@@ -10,6 +10,7 @@ Supports all providers through a single client:
 - DashScope (Qwen, Deepseek via OpenAI-compatible mode)
 """
 
+import copy
 import json
 import logging
 import os
@@ -22,6 +23,7 @@ from .base import (
     StopReason,
     StreamChunk,
     ToolCall,
+    ToolCallDelta,
     Usage,
 )
 from .prompt_caching import apply_anthropic_cache_control, is_anthropic_model
@@ -169,7 +171,9 @@ class LiteLLMClient(BaseLLMClient):
         }
 
         if tools:
-            params["tools"] = tools
+            # Some litellm providers (Gemini, vLLM, watsonx) rewrite tool
+            # schemas in place; the registry's compiled schemas are shared.
+            params["tools"] = copy.deepcopy(tools)
             params["tool_choice"] = kwargs.get("tool_choice", "auto")
 
         if "stop" in kwargs:
@@ -268,6 +272,10 @@ class LiteLLMClient(BaseLLMClient):
         """Make a streaming call via litellm.acompletion(stream=True)."""
         import litellm
 
+        media = kwargs.pop("media", None)
+        if media and messages:
+            messages = self._add_media_to_messages_openai(messages, media)
+
         model = kwargs.get("model") or self._litellm_model
         params: Dict[str, Any] = {
             "model": model,
@@ -279,7 +287,9 @@ class LiteLLMClient(BaseLLMClient):
         }
 
         if tools:
-            params["tools"] = tools
+            # Some litellm providers (Gemini, vLLM, watsonx) rewrite tool
+            # schemas in place; the registry's compiled schemas are shared.
+            params["tools"] = copy.deepcopy(tools)
             params["tool_choice"] = kwargs.get("tool_choice", "auto")
 
         if "stop" in kwargs:
@@ -313,17 +323,24 @@ class LiteLLMClient(BaseLLMClient):
                             f"[LiteLLM] Cache: {cache_read:,}/{prompt_tokens:,} "
                             f"tokens ({hit_pct:.0f}% hit, {cache_creation:,} written)"
                         )
-                    yield StreamChunk(
-                        content="",
-                        is_final=True,
-                        usage=Usage(
-                            prompt_tokens=prompt_tokens,
-                            completion_tokens=chunk.usage.completion_tokens,
-                            total_tokens=chunk.usage.total_tokens,
-                            cache_read_tokens=cache_read,
-                            cache_creation_tokens=cache_creation,
-                        ),
+                    usage = Usage(
+                        prompt_tokens=prompt_tokens,
+                        completion_tokens=chunk.usage.completion_tokens,
+                        total_tokens=chunk.usage.total_tokens,
+                        cache_read_tokens=cache_read,
+                        cache_creation_tokens=cache_creation,
                     )
+                    if self.config.track_costs:
+                        try:
+                            prompt_cost, completion_cost = litellm.cost_per_token(
+                                model=model,
+                                prompt_tokens=usage.prompt_tokens,
+                                completion_tokens=usage.completion_tokens,
+                            )
+                            usage.cost = prompt_cost + completion_cost
+                        except Exception as e:
+                            logger.debug(f"Cost calculation failed: {e}")
+                    yield StreamChunk(content="", is_final=True, usage=usage)
                 continue
 
             choice = chunk.choices[0]
@@ -333,18 +350,23 @@ class LiteLLMClient(BaseLLMClient):
 
             # Accumulate tool call deltas
             tool_calls = None
+            fragments: Optional[List[ToolCallDelta]] = None
             if delta.tool_calls:
+                fragments = []
                 for tc_delta in delta.tool_calls:
                     idx = tc_delta.index
                     if idx not in tool_call_deltas:
                         tool_call_deltas[idx] = {"id": "", "name": "", "arguments": ""}
+                    fragment = ToolCallDelta(index=idx)
                     if tc_delta.id:
-                        tool_call_deltas[idx]["id"] = tc_delta.id
+                        tool_call_deltas[idx]["id"] = fragment.id = tc_delta.id
                     if tc_delta.function:
                         if tc_delta.function.name:
-                            tool_call_deltas[idx]["name"] = tc_delta.function.name
+                            tool_call_deltas[idx]["name"] = fragment.name = tc_delta.function.name
                         if tc_delta.function.arguments:
                             tool_call_deltas[idx]["arguments"] += tc_delta.function.arguments
+                            fragment.arguments = tc_delta.function.arguments
+                    fragments.append(fragment)
 
             is_final = choice.finish_reason is not None
             stop_reason = None
@@ -363,6 +385,7 @@ class LiteLLMClient(BaseLLMClient):
             yield StreamChunk(
                 content=content,
                 tool_calls=tool_calls,
+                tool_call_deltas=fragments,
                 is_final=is_final,
                 stop_reason=stop_reason,
             )
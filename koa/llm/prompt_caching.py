@@ -11,40 +11,44 @@ prefix pay only 0.1x read cost (within the TTL window).
 Pure functions — no class state, no side effects.
 """
 
-import copy
 import logging
 from typing import Any, Dict, List
 
 logger = logging.getLogger(__name__)
 
 
-def _apply_cache_marker(msg: dict, marker: dict) -> None:
-    """Add cache_control to a single message, handling all format variations.
+def _apply_cache_marker(msg: dict, marker: dict) -> dict:
+    """Return a copy of a single message with cache_control added.
 
     - String content → wrapped in [{"type": "text", "text": ..., "cache_control": ...}]
-    - List content → marker added to the last content block
+    - List content → marker added to (a copy of) the last content block
     - Tool messages → marker at message level
     - Empty/None content → marker at message level
+
+    Copy-on-write: only the message dict, and for list content the list and
+    its last block, are copied.  Everything else is shared with ``msg``.
     """
+    msg = dict(msg)
     role = msg.get("role", "")
     content = msg.get("content")
 
     if role == "tool":
         msg["cache_control"] = marker
-        return
+        return msg
 
     if content is None or content == "":
         msg["cache_control"] = marker
-        return
+        return msg
 
     if isinstance(content, str):
         msg["content"] = [{"type": "text", "text": content, "cache_control": marker}]
-        return
+        return msg
 
     if isinstance(content, list) and content:
         last = content[-1]
         if isinstance(last, dict):
-            last["cache_control"] = marker
+            msg["content"] = content[:-1] + [{**last, "cache_control": marker}]
+    return msg
 
 
 def apply_anthropic_cache_control(
@@ -62,10 +66,11 @@ def apply_anthropic_cache_control(
         ttl: Cache time-to-live. "5m" (default, 1.25x write) or "1h".
 
     Returns:
-        Deep copy of messages with cache_control breakpoints injected.
-        Original list is never mutated.
+        New list with cache_control breakpoints injected.  The (at most 4)
+        marked messages are copies; all others are the caller's own message
+        objects, shared rather than copied.  Original list is never mutated.
     """
-    messages = copy.deepcopy(messages)
+    messages = list(messages)
     if not messages:
         return messages
 
@@ -77,14 +82,17 @@ def apply_anthropic_cache_control(
 
     # Breakpoint 1: system prompt
     if messages[0].get("role") == "system":
-        _apply_cache_marker(messages[0], marker)
+        messages[0] = _apply_cache_marker(messages[0], marker)
         breakpoints_used += 1
 
     # Breakpoints 2-4: last N non-system messages
     remaining = 4 - breakpoints_used
-    non_sys_indices = [i for i in range(len(messages)) if messages[i].get("role") != "system"]
-    for idx in non_sys_indices[-remaining:]:
-        _apply_cache_marker(messages[idx], marker)
+    for idx in range(len(messages) - 1, -1, -1):
+        if remaining == 0:
+            break
+        if messages[idx].get("role") != "system":
+            messages[idx] = _apply_cache_marker(messages[idx], marker)
+            remaining -= 1
 
     return messages
 
@@ -0,0 +1,342 @@
+"""Response cache for deterministic LLM helper calls.
+
+``ModelRouter`` scoring, the context summarizer and short field
+extractions send the same prompts over and over, often from many users.
+(Intent classification has its own ``PreflightCache`` and is not routed
+through here.)  :class:`ResponseCache` sits in front of
+``BaseLLMClient.chat_completion`` for call sites that opt in through
+:func:`cached_completion`:
+
+- **Exact tier** - keyed by a hash of the scope, the client's provider and
+  model, the call parameters and the *normalized* messages (NFKC, collapsed
+  whitespace, optionally case-folded user text).  Entries expire after
+  ``ttl_s`` and the least recently used are evicted past ``max_entries``.
+- **Semantic tier** (optional) - with an ``embedder`` (any object with
+  ``async embed(texts) -> list[list[float]]``, same contract as
+  :mod:`koa.orchestrator.intent_embedding`), a call made with
+  ``semantic=True`` whose prompt differs only in the final user message
+  reuses the response of the closest earlier message when the cosine
+  similarity reaches ``similarity_threshold``.
+
+Entries are tenant-isolated unless a call passes ``shared=True``, which
+call sites only do when the whole prompt is tenant-neutral: an exact match
+then means both tenants sent the very same prompt.  Semantic matches are
+never shared across tenants.
+
+Lookups are counted in ``koa_llm_cache_requests_total`` labelled with the
+scope and ``result`` (``hit``, ``semantic_hit`` or ``miss``).
+
+The process-wide cache is off until :func:`configure_response_cache` is
+called (``Koa`` does so from the ``llm_cache`` config section), so
+:func:`cached_completion` is a plain ``chat_completion`` call by default.
+"""
+
+from __future__ import annotations
+
+import copy
+import dataclasses
+import hashlib
+import json
+import logging
+import math
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+
+from ..observability.metrics import counter
+from .base import LLMResponse
+
+try:
+    import numpy as np
+
+    _HAS_NUMPY = True
+except ImportError:  # pragma: no cover - numpy is an optional extra
+    np = None
+    _HAS_NUMPY = False
+
+logger = logging.getLogger(__name__)
+
+
+class Embedder(Protocol):
+    async def embed(self, texts: Sequence[str]) -> List[List[float]]: ...
+
+
+def _normalize_text(text: str, fold_case: bool) -> str:
+    text = " ".join(unicodedata.normalize("NFKC", text).split())
+    return text.casefold() if fold_case else text
+
+
+def normalize_messages(
+    messages: List[Dict[str, Any]], fold_case: bool = False
+) -> List[Dict[str, Any]]:
+    """Canonical form of ``messages`` used for cache keys.
+
+    Only the fields that reach the model are kept; prompt-cache markers
+    are dropped.  ``fold_case`` case-folds user text, for classifiers
+    whose answer does not depend on capitalization.
+    """
+    normalized: List[Dict[str, Any]] = []
+    for message in messages:
+        role = message.get("role")
+        fold = fold_case and role == "user"
+        content = message.get("content")
+        if isinstance(content, str):
+            content = _normalize_text(content, fold)
+        elif isinstance(content, list):
+            content = [
+                (
+                    {
+                        k: _normalize_text(v, fold) if k == "text" and isinstance(v, str) else v
+                        for k, v in part.items()
+                        if k != "cache_control"
+                    }
+                    if isinstance(part, dict)
+                    else part
+                )
+                for part in content
+            ]
+        entry = {"role": role, "content": content}
+        for field in ("name", "tool_calls", "tool_call_id"):
+            if message.get(field) is not None:
+                entry[field] = message[field]
+        normalized.append(entry)
+    return normalized
+
+
+def _client_identity(llm_client: Any) -> str:
+    config = getattr(llm_client, "config", None)
+    return ":".join(
+        str(part or "")
+        for part in (
+            type(llm_client).__name__,
+            getattr(llm_client, "provider", None),
+            getattr(config, "model", None),
+            getattr(config, "base_url", None),
+        )
+    )
+
+
+def _digest(payload: Dict[str, Any]) -> str:
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def _unit(vector: Sequence[float]) -> Optional[List[float]]:
+    norm = math.sqrt(sum(x * x for x in vector))
+    if norm <= 0:
+        return None
+    return [x / norm for x in vector]
+
+
+class ResponseCache:
+    """TTL + LRU cache of :class:`LLMResponse` objects.
+
+    Args:
+        max_entries: Bound on cached responses (least recently used first out).
+        ttl_s: Seconds a response stays valid.
+        embedder: Optional embedding backend enabling the semantic tier.
+        similarity_threshold: Minimum cosine similarity for a semantic hit.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_s: float = 600.0,
+        *,
+        embedder: Optional[Embedder] = None,
+        similarity_threshold: float = 0.95,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        # key -> (expires_at, response, semantic bucket or None)
+        self._entries: "OrderedDict[str, Tuple[float, LLMResponse, Optional[str]]]" = OrderedDict()
+        # bucket -> key -> unit vector of the final user message
+        self._vectors: Dict[str, Dict[str, List[float]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._vectors.clear()
+
+    async def chat_completion(
+        self,
+        llm_client: Any,
+        messages: List[Dict[str, Any]],
+        *,
+        scope: str,
+        tenant_id: Optional[str] = None,
+        shared: bool = False,
+        fold_case: bool = False,
+        semantic: bool = False,
+        **kwargs: Any,
+    ) -> LLMResponse:
+        """``llm_client.chat_completion(messages=messages, **kwargs)``, cached.
+
+        Args:
+            scope: Call-site label; part of the key and the metric labels.
+            tenant_id: Tenant the prompt belongs to.
+            shared: Let tenants share exact hits (tenant-neutral prompts only).
+            fold_case: Case-fold user text when building the key.
+            semantic: Allow a semantic-tier hit on the final user message.
+
+        Only responses with text content and no tool calls are cached.
+        """
+        normalized = normalize_messages(messages, fold_case)
+        base = {
+            "scope": scope,
+            "client": _client_identity(llm_client),
+            "tenant": None if shared else (tenant_id or ""),
+            "params": kwargs,
+        }
+        key = _digest({**base, "messages": normalized})
+
+        cached = self._get(key)
+        if cached is not None:
+            counter("koa_llm_cache_requests_total", {"scope": scope, "result": "hit"})
+            return cached
+
+        bucket: Optional[str] = None
+        vector: Optional[List[float]] = None
+        if (
+            semantic
+            and not shared
+            and self.embedder is not None
+            and normalized
+            and normalized[-1]["role"] == "user"
+            and isinstance(normalized[-1]["content"], str)
+        ):
+            bucket = _digest({**base, "messages": normalized[:-1]})
+            vector = await self._embed(normalized[-1]["content"])
+            if vector is not None:
+                cached = self._nearest(bucket, vector)
+                if cached is not None:
+                    counter(
+                        "koa_llm_cache_requests_total", {"scope": scope, "result": "semantic_hit"}
+                    )
+                    return cached
+
+        counter("koa_llm_cache_requests_total", {"scope": scope, "result": "miss"})
+        response = await llm_client.chat_completion(messages=messages, **kwargs)
+        if getattr(response, "content", None) and not getattr(response, "tool_calls", None):
+            self._put(key, response, bucket if vector is not None else None, vector)
+        return response
+
+    # ------------------------------------------------------------------
+    # internals
+    # ------------------------------------------------------------------
+
+    def _get(self, key: str) -> Optional[LLMResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response, _ = entry
+        if expires_at <= time.monotonic():
+            self._evict(key)
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(response)
+
+    def _put(
+        self,
+        key: str,
+        response: LLMResponse,
+        bucket: Optional[str],
+        vector: Optional[List[float]],
+    ) -> None:
+        if dataclasses.is_dataclass(response):
+            response = dataclasses.replace(response, raw_response=None)
+        self._evict(key)
+        self._entries[key] = (time.monotonic() + self.ttl_s, copy.deepcopy(response), bucket)
+        if bucket is not None and vector is not None:
+            self._vectors.setdefault(bucket, {})[key] = vector
+        while len(self._entries) > self.max_entries:
+            self._evict(next(iter(self._entries)))
+
+    def _evict(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None or entry[2] is None:
+            return
+        vectors = self._vectors.get(entry[2])
+        if vectors is not None:
+            vectors.pop(key, None)
+            if not vectors:
+                del self._vectors[entry[2]]
+
+    async def _embed(self, text: str) -> Optional[List[float]]:
+        try:
+            vectors = await self.embedder.embed([text])
+        except Exception as exc:
+            logger.debug("[ResponseCache] embed failed: %s", exc)
+            return None
+        return _unit(vectors[0]) if vectors else None
+
+    def _nearest(self, bucket: str, vector: List[float]) -> Optional[LLMResponse]:
+        candidates = self._vectors.get(bucket)
+        if not candidates:
+            return None
+        keys = [k for k, v in candidates.items() if len(v) == len(vector)]
+        if not keys:
+            return None
+        if _HAS_NUMPY:
+            sims = np.asarray([candidates[k] for k in keys], dtype=np.float32) @ np.asarray(
+                vector, dtype=np.float32
+            )
+            best = int(np.argmax(sims))
+            score = float(sims[best])
+        else:
+            scores = [sum(a * b for a, b in zip(candidates[k], vector)) for k in keys]
+            best = max(range(len(keys)), key=scores.__getitem__)
+            score = scores[best]
+        if score < self.similarity_threshold:
+            return None
+        return self._get(keys[best])
+
+
+_default_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide cache, or ``None`` when caching is off."""
+    return _default_cache
+
+
+def configure_response_cache(cache: Optional[ResponseCache]) -> None:
+    """Install the process-wide cache (``None`` turns caching off)."""
+    global _default_cache
+    _default_cache = cache
+
+
+async def cached_completion(
+    llm_client: Any,
+    messages: List[Dict[str, Any]],
+    *,
+    scope: str,
+    tenant_id: Optional[str] = None,
+    shared: bool = False,
+    fold_case: bool = False,
+    semantic: bool = False,
+    **kwargs: Any,
+) -> LLMResponse:
+    """``chat_completion`` through the process-wide cache when one is configured.
+
+    See :meth:`ResponseCache.chat_completion` for the options.
+    """
+    cache = _default_cache
+    if cache is None:
+        return await llm_client.chat_completion(messages=messages, **kwargs)
+    return await cache.chat_completion(
+        llm_client,
+        messages,
+        scope=scope,
+        tenant_id=tenant_id,
+        shared=shared,
+        fold_case=fold_case,
+        semantic=semantic,
+        **kwargs,
+    )
@@ -32,6 +32,8 @@ import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
+from .response_cache import cached_completion
+
 logger = logging.getLogger(__name__)
 
 
@@ -165,6 +167,7 @@ class ModelRouter:
     async def route(
         self,
         messages: List[Dict[str, Any]],
+        tenant_id: Optional[str] = None,
     ) -> RoutingDecision:
         """Classify the request complexity and pick a provider.
 
@@ -172,6 +175,9 @@ class ModelRouter:
             messages: The full message list that will be sent to the main LLM.
                 Only the last ``HISTORY_TURNS`` user/assistant messages are
                 forwarded to the classifier.
+            tenant_id: Owner of ``messages``; scopes cached scores (see
+                :mod:`koa.llm.response_cache`).  A lone first message is
+                scored the same for every tenant, so that score is shared.
 
         Returns:
             A ``RoutingDecision`` with the chosen provider, score, and reasoning.
@@ -196,8 +202,14 @@ class ModelRouter:
                     f"Classifier provider '{self.classifier_provider}' not found in LLMRegistry"
                 )
 
-            resp = await classifier_client.chat_completion(
-                messages=classifier_messages,
+            resp = await cached_completion(
+                classifier_client,
+                classifier_messages,
+                scope="model_router",
+                tenant_id=tenant_id,
+                shared=len(recent) == 1,
+                fold_case=True,
+                semantic=True,
                 config={"temperature": 0, "max_tokens": 150},
             )
 
@@ -205,31 +217,12 @@ class ModelRouter:
             score = parsed["score"]
             reasoning = parsed.get("reasoning", "")
 
-            # Match against rules (first match wins)
-            provider = self.default_provider
-            for rule in self.rules:
-                if rule.matches(score):
-                    provider = rule.provider
-                    break
-
-            # Verify the provider actually exists; fall back if not
-            if self.registry.get(provider) is None:
-                logger.warning(
-                    f"[ModelRouter] Provider '{provider}' not in registry, "
-                    f"falling back to '{self.default_provider}'"
-                )
-                provider = self.default_provider
-
             elapsed = (time.monotonic() - start) * 1000
+            decision = self.route_score(score, reasoning=reasoning, latency_ms=elapsed)
             logger.info(
-                f"[ModelRouter] score={score} -> {provider} ({elapsed:.0f}ms) | {reasoning}"
-            )
-            return RoutingDecision(
-                provider=provider,
-                score=score,
-                reasoning=reasoning,
-                latency_ms=elapsed,
+                f"[ModelRouter] score={score} -> {decision.provider} ({elapsed:.0f}ms) | {reasoning}"
             )
+            return decision
 
         except Exception as e:
             elapsed = (time.monotonic() - start) * 1000
@@ -244,6 +237,40 @@ class ModelRouter:
                 latency_ms=elapsed,
             )
 
+    def route_score(
+        self,
+        score: int,
+        reasoning: str = "",
+        latency_ms: float = 0.0,
+    ) -> RoutingDecision:
+        """Pick a provider for an already-known complexity score.
+
+        Used directly when the score comes from the fused pre-flight
+        classifier (``IntentAnalyzer(score_complexity=True)``), which
+        saves :meth:`route`'s own classifier call.
+        """
+        # Match against rules (first match wins)
+        provider = self.default_provider
+        for rule in self.rules:
+            if rule.matches(score):
+                provider = rule.provider
+                break
+
+        # Verify the provider actually exists; fall back if not
+        if self.registry.get(provider) is None:
+            logger.warning(
+                f"[ModelRouter] Provider '{provider}' not in registry, "
+                f"falling back to '{self.default_provider}'"
+            )
+            provider = self.default_provider
+
+        return RoutingDecision(
+            provider=provider,
+            score=score,
+            reasoning=reasoning,
+            latency_ms=latency_ms,
+        )
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
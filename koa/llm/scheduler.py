@@ -0,0 +1,361 @@
+"""Latency-aware scheduling of LLM provider calls.
+
+:class:`~koa.llm.circuit_breaker.CircuitBreaker` reacts to hard failures
+only; a provider that is slow but still answering keeps receiving traffic
+and sets the tail latency.  :class:`ProviderScheduler` adds two soft
+controls, both keyed by ``provider:model`` like the breakers:
+
+- **Hedging** - a rolling window of recent call latencies per provider.
+  :meth:`ProviderScheduler.hedge` starts the primary call and, once it has
+  been outstanding longer than a chosen percentile of that window, starts
+  the same request on a second provider; the first success wins and the
+  other call is cancelled.
+- **Adaptive concurrency** (opt-in, with ``initial_limit``) - an
+  :class:`AIMDLimiter` per provider caps in-flight calls.  Each success
+  raises the limit by ``1 / limit`` (about one per round of calls); a
+  rate-limit response halves it, at most once per
+  ``decrease_interval_s``.  Calls over the limit wait locally instead of
+  piling onto a provider that is already pushing back.  A streamed call
+  holds its slot until the stream is exhausted or closed.
+
+Usage::
+
+    scheduler = get_provider_scheduler()
+    async with scheduler.slot(client):
+        response = await client.chat_completion(...)
+
+    lease = await scheduler.acquire(client, stream=True)  # released by the stream
+
+    result, hedged, hedge_won = await scheduler.hedge(
+        call_primary, call_fallback, delay=scheduler.hedge_delay(client, 95.0)
+    )
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from ..observability.metrics import counter, observe
+
+logger = logging.getLogger(__name__)
+
+
+def provider_key(client: Any) -> str:
+    """``provider:model`` key shared by circuit breakers and the scheduler."""
+    provider = getattr(client, "provider", "") or id(client)
+    model = getattr(getattr(client, "config", None), "model", "")
+    return f"{provider}:{model}"
+
+
+class LatencyWindow:
+    """The last ``size`` latencies (seconds) of successful calls."""
+
+    def __init__(self, size: int = 200) -> None:
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank ``q``-th percentile (0-100), or ``None`` when empty."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+        return ordered[min(rank, len(ordered)) - 1]
+
+
+class AIMDLimiter:
+    """Additive-increase / multiplicative-decrease concurrency limit.
+
+    Args:
+        name: Label for logs and metrics.
+        initial_limit: Starting number of concurrent calls.
+        min_limit: Floor for the limit.
+        max_limit: Ceiling for the limit.
+        backoff: Factor applied to the limit on overload.
+        decrease_interval_s: Minimum time between two decreases, so a burst
+            of rate-limit errors from one round of calls counts once.
+    """
+
+    def __init__(
+        self,
+        name: str = "",
+        initial_limit: int = 16,
+        min_limit: int = 1,
+        max_limit: int = 128,
+        backoff: float = 0.5,
+        decrease_interval_s: float = 1.0,
+    ) -> None:
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.backoff = backoff
+        self.decrease_interval_s = decrease_interval_s
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = -math.inf
+
+    @property
+    def available(self) -> int:
+        """Slots free right now (0 when calls are queued)."""
+        if self._waiters:
+            return 0
+        return max(0, int(self.limit) - self.in_flight)
+
+    async def acquire(self) -> None:
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return
+        started = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # the slot was granted as we were cancelled
+            else:
+                self._waiters.remove(waiter)
+            raise
+        observe("koa_llm_queue_wait_seconds", {"provider": self.name}, time.monotonic() - started)
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def on_success(self) -> None:
+        self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+        self._wake()
+
+    def on_overload(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_interval_s:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self.limit = max(float(self.min_limit), self.limit * self.backoff)
+        counter("koa_llm_concurrency_decrease_total", {"provider": self.name})
+        logger.warning(
+            f"[Scheduler] {self.name}: concurrency limit {previous:.1f} -> {self.limit:.1f}"
+        )
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class SlotLease:
+    """One call's hold on a provider, from :meth:`ProviderScheduler.acquire`.
+
+    :meth:`succeeded` records the call's latency (for a stream, the time to
+    its first chunk) and raises the concurrency limit; :meth:`release`
+    frees the slot and may be called more than once.
+    """
+
+    def __init__(self, latencies: LatencyWindow, limiter: Optional[AIMDLimiter]) -> None:
+        self._latencies = latencies
+        self._limiter = limiter
+        self._started = time.monotonic()
+        self._released = False
+
+    def succeeded(self) -> None:
+        self._latencies.record(time.monotonic() - self._started)
+        if self._limiter is not None:
+            self._limiter.on_success()
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        if self._limiter is not None:
+            self._limiter.release()
+
+
+class ProviderScheduler:
+    """Per-provider latency windows and concurrency limiters.
+
+    Args:
+        window: Latencies kept per provider.
+        min_samples: Samples needed before :meth:`hedge_delay` returns a delay.
+        initial_limit: Starting concurrency limit per provider.  ``None``
+            (the default) leaves concurrency unlimited; calls are only timed.
+        min_limit: Concurrency floor per provider.
+        max_limit: Concurrency ceiling per provider.
+    """
+
+    def __init__(
+        self,
+        window: int = 200,
+        min_samples: int = 20,
+        initial_limit: Optional[int] = None,
+        min_limit: int = 1,
+        max_limit: int = 128,
+    ) -> None:
+        self.window = window
+        self.min_samples = min_samples
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self._latencies: Dict[Tuple[str, bool], LatencyWindow] = {}
+        self._limiters: Dict[str, AIMDLimiter] = {}
+
+    def latencies(self, client: Any, stream: bool = False) -> LatencyWindow:
+        """Latency window of ``client``; streams are timed to the first chunk."""
+        key = (provider_key(client), stream)
+        if key not in self._latencies:
+            self._latencies[key] = LatencyWindow(self.window)
+        return self._latencies[key]
+
+    @property
+    def adaptive(self) -> bool:
+        """Whether per-provider concurrency limits are enforced."""
+        return self.initial_limit is not None
+
+    def limiter(self, client: Any) -> AIMDLimiter:
+        key = provider_key(client)
+        if key not in self._limiters:
+            self._limiters[key] = AIMDLimiter(
+                name=key,
+                initial_limit=self.initial_limit or self.max_limit,
+                min_limit=self.min_limit,
+                max_limit=self.max_limit,
+            )
+        return self._limiters[key]
+
+    def hedge_delay(self, client: Any, percentile: float, stream: bool = False) -> Optional[float]:
+        """Seconds after which a call to ``client`` counts as slow, if known."""
+        window = self.latencies(client, stream)
+        if len(window) < self.min_samples:
+            return None
+        return window.percentile(percentile)
+
+    def has_capacity(self, client: Any) -> bool:
+        """Whether a call to ``client`` would start without queueing."""
+        return not self.adaptive or self.limiter(client).available > 0
+
+    async def acquire(self, client: Any, stream: bool = False) -> SlotLease:
+        """Take a concurrency slot for one call; the caller must release it."""
+        limiter = self.limiter(client) if self.adaptive else None
+        if limiter is not None:
+            await limiter.acquire()
+        return SlotLease(self.latencies(client, stream), limiter)
+
+    @asynccontextmanager
+    async def slot(self, client: Any, stream: bool = False) -> AsyncIterator[SlotLease]:
+        """Hold a concurrency slot for one call and time it.
+
+        Latency is recorded and the limit raised only when the block exits
+        normally; call :meth:`overloaded` for rate-limit errors.
+        """
+        lease = await self.acquire(client, stream)
+        try:
+            yield lease
+            lease.succeeded()
+        finally:
+            lease.release()
+
+    def overloaded(self, client: Any) -> None:
+        """Record that ``client``'s provider is rate-limiting us."""
+        if self.adaptive:
+            self.limiter(client).on_overload()
+
+    async def hedge(
+        self,
+        primary: Callable[[], Awaitable[Any]],
+        fallback: Optional[Callable[[], Awaitable[Any]]],
+        delay: Optional[float],
+        *,
+        name: str = "",
+    ) -> Tuple[Any, bool, bool]:
+        """Race ``primary`` against ``fallback`` started after ``delay`` seconds.
+
+        A call *fails* when it raises or returns an exception (the
+        ``_llm_call_single_client`` convention).  The first call to succeed
+        wins and the other is cancelled.  When both fail, the primary's
+        outcome is returned or raised.  The fallback is not started when
+        ``delay`` is ``None`` or the primary finishes within it.
+
+        Returns:
+            ``(result, hedged, hedge_won)``; ``hedged`` is whether the
+            fallback call was started.
+        """
+        if fallback is None or delay is None:
+            return await primary(), False, False
+
+        primary_task = asyncio.ensure_future(primary())
+        tasks = {primary_task}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done and _succeeded(primary_task):
+                return primary_task.result(), False, False
+            hedged = not done
+            if hedged:
+                hedge_task = asyncio.ensure_future(fallback())
+                tasks.add(hedge_task)
+                counter("koa_llm_hedged_requests_total", {"provider": name})
+            while True:
+                pending = {t for t in tasks if not t.done()}
+                winner = next((t for t in tasks if t.done() and _succeeded(t)), None)
+                if winner is not None:
+                    for task in tasks - {winner}:
+                        _discard(task)
+                    hedge_won = winner is not primary_task
+                    if hedge_won:
+                        counter("koa_llm_hedge_wins_total", {"provider": name})
+                    return winner.result(), hedged, hedge_won
+                if not pending:
+                    return primary_task.result(), hedged, False
+                await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+
+def _succeeded(task: asyncio.Task) -> bool:
+    return (
+        not task.cancelled()
+        and task.exception() is None
+        and not isinstance(task.result(), Exception)
+    )
+
+
+def _discard(task: asyncio.Task) -> None:
+    """Cancel a losing call, closing a stream it already opened."""
+    if not task.done():
+        task.cancel()
+        return
+    if _succeeded(task):
+        aclose = getattr(task.result(), "aclose", None)
+        if aclose is not None:
+            asyncio.ensure_future(aclose())
+    elif not task.cancelled():
+        task.exception()  # mark retrieved
+
+
+_default_scheduler = ProviderScheduler()
+
+
+def get_provider_scheduler() -> ProviderScheduler:
+    """Return the process-wide provider scheduler."""
+    return _default_scheduler
+
+
+def configure_provider_scheduler(scheduler: Optional[ProviderScheduler] = None) -> None:
+    """Install the process-wide scheduler (``None`` restores the default)."""
+    global _default_scheduler
+    _default_scheduler = scheduler or ProviderScheduler()
@@ -19,7 +19,8 @@ rest of the stack is using:
   * ``KOI_EMBEDDING_API_VERSION`` — optional (needed for Azure)
 
 ``build_embedder()`` returns ``None`` if no API key is configured so
-callers can gracefully fall back to keyword search.
+callers can gracefully fall back to keyword search.  Concurrent calls for
+the same text share one request (see :mod:`koa.single_flight`).
 """
 
 from __future__ import annotations
@@ -28,6 +29,8 @@ import logging
 import os
 from typing import Awaitable, Callable, List, Optional
 
+from ..single_flight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 Embedder = Callable[[str], Awaitable[Optional[List[float]]]]
@@ -59,9 +62,14 @@ def build_embedder() -> Optional[Embedder]:
     if "/" not in model:
         model = f"{provider}/{model}"
 
+    flight = SingleFlight("embedding", share=lambda vec: list(vec) if vec else vec)
+
     async def _embed(text: str) -> Optional[List[float]]:
         if not text or not text.strip():
             return None
+        return await flight.do(text[:8000], lambda: _request(text))
+
+    async def _request(text: str) -> Optional[List[float]]:
         try:
             # Import lazily to avoid hard dep + reduce startup cost.
             from litellm import aembedding  # type: ignore
@@ -9,6 +9,8 @@ Modules:
                           episode (written to Momex via EpisodeMemory).
   episode_memory        — thin adapter over MomexMemory for episodic writes
                           and reads (kind=episode metadata convention).
+  health_rollup         — per-day health metrics kept current at ingest, so
+                          day and range reads skip the raw samples.
   weekly_reflector      — the LLM-driven reflection step itself, also
                           persisting its output as an episode.
 """
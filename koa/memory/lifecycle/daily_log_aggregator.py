@@ -1,7 +1,8 @@
 """DailyLogAggregator — builds a daily_log *episode* per user per local day.
 
 This is a *pure-SQL* rollup (no LLM). It reads the day's messages, tool
-calls, calendar events, user_state, health samples and motion segments,
+calls, calendar events, user_state, the health rollup (see
+:mod:`health_rollup`) and motion segments,
 produces a compact JSON-shaped summary, and writes that summary to Momex
 as an episode with ``subkind="daily_log"`` via :class:`EpisodeMemory`.
 
@@ -18,6 +19,8 @@ import logging
 from datetime import date, datetime, timedelta, timezone
 from typing import Any, Dict, List
 
+from . import health_rollup
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,7 +41,7 @@ async def aggregate_day(
     tools = await _tool_summary(db, user_id, start_utc, end_utc)
     calendar = await _calendar_summary(db, user_id, start_utc, end_utc)
     reminders = await _reminder_summary(db, user_id, start_utc, end_utc)
-    health = await _health_summary(db, user_id, start_utc, end_utc)
+    health = await _health_summary(db, user_id, start_utc, end_utc, local_date, tz_name)
     motion = await _motion_summary(db, user_id, start_utc, end_utc)
     state = await _state_summary(db, user_id, local_date)
 
@@ -177,7 +180,18 @@ async def _reminder_summary(db, user_id: str, start: datetime, end: datetime) ->
         return {}
 
 
-async def _health_summary(db, user_id: str, start: datetime, end: datetime) -> Dict[str, Any]:
+async def _health_summary(
+    db, user_id: str, start: datetime, end: datetime, local_date: date, tz_name: str
+) -> Dict[str, Any]:
+    """Per-metric stats for the day, from the daily rollup when it was cut in
+    ``tz_name``; otherwise (e.g. days uploaded without a timezone) from the
+    raw samples."""
+    try:
+        days = await health_rollup.fetch_days(db, user_id, local_date, local_date, tz_name)
+        if local_date in days:
+            return health_rollup.metric_stats(days[local_date])
+    except Exception as e:
+        logger.debug("health rollup read failed: %s", e)
     try:
         rows = await db.fetch(
             """SELECT type,
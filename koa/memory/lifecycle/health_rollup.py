@@ -0,0 +1,132 @@
+"""Per-day health rollup — one row per (user, local day, metric).
+
+``health_samples`` holds every raw HealthKit sample (heart rate alone is
+thousands a day).  Readers that only need daily totals — the summary
+endpoint, the daily log aggregator, the weekly reflector — read
+``health_daily_rollup`` instead, so an N-day view costs O(days) rather than
+O(samples).
+
+The rollup is maintained at ingest time: after each batch is merged into
+``health_samples``, every (user, local day) the batch touched is recomputed
+from the raw rows in the same transaction.  Recomputing instead of adding
+deltas keeps re-sent and late-arriving samples from being double counted.
+
+Local days are cut in the timezone the client reported with the upload
+(``UTC`` when absent); each row records that timezone in ``tz`` so readers
+working in a different zone can tell and fall back to the raw samples.
+
+Columns per metric (``metric`` = sample ``type``):
+
+  sample_count   all samples
+  value_count    samples with a value
+  value_sum / value_min / value_max
+  minutes        per sample, whole minutes between started_at and ended_at,
+                 or the truncated value when there is no end
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timezone, tzinfo
+from typing import Any, Dict, Iterable, Optional, Set
+
+ROLLUP_TABLE = "tenant_default.health_daily_rollup"
+
+# Serializes refreshes per user for the rest of the transaction: without it
+# two uploads for the same user could both delete, then both insert.
+_REFRESH_LOCK = "SELECT pg_advisory_xact_lock(hashtext('health_daily_rollup'), hashtext($1))"
+
+_REFRESH_DELETE = f"""DELETE FROM {ROLLUP_TABLE}
+    WHERE user_id = $1 AND local_date = ANY($2::date[])"""
+
+_REFRESH_INSERT = f"""INSERT INTO {ROLLUP_TABLE}
+        (user_id, local_date, metric, tz, sample_count, value_count,
+         value_sum, value_min, value_max, minutes, updated_at)
+    SELECT $1, d.local_date, s.type, $3, COUNT(*), COUNT(s.value),
+           SUM(s.value), MIN(s.value), MAX(s.value),
+           COALESCE(SUM(CASE WHEN s.ended_at IS NOT NULL
+                             THEN FLOOR(EXTRACT(EPOCH FROM (s.ended_at - s.started_at)) / 60)
+                             ELSE TRUNC(s.value) END), 0),
+           NOW()
+    FROM unnest($2::date[]) AS d(local_date)
+    JOIN tenant_default.health_samples s
+      ON s.user_id = $1
+     AND s.started_at >= (d.local_date::timestamp AT TIME ZONE $3)
+     AND s.started_at < ((d.local_date + 1)::timestamp AT TIME ZONE $3)
+    GROUP BY d.local_date, s.type"""
+
+
+def resolve_tz(tz_name: Optional[str]) -> tzinfo:
+    """``ZoneInfo(tz_name)``, UTC for empty/``UTC``; raises ``ValueError`` if unknown."""
+    if not tz_name or tz_name == "UTC":
+        return timezone.utc
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+    try:
+        return ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"unknown timezone '{tz_name}'") from e
+
+
+def local_dates(timestamps: Iterable[datetime], tz_name: str) -> Set[date]:
+    """Local days (in ``tz_name``) that the given sample start times fall on."""
+    tz = resolve_tz(tz_name)
+    return {ts.astimezone(tz).date() for ts in timestamps if ts is not None}
+
+
+async def refresh_days(conn, user_id: str, days: Iterable[date], tz_name: str = "UTC") -> None:
+    """Recompute the rollup for ``user_id`` on ``days`` from ``health_samples``.
+
+    Run on the connection (and inside the transaction) that wrote the
+    samples so the rollup never lags what was committed.  A per-user
+    advisory lock, held until that transaction ends, makes a concurrent
+    refresh for the same user wait and then recompute from committed rows.
+    """
+    days = sorted(set(days))
+    if not days:
+        return
+    await conn.execute(_REFRESH_LOCK, user_id)
+    await conn.execute(_REFRESH_DELETE, user_id, days)
+    await conn.execute(_REFRESH_INSERT, user_id, days, tz_name or "UTC")
+
+
+async def fetch_days(
+    db, user_id: str, start: date, end: date, tz_name: Optional[str] = None
+) -> Dict[date, Dict[str, Dict[str, Any]]]:
+    """Rollup rows for ``start``..``end`` (inclusive) as ``{day: {metric: row}}``.
+
+    With ``tz_name``, days rolled up in another timezone are left out.
+    """
+    rows = await db.fetch(
+        f"""SELECT local_date, metric, tz, sample_count, value_count,
+                   value_sum, value_min, value_max, minutes
+            FROM {ROLLUP_TABLE}
+            WHERE user_id = $1 AND local_date >= $2 AND local_date <= $3
+            ORDER BY local_date""",
+        user_id,
+        start,
+        end,
+    )
+    out: Dict[date, Dict[str, Dict[str, Any]]] = {}
+    for r in rows:
+        if tz_name is not None and r["tz"] != tz_name:
+            continue
+        out.setdefault(r["local_date"], {})[r["metric"]] = dict(r)
+    return out
+
+
+def metric_avg(row: Optional[Dict[str, Any]]) -> Optional[float]:
+    if not row or not row.get("value_count"):
+        return None
+    return round(float(row["value_sum"]) / row["value_count"], 2)
+
+
+def metric_stats(metrics: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """``{metric: {count, total, avg}}`` — the daily_log health payload shape."""
+    return {
+        metric: {
+            "count": row["sample_count"],
+            "total": float(row["value_sum"] or 0.0),
+            "avg": metric_avg(row),
+        }
+        for metric, row in metrics.items()
+    }
@@ -100,6 +100,7 @@ async def run_weekly_reflection(
     week_end: date,
     llm_call: LLMCall,
     episode_memory,
+    health_days: Optional[Dict[str, Dict[str, Any]]] = None,
 ) -> Optional[WeeklyReflection]:
     """Run the full pipeline for a single user.
 
@@ -108,6 +109,10 @@ async def run_weekly_reflection(
 
     ``week_end`` is inclusive; the reflector reads days
     [week_end - 6, week_end].
+
+    ``health_days`` maps ISO dates to per-metric health stats from the
+    daily rollup; when given it replaces the health block each daily_log
+    episode captured at aggregation time (which misses late uploads).
     """
     week_start = week_end - timedelta(days=6)
 
@@ -116,7 +121,9 @@ async def run_weekly_reflection(
         logger.info("weekly_reflector: no daily_log episodes for %s..%s", week_start, week_end)
         return None
 
-    user_prompt = _build_user_prompt(user_id, week_start, week_end, daily_episodes)
+    user_prompt = _build_user_prompt(
+        user_id, week_start, week_end, daily_episodes, health_days=health_days
+    )
 
     try:
         raw = await llm_call(SYSTEM_PROMPT, user_prompt)
@@ -191,7 +198,13 @@ async def _fetch_daily_log_episodes(
     return out
 
 
-def _build_user_prompt(user_id: str, start: date, end: date, rows: List[Dict[str, Any]]) -> str:
+def _build_user_prompt(
+    user_id: str,
+    start: date,
+    end: date,
+    rows: List[Dict[str, Any]],
+    health_days: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> str:
     compact = []
     for r in rows:
         p = r.get("payload") or {}
@@ -205,7 +218,7 @@ def _build_user_prompt(user_id: str, start: date, end: date, rows: List[Dict[str
                     e.get("title") for e in (p.get("calendar", {}) or {}).get("events", [])
                 ][:10],
                 "reminders_done": (p.get("reminders", {}) or {}).get("completed", [])[:10],
-                "health": p.get("health", {}),
+                "health": (health_days or {}).get(r.get("local_date"), p.get("health", {})),
                 "motion": p.get("motion", {}),
                 "state": {
                     k: v
@@ -6,7 +6,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Dict
 from urllib.parse import urlencode
 
-import httpx
+from ..http_pool import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +47,7 @@ class DropboxOAuth:
         """Exchange authorization code for tokens."""
         app_key, app_secret = DropboxOAuth.get_credentials()
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             response = await client.post(
                 DropboxOAuth.TOKEN_URL,
                 data={
@@ -74,7 +74,7 @@ class DropboxOAuth:
     @staticmethod
     async def fetch_user_email(access_token: str) -> str:
         """Fetch user email from Dropbox get_current_account endpoint."""
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             response = await client.post(
                 "https://api.dropboxapi.com/2/users/get_current_account",
                 headers={"Authorization": f"Bearer {access_token}"},
@@ -6,7 +6,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Dict
 from urllib.parse import urlencode
 
-import httpx
+from ..http_pool import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +62,7 @@ class GoogleOAuth:
         """Exchange authorization code for tokens."""
         client_id, client_secret = GoogleOAuth.get_credentials()
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             response = await client.post(
                 GoogleOAuth.TOKEN_URL,
                 data={
@@ -90,7 +90,7 @@ class GoogleOAuth:
     @staticmethod
     async def fetch_user_email(access_token: str) -> str:
         """Fetch user email from Google userinfo endpoint."""
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             response = await client.get(
                 GoogleOAuth.USERINFO_URL,
                 headers={"Authorization": f"Bearer {access_token}"},
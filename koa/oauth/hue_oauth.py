@@ -7,7 +7,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Dict
 from urllib.parse import urlencode
 
-import httpx
+from ..http_pool import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -51,7 +51,7 @@ class HueOAuth:
         client_id, client_secret, _ = HueOAuth.get_credentials()
         basic_auth = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             response = await client.post(
                 HueOAuth.TOKEN_URL,
                 data={
@@ -6,7 +6,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Dict
 from urllib.parse import urlencode
 
-import httpx
+from ..http_pool import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +62,7 @@ class MicrosoftOAuth:
         client_id, client_secret, tenant_id = MicrosoftOAuth.get_credentials()
         token_url = MicrosoftOAuth.TOKEN_URL.format(tenant=tenant_id)
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             response = await client.post(
                 token_url,
                 data={
@@ -91,7 +91,7 @@ class MicrosoftOAuth:
     @staticmethod
     async def fetch_user_email(access_token: str) -> str:
         """Fetch user email from Microsoft Graph /me endpoint."""
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             response = await client.get(
                 MicrosoftOAuth.GRAPH_ME_URL,
                 headers={"Authorization": f"Bearer {access_token}"},
@@ -3,7 +3,7 @@
 import base64
 import os
 
-import httpx
+from ..http_pool import http_client
 
 
 class NotionOAuth:
@@ -32,7 +32,7 @@ class NotionOAuth:
         client_secret = os.getenv("NOTION_CLIENT_SECRET", "")
         basic = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
 
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_client(timeout=30) as client:
             resp = await client.post(
                 NotionOAuth.TOKEN_URL,
                 headers={
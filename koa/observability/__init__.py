@@ -12,6 +12,8 @@ Provides production-grade observability scaffolding:
   and tenant_id into every record.
 - ``task_registry``: :class:`TaskRegistry` that wraps ``asyncio.create_task``
   with exception logging, cancellation tracking, and cancel-all on shutdown.
+- ``write_behind``: :class:`WriteBehindSink` that batches telemetry writes
+  (tool-call history, audit, intent feedback) off the request path.
 
 All components default to no-op behavior; importing this package never
 performs network/IO side effects.  Integrate at orchestrator init:
@@ -47,6 +49,7 @@ from .metrics import (
 )
 from .task_registry import TaskRegistry, get_task_registry
 from .tracing import configure_tracing, get_tracer, trace_span
+from .write_behind import WriteBehindSink
 
 __all__ = [
     "bind_request_context",
@@ -68,4 +71,5 @@ __all__ = [
     "TaskRegistry",
     "tenant_id_var",
     "trace_span",
+    "WriteBehindSink",
 ]
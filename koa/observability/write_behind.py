@@ -0,0 +1,217 @@
+"""Write-behind batching for telemetry records.
+
+Tool-call history, audit events and intent feedback are written after the
+user already has an answer, yet each write used to cost its own round trip
+on the request path.  :class:`WriteBehindSink` takes those records with a
+non-blocking :meth:`~WriteBehindSink.submit` and writes them from one
+background task, one batch per stream, when a stream reaches
+``max_batch`` records or every ``flush_interval_s`` seconds.
+
+Memory is bounded: once ``max_pending`` records are buffered, further
+records are *spilled* — handed to the stream's ``spill`` callable (by
+default a JSON line on the ``koa.write_behind`` logger) instead of being
+queued.  A batch whose writer raises is spilled the same way, so telemetry
+is never retried into an outage and never lost silently.
+
+Usage::
+
+    sink = WriteBehindSink("orchestrator")
+    sink.register("tool_call_history", write_rows)
+    sink.submit("tool_call_history", row)   # returns immediately
+    ...
+    await sink.aclose()                     # final flush on shutdown
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional
+
+from .metrics import counter, observe
+
+logger = logging.getLogger(__name__)
+
+_spill_logger = logging.getLogger("koa.write_behind")
+
+BatchWriter = Callable[[List[Any]], Awaitable[None]]
+SpillHandler = Callable[[List[Any]], None]
+
+
+def log_spill(stream: str, omit: Iterable[str] = ()) -> SpillHandler:
+    """Default spill handler: one JSON line per record on ``koa.write_behind``.
+
+    Keys in ``omit`` are left out of dict records, so user content does not
+    end up in operational logs.
+    """
+    omitted = frozenset(omit)
+
+    def _spill(records: List[Any]) -> None:
+        for record in records:
+            if omitted and isinstance(record, dict):
+                record = {k: v for k, v in record.items() if k not in omitted}
+            _spill_logger.warning(json.dumps({"stream": stream, "record": record}, default=str))
+
+    return _spill
+
+
+@dataclass
+class _Stream:
+    writer: BatchWriter
+    spill: SpillHandler
+    pending: Deque[Any] = field(default_factory=deque)
+
+
+class WriteBehindSink:
+    """Buffer records per stream and write them in batches in the background.
+
+    Args:
+        name: Label for log messages and metrics.
+        max_batch: Records per writer call; a stream reaching it is
+            flushed without waiting for the interval.
+        flush_interval_s: Longest time a record waits before being written.
+        max_pending: Records buffered across all streams before new
+            records are spilled.
+    """
+
+    def __init__(
+        self,
+        name: str = "koa",
+        *,
+        max_batch: int = 200,
+        flush_interval_s: float = 1.0,
+        max_pending: int = 10_000,
+    ) -> None:
+        self.name = name
+        self.max_batch = max(1, max_batch)
+        self.flush_interval_s = flush_interval_s
+        self.max_pending = max(1, max_pending)
+        self._streams: Dict[str, _Stream] = {}
+        self._pending = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._closed = False
+
+    def register(
+        self,
+        stream: str,
+        writer: BatchWriter,
+        spill: Optional[SpillHandler] = None,
+    ) -> None:
+        """Add a stream; ``writer`` receives each batch in submission order."""
+        self._streams[stream] = _Stream(writer=writer, spill=spill or log_spill(stream))
+
+    @property
+    def pending(self) -> int:
+        """Records currently buffered across all streams."""
+        return self._pending
+
+    def submit(self, stream: str, record: Any) -> bool:
+        """Queue ``record`` for ``stream`` without waiting for any I/O.
+
+        Returns ``False`` when the record was spilled instead: the buffer is
+        full, the sink is closed, or there is no running event loop.
+        """
+        target = self._streams[stream]
+        if self._closed or self._pending >= self.max_pending or not self._ensure_started():
+            self._spill(stream, target, [record])
+            return False
+        target.pending.append(record)
+        self._pending += 1
+        if len(target.pending) >= self.max_batch:
+            self._wakeup.set()
+        return True
+
+    async def flush(self) -> None:
+        """Write everything buffered so far."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            for stream, target in self._streams.items():
+                while target.pending:
+                    count = min(len(target.pending), self.max_batch)
+                    batch = [target.pending.popleft() for _ in range(count)]
+                    self._pending -= count
+                    try:
+                        await target.writer(batch)
+                    except asyncio.CancelledError:
+                        # The batch has left the queue; spill it rather than drop it
+                        self._spill(stream, target, batch)
+                        raise
+                    except Exception as exc:
+                        logger.warning(
+                            "[WriteBehind:%s] %s batch of %d failed, spilling: %s",
+                            self.name,
+                            stream,
+                            count,
+                            exc,
+                        )
+                        self._spill(stream, target, batch)
+                    else:
+                        observe("koa_write_behind_batch_size", {"stream": stream}, count)
+
+    async def aclose(self, timeout: float = 5.0) -> None:
+        """Stop the background task and flush what is left.
+
+        Records still unwritten after ``timeout`` seconds are spilled.
+        Later :meth:`submit` calls spill immediately.
+        """
+        self._closed = True
+        try:
+            await asyncio.wait_for(self._drain(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("[WriteBehind:%s] Final flush timed out", self.name)
+        self._task = None
+        for stream, target in self._streams.items():
+            if target.pending:
+                batch = list(target.pending)
+                target.pending.clear()
+                self._pending -= len(batch)
+                self._spill(stream, target, batch)
+
+    # ------------------------------------------------------------------
+    # internals
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self) -> bool:
+        if self._task is not None and not self._task.done():
+            return True
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name=f"write_behind:{self.name}")
+        return True
+
+    async def _drain(self) -> None:
+        # Let the background task finish its current flush and exit instead
+        # of cancelling it mid-batch; on timeout the cancellation reaches
+        # flush(), which spills the batch it was writing.
+        if self._task is not None:
+            self._wakeup.set()
+            await self._task
+        await self.flush()
+
+    async def _run(self) -> None:
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_s)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as exc:  # pragma: no cover - flush spills its own errors
+                logger.error("[WriteBehind:%s] Flush failed: %s", self.name, exc)
+
+    def _spill(self, stream: str, target: _Stream, records: List[Any]) -> None:
+        counter("koa_write_behind_spilled_total", {"stream": stream}, len(records))
+        try:
+            target.spill(records)
+        except Exception as exc:
+            logger.error("[WriteBehind:%s] Spilling %s records failed: %s", self.name, stream, exc)
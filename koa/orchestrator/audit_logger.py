@@ -37,6 +37,15 @@ from ..observability.context import (
 _audit_logger = logging.getLogger("koa.audit")
 
 
+def _write_entries(entries: List[Dict[str, Any]]) -> None:
+    for entry in entries:
+        _audit_logger.info(json.dumps(entry, default=str))
+
+
+async def _write_entries_async(entries: List[Dict[str, Any]]) -> None:
+    _write_entries(entries)
+
+
 class AuditLogger:
     """Structured audit logger with per-request tracing.
 
@@ -49,6 +58,7 @@ class AuditLogger:
 
     def __init__(self, tenant_id: Optional[str] = None) -> None:
         self._default_tenant_id = tenant_id
+        self._sink: Optional[Any] = None
         # Per-request start timestamps keyed by request_id so multiple
         # concurrent requests on the same logger instance don't collide.
         self._starts: Dict[str, float] = {}
@@ -139,11 +149,22 @@ class AuditLogger:
         """Current request id from the ContextVar."""
         return get_request_id()
 
+    def attach_sink(self, sink: Any) -> None:
+        """Serialize and write entries from a :class:`~koa.observability.WriteBehindSink`.
+
+        Entries are still built (timestamp, request id) at call time.
+        Entries the sink spills are logged synchronously, as without a sink.
+        """
+        sink.register("audit", _write_entries_async, spill=_write_entries)
+        self._sink = sink
+
     # ------------------------------------------------------------------
     # helpers
     # ------------------------------------------------------------------
 
     def _emit(self, event_type: str, fields: Dict[str, Any]) -> None:
+        if not _audit_logger.isEnabledFor(logging.INFO):
+            return
         entry: Dict[str, Any] = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "event_type": event_type,
@@ -152,7 +173,10 @@ class AuditLogger:
         if rid:
             entry["request_id"] = rid
         entry.update(fields)
-        _audit_logger.info(json.dumps(entry, default=str))
+        if self._sink is not None:
+            self._sink.submit("audit", entry)
+        else:
+            _write_entries([entry])
 
     def _tid(self, tenant_id: Optional[str] = None) -> str:
         return tenant_id or get_tenant_id() or self._default_tenant_id or ""
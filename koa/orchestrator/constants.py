@@ -20,7 +20,7 @@ TEXT_CHARS_PER_TOKEN = 4
 """Chars-per-token ratio for natural-language content."""
 
 JSON_DETECTION_SAMPLE_SIZE = 500
-"""Number of leading characters sampled for the JSON-detection heuristic."""
+"""Characters sampled from each end of a string for the JSON-detection heuristic."""
 
 JSON_DETECTION_RATIO = 0.15
 """If the fraction of special chars ({, [, ", :, ,) in the sample exceeds
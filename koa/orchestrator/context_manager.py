@@ -4,10 +4,19 @@ Defense 1 -- Single tool-result truncation (after each tool execution).
 Defense 2 -- History message trimming (before each loop iteration).
 Defense 2b -- Context summarization (summarize old messages via LLM before dropping).
 Defense 3 -- Force trim to safe range (after a context overflow error).
+
+Sizes come from a :class:`TokenLedger`: the ReAct loop keeps its messages
+in one, so each message is counted once when it is added (with the
+``cl100k_base`` tokenizer when it is available locally, otherwise with the
+chars-per-token heuristic) and every budget check reads a running total.
 """
 
+import copy
+import json
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+import os
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from .constants import (
     IMAGE_TOKEN_ESTIMATE,
@@ -20,71 +29,241 @@ from .constants import (
 )
 from .react_config import ReactLoopConfig
 
+try:
+    import tiktoken
+
+    _HAS_TIKTOKEN = True
+except ImportError:
+    _HAS_TIKTOKEN = False
+
 logger = logging.getLogger(__name__)
 
+_JSON_CHARS = '{}[]":,'
+
+
+@lru_cache(maxsize=1)
+def _local_encoding() -> Optional[Any]:
+    """The ``cl100k_base`` encoding if it can be loaded without a download.
+
+    litellm bundles the BPE file and points ``TIKTOKEN_CACHE_DIR`` at it;
+    any other explicitly configured cache dir works too.  Otherwise tiktoken
+    would fetch the file over the network, so the heuristic is used.
+    """
+    if not _HAS_TIKTOKEN:
+        return None
+    try:
+        from litellm.litellm_core_utils.default_encoding import encoding
+
+        return encoding
+    except Exception:
+        pass
+    if not os.environ.get("TIKTOKEN_CACHE_DIR"):
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.info(f"[Context] Tokenizer unavailable, using heuristic estimates: {e}")
+        return None
+
+
+class TokenLedger(list):
+    """A message list that keeps a running token total.
+
+    Each message is counted once, when it is added; counts are memoized by
+    message identity (and its ``content`` object), so ledgers derived from
+    this one -- trimmed or summarized copies -- reuse them.  ``tokens`` is
+    therefore O(1) however long the conversation gets.
+
+    Copies and pickles are plain lists.
+    """
+
+    def __init__(
+        self,
+        messages: Iterable[Dict[str, Any]] = (),
+        count: Optional[Callable[[Dict[str, Any]], int]] = None,
+        memo: Optional[Dict[int, Tuple[Dict[str, Any], Any, int]]] = None,
+    ) -> None:
+        super().__init__()
+        self._count = count or ContextManager.estimate_message_tokens
+        self._memo = memo if memo is not None else {}
+        self.tokens = 0
+        self.extend(messages)
+
+    def derive(self, messages: Iterable[Dict[str, Any]]) -> "TokenLedger":
+        """A new ledger over ``messages`` sharing this ledger's counts."""
+        return TokenLedger(messages, self._count, self._memo)
+
+    def tokens_of(self, message: Dict[str, Any]) -> int:
+        entry = self._memo.get(id(message))
+        if entry is None or entry[0] is not message or entry[1] is not message.get("content"):
+            entry = (message, message.get("content"), self._count(message))
+            self._memo[id(message)] = entry
+        return entry[2]
+
+    def append(self, message: Dict[str, Any]) -> None:
+        super().append(message)
+        self.tokens += self.tokens_of(message)
+
+    def extend(self, messages: Iterable[Dict[str, Any]]) -> None:
+        for message in messages:
+            self.append(message)
+
+    def __iadd__(self, messages: Iterable[Dict[str, Any]]) -> "TokenLedger":
+        self.extend(messages)
+        return self
+
+    def insert(self, index: int, message: Dict[str, Any]) -> None:
+        super().insert(index, message)
+        self.tokens += self.tokens_of(message)
+
+    def pop(self, index: int = -1) -> Dict[str, Any]:
+        message = super().pop(index)
+        self.tokens -= self.tokens_of(message)
+        return message
+
+    def remove(self, message: Dict[str, Any]) -> None:
+        super().remove(message)
+        self.tokens -= self.tokens_of(message)
+
+    def clear(self) -> None:
+        super().clear()
+        self.tokens = 0
+
+    def __setitem__(self, index, value) -> None:
+        removed = self[index] if isinstance(index, slice) else [self[index]]
+        super().__setitem__(index, value)
+        added = self[index] if isinstance(index, slice) else [value]
+        self.tokens += sum(map(self.tokens_of, added)) - sum(map(self.tokens_of, removed))
+
+    def __delitem__(self, index) -> None:
+        removed = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        self.tokens -= sum(map(self.tokens_of, removed))
+
+    def __copy__(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> List[Dict[str, Any]]:
+        return copy.deepcopy(list(self), memo)
+
+    def __reduce_ex__(self, protocol):
+        return (list, (list(self),))
+
 
 class ContextManager:
     """Manages conversation context size using three lines of defense."""
 
     def __init__(self, config: ReactLoopConfig) -> None:
         self.config = config
+        self._encoding = _local_encoding()
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
+    def track(
+        self,
+        messages: List[Dict[str, Any]],
+        like: Optional[List[Dict[str, Any]]] = None,
+    ) -> "TokenLedger":
+        """Return ``messages`` as a :class:`TokenLedger`.
+
+        A ledger is returned as is.  When ``like`` is a ledger, the new one
+        shares its memoized counts, so only new messages are counted.
+        """
+        if isinstance(messages, TokenLedger):
+            return messages
+        if isinstance(like, TokenLedger):
+            return like.derive(messages)
+        return TokenLedger(messages, self.count_message_tokens)
+
     def estimate_tokens(self, messages: List[Dict[str, Any]]) -> int:
         """Estimate token count from messages.
 
-        Uses ~4 chars/token for English text, ~2 chars/token for code/JSON,
+        For a :class:`TokenLedger` this is its running total.  Otherwise
+        each message is counted with :meth:`count_message_tokens`, the
+        counter :meth:`track` gives its ledgers, so both agree.
+        """
+        if isinstance(messages, TokenLedger):
+            return messages.tokens
+        return sum(map(self.count_message_tokens, messages))
+
+    def count_message_tokens(self, msg: Dict[str, Any]) -> int:
+        """Token count of one message: tokenizer-accurate when available."""
+        if self._encoding is None:
+            return self.estimate_message_tokens(msg)
+        encode = self._encoding.encode_ordinary
+        total = TOKENS_PER_MESSAGE_OVERHEAD
+        for text, images in self._message_texts(msg):
+            total += len(encode(text)) + images * IMAGE_TOKEN_ESTIMATE
+        for args in self._tool_call_arguments(msg):
+            total += TOOL_CALL_STRUCTURE_OVERHEAD_TOKENS + len(encode(args))
+        return total
+
+    @classmethod
+    def estimate_message_tokens(cls, msg: Dict[str, Any]) -> int:
+        """Heuristic token estimate for one message.
+
+        Uses ~4 chars/token for English text, ~3 chars/token for code/JSON,
         plus overhead per message (role, formatting).
         """
-        total = 0
-        for msg in messages:
-            total += TOKENS_PER_MESSAGE_OVERHEAD
-            content = msg.get("content")
-            if content is None:
-                continue
-            if isinstance(content, str):
-                total += self._estimate_string_tokens(content)
-            elif isinstance(content, list):
-                for part in content:
-                    if isinstance(part, dict):
-                        part_type = part.get("type", "")
-                        if part_type in ("image_url", "image"):
-                            total += IMAGE_TOKEN_ESTIMATE
-                            continue
-                        text = part.get("text") or part.get("content", "")
-                        if isinstance(text, str):
-                            total += self._estimate_string_tokens(text)
-                    elif isinstance(part, str):
-                        total += self._estimate_string_tokens(part)
-            # Tool calls in assistant messages
-            tool_calls = msg.get("tool_calls")
-            if tool_calls:
-                for tc in tool_calls:
-                    total += TOOL_CALL_STRUCTURE_OVERHEAD_TOKENS
-                    args = tc.get("arguments") or tc.get("function", {}).get("arguments", "")
-                    if isinstance(args, str):
-                        total += len(args) // JSON_CHARS_PER_TOKEN
-                    elif isinstance(args, dict):
-                        import json
-
-                        total += len(json.dumps(args)) // JSON_CHARS_PER_TOKEN
+        total = TOKENS_PER_MESSAGE_OVERHEAD
+        for text, images in cls._message_texts(msg):
+            total += cls._estimate_string_tokens(text) + images * IMAGE_TOKEN_ESTIMATE
+        for args in cls._tool_call_arguments(msg):
+            total += TOOL_CALL_STRUCTURE_OVERHEAD_TOKENS + len(args) // JSON_CHARS_PER_TOKEN
         return total
 
+    @staticmethod
+    def _message_texts(msg: Dict[str, Any]) -> List[Tuple[str, int]]:
+        """``(text, image_count)`` pairs for the content of one message."""
+        content = msg.get("content")
+        if isinstance(content, str):
+            return [(content, 0)]
+        if not isinstance(content, list):
+            return []
+        texts: List[Tuple[str, int]] = []
+        for part in content:
+            if isinstance(part, dict):
+                if part.get("type", "") in ("image_url", "image"):
+                    texts.append(("", 1))
+                    continue
+                text = part.get("text") or part.get("content", "")
+                if isinstance(text, str):
+                    texts.append((text, 0))
+            elif isinstance(part, str):
+                texts.append((part, 0))
+        return texts
+
+    @staticmethod
+    def _tool_call_arguments(msg: Dict[str, Any]) -> List[str]:
+        """Serialized arguments of each tool call in an assistant message."""
+        arguments = []
+        for tc in msg.get("tool_calls") or ():
+            args = tc.get("arguments") or tc.get("function", {}).get("arguments", "")
+            if isinstance(args, dict):
+                args = json.dumps(args)
+            arguments.append(args if isinstance(args, str) else "")
+        return arguments
+
     @staticmethod
     def _estimate_string_tokens(text: str) -> int:
         """Estimate tokens for a string. JSON/code averages ~3 chars/token,
         natural language ~4 chars/token."""
         if not text:
             return 0
-        # Heuristic: if special-char fraction exceeds threshold, treat as JSON/code
-        sample_len = min(len(text), JSON_DETECTION_SAMPLE_SIZE)
-        special = sum(1 for c in text[:sample_len] if c in '{}[]":,')
-        ratio = special / sample_len if text else 0
+        # Heuristic: if special-char fraction exceeds threshold, treat as
+        # JSON/code.  Sample both ends: tool results often wrap a JSON body
+        # in a line of prose, or end in one.
+        if len(text) > 2 * JSON_DETECTION_SAMPLE_SIZE:
+            sample = text[:JSON_DETECTION_SAMPLE_SIZE] + text[-JSON_DETECTION_SAMPLE_SIZE:]
+        else:
+            sample = text
+        special = sum(map(sample.count, _JSON_CHARS))
         chars_per_token = (
-            JSON_CHARS_PER_TOKEN if ratio > JSON_DETECTION_RATIO else TEXT_CHARS_PER_TOKEN
+            JSON_CHARS_PER_TOKEN
+            if special / len(sample) > JSON_DETECTION_RATIO
+            else TEXT_CHARS_PER_TOKEN
         )
         return len(text) // chars_per_token
 
@@ -154,7 +333,7 @@ class ContextManager:
                         new_parts.append(part)
                     msg["content"] = new_parts
             out.append(msg)
-        return out
+        return self.track(out, like=messages) if isinstance(messages, TokenLedger) else out
 
     # ------------------------------------------------------------------
     # Defense 3: Force trim to safe range
@@ -233,4 +412,6 @@ class ContextManager:
             rest = messages
 
         trimmed = rest[-keep:] if len(rest) > keep else rest
+        if isinstance(messages, TokenLedger):
+            return messages.derive(system + trimmed)
         return system + trimmed
@@ -17,13 +17,22 @@ Production hardening layers:
 - Structured ``slots`` on :class:`SubTask` — typed entities (targets,
   quantities, times, locations) so downstream agents don't re-parse
   natural language.
+- Fused pre-flight scoring — with ``score_complexity=True`` the same call
+  also returns the routing complexity score, so ``ModelRouter`` does not
+  need a second classifier round trip (see :meth:`ModelRouter.route_score`).
+- :class:`PreflightCache` — reuses a classification for a repeated message
+  with the same recent history.
 """
 
+import copy
+import hashlib
 import json
 import logging
 import re
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +76,9 @@ class IntentAnalysis:
     #: Route used to produce this analysis: ``"fast_path"``, ``"embedding"``,
     #: ``"llm"``, or ``"fallback"``.  Useful for metrics + eval.
     source: str = "llm"
+    #: Routing complexity score (1-100, same scale as ``ModelRouter``), or
+    #: ``-1`` when the classifier was not asked for one.
+    complexity: int = -1
 
 
 VALID_DOMAINS = {"communication", "productivity", "lifestyle", "travel", "general"}
@@ -159,6 +171,23 @@ For multi intent, sub_tasks must have at least 2 entries:
 }
 """
 
+#: Appended to the system prompt when the analyzer also scores routing
+#: complexity.  Same 1-100 scale and bands as
+#: :data:`koa.llm.router.CLASSIFIER_SYSTEM_PROMPT`.
+COMPLEXITY_PROMPT_SECTION = """
+Complexity:
+Also score the ACTUAL work the request needs from 1 to 100 in "complexity":
+- 1-20: greetings, chitchat, quick factual Q&A, acknowledgements
+- 21-50: one clear task for one agent with 1-3 tool calls
+- 51-80: spans several services, needs investigation, or is ambiguous
+- 81-100: multi-step workflows, trip planning, deep reasoning
+Score follow-ups to an already running task LOWER.  When in doubt, round UP.
+Add it to the JSON object: "complexity": <integer 1-100>
+"""
+
+#: Complexity reported for fast-path hits (greetings, acks, cancellations).
+FAST_PATH_COMPLEXITY = 5
+
 
 # ---------------------------------------------------------------------------
 # Fast-path regex classifier
@@ -261,6 +290,63 @@ class FastPathClassifier:
         return None
 
 
+class PreflightCache:
+    """Small TTL + LRU cache of LLM classifications.
+
+    Keyed by tenant, the normalized message and a hash of the last
+    :attr:`HISTORY_TURNS` user/assistant messages, so a retried or repeated
+    request in the same conversational state skips the classifier call.
+    """
+
+    #: Recent user/assistant messages that are part of the key.
+    HISTORY_TURNS = 4
+
+    def __init__(self, max_entries: int = 1024, ttl_s: float = 300.0) -> None:
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, IntentAnalysis]]" = (
+            OrderedDict()
+        )
+
+    @classmethod
+    def key(
+        cls,
+        tenant_id: Optional[str],
+        user_message: str,
+        conversation_history: Optional[List[Dict[str, Any]]],
+    ) -> Tuple[str, str, str]:
+        normalized = " ".join((user_message or "").split()).casefold()
+        tail = [
+            (m.get("role"), m.get("content"))
+            for m in conversation_history or []
+            if m.get("role") in ("user", "assistant") and m.get("content")
+        ][-cls.HISTORY_TURNS :]
+        digest = hashlib.sha256(
+            json.dumps(tail, ensure_ascii=False, default=str).encode()
+        ).hexdigest()
+        return (tenant_id or "", normalized, digest)
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[IntentAnalysis]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, analysis = entry
+        if time.monotonic() - stored_at > self.ttl_s:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(analysis)
+
+    def put(self, key: Tuple[str, str, str], analysis: IntentAnalysis) -> None:
+        self._entries[key] = (time.monotonic(), copy.deepcopy(analysis))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class IntentAnalyzer:
     """Lightweight LLM-based intent analyzer.
 
@@ -274,6 +360,9 @@ class IntentAnalyzer:
         embedding_router: Optional L1 embedding router (see
             :mod:`koa.orchestrator.intent_embedding`) tried after the
             fast-path but before the LLM.
+        score_complexity: Also ask the LLM for the routing complexity
+            score (:attr:`IntentAnalysis.complexity`).
+        cache: Optional :class:`PreflightCache` for LLM classifications.
     """
 
     def __init__(
@@ -282,22 +371,28 @@ class IntentAnalyzer:
         *,
         fast_path: Optional[FastPathClassifier] = ...,  # type: ignore[assignment]
         embedding_router: Optional[Any] = None,
+        score_complexity: bool = False,
+        cache: Optional[PreflightCache] = None,
     ):
         self.llm_client = llm_client
         self.fast_path = FastPathClassifier() if fast_path is ... else fast_path
         self.embedding_router = embedding_router
+        self.score_complexity = score_complexity
+        self.cache = cache
 
     async def analyze(
         self,
         user_message: str,
         conversation_history: Optional[List[Dict[str, Any]]] = None,
         metadata: Optional[Dict[str, Any]] = None,
+        tenant_id: Optional[str] = None,
     ) -> IntentAnalysis:
         """Analyze user message intent and domain classification.
 
         Receives the same conversation_history and metadata that the main
         ReAct LLM sees, so short follow-ups ("ok", "yes", "然后呢") are
         classified in the context of the preceding exchange.
+        ``tenant_id`` lets the embedding router use tenant-specific exemplars.
 
         Falls back to single-intent with all domains on failure.
         """
@@ -308,21 +403,35 @@ class IntentAnalyzer:
             fp = self.fast_path.classify(user_message)
             if fp is not None:
                 logger.debug("[IntentAnalyzer] fast-path hit: %s", fp.domains)
+                if self.score_complexity:
+                    fp.complexity = FAST_PATH_COMPLEXITY
                 return fp
 
         # Embedding L1 router (optional): if the message closely matches a
         # known-intent centroid, reuse that classification and skip LLM.
         if self.embedding_router is not None:
             try:
-                embedded = await self.embedding_router.classify(user_message)
+                embedded = await self.embedding_router.classify(user_message, tenant_id=tenant_id)
                 if embedded is not None:
                     logger.debug("[IntentAnalyzer] embedding hit: %s", embedded.domains)
                     return embedded
             except Exception as exc:
                 logger.debug("[IntentAnalyzer] embedding router failed: %s", exc)
 
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key(tenant_id, user_message, conversation_history)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug("[IntentAnalyzer] cache hit: %s", cached.domains)
+                cached.raw_message = user_message
+                return cached
+
+        system_prompt = INTENT_ANALYZER_SYSTEM_PROMPT
+        if self.score_complexity:
+            system_prompt += COMPLEXITY_PROMPT_SECTION
         messages: List[Dict[str, Any]] = [
-            {"role": "system", "content": INTENT_ANALYZER_SYSTEM_PROMPT},
+            {"role": "system", "content": system_prompt},
         ]
 
         # Full conversation history — same as what the main model receives.
@@ -367,7 +476,10 @@ class IntentAnalyzer:
             if not result_json:
                 logger.warning("[IntentAnalyzer] Failed to parse JSON from response")
                 return self._fallback(user_message)
-            return self._parse_result(result_json, user_message)
+            analysis = self._parse_result(result_json, user_message)
+            if cache_key is not None:
+                self.cache.put(cache_key, analysis)
+            return analysis
         except Exception as e:
             logger.warning(f"[IntentAnalyzer] LLM call failed: {e}")
             return self._fallback(user_message)
@@ -411,6 +523,11 @@ class IntentAnalyzer:
         if not isinstance(slots, dict):
             slots = {}
 
+        try:
+            complexity = max(1, min(100, int(data["complexity"])))
+        except (KeyError, TypeError, ValueError):
+            complexity = -1
+
         # Validate domains
         domains = [d for d in domains if d in VALID_DOMAINS]
         # If model appended "general" as a safety-net alongside specific
@@ -466,6 +583,7 @@ class IntentAnalyzer:
             clarification_question=clarification_question,
             slots=slots,
             source="llm",
+            complexity=complexity,
         )
 
     @staticmethod
@@ -9,10 +9,14 @@ Design
 
 At initialization time, callers register "exemplars" — short labelled
 utterances representing each domain.  The router embeds them once and
-averages per-domain centroids.
+reduces each domain to ``k`` unit-norm prototypes (``k=1``: the centroid).
+Tenants can register extra exemplar sets that are scored alongside the
+global one.
 
-At classify-time, the router embeds the user message and compares (cosine
-similarity) to every centroid.  A classification is returned only when:
+At classify-time, the router embeds the user message and scores it against
+every prototype with one matrix-vector product over a contiguous matrix
+(NumPy when installed, a flat ``array`` otherwise); a domain scores as its
+best prototype.  A classification is returned only when:
 
 - top-1 similarity ≥ ``hit_threshold`` (default 0.82), AND
 - gap between top-1 and top-2 ≥ ``margin`` (default 0.05) so we don't
@@ -34,11 +38,21 @@ from __future__ import annotations
 
 import logging
 import math
+import operator
+from array import array
 from dataclasses import dataclass
 from typing import Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
 
 from .intent_analyzer import VALID_DOMAINS, IntentAnalysis
 
+try:
+    import numpy as np
+
+    _HAS_NUMPY = True
+except ImportError:  # pragma: no cover - numpy is an optional extra
+    np = None
+    _HAS_NUMPY = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -60,21 +74,6 @@ DEFAULT_HIT_THRESHOLD = 0.82
 DEFAULT_MARGIN = 0.05
 
 
-def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
-    if not a or not b or len(a) != len(b):
-        return 0.0
-    dot = 0.0
-    na = 0.0
-    nb = 0.0
-    for x, y in zip(a, b):
-        dot += x * y
-        na += x * x
-        nb += y * y
-    if na <= 0 or nb <= 0:
-        return 0.0
-    return dot / (math.sqrt(na) * math.sqrt(nb))
-
-
 def _avg(vectors: List[List[float]]) -> List[float]:
     if not vectors:
         return []
@@ -86,13 +85,115 @@ def _avg(vectors: List[List[float]]) -> List[float]:
     return [x / len(vectors) for x in out]
 
 
+def _dot(a: Sequence[float], b: Sequence[float]) -> float:
+    return sum(map(operator.mul, a, b))
+
+
+def _normalize(vec: Sequence[float]) -> List[float]:
+    norm = math.sqrt(_dot(vec, vec))
+    if norm <= 0:
+        return [0.0] * len(vec)
+    return [x / norm for x in vec]
+
+
+def _prototypes(vectors: List[List[float]], k: int, iterations: int = 10) -> List[List[float]]:
+    """Up to ``k`` unit-norm prototypes summarizing one domain's exemplars.
+
+    ``k == 1`` is the plain centroid.  Larger ``k`` runs spherical k-means
+    (deterministic farthest-point seeding), so a domain whose exemplars
+    form several clusters ("turn off the lights" vs. "track my package")
+    keeps one prototype per cluster instead of a blurred average.
+    """
+    if k <= 1 or len(vectors) <= 1:
+        return [_normalize(_avg(vectors))]
+    units = [_normalize(v) for v in vectors]
+    if len(units) <= k:
+        return units
+
+    centers = [units[0]]
+    closest = [_dot(u, centers[0]) for u in units]
+    while len(centers) < k:
+        far = min(range(len(units)), key=closest.__getitem__)
+        centers.append(units[far])
+        closest = [max(c, _dot(u, units[far])) for c, u in zip(closest, units)]
+
+    for _ in range(iterations):
+        groups: List[List[List[float]]] = [[] for _ in centers]
+        for u in units:
+            best = max(range(len(centers)), key=lambda i: _dot(u, centers[i]))
+            groups[best].append(u)
+        updated = [_normalize(_avg(g)) if g else c for g, c in zip(groups, centers)]
+        if updated == centers:
+            break
+        centers = updated
+    return centers
+
+
+class _PrototypeMatrix:
+    """Unit-norm prototypes in one contiguous row-major buffer.
+
+    Rows are grouped by domain, so scoring a message is a single
+    matrix-vector product followed by a per-domain max.  Uses NumPy when
+    installed and a flat ``array('d')`` otherwise.
+    """
+
+    def __init__(self, prototypes: Dict[str, List[List[float]]]) -> None:
+        self.domains: List[str] = []
+        offsets: List[int] = []
+        rows: List[List[float]] = []
+        for domain, vectors in prototypes.items():
+            if not vectors:
+                continue
+            self.domains.append(domain)
+            offsets.append(len(rows))
+            rows.extend(vectors)
+        self.size = len(rows)
+        self.dim = len(rows[0]) if rows else 0
+        self._bounds = offsets + [self.size]
+        if _HAS_NUMPY:
+            self._matrix = np.asarray(rows, dtype=np.float32).reshape(self.size, self.dim)
+            self._offsets = np.asarray(offsets, dtype=np.intp)
+        else:
+            flat = array("d")
+            for row in rows:
+                flat.extend(row)
+            self._flat = memoryview(flat)
+
+    def scores(self, query: Sequence[float]) -> List[float]:
+        """Best cosine similarity per domain, aligned with :attr:`domains`."""
+        if not self.size or len(query) != self.dim:
+            return [0.0] * len(self.domains)
+        if _HAS_NUMPY:
+            q = np.asarray(query, dtype=np.float32)
+            norm = float(np.linalg.norm(q))
+            if norm <= 0:
+                return [0.0] * len(self.domains)
+            sims = self._matrix @ (q / norm)
+            return np.maximum.reduceat(sims, self._offsets).tolist()
+
+        q = _normalize(query)
+        flat, dim, bounds = self._flat, self.dim, self._bounds
+        out: List[float] = []
+        for i in range(len(self.domains)):
+            out.append(
+                max(
+                    _dot(flat[row * dim : (row + 1) * dim], q)
+                    for row in range(bounds[i], bounds[i + 1])
+                )
+            )
+        return out
+
+
 class EmbeddingRouter:
-    """Nearest-centroid domain router.
+    """Nearest-prototype domain router.
 
     Args:
         backend: Embedding backend (see :class:`EmbeddingBackend`).
         hit_threshold: Minimum cosine similarity for a classification hit.
         margin: Minimum gap between top-1 and top-2 for a confident hit.
+        prototypes_per_domain: Prototypes kept per domain (``k``).  ``1``
+            is a single centroid; higher values keep distinct clusters of
+            exemplars apart.  A domain scores as its best prototype.
     """
 
     def __init__(
@@ -101,22 +202,25 @@ class EmbeddingRouter:
         *,
         hit_threshold: float = DEFAULT_HIT_THRESHOLD,
         margin: float = DEFAULT_MARGIN,
+        prototypes_per_domain: int = 1,
     ) -> None:
         self.backend = backend
         self.hit_threshold = float(hit_threshold)
         self.margin = float(margin)
-        self._centroids: Dict[str, List[float]] = {}
-        #: Number of exemplars that contributed to each centroid; used to
+        self.prototypes_per_domain = max(1, int(prototypes_per_domain))
+        self._prototypes: Dict[str, List[List[float]]] = {}
+        self._matrix: Optional[_PrototypeMatrix] = None
+        #: Number of exemplars that contributed to each domain; used to
         #: refuse classification from under-trained domains.
         self._exemplar_counts: Dict[str, int] = {}
-        self._initialized = False
-
-    async def fit(self, exemplars: Iterable[Exemplar]) -> None:
-        """Compute per-domain centroids from the exemplar set.
-
-        Must be called before :meth:`classify`.  Safe to call again with
-        an updated exemplar set; state is fully replaced.
-        """
+        # Tenant-specific exemplar sets, scored together with the global set
+        self._tenant_prototypes: Dict[str, Dict[str, List[List[float]]]] = {}
+        self._tenant_counts: Dict[str, Dict[str, int]] = {}
+        self._tenant_matrices: Dict[str, _PrototypeMatrix] = {}
+
+    async def _embed_grouped(
+        self, exemplars: Iterable[Exemplar], k: int
+    ) -> Tuple[Dict[str, List[List[float]]], Dict[str, int]]:
         grouped: Dict[str, List[str]] = {}
         for ex in exemplars:
             if ex.domain not in VALID_DOMAINS:
@@ -144,27 +248,75 @@ class EmbeddingRouter:
                 f"Embedding backend returned {len(vectors)} vectors for {len(flat_texts)} texts"
             )
 
-        centroids: Dict[str, List[float]] = {}
+        prototypes: Dict[str, List[List[float]]] = {}
         counts: Dict[str, int] = {}
         for domain, start, end in boundaries:
-            centroids[domain] = _avg(vectors[start:end])
+            prototypes[domain] = _prototypes([list(v) for v in vectors[start:end]], k)
             counts[domain] = end - start
+        return prototypes, counts
 
-        self._centroids = centroids
+    async def fit(self, exemplars: Iterable[Exemplar]) -> None:
+        """Compute per-domain prototypes from the exemplar set.
+
+        Must be called before :meth:`classify`.  Safe to call again with
+        an updated exemplar set; state is fully replaced.
+        """
+        prototypes, counts = await self._embed_grouped(exemplars, self.prototypes_per_domain)
+        self._prototypes = prototypes
         self._exemplar_counts = counts
-        self._initialized = True
+        self._matrix = _PrototypeMatrix(prototypes)
+        self._tenant_matrices.clear()
         logger.info(
-            "EmbeddingRouter fit complete: %s",
+            "EmbeddingRouter fit complete: %s (%d prototypes)",
             ", ".join(f"{d}={n}" for d, n in counts.items()),
+            self._matrix.size,
         )
 
-    async def classify(self, user_message: str) -> Optional[IntentAnalysis]:
-        """Classify a message using the fitted centroids.
+    async def fit_tenant(self, tenant_id: str, exemplars: Iterable[Exemplar]) -> None:
+        """Register exemplars that apply only to ``tenant_id``.
+
+        They are scored alongside the global set when :meth:`classify` is
+        called with the same ``tenant_id``.  Replaces any previous set for
+        the tenant.
+        """
+        prototypes, counts = await self._embed_grouped(exemplars, self.prototypes_per_domain)
+        self._tenant_prototypes[tenant_id] = prototypes
+        self._tenant_counts[tenant_id] = counts
+        self._tenant_matrices.pop(tenant_id, None)
+
+    def remove_tenant(self, tenant_id: str) -> None:
+        """Drop a tenant's exemplar set."""
+        self._tenant_prototypes.pop(tenant_id, None)
+        self._tenant_counts.pop(tenant_id, None)
+        self._tenant_matrices.pop(tenant_id, None)
+
+    def _matrix_for(
+        self, tenant_id: Optional[str]
+    ) -> Tuple[Optional[_PrototypeMatrix], Dict[str, int]]:
+        if tenant_id is None or tenant_id not in self._tenant_prototypes:
+            return self._matrix, self._exemplar_counts
+
+        counts = dict(self._exemplar_counts)
+        for domain, n in self._tenant_counts[tenant_id].items():
+            counts[domain] = counts.get(domain, 0) + n
+        matrix = self._tenant_matrices.get(tenant_id)
+        if matrix is None:
+            merged = {domain: list(rows) for domain, rows in self._prototypes.items()}
+            for domain, rows in self._tenant_prototypes[tenant_id].items():
+                merged.setdefault(domain, []).extend(rows)
+            matrix = self._tenant_matrices[tenant_id] = _PrototypeMatrix(merged)
+        return matrix, counts
+
+    async def classify(
+        self, user_message: str, tenant_id: Optional[str] = None
+    ) -> Optional[IntentAnalysis]:
+        """Classify a message using the fitted prototypes.
 
         Returns ``None`` when the router is not confident enough — the
         caller should fall through to the LLM classifier.
         """
-        if not self._initialized or not self._centroids:
+        matrix, counts = self._matrix_for(tenant_id)
+        if matrix is None or not matrix.size:
             return None
         if not user_message or not user_message.strip():
             return None
@@ -175,21 +327,17 @@ class EmbeddingRouter:
             return None
         if not vectors:
             return None
-        vec = vectors[0]
-
-        scored: List[Tuple[str, float]] = []
-        for domain, centroid in self._centroids.items():
-            scored.append((domain, _cosine(vec, centroid)))
-        scored.sort(key=lambda x: x[1], reverse=True)
 
-        top_domain, top_score = scored[0]
-        runner_up = scored[1][1] if len(scored) > 1 else 0.0
+        scores = matrix.scores(vectors[0])
+        top = max(range(len(scores)), key=scores.__getitem__)
+        top_domain, top_score = matrix.domains[top], scores[top]
+        runner_up = max((s for i, s in enumerate(scores) if i != top), default=0.0)
 
         if top_score < self.hit_threshold:
             return None
         if (top_score - runner_up) < self.margin:
             return None
-        if self._exemplar_counts.get(top_domain, 0) < 2:
+        if counts.get(top_domain, 0) < 2:
             # Single-exemplar domain isn't statistically meaningful.
             return None
 
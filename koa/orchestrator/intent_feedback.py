@@ -73,6 +73,36 @@ class IntentFeedbackRecord:
     extra: Dict[str, Any] = field(default_factory=dict)
 
 
+def _make_record(
+    *,
+    tenant_id: str,
+    user_message: str,
+    intent_type: str,
+    domains: List[str],
+    confidence: float,
+    source: str,
+    outcome: str,
+    parent_id: Optional[str] = None,
+    extra: Optional[Dict[str, Any]] = None,
+    created_at: Optional[float] = None,
+) -> IntentFeedbackRecord:
+    if outcome not in VALID_OUTCOMES:
+        raise ValueError(f"Invalid outcome {outcome!r}; must be one of {sorted(VALID_OUTCOMES)}")
+    return IntentFeedbackRecord(
+        id=uuid.uuid4().hex,
+        tenant_id=tenant_id,
+        user_message=user_message,
+        intent_type=intent_type,
+        domains=list(domains),
+        confidence=float(confidence),
+        source=source,
+        outcome=outcome,
+        created_at=time.time() if created_at is None else created_at,
+        parent_id=parent_id,
+        extra=dict(extra or {}),
+    )
+
+
 class IntentFeedbackStore(Protocol):
     async def record(
         self,
@@ -129,27 +159,32 @@ class InMemoryIntentFeedbackStore:
         parent_id: Optional[str] = None,
         extra: Optional[Dict[str, Any]] = None,
     ) -> IntentFeedbackRecord:
-        if outcome not in VALID_OUTCOMES:
-            raise ValueError(
-                f"Invalid outcome {outcome!r}; must be one of {sorted(VALID_OUTCOMES)}"
-            )
-        rec = IntentFeedbackRecord(
-            id=uuid.uuid4().hex,
+        rec = _make_record(
             tenant_id=tenant_id,
             user_message=user_message,
             intent_type=intent_type,
-            domains=list(domains),
-            confidence=float(confidence),
+            domains=domains,
+            confidence=confidence,
             source=source,
             outcome=outcome,
-            created_at=time.time(),
             parent_id=parent_id,
-            extra=dict(extra or {}),
+            extra=extra,
         )
         async with self._lock:
             self._records.append(rec)
         return rec
 
+    async def record_many(self, items: List[Dict[str, Any]]) -> List[IntentFeedbackRecord]:
+        """Record several outcomes at once; each item holds :meth:`record`'s kwargs.
+
+        Used by the orchestrator's write-behind sink.  Durable stores should
+        implement it as one bulk write.
+        """
+        recs = [_make_record(**item) for item in items]
+        async with self._lock:
+            self._records.extend(recs)
+        return recs
+
     async def list_recent(
         self,
         *,
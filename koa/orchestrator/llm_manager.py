@@ -1,20 +1,75 @@
 """LLM call management mixin for the Orchestrator.
 
-Provides retry logic, fallback provider chains, and error recovery
-for LLM API calls.
+Provides retry logic, fallback provider chains, hedged requests and
+error recovery for LLM API calls.
 """
 
 import asyncio
 import json
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from ..llm.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError
+from ..llm.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError, CircuitState
+from ..llm.scheduler import ProviderScheduler, get_provider_scheduler, provider_key
 from .error_classifier import LLMErrorKind, classify_llm_error
 
 logger = logging.getLogger(__name__)
 
 
+class LLMStream:
+    """A streaming completion whose first chunk has already arrived.
+
+    Returned by ``_llm_call_with_retry(..., stream=True)``.  Opening the
+    stream and reading its first chunk goes through the same retry,
+    fallback and circuit-breaker handling as a non-streaming call; once
+    chunks reach the caller the output is visible and the call can no
+    longer be retried, so a later failure is recorded against the
+    provider's circuit breaker and re-raised.  ``on_close`` (the provider
+    concurrency slot) runs once the stream is exhausted, fails or is closed.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        first: Optional[Any],
+        rest: Any,
+        breaker: CircuitBreaker,
+        on_close: Optional[Callable[[], None]] = None,
+    ):
+        self.client = client
+        self._first = first
+        self._rest = rest
+        self._breaker = breaker
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        try:
+            if self._first is None:
+                return
+            yield self._first
+            try:
+                async for chunk in self._rest:
+                    yield chunk
+            except Exception:
+                self._breaker.record_failure()
+                raise
+        finally:
+            self._closed()
+
+    async def aclose(self) -> None:
+        try:
+            aclose = getattr(self._rest, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        finally:
+            self._closed()
+
+    def _closed(self) -> None:
+        on_close, self._on_close = self._on_close, None
+        if on_close is not None:
+            on_close()
+
+
 class LLMManagerMixin:
     """Mixin providing LLM call retry and fallback logic.
 
@@ -28,11 +83,12 @@ class LLMManagerMixin:
     # Circuit breakers keyed by provider name (populated lazily)
     _circuit_breakers: dict = {}
 
+    # Latency windows and concurrency limits; None uses the process-wide one
+    _provider_scheduler: Optional[ProviderScheduler] = None
+
     def _get_circuit_breaker(self, client: Any) -> CircuitBreaker:
         """Get or create a circuit breaker for the given LLM client."""
-        provider = getattr(client, "provider", "") or id(client)
-        model = getattr(getattr(client, "config", None), "model", "")
-        key = f"{provider}:{model}"
+        key = provider_key(client)
         if key not in self._circuit_breakers:
             self._circuit_breakers[key] = CircuitBreaker(
                 failure_threshold=5,
@@ -47,6 +103,7 @@ class LLMManagerMixin:
         tool_schemas: Optional[List[Dict[str, Any]]],
         tool_choice: Optional[Any] = None,
         llm_client_override: Optional[Any] = None,
+        stream: bool = False,
         **extra_kwargs,
     ) -> Any:
         """LLM call with error recovery and model fallback chain.
@@ -60,25 +117,51 @@ class LLMManagerMixin:
         If all retries on the primary client are exhausted, tries each
         fallback provider from ``ReactLoopConfig.fallback_providers`` in order.
 
+        With ``ReactLoopConfig.hedge_percentile`` set, a primary call still
+        outstanding after that percentile of its recent latencies is hedged
+        on the first available fallback provider; whichever succeeds first
+        is used and the other call is cancelled.
+
         Args:
             tool_choice: Override for tool_choice param ("auto", "required", "none").
                          If None, the LLM client uses its default ("auto").
             llm_client_override: Optional LLM client to use instead of
                 ``self.llm_client``.  Set by the model router when
                 complexity-based routing is active.
+            stream: Use ``stream_completion`` and return an
+                :class:`LLMStream` once the first chunk has arrived.
         """
         client = llm_client_override or self.llm_client
-        primary_error = await self._llm_call_single_client(
-            client,
-            messages,
-            tool_schemas,
-            tool_choice,
-            **extra_kwargs,
+        hedge_client = self._get_hedge_client(client)
+        scheduler = self._get_provider_scheduler()
+
+        def call(target: Any):
+            return lambda: self._llm_call_single_client(
+                target,
+                messages,
+                tool_schemas,
+                tool_choice,
+                stream=stream,
+                **extra_kwargs,
+            )
+
+        primary_error, hedged, hedge_won = await scheduler.hedge(
+            call(client),
+            call(hedge_client) if hedge_client is not None else None,
+            delay=(
+                scheduler.hedge_delay(client, self._react_config.hedge_percentile, stream)
+                if hedge_client is not None
+                else None
+            ),
+            name=provider_key(client),
         )
         if not isinstance(primary_error, Exception):
+            if hedge_won:
+                logger.info(f"[LLM] Hedged request to {provider_key(hedge_client)} won")
             return primary_error  # success — it's an LLMResponse
 
-        # Primary failed — try fallback providers
+        # Primary failed — try fallback providers (except one already hedged on)
+        tried = (client, hedge_client) if hedged else (client,)
         fallback_providers = self._react_config.fallback_providers
         if fallback_providers:
             registry = self._get_llm_registry()
@@ -89,7 +172,7 @@ class LLMManagerMixin:
                 raise primary_error
             for provider_name in fallback_providers:
                 fallback_client = registry.get(provider_name)
-                if fallback_client is None or fallback_client is client:
+                if fallback_client is None or fallback_client in tried:
                     continue
                 logger.warning(f"[LLM] Primary failed, trying fallback provider: {provider_name}")
                 try:
@@ -98,6 +181,7 @@ class LLMManagerMixin:
                         messages,
                         tool_schemas,
                         tool_choice,
+                        stream=stream,
                         **extra_kwargs,
                     )
                 except Exception as fb_err:
@@ -117,14 +201,17 @@ class LLMManagerMixin:
         messages: List[Dict[str, Any]],
         tool_schemas: Optional[List[Dict[str, Any]]],
         tool_choice: Optional[Any] = None,
+        stream: bool = False,
         **extra_kwargs,
     ) -> Any:
         """Try a single LLM client with retries.
 
-        Returns the LLMResponse on success, or the last Exception on failure.
+        Returns the LLMResponse (or :class:`LLMStream` when ``stream``) on
+        success, or the last Exception on failure.
         """
         last_error: Optional[Exception] = None
         cb = self._get_circuit_breaker(client)
+        scheduler = self._get_provider_scheduler()
 
         # Fast-fail if circuit is open
         try:
@@ -144,7 +231,20 @@ class LLMManagerMixin:
                     )
                 else:
                     logger.info("[LLM] Sending request with NO tools")
-                response = await client.chat_completion(**kwargs)
+                if stream:
+                    # The slot stays held while the caller reads the stream.
+                    lease = await scheduler.acquire(client, stream=True)
+                    try:
+                        response = await self._open_stream(client, kwargs, cb, lease.release)
+                    except BaseException:
+                        lease.release()
+                        raise
+                    lease.succeeded()
+                    logger.info("[LLM] Stream opened")
+                    cb.record_success()
+                    return response
+                async with scheduler.slot(client):
+                    response = await client.chat_completion(**kwargs)
                 # Debug: log what came back
                 tc = getattr(response, "tool_calls", None)
                 sr = getattr(response, "stop_reason", None)
@@ -163,8 +263,9 @@ class LLMManagerMixin:
                 if error_kind == LLMErrorKind.AUTH:
                     raise
 
-                # Rate limit: exponential backoff
+                # Rate limit: shrink the provider's concurrency, exponential backoff
                 if error_kind == LLMErrorKind.RATE_LIMIT:
+                    scheduler.overloaded(client)
                     delay = self._react_config.llm_retry_base_delay * (2**attempt)
                     logger.warning(f"Rate limited, retrying in {delay}s (attempt {attempt + 1})")
                     await asyncio.sleep(delay)
@@ -211,10 +312,57 @@ class LLMManagerMixin:
 
         return last_error  # type: ignore[return-value]
 
+    @staticmethod
+    async def _open_stream(
+        client: Any,
+        kwargs: Dict[str, Any],
+        cb: CircuitBreaker,
+        on_close: Optional[Callable[[], None]] = None,
+    ) -> LLMStream:
+        """Start ``client.stream_completion`` and wait for its first chunk.
+
+        Errors raised before the first chunk (connection, rate limit, auth,
+        context overflow) surface here, inside the retry loop.
+        """
+        rest = client.stream_completion(**kwargs).__aiter__()
+        try:
+            first = await rest.__anext__()
+        except StopAsyncIteration:
+            first = None
+        return LLMStream(client, first, rest, cb, on_close)
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
+    def _get_provider_scheduler(self) -> ProviderScheduler:
+        return self._provider_scheduler or get_provider_scheduler()
+
+    def _get_hedge_client(self, client: Any) -> Optional[Any]:
+        """First fallback client a slow call to ``client`` may be hedged on.
+
+        Skips providers whose circuit is open or whose concurrency limit is
+        used up, so hedging never adds load to a struggling provider.
+        """
+        if self._react_config.hedge_percentile is None:
+            return None
+        if not self._react_config.fallback_providers:
+            return None
+        registry = self._get_llm_registry()
+        if registry is None:
+            return None
+        scheduler = self._get_provider_scheduler()
+        for provider_name in self._react_config.fallback_providers:
+            candidate = registry.get(provider_name)
+            if candidate is None or candidate is client:
+                continue
+            if self._get_circuit_breaker(candidate).state == CircuitState.OPEN:
+                continue
+            if not scheduler.has_capacity(candidate):
+                continue
+            return candidate
+        return None
+
     def _get_llm_registry(self) -> Optional[Any]:
         """Return the LLMRegistry, preferring the model router's reference.
 
@@ -56,7 +56,11 @@ from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, List, Opti
 from ..constants import GENERATE_PLAN_TOOL_NAME
 from ..memory.governance import MemoryGovernance
 from ..memory.session_memory import SessionMemoryManager
-from ..memory.true_memory import extract_true_memory_proposals, format_true_memory_for_prompt
+from ..memory.true_memory import (
+    extract_true_memory_proposals,
+    format_true_memory_for_prompt,
+    looks_like_true_memory_candidate,
+)
 from ..message import Message
 from ..models import AgentToolContext
 from ..result import AgentResult, AgentStatus
@@ -95,6 +99,7 @@ logger = logging.getLogger(__name__)
 
 
 from .state_persistence import PlanStore  # noqa: E402
+from .summary_cache import SummaryCache  # noqa: E402
 from .tool_pipeline import ToolPipeline, credential_check_hook, result_audit_hook  # noqa: E402
 
 
@@ -253,6 +258,7 @@ class Orchestrator(ReactLoopMixin, ToolManagerMixin, LLMManagerMixin):
         # ReAct loop configuration
         self._react_config = react_config or ReactLoopConfig()
         self._context_manager = ContextManager(self._react_config)
+        self._summary_cache = SummaryCache(database=database)
 
         # Agent registry
         self._agent_registry: Optional[AgentRegistry] = agent_registry
@@ -285,6 +291,9 @@ class Orchestrator(ReactLoopMixin, ToolManagerMixin, LLMManagerMixin):
         from ..observability import TaskRegistry as _TR
 
         self.task_registry = task_registry or _TR(self.__class__.__name__)
+        # True-memory extractions started by post_process(), keyed by
+        # request id until the pipeline yields their proposals.
+        self._true_memory_tasks: Dict[str, asyncio.Task] = {}
 
         # Intent-recognition infrastructure.  See
         # :mod:`koa.orchestrator.intent_feedback` and
@@ -298,10 +307,29 @@ class Orchestrator(ReactLoopMixin, ToolManagerMixin, LLMManagerMixin):
             intent_feedback_store = InMemoryIntentFeedbackStore()
         self.intent_feedback_store = intent_feedback_store
         self.intent_embedding_router = intent_embedding_router
+        from .intent_analyzer import PreflightCache
+
+        self._preflight_cache = PreflightCache()
         self.enable_clarification = bool(enable_clarification)
 
+        # Telemetry writes (tool-call history, audit, intent feedback) are
+        # batched by a write-behind sink so the response path never waits
+        # on them.  Flushed on shutdown().  Spilled intent feedback is
+        # logged without the user's message.
+        from ..observability import WriteBehindSink
+        from ..observability.write_behind import log_spill
+
+        self._telemetry = WriteBehindSink(self.__class__.__name__)
+        self._telemetry.register("tool_call_history", self._write_tool_call_history)
+        self._telemetry.register(
+            "intent_feedback",
+            self._write_intent_feedback,
+            spill=log_spill("intent_feedback", omit=("user_message", "extra")),
+        )
+
         # Audit logging
         self._audit = AuditLogger()
+        self._audit.attach_sink(self._telemetry)
 
         # Tool execution pipeline with before/after hooks
         self._tool_pipeline = ToolPipeline(idempotency_store=self.idempotency_store)
@@ -382,8 +410,16 @@ class Orchestrator(ReactLoopMixin, ToolManagerMixin, LLMManagerMixin):
             await self.task_registry.cancel_all(timeout=5.0)
         except Exception as exc:
             logger.warning("task_registry.cancel_all failed: %s", exc)
+        # Then write out buffered telemetry while the database is still up.
+        try:
+            await self._telemetry.aclose(timeout=5.0)
+        except Exception as exc:
+            logger.warning("telemetry flush failed: %s", exc)
         if self.trigger_engine:
             await self.trigger_engine.stop()
+        gate = getattr(self, "tenant_gate", None)
+        if gate is not None and hasattr(gate, "aclose"):
+            await gate.aclose()
         await self.agent_pool.close()
         if self._agent_registry:
             await self._agent_registry.shutdown()
@@ -454,6 +490,9 @@ class Orchestrator(ReactLoopMixin, ToolManagerMixin, LLMManagerMixin):
         async for event in self._execute_message(tenant_id, message, images, metadata):
             if event.type == EventType.EXECUTION_END:
                 result = event.data
+            elif event.type == EventType.TRUE_MEMORY_PROPOSALS and result is not None:
+                existing = result.metadata.get("true_memory_proposals", [])
+                result.metadata["true_memory_proposals"] = existing + event.data["proposals"]
         return result
 
     # ==========================================================================
@@ -502,8 +541,12 @@ class Orchestrator(ReactLoopMixin, ToolManagerMixin, LLMManagerMixin):
         Both ``handle_message`` (consumes silently) and ``stream_message``
         (yields to caller) delegate to this single implementation.
 
-        The final event is always EXECUTION_END carrying an ``AgentResult``
-        in ``event.data`` so that ``handle_message`` can return it directly.
+        The last event of the turn is EXECUTION_END carrying an
+        ``AgentResult`` in ``event.data`` so that ``handle_message`` can
+        return it directly.  When post_process() started a true-memory
+        extraction, a TRUE_MEMORY_PROPOSALS event with
+        ``{"proposals": [...]}`` follows once it finishes (only if there are
+        proposals), so the extra LLM call never delays the answer.
 
         Admission control:
             The optional :class:`~koa.tenant_gate.TenantGate` (injected via
@@ -521,56 +564,65 @@ class Orchestrator(ReactLoopMixin, ToolManagerMixin, LLMManagerMixin):
         # Bind request/tenant ContextVars so concurrent requests on the
         # same orchestrator instance don't corrupt each other's tracing.
         rid = new_request_id()
-        with bind_request_context(
-            request_id=rid,
-            tenant_id=tenant_id,
-            idempotency_key=caller_idempotency_key,
-        ):
-            with trace_span(
-                "orchestrator.execute_message",
+        try:
+            with bind_request_context(
+                request_id=rid,
                 tenant_id=tenant_id,
-                has_images=bool(images),
+                idempotency_key=caller_idempotency_key,
             ):
-                # Admission control — fail-closed if gate is configured.
-                gate = getattr(self, "tenant_gate", None)
-                if gate is not None:
-                    from ..tenant_gate import GateRejected
-
-                    try:
-                        async with gate.acquire(tenant_id) as ticket:
-                            async for ev in self._execute_message_inner(
-                                tenant_id, message, images, metadata, rid, ticket
-                            ):
-                                yield ev
-                        return
-                    except GateRejected as gr:
-                        logger.warning(
-                            "[Orchestrator] Gate rejected tenant=%s reason=%s",
-                            tenant_id,
-                            gr.reason,
-                        )
-                        yield AgentEvent(
-                            type=EventType.ERROR,
-                            data={
-                                "code": gr.reason,
-                                "error": str(gr),
-                                "retry_after": gr.retry_after,
-                            },
-                        )
-                        rejected = AgentResult(
-                            agent_type=self.__class__.__name__,
-                            status=AgentStatus.FAILED,
-                            raw_message=f"Request rejected: {gr.reason}. "
-                            f"Please retry in {gr.retry_after:.0f}s.",
-                            metadata={"gate_rejected": True, "reason": gr.reason},
-                        )
-                        yield AgentEvent(type=EventType.EXECUTION_END, data=rejected)
-                        return
-                # No gate configured — run inner pipeline directly.
-                async for ev in self._execute_message_inner(
-                    tenant_id, message, images, metadata, rid, None
+                with trace_span(
+                    "orchestrator.execute_message",
+                    tenant_id=tenant_id,
+                    has_images=bool(images),
                 ):
-                    yield ev
+                    # Admission control — fail-closed if gate is configured.
+                    gate = getattr(self, "tenant_gate", None)
+                    if gate is not None:
+                        from ..tenant_gate import GateRejected
+
+                        try:
+                            async with gate.acquire(tenant_id) as ticket:
+                                async for ev in self._execute_message_inner(
+                                    tenant_id, message, images, metadata, rid, ticket
+                                ):
+                                    yield ev
+                        except GateRejected as gr:
+                            logger.warning(
+                                "[Orchestrator] Gate rejected tenant=%s reason=%s",
+                                tenant_id,
+                                gr.reason,
+                            )
+                            yield AgentEvent(
+                                type=EventType.ERROR,
+                                data={
+                                    "code": gr.reason,
+                                    "error": str(gr),
+                                    "retry_after": gr.retry_after,
+                                },
+                            )
+                            rejected = AgentResult(
+                                agent_type=self.__class__.__name__,
+                                status=AgentStatus.FAILED,
+                                raw_message=f"Request rejected: {gr.reason}. "
+                                f"Please retry in {gr.retry_after:.0f}s.",
+                                metadata={"gate_rejected": True, "reason": gr.reason},
+                            )
+                            yield AgentEvent(type=EventType.EXECUTION_END, data=rejected)
+                            return
+                    else:
+                        # No gate configured — run inner pipeline directly.
+                        async for ev in self._execute_message_inner(
+                            tenant_id, message, images, metadata, rid, None
+                        ):
+                            yield ev
+
+                    # The answer is out (and the gate slot released); deliver
+                    # deferred true-memory proposals, if any.
+                    async for ev in self._true_memory_events(rid):
+                        yield ev
+        finally:
+            # No-op unless the consumer stopped before the proposals.
+            getattr(self, "_true_memory_tasks", {}).pop(rid, None)
 
     async def _execute_message_inner(
         self,
@@ -607,16 +659,45 @@ class Orchestrator(ReactLoopMixin, ToolManagerMixin, LLMManagerMixin):
             # Step 0: Clean up stale/completed agents to prevent cross-request state leakage
             await self._cleanup_stale_agents(tenant_id)
 
-            # Step 1: Prepare context
-            context = await self.prepare_context(tenant_id, message, metadata)
-            context["request_id"] = request_id
-
-            # Store images in context so agent tools can access them (e.g. receipt scanning)
-            if images:
-                context["user_images"] = images
-
-            # Step 2: Check if should process
-            if not await self.should_process(message, context):
+            # Step 1: Prepare context.  Unless an agent is already waiting for
+            # this reply, the pre-flight classifier (Step 4) starts now: it only
+            # needs the message, history and metadata, so it runs alongside
+            # context preparation and is cancelled if Steps 2-3 end the request.
+            intent_task: Optional[asyncio.Task] = None
+            if not await self._has_waiting_agents(tenant_id):
+                intent_task = asyncio.create_task(
+                    self._analyze_intent(
+                        message,
+                        {
+                            "tenant_id": tenant_id,
+                            "metadata": metadata,
+                            "conversation_history": metadata.get("conversation_history") or [],
+                        },
+                    )
+                )
+            try:
+                context = await self.prepare_context(tenant_id, message, metadata)
+                context["request_id"] = request_id
+
+                # Store images in context so agent tools can access them (e.g. receipt scanning)
+                if images:
+                    context["user_images"] = images
+
+                # Step 2: Check if should process
+                should_process = await self.should_process(message, context)
+
+                # Step 3: Check pending agents (WAITING_FOR_INPUT / WAITING_FOR_APPROVAL)
+                agent_result = None
+                if should_process:
+                    agent_result = await self._check_pending_agents(tenant_id, message, context)
+            except BaseException:
+                if intent_task is not None:
+                    intent_task.cancel()
+                raise
+            if intent_task is not None and (not should_process or agent_result is not None):
+                intent_task.cancel()
+
+            if not should_process:
                 result = await self.reject_message(message, context)
                 yield AgentEvent(
                     type=EventType.MESSAGE_CHUNK,
@@ -625,8 +706,6 @@ class Orchestrator(ReactLoopMixin, ToolManagerMixin, LLMManagerMixin):
                 yield AgentEvent(type=EventType.EXECUTION_END, data=result)
                 return
 
-            # Step 3: Check pending agents (WAITING_FOR_INPUT / WAITING_FOR_APPROVAL)
-            agent_result = await self._check_pending_agents(tenant_id, message, context)
             if agent_result is not None:
                 # Agent still waiting or completed -> return result directly.
                 # The user's message was a response to the pending agent (e.g. an
@@ -659,8 +738,13 @@ class Orchestrator(ReactLoopMixin, ToolManagerMixin, LLMManagerMixin):
                 if speculative_tasks:
                     context["_speculative_tasks"] = speculative_tasks
 
-            # Step 4: Intent Analysis — classify domains and detect multi-intent
-            intent = await self._analyze_intent(message, context)
+            # Step 4: Intent Analysis — classify domains and detect multi-intent.
+            # Started in Step 1 unless an agent was waiting; one that turned
+            # out not to take this message leaves it to run here.
+            if intent_task is not None:
+                intent = await intent_task
+            else:
+                intent = await self._analyze_intent(message, context)
             context["intent_analysis"] = intent
             self._audit.log_phase(
                 "intent_analysis",
@@ -1105,6 +1189,23 @@ class Orchestrator(ReactLoopMixin, ToolManagerMixin, LLMManagerMixin):
     # MESSAGE BUILDING
     # ==========================================================================
 
+    async def _has_waiting_agents(self, tenant_id: str) -> bool:
+        """Whether the pool already holds an agent waiting for user input.
+
+        Cheap pre-check for :meth:`_check_pending_agents`; agents restored
+        lazily by :meth:`prepare_context` are not seen here.  Errors count
+        as "waiting", so the classifier is not started early.
+        """
+        try:
+            agents = await self.agent_pool.list_agents(tenant_id)
+        except Exception as e:
+            logger.debug(f"Waiting-agent pre-check failed for tenant={tenant_id}: {e}")
+            return True
+        return any(
+            a.status in (AgentStatus.WAITING_FOR_INPUT, AgentStatus.WAITING_FOR_APPROVAL)
+            for a in agents
+        )
+
     async def _check_pending_agents(
         self,
         tenant_id: str,
@@ -1528,14 +1629,22 @@ class Orchestrator(ReactLoopMixin, ToolManagerMixin, LLMManagerMixin):
         Single lightweight LLM call (~200 tokens).  Pre-empted by the
         fast-path regex classifier for trivial utterances and, when
         configured, by the embedding L1 router for messages close to
-        known-intent centroids.
+        known-intent centroids.  With a ``ModelRouter`` configured the
+        same call also scores routing complexity, which the ReAct loop
+        uses instead of a separate routing call; an embedding hit has no
+        score, so the router's own classifier scores it here, still inside
+        the pre-flight stage.  LLM results are cached per tenant, message
+        and recent history.
         Falls back to all-domains on failure.
         """
         from .intent_analyzer import IntentAnalyzer
 
+        model_router = getattr(self, "_model_router", None)
         analyzer = IntentAnalyzer(
             self.llm_client,
             embedding_router=self.intent_embedding_router,
+            score_complexity=model_router is not None,
+            cache=getattr(self, "_preflight_cache", None),
         )
         history = context.get("conversation_history", [])
         metadata = context.get("metadata", {})
@@ -1543,11 +1652,19 @@ class Orchestrator(ReactLoopMixin, ToolManagerMixin, LLMManagerMixin):
             message,
             conversation_history=history,
             metadata=metadata,
+            tenant_id=context.get("tenant_id"),
         )
+        if model_router is not None and intent.source == "embedding" and intent.complexity < 0:
+            decision = await model_router.route(
+                [*(history or []), {"role": "user", "content": message}],
+                tenant_id=context.get("tenant_id"),
+            )
+            if decision.score > 0:
+                intent.complexity = decision.score
 
         logger.info(
             "[IntentAnalyzer] source=%s type=%s domains=%s "
-            "needs_memory=%s confidence=%.2f clarify=%s sub_tasks=%d",
+            "needs_memory=%s confidence=%.2f clarify=%s sub_tasks=%d complexity=%d",
             intent.source,
             intent.intent_type,
             intent.domains,
@@ -1555,6 +1672,7 @@ class Orchestrator(ReactLoopMixin, ToolManagerMixin, LLMManagerMixin):
             intent.confidence,
             intent.needs_clarification,
             len(intent.sub_tasks),
+            intent.complexity,
         )
         return intent
 
@@ -1572,25 +1690,39 @@ class Orchestrator(ReactLoopMixin, ToolManagerMixin, LLMManagerMixin):
         Intentionally swallows all exceptions — feedback recording must
         never block or fail a user request.
         """
-        store = self.intent_feedback_store
-        if store is None:
+        if self.intent_feedback_store is None:
             return
         try:
-            coro = store.record(
-                tenant_id=tenant_id,
-                user_message=intent.raw_message or "",
-                intent_type=intent.intent_type,
-                domains=list(intent.domains),
-                confidence=float(intent.confidence),
-                source=intent.source,
-                outcome=outcome,
-                parent_id=parent_id,
-                extra=extra,
+            self._telemetry.submit(
+                "intent_feedback",
+                {
+                    "tenant_id": tenant_id,
+                    "user_message": intent.raw_message or "",
+                    "intent_type": intent.intent_type,
+                    "domains": list(intent.domains),
+                    "confidence": float(intent.confidence),
+                    "source": intent.source,
+                    "outcome": outcome,
+                    "parent_id": parent_id,
+                    "extra": extra,
+                    "created_at": time.time(),
+                },
             )
-            self.task_registry.create_task(coro, name="intent_feedback")
         except Exception as exc:
             logger.debug("intent feedback record failed: %s", exc)
 
+    async def _write_intent_feedback(self, items: List[Dict[str, Any]]) -> None:
+        """Write-behind batch writer for intent feedback."""
+        store = self.intent_feedback_store
+        if store is None:
+            return
+        record_many = getattr(store, "record_many", None)
+        if record_many is not None:
+            await record_many(items)
+            return
+        for item in items:
+            await store.record(**{k: v for k, v in item.items() if k != "created_at"})
+
     async def _execute_dag(
         self,
         intent: "IntentAnalysis",
@@ -2319,21 +2451,6 @@ class Orchestrator(ReactLoopMixin, ToolManagerMixin, LLMManagerMixin):
 
             self.task_registry.create_task(_bg_momex_add(), name="momex_add")
 
-        # True Memory proposal extraction — runs synchronously so proposals
-        # are available in result.metadata before the response is returned.
-        try:
-            proposals = await extract_true_memory_proposals(
-                self.llm_client,
-                user_message=user_message,
-                assistant_response=result.raw_message or "",
-                existing_true_memory=(context.get("metadata") or {}).get("true_memory"),
-                user_profile=(context.get("metadata") or {}).get("user_profile"),
-            )
-            if proposals:
-                result.metadata["true_memory_proposals"] = proposals
-        except Exception as e:
-            logger.warning(f"True memory proposal extraction failed: {e}")
-
         # Guardrails output check
         if self.guardrails_checker and result.raw_message:
             try:
@@ -2353,8 +2470,65 @@ class Orchestrator(ReactLoopMixin, ToolManagerMixin, LLMManagerMixin):
             except Exception as e:
                 logger.error(f"Post-process hook {hook.__name__} failed: {e}")
 
+        # True Memory proposal extraction is an extra LLM call, so it only
+        # runs when the cheap gate matches, and then in the background: the
+        # pipeline yields its proposals after EXECUTION_END (see
+        # _true_memory_events).  Outside the pipeline (no request id) it
+        # runs inline and lands in result.metadata as before.
+        if looks_like_true_memory_candidate(user_message):
+            extraction = self._extract_true_memory(
+                user_message, result.raw_message or "", context.get("metadata") or {}
+            )
+            request_id = context.get("request_id")
+            if request_id:
+                self._true_memory_tasks[request_id] = self.task_registry.create_task(
+                    extraction, name="true_memory_extraction"
+                )
+            else:
+                proposals = await extraction
+                if proposals:
+                    result.metadata["true_memory_proposals"] = proposals
+
         return result
 
+    async def _extract_true_memory(
+        self,
+        user_message: str,
+        assistant_response: str,
+        metadata: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        """Run true-memory proposal extraction; never raises."""
+        try:
+            proposals = await extract_true_memory_proposals(
+                self.llm_client,
+                user_message=user_message,
+                assistant_response=assistant_response,
+                existing_true_memory=metadata.get("true_memory"),
+                user_profile=metadata.get("user_profile"),
+            )
+        except Exception as e:
+            logger.warning(f"True memory proposal extraction failed: {e}")
+            return []
+        self._audit.log_phase("true_memory_extraction", {"proposals": len(proposals)})
+        return proposals
+
+    async def _true_memory_events(self, request_id: str) -> AsyncIterator[AgentEvent]:
+        """Wait for the request's deferred extraction and yield its proposals."""
+        task = getattr(self, "_true_memory_tasks", {}).pop(request_id, None)
+        if task is None:
+            return
+        try:
+            proposals = await task
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+            return  # cancelled by shutdown
+        if proposals:
+            yield AgentEvent(
+                type=EventType.TRUE_MEMORY_PROPOSALS,
+                data={"proposals": proposals},
+            )
+
     # ==========================================================================
     # CALLBACK SYSTEM
     # ==========================================================================
@@ -50,6 +50,9 @@ class ReactLoopConfig:
     """Max LLM call retries on transient errors."""
     llm_retry_base_delay: float = 1.0
     """Retry base delay in seconds (used for exponential back-off)."""
+    stream_llm: bool = False
+    """Stream ReAct LLM calls: the final answer is emitted token by token and
+    each tool call starts executing as soon as its arguments are complete."""
 
     # complete_task enforcement
     max_complete_task_retries: int = 3
@@ -63,6 +66,10 @@ class ReactLoopConfig:
     fallback_providers: List[str] = field(default_factory=list)
     """Ordered list of LLMRegistry provider names to try when the primary
     model fails after exhausting retries. Example: ["anthropic_main", "deepseek"]."""
+    hedge_percentile: Optional[float] = None
+    """Latency percentile (e.g. 95.0) of the primary provider after which the
+    same request is also sent to the first available fallback provider; the
+    slower call is cancelled. None disables hedging."""
 
     # Planning
     planning_score_threshold: int = 40
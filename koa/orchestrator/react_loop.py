@@ -11,9 +11,11 @@ import logging
 import random
 import time
 from collections import namedtuple
-from typing import Any, AsyncIterator, Dict, List, Optional
+from typing import Any, AsyncIterator, Collection, Dict, List, Optional, Set
 
 from ..constants import GENERATE_PLAN_SCHEMA
+from ..llm.base import LLMResponse, StopReason
+from ..llm.response_cache import cached_completion
 from ..llm.tool_validator import ToolSchemaValidator
 from ..models import ToolOutput
 from ..streaming.models import AgentEvent, EventType
@@ -27,6 +29,8 @@ from .react_config import (
     TokenUsage,
     ToolCallRecord,
 )
+from .stream_assembly import JSONStringFieldDecoder, ToolCallAssembler
+from .summary_cache import prefix_digests
 from .transcript_repair import repair_transcript
 
 logger = logging.getLogger(__name__)
@@ -34,6 +38,21 @@ logger = logging.getLogger(__name__)
 TimedResult = namedtuple("TimedResult", ["result", "duration_ms"])
 
 
+@dataclasses.dataclass
+class _StreamedTurn:
+    """What a streamed LLM call produced, for the rest of the turn."""
+
+    response: Optional[LLMResponse] = None
+    # Tool executions started while the model was still streaming, by call id
+    tool_tasks: Dict[str, "asyncio.Task"] = dataclasses.field(default_factory=dict)
+    # Answer text already sent to the user as MESSAGE_CHUNKs (complete only)
+    answer: Optional[str] = None
+    message_open: bool = False
+
+    def already_sent(self, text: str) -> bool:
+        return self.answer is not None and self.answer == text
+
+
 class _ReactLoopLLMError(Exception):
     """Raised when the ReAct loop LLM call fails after all retries.
 
@@ -85,10 +104,12 @@ class ReactLoopMixin:
     - ``llm_client``
     - ``_react_config``
     - ``_context_manager``
+    - ``_summary_cache`` (``SummaryCache``, optional)
     - ``_model_router``
     - ``_audit``
     - ``agent_pool``
     - ``database``
+    - ``_telemetry`` (``WriteBehindSink``)
     - ``_tenant_plans``
 
     Also expects the following methods (from other mixins or Orchestrator):
@@ -124,6 +145,204 @@ class ReactLoopMixin:
                 await asyncio.sleep(0)  # yield control so SSE can flush
         yield AgentEvent(type=EventType.MESSAGE_END, data={})
 
+    async def _stream_llm_turn(
+        self,
+        streamed: _StreamedTurn,
+        messages: List[Dict[str, Any]],
+        tool_schemas: Optional[List[Dict[str, Any]]],
+        turn: int,
+        execute: Any,
+        early_tools: Collection[str] = (),
+        **llm_kwargs,
+    ) -> AsyncIterator[AgentEvent]:
+        """Streaming LLM call for one turn (``ReactLoopConfig.stream_llm``).
+
+        While the model is still generating:
+
+        - the ``complete_task`` ``result`` argument is decoded and sent as
+          MESSAGE_CHUNK events, as long as no other tool call precedes it;
+        - every tool call named in ``early_tools`` that passes schema
+          validation is started with ``execute`` as soon as its arguments
+          are complete, and its task is stored in ``streamed.tool_tasks``
+          for the turn to await.  Other calls wait for the turn as usual.
+
+        The assembled :class:`LLMResponse` is left in ``streamed.response``.
+        Errors before the first chunk are retried like a normal call; after
+        that they cancel the started tools and propagate.
+        """
+        stream = await self._llm_call_with_retry(messages, tool_schemas, stream=True, **llm_kwargs)
+        validator = ToolSchemaValidator.from_openai_tools(tool_schemas) if tool_schemas else None
+        assembler = ToolCallAssembler()
+        calls: List[Any] = []
+        final_calls = None
+        content: List[str] = []
+        usage = None
+        stop_reason = StopReason.END_TURN
+        answer: Optional[JSONStringFieldDecoder] = None
+        answer_index = -1
+        other_call_seen = False
+
+        try:
+            async for chunk in stream:
+                if chunk.content:
+                    content.append(chunk.content)
+                if chunk.tool_calls:
+                    final_calls = chunk.tool_calls
+                if chunk.usage:
+                    usage = chunk.usage
+                if chunk.stop_reason:
+                    stop_reason = chunk.stop_reason
+                if not chunk.tool_call_deltas:
+                    continue
+
+                for delta in chunk.tool_call_deltas:
+                    if not delta.name:
+                        continue
+                    if delta.name != COMPLETE_TASK_TOOL_NAME:
+                        other_call_seen = True
+                    elif answer is None and not other_call_seen:
+                        answer = JSONStringFieldDecoder("result")
+                        answer_index = delta.index
+                for tc in assembler.feed(chunk.tool_call_deltas):
+                    calls.append(tc)
+                    self._start_streamed_tool(streamed, tc, validator, execute, early_tools)
+
+                if answer is None or answer.done:
+                    continue
+                text = answer.feed(assembler.arguments(answer_index))
+                if text:
+                    if not streamed.message_open:
+                        streamed.message_open = True
+                        yield AgentEvent(type=EventType.MESSAGE_START, data={"turn": turn})
+                    yield AgentEvent(type=EventType.MESSAGE_CHUNK, data={"chunk": text})
+                if answer.done and streamed.message_open:
+                    streamed.message_open = False
+                    streamed.answer = answer.value
+                    yield AgentEvent(type=EventType.MESSAGE_END, data={})
+        except Exception:
+            self._cancel_streamed_tools(streamed)
+            if streamed.message_open:
+                streamed.message_open = False
+                yield AgentEvent(type=EventType.MESSAGE_END, data={})
+            raise
+        finally:
+            await stream.aclose()
+
+        for tc in assembler.finish():
+            calls.append(tc)
+            self._start_streamed_tool(streamed, tc, validator, execute, early_tools)
+        if streamed.message_open:
+            # Stream ended inside the answer (e.g. max_tokens)
+            streamed.message_open = False
+            yield AgentEvent(type=EventType.MESSAGE_END, data={})
+
+        # Clients that only report assembled calls on the final chunk
+        tool_calls = calls if assembler else final_calls
+        streamed.response = LLMResponse(
+            content="".join(content),
+            tool_calls=tool_calls or None,
+            stop_reason=stop_reason,
+            usage=usage,
+            model=getattr(getattr(stream.client, "config", None), "model", None),
+        )
+
+    async def _stream_text_reply(
+        self,
+        streamed: _StreamedTurn,
+        messages: List[Dict[str, Any]],
+        turn: int,
+        llm_client_override: Optional[Any] = None,
+    ) -> AsyncIterator[AgentEvent]:
+        """Stream a tool-less reply straight to the user as MESSAGE_CHUNKs."""
+        stream = await self._llm_call_with_retry(
+            messages,
+            tool_schemas=None,
+            llm_client_override=llm_client_override,
+            stream=True,
+        )
+        parts: List[str] = []
+        usage = None
+        stop_reason = StopReason.END_TURN
+        try:
+            async for chunk in stream:
+                if chunk.usage:
+                    usage = chunk.usage
+                if chunk.stop_reason:
+                    stop_reason = chunk.stop_reason
+                if not chunk.content:
+                    continue
+                if not streamed.message_open:
+                    streamed.message_open = True
+                    yield AgentEvent(type=EventType.MESSAGE_START, data={"turn": turn})
+                parts.append(chunk.content)
+                yield AgentEvent(type=EventType.MESSAGE_CHUNK, data={"chunk": chunk.content})
+        except Exception:
+            if streamed.message_open:
+                streamed.message_open = False
+                yield AgentEvent(type=EventType.MESSAGE_END, data={})
+            raise
+        finally:
+            await stream.aclose()
+        if streamed.message_open:
+            streamed.message_open = False
+            yield AgentEvent(type=EventType.MESSAGE_END, data={})
+
+        text = "".join(parts)
+        streamed.answer = text or None
+        streamed.response = LLMResponse(
+            content=text,
+            stop_reason=stop_reason,
+            usage=usage,
+            model=getattr(getattr(stream.client, "config", None), "model", None),
+        )
+
+    @staticmethod
+    def _start_streamed_tool(
+        streamed: _StreamedTurn,
+        tc: Any,
+        validator: Optional[ToolSchemaValidator],
+        execute: Any,
+        early_tools: Collection[str],
+    ) -> None:
+        """Start a streamed tool call early if the turn would run it anyway.
+
+        Calls that fail validation are left alone: the turn rejects them
+        and reports the error back to the model as usual.
+        """
+        if tc.name == COMPLETE_TASK_TOOL_NAME or tc.name not in early_tools:
+            return
+        if not tc.id or tc.id in streamed.tool_tasks:
+            return
+        if validator is None or not isinstance(tc.arguments, dict):
+            return
+        if not validator.validate(tc.name, tc.arguments).ok:
+            return
+        logger.info(f"[ReAct] Starting {tc.name} while the model is still streaming")
+        streamed.tool_tasks[tc.id] = asyncio.create_task(execute(tc))
+
+    def _early_start_tools(self, request_tools: Optional[List]) -> Set[str]:
+        """Names of tools that may start while the model is still streaming.
+
+        A stream can fail after such a call has started; the call is then
+        cancelled and the whole loop may be re-run on a fallback model.  Only
+        read-only or idempotent builtin tools that need no approval are safe
+        to run (or half-run) twice.
+        """
+        tools = request_tools if request_tools is not None else getattr(self, "builtin_tools", [])
+        return {
+            t.name
+            for t in tools or []
+            if (t.read_only or t.idempotent) and not t.needs_approval
+        }
+
+    @staticmethod
+    def _cancel_streamed_tools(streamed: Optional[_StreamedTurn]) -> None:
+        if not streamed:
+            return
+        for task in streamed.tool_tasks.values():
+            task.cancel()
+        streamed.tool_tasks.clear()
+
     async def _react_loop_events(
         self,
         messages: List[Dict[str, Any]],
@@ -184,12 +403,22 @@ class ReactLoopMixin:
 
         # Model routing: classify once before the loop, reuse for all turns.
         # If a model-level override is provided (e.g. from fallback), use it
-        # directly and skip routing.
+        # directly and skip routing.  A score from the pre-flight intent
+        # analysis of this same message replaces the router's own call.
         routed_llm_client = _llm_client_override
         routing_score = -1
         if routed_llm_client is None and self._model_router:
+            intent = (context or {}).get("intent_analysis")
+            preflight_score = -1
+            if intent is not None and intent.raw_message == user_message:
+                preflight_score = getattr(intent, "complexity", -1)
             try:
-                decision = await self._model_router.route(messages)
+                if preflight_score > 0:
+                    decision = self._model_router.route_score(
+                        preflight_score, reasoning=f"preflight ({intent.source})"
+                    )
+                else:
+                    decision = await self._model_router.route(messages, tenant_id=tenant_id)
                 routing_score = decision.score
                 routed_llm_client = self._model_router.registry.get(decision.provider)
                 if routed_llm_client:
@@ -297,6 +526,58 @@ class ReactLoopMixin:
             except Exception as e:
                 logger.warning(f"[ReAct] Planning phase failed, proceeding without plan: {e}")
 
+        # Per-tool timed execution, shared by all turns.  When speculative
+        # tasks exist (image requests), check if a matching result is
+        # already available before executing.
+        speculative = (context or {}).get("_speculative_tasks", {})
+
+        async def _timed_execute(tc):
+            t0 = time.monotonic()
+
+            # Try to reuse a speculative result
+            if speculative and tc.name == "google_search":
+                try:
+                    args = (
+                        tc.arguments if isinstance(tc.arguments, dict) else json.loads(tc.arguments)
+                    )
+                except (json.JSONDecodeError, TypeError):
+                    args = {}
+                search_type = args.get("search_type", "web")
+                spec_key = f"google_search:{search_type}"
+                spec_task = speculative.pop(spec_key, None)
+                if spec_task is not None:
+                    try:
+                        result = await spec_task
+                        if result is not None:
+                            elapsed = int((time.monotonic() - t0) * 1000)
+                            logger.info(
+                                f"[Speculative] ♻️  Reused {spec_key} "
+                                f"(waited {elapsed}ms for pre-started task)"
+                            )
+                            return TimedResult(result=result, duration_ms=elapsed)
+                    except Exception as e:
+                        logger.info(f"[Speculative] {spec_key} failed, falling back: {e}")
+
+            # Normal execution path
+            try:
+                r = await self._execute_with_timeout(
+                    tc,
+                    tenant_id,
+                    metadata=metadata,
+                    request_tools=request_tools,
+                    request_context=context,
+                )
+            except BaseException as exc:
+                return TimedResult(result=exc, duration_ms=int((time.monotonic() - t0) * 1000))
+            return TimedResult(result=r, duration_ms=int((time.monotonic() - t0) * 1000))
+
+        streamed: Optional[_StreamedTurn] = None
+        early_tools = self._early_start_tools(request_tools)
+
+        # Messages are counted once as they are appended; budget checks
+        # read the ledger's running total.
+        messages = self._context_manager.track(messages)
+
         for turn in range(1, self._react_config.max_turns + 1):
             elapsed = time.monotonic() - start_time
             if elapsed > self._react_config.react_timeout:
@@ -310,10 +591,17 @@ class ReactLoopMixin:
                 break
 
             # Context guard with summarization
-            messages = await self._summarize_and_trim(messages)
+            messages = self._context_manager.track(
+                await self._summarize_and_trim(
+                    messages,
+                    session_id=(context or {}).get("session_id") or tenant_id,
+                    tenant_id=tenant_id,
+                ),
+                like=messages,
+            )
 
             # Transcript repair before LLM call
-            messages = repair_transcript(messages)
+            messages = self._context_manager.track(repair_transcript(messages), like=messages)
 
             # LLM call
             try:
@@ -325,13 +613,29 @@ class ReactLoopMixin:
                 # Pass images only on the first turn
                 if media and turn == 1:
                     extra_kwargs["media"] = media
-                response = await self._llm_call_with_retry(
-                    messages,
-                    tool_schemas,
-                    tool_choice=tool_choice,
-                    llm_client_override=routed_llm_client,
-                    **extra_kwargs,
-                )
+                if self._react_config.stream_llm:
+                    streamed = _StreamedTurn()
+                    async for event in self._stream_llm_turn(
+                        streamed,
+                        messages,
+                        tool_schemas,
+                        turn,
+                        _timed_execute,
+                        early_tools,
+                        tool_choice=tool_choice,
+                        llm_client_override=routed_llm_client,
+                        **extra_kwargs,
+                    ):
+                        yield event
+                    response = streamed.response
+                else:
+                    response = await self._llm_call_with_retry(
+                        messages,
+                        tool_schemas,
+                        tool_choice=tool_choice,
+                        llm_client_override=routed_llm_client,
+                        **extra_kwargs,
+                    )
             except Exception as e:
                 # Classify the error to decide whether to retry at model level
                 from .error_classifier import LLMErrorKind, classify_llm_error
@@ -423,13 +727,21 @@ class ReactLoopMixin:
                             ),
                         }
                     )
+                    streamed = _StreamedTurn() if self._react_config.stream_llm else None
                     try:
-                        fallback_resp = await self._llm_call_with_retry(
-                            messages,
-                            tool_schemas=[],
-                            tool_choice=None,
-                            llm_client_override=routed_llm_client,
-                        )
+                        if streamed is not None:
+                            async for event in self._stream_text_reply(
+                                streamed, messages, turn, llm_client_override=routed_llm_client
+                            ):
+                                yield event
+                            fallback_resp = streamed.response
+                        else:
+                            fallback_resp = await self._llm_call_with_retry(
+                                messages,
+                                tool_schemas=[],
+                                tool_choice=None,
+                                llm_client_override=routed_llm_client,
+                            )
                         final_response = (
                             getattr(fallback_resp, "content", None)
                             or fallback_resp.choices[0].message.content
@@ -443,8 +755,9 @@ class ReactLoopMixin:
                         final_answer=True,
                         tenant_id=tenant_id,
                     )
-                    async for event in self._yield_chunked_response(final_response, turn):
-                        yield event
+                    if not (streamed and streamed.already_sent(final_response)):
+                        async for event in self._yield_chunked_response(final_response, turn):
+                            yield event
                     return
 
             if tool_calls:
@@ -509,8 +822,9 @@ class ReactLoopMixin:
                         final_answer=True,
                         tenant_id=tenant_id,
                     )
-                    async for event in self._yield_chunked_response(final_response, turn):
-                        yield event
+                    if not (streamed and streamed.already_sent(final_response)):
+                        async for event in self._yield_chunked_response(final_response, turn):
+                            yield event
                     break
 
                 # complete_task was called alongside other tools -- add its result
@@ -603,59 +917,14 @@ class ReactLoopMixin:
                         data={"tool_name": tc.name, "call_id": tc.id},
                     )
 
-                # Execute all tool calls concurrently with per-tool timing.
-                # When speculative tasks exist (image requests), check if a
-                # matching result is already available before executing.
-                speculative = (context or {}).get("_speculative_tasks", {})
-
-                async def _timed_execute(tc):
-                    t0 = time.monotonic()
-
-                    # Try to reuse a speculative result
-                    if speculative and tc.name == "google_search":
-                        try:
-                            args = (
-                                tc.arguments
-                                if isinstance(tc.arguments, dict)
-                                else json.loads(tc.arguments)
-                            )
-                        except (json.JSONDecodeError, TypeError):
-                            args = {}
-                        search_type = args.get("search_type", "web")
-                        spec_key = f"google_search:{search_type}"
-                        spec_task = speculative.pop(spec_key, None)
-                        if spec_task is not None:
-                            try:
-                                result = await spec_task
-                                if result is not None:
-                                    elapsed = int((time.monotonic() - t0) * 1000)
-                                    logger.info(
-                                        f"[Speculative] ♻️  Reused {spec_key} "
-                                        f"(waited {elapsed}ms for pre-started task)"
-                                    )
-                                    return TimedResult(result=result, duration_ms=elapsed)
-                            except Exception as e:
-                                logger.info(f"[Speculative] {spec_key} failed, falling back: {e}")
-
-                    # Normal execution path
-                    try:
-                        r = await self._execute_with_timeout(
-                            tc,
-                            tenant_id,
-                            metadata=metadata,
-                            request_tools=request_tools,
-                            request_context=context,
-                        )
-                    except BaseException as exc:
-                        return TimedResult(
-                            result=exc, duration_ms=int((time.monotonic() - t0) * 1000)
-                        )
-                    return TimedResult(result=r, duration_ms=int((time.monotonic() - t0) * 1000))
-
                 # Execute tools eagerly: yield results as each completes
                 # instead of waiting for all to finish (asyncio.gather).
+                # In streaming mode most calls are already running.
+                started = streamed.tool_tasks if streamed else {}
+
                 async def _timed_with_index(idx, tc):
-                    return (idx, await _timed_execute(tc))
+                    task = started.pop(tc.id, None) if tc.id else None
+                    return (idx, await (task if task is not None else _timed_execute(tc)))
 
                 # Token attribution for this turn
                 turn_tokens = None
@@ -893,8 +1162,9 @@ class ReactLoopMixin:
                         final_answer=True,
                         tenant_id=tenant_id,
                     )
-                    async for event in self._yield_chunked_response(final_response, turn):
-                        yield event
+                    if not (streamed and streamed.already_sent(final_response)):
+                        async for event in self._yield_chunked_response(final_response, turn):
+                            yield event
                     break
 
                 # Watchdog: detect loops (enhanced with args + result hashes)
@@ -985,12 +1255,20 @@ class ReactLoopMixin:
                     ),
                 }
             )
+            streamed = _StreamedTurn() if self._react_config.stream_llm else None
             try:
-                response = await self._llm_call_with_retry(
-                    messages,
-                    tool_schemas=None,
-                    llm_client_override=routed_llm_client,
-                )
+                if streamed is not None:
+                    async for event in self._stream_text_reply(
+                        streamed, messages, turn, llm_client_override=routed_llm_client
+                    ):
+                        yield event
+                    response = streamed.response
+                else:
+                    response = await self._llm_call_with_retry(
+                        messages,
+                        tool_schemas=None,
+                        llm_client_override=routed_llm_client,
+                    )
                 final_text = response.content or ""
                 usage = getattr(response, "usage", None)
                 if usage:
@@ -1001,17 +1279,18 @@ class ReactLoopMixin:
                 final_text = "I was unable to complete the request within the allowed turns."
 
             final_response = final_text
-            async for event in self._yield_chunked_response(final_text, turn):
-                yield event
+            if not (streamed and streamed.already_sent(final_text)):
+                async for event in self._yield_chunked_response(final_text, turn):
+                    yield event
 
         duration_ms = int((time.monotonic() - start_time) * 1000)
 
         # Cancel any speculative tasks that were not consumed
-        speculative = (context or {}).get("_speculative_tasks", {})
         for key, task in speculative.items():
             if task and not task.done():
                 task.cancel()
                 logger.info(f"[Speculative] Cancelled unused task: {key}")
+        self._cancel_streamed_tools(streamed)
 
         yield AgentEvent(
             type=EventType.EXECUTION_END,
@@ -1037,23 +1316,46 @@ class ReactLoopMixin:
         tenant_id: str,
         tool_calls: list,
     ) -> None:
-        """Persist tool call records to the database (fire-and-forget)."""
+        """Queue tool call records for the database (fire-and-forget).
+
+        Rows go to the orchestrator's write-behind sink (``_telemetry``)
+        and are inserted in batches by :meth:`_write_tool_call_history`.
+        """
         if not self.database or not tool_calls:
             return
         try:
-            from ..builtin_agents.tools.action_history import save_tool_call_history
+            from ..builtin_agents.tools.action_history import tool_call_history_rows
 
-            await save_tool_call_history(self.database, tenant_id, tool_calls)
+            for row in tool_call_history_rows(tenant_id, tool_calls):
+                self._telemetry.submit("tool_call_history", row)
         except Exception as e:
             logger.warning(f"Failed to save tool call history: {e}")
 
-    async def _summarize_and_trim(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def _write_tool_call_history(self, rows: list) -> None:
+        """Write-behind batch writer for ``tool_call_history`` rows."""
+        if not self.database:
+            return
+        from ..builtin_agents.tools.action_history import insert_tool_call_history_rows
+
+        await insert_tool_call_history_rows(self.database, rows)
+
+    async def _summarize_and_trim(
+        self,
+        messages: List[Dict[str, Any]],
+        session_id: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
         """Summarize old messages via LLM before trimming, preserving context.
 
         If context is within threshold, returns messages unchanged.
         Otherwise, splits messages into old/recent, summarizes old via LLM,
         and replaces them with a single summary message.
         Falls back to simple trim if summarization fails.
+
+        With a ``session_id`` and a ``_summary_cache``, a summary of the same
+        old prefix is reused without an LLM call, and a summary of a shorter
+        prefix is extended with just the messages aged out since.  The
+        summarizer call itself goes through the tenant's LLM response cache.
         """
         split = self._context_manager.split_for_summarization(messages)
         if split is None:
@@ -1061,15 +1363,32 @@ class ReactLoopMixin:
 
         system_msgs, old_msgs, recent_msgs = split
 
+        cache = getattr(self, "_summary_cache", None) if session_id else None
+        digests: List[str] = []
+        base_count, base_summary = 0, ""
+        if cache is not None:
+            digests = prefix_digests(old_msgs)
+            cached = await cache.lookup(tenant_id or "", session_id, digests)
+            if cached is not None:
+                base_count, base_summary = cached
+        if base_count == len(old_msgs):
+            logger.info(f"[Context] Reused cached summary of {base_count} old messages")
+            return self._context_manager.build_summarized_messages(
+                system_msgs,
+                base_summary,
+                recent_msgs,
+            )
+        new_msgs = old_msgs[base_count:]
+
         # Token-budget-aware truncation: allocate a per-message budget
         # based on the summarizer's total budget rather than a fixed
         # character count.  This preserves more content from tool results
         # that carry important data in the second half.
         SUMMARIZER_BUDGET_CHARS = 12_000  # ~3k tokens for the summarizer input
-        per_msg_budget = max(200, SUMMARIZER_BUDGET_CHARS // max(len(old_msgs), 1))
+        per_msg_budget = max(200, SUMMARIZER_BUDGET_CHARS // max(len(new_msgs), 1))
 
         old_text_parts = []
-        for msg in old_msgs:
+        for msg in new_msgs:
             role = msg.get("role", "unknown")
             content = msg.get("content", "")
             if isinstance(content, str) and content:
@@ -1085,6 +1404,12 @@ class ReactLoopMixin:
                 old_text_parts.append(f"{role}: {content}")
 
         if not old_text_parts:
+            if base_summary:
+                return self._context_manager.build_summarized_messages(
+                    system_msgs,
+                    base_summary,
+                    recent_msgs,
+                )
             return self._context_manager.trim_if_needed(messages)
 
         old_text = "\n".join(old_text_parts)
@@ -1092,28 +1417,42 @@ class ReactLoopMixin:
         if len(old_text) > SUMMARIZER_BUDGET_CHARS:
             old_text = old_text[:SUMMARIZER_BUDGET_CHARS] + "\n...[truncated]"
 
+        instructions = (
+            "Summarize the following conversation excerpt. Preserve:\n"
+            "- All specific data values (names, dates, numbers, IDs, URLs)\n"
+            "- Tool call results and their key findings\n"
+            "- Decisions made and actions taken\n"
+            "Keep the summary concise but factual. Use bullet points for structured data."
+        )
+        if base_summary:
+            # Fold only the newly aged-out messages into the cached summary
+            instructions += (
+                "\nThe excerpt continues a conversation already summarized below. "
+                "Return one updated summary covering both.\n\n"
+                f"[Existing summary]\n{base_summary}"
+            )
+
         try:
-            summary_response = await self.llm_client.chat_completion(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "Summarize the following conversation excerpt. Preserve:\n"
-                            "- All specific data values (names, dates, numbers, IDs, URLs)\n"
-                            "- Tool call results and their key findings\n"
-                            "- Decisions made and actions taken\n"
-                            "Keep the summary concise but factual. Use bullet points for structured data."
-                        ),
-                    },
+            summary_response = await cached_completion(
+                self.llm_client,
+                [
+                    {"role": "system", "content": instructions},
                     {"role": "user", "content": old_text},
                 ],
+                scope="context_summary",
+                tenant_id=tenant_id,
             )
             summary = (summary_response.content or "").strip()
             if summary:
+                extended = f", extending {base_count} cached" if base_count else ""
                 logger.info(
-                    f"[Context] Summarized {len(old_msgs)} old messages "
-                    f"({len(old_text)} chars -> {len(summary)} chars)"
+                    f"[Context] Summarized {len(new_msgs)} old messages "
+                    f"({len(old_text)} chars -> {len(summary)} chars{extended})"
                 )
+                if cache is not None:
+                    await cache.store(
+                        tenant_id or "", session_id, digests[-1], len(old_msgs), summary
+                    )
                 return self._context_manager.build_summarized_messages(
                     system_msgs,
                     summary,
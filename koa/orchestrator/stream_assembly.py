@@ -0,0 +1,156 @@
+"""Incremental assembly of streamed LLM output for the ReAct loop.
+
+Used by the streaming mode of ``ReactLoopMixin`` (see
+``ReactLoopConfig.stream_llm``):
+
+- :class:`ToolCallAssembler` stitches ``ToolCallDelta`` fragments back
+  into :class:`~koa.llm.base.ToolCall` objects and reports each call as
+  soon as it is complete, so its execution can start while the model is
+  still streaming later calls.
+- :class:`JSONStringFieldDecoder` decodes one string field (the
+  ``complete_task`` ``result``) out of a JSON object that is still being
+  streamed, so the final answer reaches the user token by token.
+"""
+
+import json
+import re
+from typing import Dict, Iterable, List, Optional
+
+from ..llm.base import ToolCall, ToolCallDelta
+
+_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+def _hex(digits: str) -> Optional[int]:
+    try:
+        return int(digits, 16)
+    except ValueError:
+        return None
+
+
+class ToolCallAssembler:
+    """Rebuild tool calls from streamed fragments.
+
+    Providers stream tool calls one after another, so a call is complete
+    once a fragment for a later index arrives, or when the stream ends.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[int, Dict[str, str]] = {}
+        self._emitted: set = set()
+
+    def __bool__(self) -> bool:
+        return bool(self._calls)
+
+    def feed(self, deltas: Iterable[ToolCallDelta]) -> List[ToolCall]:
+        """Add fragments; returns calls that became complete, in order."""
+        newest = -1
+        for delta in deltas:
+            call = self._calls.setdefault(delta.index, {"id": "", "name": "", "arguments": ""})
+            if delta.id:
+                call["id"] = delta.id
+            if delta.name:
+                call["name"] = delta.name
+            if delta.arguments:
+                call["arguments"] += delta.arguments
+            newest = max(newest, delta.index)
+        return self._emit(lambda idx: idx < newest)
+
+    def finish(self) -> List[ToolCall]:
+        """End of stream: returns every call not yet reported."""
+        return self._emit(lambda idx: True)
+
+    def name(self, index: int) -> str:
+        return self._calls.get(index, {}).get("name", "")
+
+    def arguments(self, index: int) -> str:
+        """Arguments text received so far for ``index``."""
+        return self._calls.get(index, {}).get("arguments", "")
+
+    def _emit(self, ready) -> List[ToolCall]:
+        done: List[ToolCall] = []
+        for idx in sorted(self._calls):
+            if idx in self._emitted or not ready(idx):
+                continue
+            self._emitted.add(idx)
+            call = self._calls[idx]
+            raw = call["arguments"]
+            try:
+                arguments = json.loads(raw) if raw else {}
+            except json.JSONDecodeError:
+                # Keep the raw text; the loop's schema validation rejects it
+                # and the model gets a chance to correct itself.
+                arguments = raw
+            done.append(ToolCall(id=call["id"], name=call["name"], arguments=arguments))
+        return done
+
+
+class JSONStringFieldDecoder:
+    """Decode a top-level string field from a growing JSON object text.
+
+    Call :meth:`feed` with the full text received so far; it returns the
+    newly decoded part of the field's value.  Escape sequences split
+    across fragments are held back until complete.
+    """
+
+    def __init__(self, field: str) -> None:
+        self._start = re.compile(r'[{,]\s*"' + re.escape(field) + r'"\s*:\s*"')
+        self._pos: Optional[int] = None  # next undecoded index in the text
+        self.done = False
+        self.value = ""
+
+    def feed(self, text: str) -> str:
+        if self.done:
+            return ""
+        if self._pos is None:
+            match = self._start.search(text)
+            if match is None:
+                return ""
+            self._pos = match.end()
+
+        out: List[str] = []
+        pos, end = self._pos, len(text)
+        while pos < end:
+            ch = text[pos]
+            if ch == '"':
+                self.done = True
+                pos += 1
+                break
+            if ch != "\\":
+                out.append(ch)
+                pos += 1
+                continue
+            if pos + 1 >= end:
+                break
+            esc = text[pos + 1]
+            if esc != "u":
+                out.append(_ESCAPES.get(esc, esc))
+                pos += 2
+                continue
+            if pos + 6 > end:
+                break
+            code = _hex(text[pos + 2 : pos + 6])
+            if code is not None and 0xD800 <= code < 0xDC00:
+                # High surrogate: wait for the low half
+                if pos + 12 > end:
+                    break
+                low = _hex(text[pos + 8 : pos + 12])
+                if low is not None and 0xDC00 <= low < 0xE000:
+                    out.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                    pos += 12
+                    continue
+            out.append(chr(code) if code is not None else text[pos : pos + 6])
+            pos += 6
+        self._pos = pos
+        decoded = "".join(out)
+        self.value += decoded
+        return decoded
@@ -0,0 +1,169 @@
+"""Rolling-summary cache for ReAct context compaction.
+
+``_summarize_and_trim`` replaces the aged-out prefix of an over-budget
+history with an LLM summary.  Long sessions resend the same prefix on
+every request, so the summary is cached per tenant session under a hash
+of the summarized messages.  The hash is a chain over the prefix (see
+:func:`prefix_digests`), so when the history grows the longest cached
+prefix is found in one pass and only the newly aged-out messages are
+folded into its summary.
+
+Two tiers, same shape as :class:`~koa.orchestrator.state_persistence.PlanStore`:
+a bounded in-memory LRU, and the ``tenant_default.context_summaries`` table
+when a database is configured so summaries survive restarts and are shared by
+replicas.  Database errors are logged and the cache degrades to memory.
+"""
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_HASHED_FIELDS = ("role", "content", "tool_calls", "tool_call_id", "name")
+
+
+def _canonical(message: Dict[str, Any]) -> str:
+    fields = {k: message.get(k) for k in _HASHED_FIELDS if message.get(k) is not None}
+    content = fields.get("content")
+    if isinstance(content, list):
+        # Prompt-cache markers are added per request; they are not content.
+        fields["content"] = [
+            (
+                {k: v for k, v in part.items() if k != "cache_control"}
+                if isinstance(part, dict)
+                else part
+            )
+            for part in content
+        ]
+    return json.dumps(fields, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def prefix_digests(messages: List[Dict[str, Any]]) -> List[str]:
+    """Chained digests: element ``i`` identifies ``messages[: i + 1]``."""
+    digests: List[str] = []
+    previous = ""
+    for message in messages:
+        previous = hashlib.sha256(
+            (previous + "\x00" + _canonical(message)).encode("utf-8")
+        ).hexdigest()
+        digests.append(previous)
+    return digests
+
+
+class SummaryCache:
+    """Summaries of message prefixes, keyed by ``(tenant_id, session_id, digest)``.
+
+    Args:
+        database: Optional :class:`koa.db.Database` for the shared tier.
+        max_entries: Bound on the in-memory tier (least recently used
+            entries are evicted).
+        keep_per_session: Rows kept per session in the database tier.
+    """
+
+    def __init__(
+        self,
+        database: Optional[Any] = None,
+        max_entries: int = 1024,
+        keep_per_session: int = 8,
+    ) -> None:
+        self._db = database
+        self.max_entries = max_entries
+        self.keep_per_session = keep_per_session
+        self._memory: "OrderedDict[Tuple[str, str, str], Tuple[int, str]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    async def lookup(
+        self, tenant_id: str, session_id: str, digests: List[str]
+    ) -> Optional[Tuple[int, str]]:
+        """Return ``(message_count, summary)`` for the longest cached prefix."""
+        best: Optional[Tuple[int, str]] = None
+        for count in range(len(digests), 0, -1):
+            key = (tenant_id, session_id, digests[count - 1])
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                best = entry
+                break
+
+        if self._db is None or (best is not None and best[0] == len(digests)):
+            return best
+
+        longer = digests[best[0] if best else 0 :]
+        try:
+            row = await self._db.fetchrow(
+                """
+                SELECT message_count, summary FROM tenant_default.context_summaries
+                WHERE tenant_id = $1 AND session_id = $2 AND prefix_hash = ANY($3::text[])
+                ORDER BY message_count DESC
+                LIMIT 1
+                """,
+                tenant_id,
+                session_id,
+                longer,
+            )
+        except Exception as e:
+            logger.warning(f"[SummaryCache] Failed to load summary for {session_id}: {e}")
+            return best
+        if row is None:
+            return best
+        entry = (int(row["message_count"]), row["summary"])
+        self._remember(tenant_id, session_id, digests[entry[0] - 1], entry)
+        return entry
+
+    async def store(
+        self,
+        tenant_id: str,
+        session_id: str,
+        digest: str,
+        message_count: int,
+        summary: str,
+    ) -> None:
+        """Cache the summary of the ``message_count``-message prefix ``digest``."""
+        self._remember(tenant_id, session_id, digest, (message_count, summary))
+        if self._db is None:
+            return
+        try:
+            await self._db.execute(
+                """
+                INSERT INTO tenant_default.context_summaries
+                    (tenant_id, session_id, prefix_hash, message_count, summary, updated_at)
+                VALUES ($1, $2, $3, $4, $5, NOW())
+                ON CONFLICT (tenant_id, session_id, prefix_hash)
+                DO UPDATE SET summary = EXCLUDED.summary, updated_at = NOW()
+                """,
+                tenant_id,
+                session_id,
+                digest,
+                message_count,
+                summary,
+            )
+            await self._db.execute(
+                """
+                DELETE FROM tenant_default.context_summaries
+                WHERE tenant_id = $1 AND session_id = $2 AND prefix_hash NOT IN (
+                    SELECT prefix_hash FROM tenant_default.context_summaries
+                    WHERE tenant_id = $1 AND session_id = $2
+                    ORDER BY updated_at DESC
+                    LIMIT $3
+                )
+                """,
+                tenant_id,
+                session_id,
+                self.keep_per_session,
+            )
+        except Exception as e:
+            logger.warning(f"[SummaryCache] Failed to save summary for {session_id}: {e}")
+
+    def _remember(
+        self, tenant_id: str, session_id: str, digest: str, entry: Tuple[int, str]
+    ) -> None:
+        key = (tenant_id, session_id, digest)
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
@@ -35,6 +35,10 @@ class ToolManagerMixin:
     ) -> List[Dict[str, Any]]:
         """Build combined tool schemas: builtin tools + domain-filtered agent-tools.
 
+        Agent-tool schemas come from the registry's compiled index and are
+        shared across requests; the returned list is fresh, the dicts are
+        read-only.
+
         Args:
             tenant_id: Tenant identifier for credential filtering.
             domains: List of domains to load agent tools for.
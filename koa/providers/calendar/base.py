@@ -108,6 +108,32 @@ class BaseCalendarProvider(ABC):
         """Delete a calendar event."""
         pass
 
+    # ===== Optional: incremental sync =====
+
+    async def list_event_changes(
+        self,
+        sync_token: Optional[str] = None,
+        page_token: Optional[str] = None,
+        time_min: Optional[datetime] = None,
+        calendar_id: Optional[str] = None,
+        page_size: int = 250,
+        time_max: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """Fetch one page of a full or incremental event sync.
+
+        Without ``sync_token`` this is a full listing of ``[time_min, time_max)``
+        (recurring series expanded); the last page carries the token (Google
+        ``nextSyncToken``, Graph ``deltaLink``) for the next incremental call.
+
+        Returns:
+            ``{"success": True, "events": [...], "deleted": [event ids],
+            "next_page_token": ..., "next_sync_token": ...}``.  An expired or
+            revoked token gives ``{"success": False, "full_sync_required":
+            True}``; providers without incremental sync return
+            ``{"success": False, "unsupported": True}``.
+        """
+        return {"success": False, "unsupported": True, "error": "incremental sync not supported"}
+
     # ===== Common helper methods =====
 
     async def ensure_valid_token(self, force_refresh: bool = False) -> bool:
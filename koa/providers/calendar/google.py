@@ -10,6 +10,7 @@ from typing import Any, Callable, Dict, List, Optional
 
 import httpx
 
+from ...http_pool import http_client
 from ..http_mixin import OAuthHTTPMixin
 from .base import BaseCalendarProvider
 
@@ -69,34 +70,7 @@ class GoogleCalendarProvider(BaseCalendarProvider, OAuthHTTPMixin):
             response.raise_for_status()
             data = response.json()
 
-            events = []
-            for item in data.get("items", []):
-                start_data = item.get("start", {})
-                end_data = item.get("end", {})
-                start_str = start_data.get("dateTime") or start_data.get("date")
-                end_str = end_data.get("dateTime") or end_data.get("date")
-
-                from dateutil import parser as date_parser
-
-                start_dt = date_parser.parse(start_str) if start_str else None
-                end_dt = date_parser.parse(end_str) if end_str else None
-
-                attendees = [a.get("email", "") for a in item.get("attendees", [])]
-
-                events.append(
-                    {
-                        "event_id": item.get("id"),
-                        "summary": item.get("summary", "No title"),
-                        "description": item.get("description", ""),
-                        "start": start_dt,
-                        "end": end_dt,
-                        "location": item.get("location", ""),
-                        "attendees": attendees,
-                        "organizer": item.get("organizer", {}).get("email", ""),
-                        "status": item.get("status", "confirmed"),
-                        "html_link": item.get("htmlLink", ""),
-                    }
-                )
+            events = [_to_event(item) for item in data.get("items", [])]
 
             logger.info(f"Retrieved {len(events)} events from Google Calendar")
             return {"success": True, "data": events, "count": len(events)}
@@ -108,6 +82,73 @@ class GoogleCalendarProvider(BaseCalendarProvider, OAuthHTTPMixin):
             logger.error(f"Failed to list events: {e}", exc_info=True)
             return {"success": False, "error": str(e)}
 
+    async def list_event_changes(
+        self,
+        sync_token: Optional[str] = None,
+        page_token: Optional[str] = None,
+        time_min: Optional[datetime] = None,
+        calendar_id: Optional[str] = None,
+        page_size: int = 250,
+        time_max: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """Fetch one page of a full or ``syncToken`` incremental sync.
+
+        See :meth:`BaseCalendarProvider.list_event_changes`.  Cancelled
+        events (deleted, or instances removed from a series) are returned
+        in ``deleted``; a 410 means the token was invalidated.
+        """
+        if not await self.ensure_valid_token():
+            return {"success": False, "error": "Failed to refresh access token"}
+
+        params: Dict[str, Any] = {"maxResults": page_size, "singleEvents": True}
+        if sync_token:
+            params["syncToken"] = sync_token
+        else:
+            # singleEvents expands recurring series, so a full listing must
+            # be bounded on both sides.
+            if time_min:
+                params["timeMin"] = time_min.isoformat()
+            if time_max:
+                params["timeMax"] = time_max.isoformat()
+        if page_token:
+            params["pageToken"] = page_token
+
+        try:
+            response = await self._oauth_request(
+                "GET",
+                f"{self.api_base_url}/calendars/{calendar_id or 'primary'}/events",
+                params=params,
+            )
+            if response.status_code == 410:
+                return {
+                    "success": False,
+                    "error": "sync_token_expired",
+                    "full_sync_required": True,
+                }
+            response.raise_for_status()
+            data = response.json()
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Google Calendar API error: {e.response.status_code} - {e.response.text}")
+            return {"success": False, "error": f"API error: {e.response.status_code}"}
+        except Exception as e:
+            logger.error(f"Failed to list event changes: {e}", exc_info=True)
+            return {"success": False, "error": str(e)}
+
+        events: List[Dict[str, Any]] = []
+        deleted: List[str] = []
+        for item in data.get("items", []):
+            if item.get("status") == "cancelled":
+                deleted.append(item.get("id"))
+            else:
+                events.append(_to_event(item))
+        return {
+            "success": True,
+            "events": events,
+            "deleted": deleted,
+            "next_page_token": data.get("nextPageToken"),
+            "next_sync_token": data.get("nextSyncToken"),
+        }
+
     async def create_event(
         self,
         summary: str,
@@ -275,7 +316,7 @@ class GoogleCalendarProvider(BaseCalendarProvider, OAuthHTTPMixin):
         cid = channel_id or str(uuid.uuid4())
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 resp = await client.post(
                     f"{self.api_base_url}/calendars/{calendar_id}/events/watch",
                     headers=self._get_headers(),
@@ -314,7 +355,7 @@ class GoogleCalendarProvider(BaseCalendarProvider, OAuthHTTPMixin):
             return {"success": False, "error": "Failed to refresh access token"}
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 resp = await client.post(
                     "https://www.googleapis.com/calendar/v3/channels/stop",
                     headers=self._get_headers(),
@@ -334,7 +375,7 @@ class GoogleCalendarProvider(BaseCalendarProvider, OAuthHTTPMixin):
             return {"success": False, "error": "Failed to refresh access token"}
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 resp = await client.get(
                     f"{self.api_base_url}/calendars/{calendar_id}/events",
                     headers=self._get_headers(),
@@ -365,7 +406,7 @@ class GoogleCalendarProvider(BaseCalendarProvider, OAuthHTTPMixin):
                 if page_token:
                     params["pageToken"] = page_token
 
-                async with httpx.AsyncClient() as client:
+                async with http_client() as client:
                     resp = await client.get(
                         f"{self.api_base_url}/calendars/{calendar_id}/events",
                         headers=self._get_headers(),
@@ -396,3 +437,27 @@ class GoogleCalendarProvider(BaseCalendarProvider, OAuthHTTPMixin):
         except Exception as e:
             logger.error(f"Incremental sync failed: {e}", exc_info=True)
             return {"success": False, "error": str(e)}
+
+
+def _to_event(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a Google Calendar API event resource."""
+    from dateutil import parser as date_parser
+
+    start_data = item.get("start", {})
+    end_data = item.get("end", {})
+    start_str = start_data.get("dateTime") or start_data.get("date")
+    end_str = end_data.get("dateTime") or end_data.get("date")
+
+    return {
+        "event_id": item.get("id"),
+        "summary": item.get("summary", "No title"),
+        "description": item.get("description", ""),
+        "start": date_parser.parse(start_str) if start_str else None,
+        "end": date_parser.parse(end_str) if end_str else None,
+        "location": item.get("location", ""),
+        "attendees": [a.get("email", "") for a in item.get("attendees", [])],
+        "organizer": item.get("organizer", {}).get("email", ""),
+        "status": item.get("status", "confirmed"),
+        "html_link": item.get("htmlLink", ""),
+        "ical_uid": item.get("iCalUID"),
+    }
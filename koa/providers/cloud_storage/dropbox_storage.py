@@ -12,6 +12,7 @@ from typing import Any, Callable, Dict, Optional
 
 import httpx
 
+from ...http_pool import http_client
 from .base import BaseCloudStorageProvider
 
 logger = logging.getLogger(__name__)
@@ -128,7 +129,7 @@ class DropboxProvider(BaseCloudStorageProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 body: Dict[str, Any] = {
                     "query": query,
                     "options": {"max_results": max_results},
@@ -168,7 +169,7 @@ class DropboxProvider(BaseCloudStorageProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 body = {
                     "path": "",
                     "recursive": True,
@@ -205,7 +206,7 @@ class DropboxProvider(BaseCloudStorageProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await self._post_with_retry(
                     client, "/files/get_metadata", {"path": file_id}
                 )
@@ -235,7 +236,7 @@ class DropboxProvider(BaseCloudStorageProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await self._post_with_retry(
                     client, "/files/get_temporary_link", {"path": file_id}
                 )
@@ -271,7 +272,7 @@ class DropboxProvider(BaseCloudStorageProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 if email:
                     # Share with a specific user by email
                     access_level = "editor" if link_type == "edit" else "viewer"
@@ -360,7 +361,7 @@ class DropboxProvider(BaseCloudStorageProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 # Dropbox /users/get_space_usage takes no body but expects
                 # a null JSON body or empty string; send None to avoid issues.
                 headers = {
@@ -440,7 +441,7 @@ class DropboxProvider(BaseCloudStorageProvider):
                     "error": "DROPBOX_APP_KEY and DROPBOX_APP_SECRET must be set in environment",
                 }
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.post(
                     TOKEN_URL,
                     data={
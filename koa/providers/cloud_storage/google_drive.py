@@ -11,6 +11,7 @@ from typing import Any, Callable, Dict, Optional
 
 import httpx
 
+from ...http_pool import http_client
 from ..http_mixin import OAuthHTTPMixin
 from .base import BaseCloudStorageProvider
 
@@ -393,7 +394,7 @@ class GoogleDriveProvider(BaseCloudStorageProvider, OAuthHTTPMixin):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 # Ensure folder exists
                 parent_id = "root"
                 if folder_path:
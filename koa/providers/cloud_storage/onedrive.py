@@ -13,6 +13,7 @@ from typing import Any, Callable, Dict, Optional
 
 import httpx
 
+from ...http_pool import http_client
 from .base import BaseCloudStorageProvider
 
 logger = logging.getLogger(__name__)
@@ -97,7 +98,7 @@ class OneDriveProvider(BaseCloudStorageProvider):
 
             params: Dict[str, Any] = {"$top": max_results}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await self._request(
                     "GET",
                     f"{GRAPH_BASE_URL}/root/search(q='{query}')",
@@ -140,7 +141,7 @@ class OneDriveProvider(BaseCloudStorageProvider):
 
             params: Dict[str, Any] = {"$top": max_results}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await self._request(
                     "GET",
                     f"{GRAPH_BASE_URL}/recent",
@@ -169,7 +170,7 @@ class OneDriveProvider(BaseCloudStorageProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await self._request(
                     "GET",
                     f"{GRAPH_BASE_URL}/items/{file_id}",
@@ -196,7 +197,7 @@ class OneDriveProvider(BaseCloudStorageProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await self._request(
                     "GET",
                     f"{GRAPH_BASE_URL}/items/{file_id}",
@@ -237,7 +238,7 @@ class OneDriveProvider(BaseCloudStorageProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 if email:
                     # Share with a specific user via invitation
                     roles = ["write"] if link_type == "edit" else ["read"]
@@ -312,7 +313,7 @@ class OneDriveProvider(BaseCloudStorageProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await self._request(
                     "GET",
                     GRAPH_BASE_URL,
@@ -365,7 +366,7 @@ class OneDriveProvider(BaseCloudStorageProvider):
             if not client_id or not client_secret:
                 return {"success": False, "error": "Microsoft OAuth credentials not configured"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.post(
                     f"https://login.microsoftonline.com/{tenant}/oauth2/v2.0/token",
                     data={
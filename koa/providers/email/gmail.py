@@ -5,6 +5,7 @@ Uses Google Gmail API for email operations.
 Requires OAuth scopes: gmail.send, gmail.modify, gmail.readonly
 """
 
+import asyncio
 import base64
 import logging
 import re
@@ -18,6 +19,12 @@ from .base import BaseEmailProvider
 
 logger = logging.getLogger(__name__)
 
+# Max concurrent per-message requests when hydrating search results
+HYDRATION_CONCURRENCY = 10
+
+# Gmail caps batchModify / batchDelete at 1000 ids per call
+BATCH_MODIFY_MAX_IDS = 1000
+
 
 class GmailProvider(BaseEmailProvider, OAuthHTTPMixin):
     """Gmail email provider implementation using Gmail API v1."""
@@ -208,30 +215,9 @@ class GmailProvider(BaseEmailProvider, OAuthHTTPMixin):
             result = response.json()
             messages = result.get("messages", [])
 
-            email_list = []
-            for msg in messages[:max_results]:
-                msg_id = msg["id"]
-                detail_response = await self._oauth_request(
-                    "GET",
-                    f"{self.api_base_url}/users/me/messages/{msg_id}",
-                    params={"format": "metadata", "metadataHeaders": ["From", "Subject", "Date"]},
-                )
-                if detail_response.status_code == 200:
-                    msg_data = detail_response.json()
-                    hdrs = {
-                        h["name"]: h["value"]
-                        for h in msg_data.get("payload", {}).get("headers", [])
-                    }
-                    email_list.append(
-                        {
-                            "message_id": msg_id,
-                            "sender": hdrs.get("From", "Unknown"),
-                            "subject": hdrs.get("Subject", "(No subject)"),
-                            "date": hdrs.get("Date", "Unknown"),
-                            "unread": "UNREAD" in msg_data.get("labelIds", []),
-                            "snippet": msg_data.get("snippet", ""),
-                        }
-                    )
+            ids = [msg["id"] for msg in messages[:max_results]]
+            hydrated = await self._hydrate_messages(ids)
+            email_list = [item for item in hydrated if item is not None]
 
             logger.info(f"Gmail search found {len(email_list)} emails")
             return {"success": True, "data": email_list, "count": len(email_list)}
@@ -240,27 +226,113 @@ class GmailProvider(BaseEmailProvider, OAuthHTTPMixin):
             logger.error(f"Gmail search error: {e}", exc_info=True)
             return {"success": False, "error": str(e)}
 
+    async def _hydrate_messages(self, message_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Fetch summary metadata for each id with bounded concurrency.
+
+        Results keep the input order.  A failed item yields ``None`` instead
+        of failing the whole batch.
+        """
+        semaphore = asyncio.Semaphore(HYDRATION_CONCURRENCY)
+
+        async def fetch(msg_id: str) -> Optional[Dict[str, Any]]:
+            try:
+                async with semaphore:
+                    response = await self._oauth_request(
+                        "GET",
+                        f"{self.api_base_url}/users/me/messages/{msg_id}",
+                        params={
+                            "format": "metadata",
+                            "metadataHeaders": ["From", "Subject", "Date"],
+                        },
+                    )
+                if response.status_code != 200:
+                    logger.warning(f"Gmail metadata fetch {msg_id}: HTTP {response.status_code}")
+                    return None
+                msg_data = response.json()
+            except Exception as e:
+                logger.warning(f"Gmail metadata fetch failed for {msg_id}: {e}")
+                return None
+            hdrs = {h["name"]: h["value"] for h in msg_data.get("payload", {}).get("headers", [])}
+            return {
+                "message_id": msg_id,
+                "sender": hdrs.get("From", "Unknown"),
+                "subject": hdrs.get("Subject", "(No subject)"),
+                "date": hdrs.get("Date", "Unknown"),
+                "unread": "UNREAD" in msg_data.get("labelIds", []),
+                "snippet": msg_data.get("snippet", ""),
+            }
+
+        return list(await asyncio.gather(*(fetch(msg_id) for msg_id in message_ids)))
+
+    async def _batch_modify(
+        self,
+        message_ids: List[str],
+        add_label_ids: Optional[List[str]] = None,
+        remove_label_ids: Optional[List[str]] = None,
+    ) -> int:
+        """Apply label changes via ``messages.batchModify``; return ids updated."""
+        modified = 0
+        for i in range(0, len(message_ids), BATCH_MODIFY_MAX_IDS):
+            chunk = message_ids[i : i + BATCH_MODIFY_MAX_IDS]
+            payload: Dict[str, Any] = {"ids": chunk}
+            if add_label_ids:
+                payload["addLabelIds"] = add_label_ids
+            if remove_label_ids:
+                payload["removeLabelIds"] = remove_label_ids
+            response = await self._oauth_request(
+                "POST",
+                f"{self.api_base_url}/users/me/messages/batchModify",
+                json=payload,
+            )
+            if response.status_code in (200, 204):
+                modified += len(chunk)
+            else:
+                logger.error(f"Gmail batchModify failed: {response.status_code} - {response.text}")
+        return modified
+
     async def delete_emails(
         self,
         message_ids: List[str],
         permanent: bool = False,
     ) -> Dict[str, Any]:
-        """Delete emails via Gmail API."""
+        """Delete emails via Gmail API.
+
+        Permanent deletes use ``messages.batchDelete``.  Gmail has no batch
+        trash endpoint, so trashing runs the per-message calls concurrently.
+        """
         try:
             deleted_count = 0
-            for msg_id in message_ids:
-                if permanent:
-                    response = await self._oauth_request(
-                        "DELETE",
-                        f"{self.api_base_url}/users/me/messages/{msg_id}",
-                    )
-                else:
+            if permanent:
+                for i in range(0, len(message_ids), BATCH_MODIFY_MAX_IDS):
+                    chunk = message_ids[i : i + BATCH_MODIFY_MAX_IDS]
                     response = await self._oauth_request(
                         "POST",
-                        f"{self.api_base_url}/users/me/messages/{msg_id}/trash",
+                        f"{self.api_base_url}/users/me/messages/batchDelete",
+                        json={"ids": chunk},
                     )
-                if response.status_code in [200, 204]:
-                    deleted_count += 1
+                    if response.status_code in (200, 204):
+                        deleted_count += len(chunk)
+                    else:
+                        logger.error(
+                            f"Gmail batchDelete failed: {response.status_code} - {response.text}"
+                        )
+            else:
+                semaphore = asyncio.Semaphore(HYDRATION_CONCURRENCY)
+
+                async def trash(msg_id: str) -> bool:
+                    async with semaphore:
+                        try:
+                            response = await self._oauth_request(
+                                "POST",
+                                f"{self.api_base_url}/users/me/messages/{msg_id}/trash",
+                            )
+                        except Exception as e:
+                            logger.warning(f"Gmail trash failed for {msg_id}: {e}")
+                            return False
+                    return response.status_code in (200, 204)
+
+                results = await asyncio.gather(*(trash(msg_id) for msg_id in message_ids))
+                deleted_count = sum(1 for ok in results if ok)
 
             logger.info(f"Gmail deleted {deleted_count}/{len(message_ids)} emails")
             return {"success": True, "deleted_count": deleted_count}
@@ -272,15 +344,7 @@ class GmailProvider(BaseEmailProvider, OAuthHTTPMixin):
     async def archive_emails(self, message_ids: List[str]) -> Dict[str, Any]:
         """Archive emails via Gmail API (remove INBOX label)."""
         try:
-            archived_count = 0
-            for msg_id in message_ids:
-                response = await self._oauth_request(
-                    "POST",
-                    f"{self.api_base_url}/users/me/messages/{msg_id}/modify",
-                    json={"removeLabelIds": ["INBOX"]},
-                )
-                if response.status_code == 200:
-                    archived_count += 1
+            archived_count = await self._batch_modify(message_ids, remove_label_ids=["INBOX"])
 
             logger.info(f"Gmail archived {archived_count}/{len(message_ids)} emails")
             return {"success": True, "archived_count": archived_count}
@@ -292,15 +356,7 @@ class GmailProvider(BaseEmailProvider, OAuthHTTPMixin):
     async def mark_as_read(self, message_ids: List[str]) -> Dict[str, Any]:
         """Mark emails as read via Gmail API."""
         try:
-            marked_count = 0
-            for msg_id in message_ids:
-                response = await self._oauth_request(
-                    "POST",
-                    f"{self.api_base_url}/users/me/messages/{msg_id}/modify",
-                    json={"removeLabelIds": ["UNREAD"]},
-                )
-                if response.status_code == 200:
-                    marked_count += 1
+            marked_count = await self._batch_modify(message_ids, remove_label_ids=["UNREAD"])
 
             logger.info(f"Gmail marked {marked_count}/{len(message_ids)} emails as read")
             return {"success": True, "marked_count": marked_count}
@@ -9,12 +9,14 @@ import logging
 from datetime import datetime, timedelta, timezone
 from typing import Any, Callable, Dict, List, Optional
 
-import httpx
-
+from ...http_pool import http_client
 from .base import BaseEmailProvider
 
 logger = logging.getLogger(__name__)
 
+# Graph JSON batching accepts at most 20 sub-requests per call
+GRAPH_BATCH_MAX_REQUESTS = 20
+
 
 class OutlookProvider(BaseEmailProvider):
     """Outlook/Microsoft 365 email provider using Microsoft Graph API."""
@@ -58,7 +60,7 @@ class OutlookProvider(BaseEmailProvider):
                     {"emailAddress": {"address": addr}} for addr in bcc
                 ]
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.post(
                     f"{self.api_base_url}/me/sendMail",
                     headers={
@@ -116,7 +118,7 @@ class OutlookProvider(BaseEmailProvider):
             if query:
                 params["$search"] = f'"{query}"'
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.get(
                     f"{self.api_base_url}/me/messages",
                     headers={
@@ -155,6 +157,57 @@ class OutlookProvider(BaseEmailProvider):
             logger.error(f"Outlook search error: {e}", exc_info=True)
             return {"success": False, "error": str(e)}
 
+    async def _graph_batch(self, requests: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Send sub-requests through Graph JSON ``$batch``.
+
+        Requests are chunked at Graph's 20-per-batch limit.  Returns a map of
+        sub-request id to HTTP status; a failed chunk maps its ids to 0.
+        """
+        statuses: Dict[str, int] = {}
+        async with http_client() as client:
+            for i in range(0, len(requests), GRAPH_BATCH_MAX_REQUESTS):
+                chunk = requests[i : i + GRAPH_BATCH_MAX_REQUESTS]
+                response = await client.post(
+                    f"{self.api_base_url}/$batch",
+                    headers={
+                        "Authorization": f"Bearer {self.access_token}",
+                        "Content-Type": "application/json",
+                    },
+                    json={"requests": chunk},
+                    timeout=30.0,
+                )
+                if response.status_code != 200:
+                    logger.error(f"Outlook $batch failed: {response.status_code} - {response.text}")
+                    statuses.update({req["id"]: 0 for req in chunk})
+                    continue
+                for item in response.json().get("responses", []):
+                    statuses[str(item.get("id"))] = int(item.get("status", 0))
+        return statuses
+
+    async def _batch_message_op(
+        self,
+        message_ids: List[str],
+        method: str,
+        suffix: str = "",
+        body: Optional[Dict[str, Any]] = None,
+        ok_statuses: tuple = (200, 201, 204),
+    ) -> int:
+        """Run the same per-message operation for every id via ``$batch``."""
+        requests: List[Dict[str, Any]] = []
+        for idx, msg_id in enumerate(message_ids):
+            req: Dict[str, Any] = {
+                "id": str(idx),
+                "method": method,
+                "url": f"/me/messages/{msg_id}{suffix}",
+            }
+            if body is not None:
+                req["body"] = body
+                req["headers"] = {"Content-Type": "application/json"}
+            requests.append(req)
+
+        statuses = await self._graph_batch(requests)
+        return sum(1 for status in statuses.values() if status in ok_statuses)
+
     async def delete_emails(
         self,
         message_ids: List[str],
@@ -165,16 +218,7 @@ class OutlookProvider(BaseEmailProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            deleted_count = 0
-            async with httpx.AsyncClient() as client:
-                for msg_id in message_ids:
-                    response = await client.delete(
-                        f"{self.api_base_url}/me/messages/{msg_id}",
-                        headers={"Authorization": f"Bearer {self.access_token}"},
-                        timeout=30.0,
-                    )
-                    if response.status_code == 204:
-                        deleted_count += 1
+            deleted_count = await self._batch_message_op(message_ids, "DELETE", ok_statuses=(204,))
 
             logger.info(f"Outlook deleted {deleted_count}/{len(message_ids)} emails")
             return {"success": True, "deleted_count": deleted_count}
@@ -183,6 +227,38 @@ class OutlookProvider(BaseEmailProvider):
             logger.error(f"Outlook delete error: {e}", exc_info=True)
             return {"success": False, "error": str(e)}
 
+    async def archive_emails(self, message_ids: List[str]) -> Dict[str, Any]:
+        """Archive emails via Microsoft Graph API (move to the Archive folder)."""
+        try:
+            if not await self.ensure_valid_token():
+                return {"success": False, "error": "Failed to refresh access token"}
+
+            archived_count = await self._batch_message_op(
+                message_ids, "POST", suffix="/move", body={"destinationId": "archive"}
+            )
+
+            logger.info(f"Outlook archived {archived_count}/{len(message_ids)} emails")
+            return {"success": True, "archived_count": archived_count}
+
+        except Exception as e:
+            logger.error(f"Outlook archive error: {e}", exc_info=True)
+            return {"success": False, "error": str(e)}
+
+    async def mark_as_read(self, message_ids: List[str]) -> Dict[str, Any]:
+        """Mark emails as read via Microsoft Graph API."""
+        try:
+            if not await self.ensure_valid_token():
+                return {"success": False, "error": "Failed to refresh access token"}
+
+            marked_count = await self._batch_message_op(message_ids, "PATCH", body={"isRead": True})
+
+            logger.info(f"Outlook marked {marked_count}/{len(message_ids)} emails as read")
+            return {"success": True, "marked_count": marked_count}
+
+        except Exception as e:
+            logger.error(f"Outlook mark as read error: {e}", exc_info=True)
+            return {"success": False, "error": str(e)}
+
     async def refresh_access_token(self) -> Dict[str, Any]:
         """Refresh Microsoft OAuth token."""
         try:
@@ -195,7 +271,7 @@ class OutlookProvider(BaseEmailProvider):
             if not client_id or not client_secret:
                 return {"success": False, "error": "Microsoft OAuth credentials not configured"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.post(
                     f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token",
                     data={
@@ -253,7 +329,7 @@ class OutlookProvider(BaseEmailProvider):
                 "clientState": client_state,
             }
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.post(
                     f"{self.api_base_url}/subscriptions",
                     headers={
@@ -297,7 +373,7 @@ class OutlookProvider(BaseEmailProvider):
                 datetime.utcnow() + timedelta(minutes=expiration_minutes)
             ).isoformat() + "Z"
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.patch(
                     f"{self.api_base_url}/subscriptions/{subscription_id}",
                     headers={
@@ -325,7 +401,7 @@ class OutlookProvider(BaseEmailProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.delete(
                     f"{self.api_base_url}/subscriptions/{subscription_id}",
                     headers={"Authorization": f"Bearer {self.access_token}"},
@@ -348,7 +424,7 @@ class OutlookProvider(BaseEmailProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.get(
                     f"{self.api_base_url}/me/messages/{message_id}",
                     headers={
@@ -11,6 +11,8 @@ from typing import Any, Dict, Optional
 
 import httpx
 
+from ..http_pool import http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -62,7 +64,7 @@ class OAuthHTTPMixin:
         if headers:
             req_headers.update(headers)
 
-        async with httpx.AsyncClient(timeout=timeout) as client:
+        async with http_client(timeout=timeout) as client:
             response = await client.request(
                 method,
                 url,
@@ -104,7 +106,7 @@ class OAuthHTTPMixin:
             if not client_id or not client_secret:
                 return {"success": False, "error": "Google OAuth credentials not configured"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.post(
                     "https://oauth2.googleapis.com/token",
                     data={
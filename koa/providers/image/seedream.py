@@ -9,6 +9,7 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 
+from ...http_pool import http_client
 from .base import BaseImageProvider
 
 logger = logging.getLogger(__name__)
@@ -61,7 +62,7 @@ class SeedreamProvider(BaseImageProvider):
 
             logger.info(f"Seedream generating image: size={size}, n={n}")
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.post(
                     url,
                     headers=self._get_headers(),
@@ -3,8 +3,7 @@ from __future__ import annotations
 import os
 from urllib.parse import urlparse
 
-import httpx
-
+from koa.http_pool import http_client
 from koa.models import AgentToolContext
 
 
@@ -43,7 +42,7 @@ class LocalBackendClient:
         return cls(url, service_key)
 
     async def get_routing_preference(self, tenant_id: str, surface: str) -> dict | None:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_client(timeout=10.0) as client:
             resp = await client.get(
                 f"{self._base_url}/api/internal/routing-preferences/{surface}",
                 params={"tenant_id": tenant_id},
@@ -61,7 +60,7 @@ class LocalBackendClient:
         provider: str,
         account: str | None = None,
     ) -> dict:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_client(timeout=10.0) as client:
             resp = await client.post(
                 f"{self._base_url}/api/internal/routing-preferences",
                 json={
@@ -91,7 +90,7 @@ class LocalBackendClient:
         if query is not None:
             params["query"] = query
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_client(timeout=10.0) as client:
             resp = await client.get(
                 f"{self._base_url}/api/internal/events",
                 params=params,
@@ -101,7 +100,7 @@ class LocalBackendClient:
             return resp.json()
 
     async def create_local_event(self, tenant_id: str, payload: dict) -> dict:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_client(timeout=10.0) as client:
             resp = await client.post(
                 f"{self._base_url}/api/internal/events",
                 json={"tenant_id": tenant_id, **payload},
@@ -116,7 +115,7 @@ class LocalBackendClient:
         event_id: str,
         payload: dict,
     ) -> dict:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_client(timeout=10.0) as client:
             resp = await client.patch(
                 f"{self._base_url}/api/internal/events/{event_id}",
                 json={"tenant_id": tenant_id, **payload},
@@ -126,7 +125,7 @@ class LocalBackendClient:
             return resp.json()
 
     async def delete_local_event(self, tenant_id: str, event_id: str) -> dict:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_client(timeout=10.0) as client:
             resp = await client.delete(
                 f"{self._base_url}/api/internal/events/{event_id}",
                 params={"tenant_id": tenant_id},
@@ -150,7 +149,7 @@ class LocalBackendClient:
         if completed is not None:
             params["completed"] = completed
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_client(timeout=10.0) as client:
             resp = await client.get(
                 f"{self._base_url}/api/internal/todos",
                 params=params,
@@ -160,7 +159,7 @@ class LocalBackendClient:
             return resp.json()
 
     async def create_local_todo(self, tenant_id: str, payload: dict) -> dict:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_client(timeout=10.0) as client:
             resp = await client.post(
                 f"{self._base_url}/api/internal/todos",
                 json={"tenant_id": tenant_id, **payload},
@@ -175,7 +174,7 @@ class LocalBackendClient:
         todo_id: str,
         payload: dict,
     ) -> dict:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_client(timeout=10.0) as client:
             resp = await client.patch(
                 f"{self._base_url}/api/internal/todos/{todo_id}",
                 json={"tenant_id": tenant_id, **payload},
@@ -185,7 +184,7 @@ class LocalBackendClient:
             return resp.json()
 
     async def delete_local_todo(self, tenant_id: str, todo_id: str) -> dict:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_client(timeout=10.0) as client:
             resp = await client.delete(
                 f"{self._base_url}/api/internal/todos/{todo_id}",
                 params={"tenant_id": tenant_id},
@@ -195,7 +194,7 @@ class LocalBackendClient:
             return resp.json()
 
     async def create_important_date(self, tenant_id: str, payload: dict) -> dict:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_client(timeout=10.0) as client:
             resp = await client.post(
                 f"{self._base_url}/api/internal/important-dates",
                 json={"tenant_id": tenant_id, **payload},
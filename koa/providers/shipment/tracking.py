@@ -7,10 +7,11 @@ Supports 3,000+ carriers worldwide via 17TRACK API.
 import asyncio
 import logging
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import httpx
 
+from ...http_pool import http_client
 from .carrier_detector import get_tracking_url, normalize_tracking_number
 
 logger = logging.getLogger(__name__)
@@ -30,6 +31,10 @@ CARRIER_CODES = {
     "china_post": 3011,
 }
 
+# 17TRACK accepts up to 40 numbers per gettrackinfo/register request.
+MAX_NUMBERS_PER_REQUEST = 40
+NOT_REGISTERED = -18019902
+
 
 class TrackingProvider:
     """
@@ -148,10 +153,143 @@ class TrackingProvider:
                 "tracking_number": tracking_number,
             }
 
+    async def track_many(
+        self, items: Iterable[Tuple[str, Optional[str]]], concurrency: int = 4
+    ) -> Dict[Tuple[Optional[str], str], Dict[str, Any]]:
+        """
+        Track many packages with one gettrackinfo call per carrier chunk.
+
+        ``items`` are ``(tracking_number, carrier)`` pairs.  Numbers are grouped
+        by 17TRACK carrier code and sent ``MAX_NUMBERS_PER_REQUEST`` at a time,
+        at most ``concurrency`` requests in flight.  Numbers 17TRACK has not
+        seen yet are registered in one batch per carrier and come back as
+        failures with ``just_added`` — their status shows up on a later poll
+        (or via webhook) instead of blocking the batch.
+
+        Returns ``{(carrier, normalized tracking number): result}`` in the same
+        shape as ``track()``, with ``carrier`` exactly as passed in, so the same
+        number tracked under two carriers keeps two results.
+        """
+        if not self.api_key:
+            return {}
+
+        by_carrier: Dict[Optional[int], List[str]] = {}
+        keys: Dict[Tuple[Optional[int], str], List[Tuple[Optional[str], str]]] = {}
+        for number, carrier in items:
+            number = normalize_tracking_number(number)
+            code = self._get_carrier_code(carrier)
+            requested = keys.setdefault((code, number), [])
+            if not requested:
+                by_carrier.setdefault(code, []).append(number)
+            if (carrier, number) not in requested:
+                requested.append((carrier, number))
+
+        chunks = [
+            (code, numbers[i : i + MAX_NUMBERS_PER_REQUEST])
+            for code, numbers in by_carrier.items()
+            for i in range(0, len(numbers), MAX_NUMBERS_PER_REQUEST)
+        ]
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        results: Dict[Tuple[Optional[str], str], Dict[str, Any]] = {}
+
+        async def run(carrier_code: Optional[int], numbers: List[str]) -> None:
+            async with semaphore:
+                try:
+                    chunk = await self._track_chunk(numbers, carrier_code)
+                except Exception as e:
+                    status_code = getattr(getattr(e, "response", None), "status_code", None)
+                    logger.warning(
+                        f"17TRACK batch of {len(numbers)} (carrier {carrier_code}) failed: {e}"
+                    )
+                    error = (
+                        self._get_user_friendly_error("http_error", status_code)
+                        if status_code
+                        else self._get_user_friendly_error("connection_error")
+                    )
+                    chunk = {
+                        number: {"success": False, "error": error, "tracking_number": number}
+                        for number in numbers
+                    }
+            for number, result in chunk.items():
+                for key in keys.get((carrier_code, number), ()):
+                    results[key] = result
+
+        await asyncio.gather(*(run(code, numbers) for code, numbers in chunks))
+        return results
+
+    async def _track_chunk(
+        self, numbers: List[str], carrier_code: Optional[int]
+    ) -> Dict[str, Dict[str, Any]]:
+        """One gettrackinfo request for up to ``MAX_NUMBERS_PER_REQUEST`` numbers."""
+        data = await self._post_batch("gettrackinfo", numbers, carrier_code)
+        if data.get("code") != 0:
+            error = f"API error: {data.get('code')}"
+            return {n: {"success": False, "error": error, "tracking_number": n} for n in numbers}
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for item in data.get("data", {}).get("accepted", []):
+            number = normalize_tracking_number(item.get("number", ""))
+            results[number] = self._parse_track_info(item, number)
+
+        unregistered: List[str] = []
+        for item in data.get("data", {}).get("rejected", []):
+            number = normalize_tracking_number(item.get("number", ""))
+            error = item.get("error", {})
+            if error.get("code") == NOT_REGISTERED:
+                unregistered.append(number)
+                continue
+            results[number] = {
+                "success": False,
+                "error": error.get("message", "Tracking info not found"),
+                "error_code": error.get("code"),
+                "tracking_number": number,
+            }
+
+        if unregistered:
+            logger.info(f"Registering {len(unregistered)} new tracking number(s) with 17TRACK")
+            try:
+                await self._post_batch("register", unregistered, carrier_code)
+            except Exception as e:
+                logger.warning(f"17TRACK batch register failed: {e}")
+            for number in unregistered:
+                results[number] = {
+                    "success": False,
+                    "error": self._get_user_friendly_error("not_found"),
+                    "error_code": NOT_REGISTERED,
+                    "tracking_number": number,
+                    "just_added": True,
+                }
+
+        for number in numbers:
+            results.setdefault(
+                number,
+                {"success": False, "error": "No tracking info found", "tracking_number": number},
+            )
+        return results
+
+    async def _post_batch(
+        self, endpoint: str, numbers: List[str], carrier_code: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """POST a list of numbers to a 17TRACK endpoint and return the JSON body."""
+        payload = [{"number": n} for n in numbers]
+        if carrier_code:
+            for entry in payload:
+                entry["carrier"] = carrier_code
+
+        async with http_client() as client:
+            response = await client.post(
+                f"{self.api_base}/{endpoint}",
+                headers={"17token": self.api_key, "Content-Type": "application/json"},
+                json=payload,
+                timeout=30.0,
+            )
+            response.raise_for_status()
+            return response.json()
+
     async def _identify_carrier(self, tracking_number: str) -> Optional[int]:
         """Use 17TRACK identify API to detect the carrier for a tracking number."""
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 url = f"{self.api_base}/identify"
                 headers = {"17token": self.api_key, "Content-Type": "application/json"}
                 payload = [{"number": tracking_number}]
@@ -177,7 +315,7 @@ class TrackingProvider:
 
     async def _register(self, tracking_number: str, carrier_code: int = None) -> Dict[str, Any]:
         """Register a tracking number with 17TRACK."""
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             url = f"{self.api_base}/register"
             headers = {"17token": self.api_key, "Content-Type": "application/json"}
 
@@ -231,7 +369,7 @@ class TrackingProvider:
         self, tracking_number: str, carrier_code: int = None
     ) -> Dict[str, Any]:
         """Get tracking info for a registered tracking number."""
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             url = f"{self.api_base}/gettrackinfo"
             headers = {"17token": self.api_key, "Content-Type": "application/json"}
 
@@ -276,7 +414,7 @@ class TrackingProvider:
         if not self.api_key:
             return {"success": False, "error": "API key not configured"}
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             url = f"{self.api_base}/stoptrack"
             headers = {"17token": self.api_key, "Content-Type": "application/json"}
 
@@ -311,7 +449,7 @@ class TrackingProvider:
         if not self.api_key:
             return {"success": False, "error": "API key not configured"}
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             url = f"{self.api_base}/deletetrack"
             headers = {"17token": self.api_key, "Content-Type": "application/json"}
 
@@ -11,8 +11,7 @@ import os
 from datetime import datetime, timedelta, timezone
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
-import httpx
-
+from ...http_pool import http_client
 from .base import BaseSmartHomeProvider
 
 logger = logging.getLogger(__name__)
@@ -93,7 +92,7 @@ class PhilipsHueProvider(BaseSmartHomeProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.get(
                     f"{self.api_base_url}/clip/v2/resource/light",
                     headers=self._auth_headers(),
@@ -144,7 +143,7 @@ class PhilipsHueProvider(BaseSmartHomeProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.get(
                     f"{self.api_base_url}/clip/v2/resource/light/{light_id}",
                     headers=self._auth_headers(),
@@ -200,7 +199,7 @@ class PhilipsHueProvider(BaseSmartHomeProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.put(
                     f"{self.api_base_url}/clip/v2/resource/light/{light_id}",
                     headers=self._auth_headers(),
@@ -234,7 +233,7 @@ class PhilipsHueProvider(BaseSmartHomeProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.put(
                     f"{self.api_base_url}/clip/v2/resource/light/{light_id}",
                     headers=self._auth_headers(),
@@ -270,7 +269,7 @@ class PhilipsHueProvider(BaseSmartHomeProvider):
 
             brightness = max(0.0, min(100.0, brightness))
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.put(
                     f"{self.api_base_url}/clip/v2/resource/light/{light_id}",
                     headers=self._auth_headers(),
@@ -306,7 +305,7 @@ class PhilipsHueProvider(BaseSmartHomeProvider):
 
             x, y = self._rgb_to_xy(r, g, b)
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.put(
                     f"{self.api_base_url}/clip/v2/resource/light/{light_id}",
                     headers=self._auth_headers(),
@@ -344,7 +343,7 @@ class PhilipsHueProvider(BaseSmartHomeProvider):
 
             mirek = max(153, min(500, mirek))
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.put(
                     f"{self.api_base_url}/clip/v2/resource/light/{light_id}",
                     headers=self._auth_headers(),
@@ -382,7 +381,7 @@ class PhilipsHueProvider(BaseSmartHomeProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.get(
                     f"{self.api_base_url}/clip/v2/resource/room",
                     headers=self._auth_headers(),
@@ -486,7 +485,7 @@ class PhilipsHueProvider(BaseSmartHomeProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.get(
                     f"{self.api_base_url}/clip/v2/resource/scene",
                     headers=self._auth_headers(),
@@ -531,7 +530,7 @@ class PhilipsHueProvider(BaseSmartHomeProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.put(
                     f"{self.api_base_url}/clip/v2/resource/scene/{scene_id}",
                     headers=self._auth_headers(),
@@ -583,7 +582,7 @@ class PhilipsHueProvider(BaseSmartHomeProvider):
 
             basic_auth = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.post(
                     TOKEN_URL,
                     headers={
@@ -10,8 +10,7 @@ import os
 from datetime import datetime, timedelta, timezone
 from typing import Any, Callable, Dict, Optional
 
-import httpx
-
+from ...http_pool import http_client
 from .base import BaseSmartHomeProvider
 
 logger = logging.getLogger(__name__)
@@ -37,7 +36,7 @@ class SonosProvider(BaseSmartHomeProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.get(
                     f"{self.api_base_url}/households",
                     headers=self._auth_headers(),
@@ -92,7 +91,7 @@ class SonosProvider(BaseSmartHomeProvider):
                 if not household_id:
                     return {"success": False, "error": "No households found"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.get(
                     f"{self.api_base_url}/households/{household_id}/groups",
                     headers=self._auth_headers(),
@@ -148,7 +147,7 @@ class SonosProvider(BaseSmartHomeProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.get(
                     f"{self.api_base_url}/groups/{group_id}/playback",
                     headers=self._auth_headers(),
@@ -215,7 +214,7 @@ class SonosProvider(BaseSmartHomeProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.post(
                     f"{self.api_base_url}/groups/{group_id}/playback/{command}",
                     headers=self._auth_headers(),
@@ -256,7 +255,7 @@ class SonosProvider(BaseSmartHomeProvider):
 
             volume = max(0, min(100, volume))
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.post(
                     f"{self.api_base_url}/players/{player_id}/playerVolume",
                     headers=self._auth_headers(),
@@ -296,7 +295,7 @@ class SonosProvider(BaseSmartHomeProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.get(
                     f"{self.api_base_url}/players/{player_id}/playerVolume",
                     headers=self._auth_headers(),
@@ -342,7 +341,7 @@ class SonosProvider(BaseSmartHomeProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.post(
                     f"{self.api_base_url}/players/{player_id}/playerVolume",
                     headers=self._auth_headers(),
@@ -387,7 +386,7 @@ class SonosProvider(BaseSmartHomeProvider):
                 if not household_id:
                     return {"success": False, "error": "No households found"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.get(
                     f"{self.api_base_url}/households/{household_id}/favorites",
                     headers=self._auth_headers(),
@@ -436,7 +435,7 @@ class SonosProvider(BaseSmartHomeProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.post(
                     f"{self.api_base_url}/groups/{group_id}/favorites",
                     headers=self._auth_headers(),
@@ -476,7 +475,7 @@ class SonosProvider(BaseSmartHomeProvider):
             if not household_id:
                 return None
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.get(
                     f"{self.api_base_url}/households/{household_id}/groups",
                     headers=self._auth_headers(),
@@ -511,7 +510,7 @@ class SonosProvider(BaseSmartHomeProvider):
             credentials_str = f"{client_id}:{client_secret}"
             basic_auth = base64.b64encode(credentials_str.encode()).decode()
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.post(
                     TOKEN_URL,
                     headers={
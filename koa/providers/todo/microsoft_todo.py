@@ -10,8 +10,7 @@ import os
 from datetime import datetime, timedelta, timezone
 from typing import Any, Callable, Dict, Optional
 
-import httpx
-
+from ...http_pool import http_client
 from .base import BaseTodoProvider
 
 logger = logging.getLogger(__name__)
@@ -107,7 +106,7 @@ class MicrosoftTodoProvider(BaseTodoProvider):
             else:
                 params["$filter"] = "status ne 'completed'"
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.get(
                     f"{self.api_base_url}/lists/{list_id}/tasks",
                     headers=self._auth_headers(),
@@ -160,7 +159,7 @@ class MicrosoftTodoProvider(BaseTodoProvider):
                 if not list_id:
                     return {"success": False, "error": "No task lists found"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.get(
                     f"{self.api_base_url}/lists/{list_id}/tasks",
                     headers=self._auth_headers(),
@@ -235,7 +234,7 @@ class MicrosoftTodoProvider(BaseTodoProvider):
                 importance = _PRIORITY_TO_IMPORTANCE.get(priority.lower(), "normal")
                 body["importance"] = importance
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.post(
                     f"{self.api_base_url}/lists/{list_id}/tasks",
                     headers={
@@ -279,7 +278,7 @@ class MicrosoftTodoProvider(BaseTodoProvider):
                 if not list_id:
                     return {"success": False, "error": "No task lists found"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.patch(
                     f"{self.api_base_url}/lists/{list_id}/tasks/{task_id}",
                     headers={
@@ -346,7 +345,7 @@ class MicrosoftTodoProvider(BaseTodoProvider):
             if not body:
                 return {"success": False, "error": "No fields to update"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.patch(
                     f"{self.api_base_url}/lists/{list_id}/tasks/{task_id}",
                     headers={
@@ -390,7 +389,7 @@ class MicrosoftTodoProvider(BaseTodoProvider):
                 if not list_id:
                     return {"success": False, "error": "No task lists found"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.delete(
                     f"{self.api_base_url}/lists/{list_id}/tasks/{task_id}",
                     headers=self._auth_headers(),
@@ -416,7 +415,7 @@ class MicrosoftTodoProvider(BaseTodoProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.get(
                     f"{self.api_base_url}/lists",
                     headers=self._auth_headers(),
@@ -460,7 +459,7 @@ class MicrosoftTodoProvider(BaseTodoProvider):
             if not client_id or not client_secret:
                 return {"success": False, "error": "Microsoft OAuth credentials not configured"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.post(
                     f"https://login.microsoftonline.com/{tenant}/oauth2/v2.0/token",
                     data={
@@ -9,6 +9,7 @@ from typing import Any, Callable, Dict, Optional
 
 import httpx
 
+from ...http_pool import http_client
 from .base import BaseTodoProvider
 
 logger = logging.getLogger(__name__)
@@ -74,7 +75,7 @@ class TodoistProvider(BaseTodoProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 params: Dict[str, Any] = {}
                 if list_id:
                     params["project_id"] = list_id
@@ -126,7 +127,7 @@ class TodoistProvider(BaseTodoProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 params: Dict[str, Any] = {}
                 if list_id:
                     params["project_id"] = list_id
@@ -196,7 +197,7 @@ class TodoistProvider(BaseTodoProvider):
             if list_id:
                 body["project_id"] = list_id
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.post(
                     f"{self.api_base_url}/tasks",
                     headers=self._get_headers(),
@@ -230,7 +231,7 @@ class TodoistProvider(BaseTodoProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.post(
                     f"{self.api_base_url}/tasks/{task_id}/close",
                     headers=self._get_headers(),
@@ -271,7 +272,7 @@ class TodoistProvider(BaseTodoProvider):
                 if not result.get("success"):
                     return result
             elif completed is False:
-                async with httpx.AsyncClient() as client:
+                async with http_client() as client:
                     response = await client.post(
                         f"{self.api_base_url}/tasks/{task_id}/reopen",
                         headers=self._get_headers(),
@@ -295,7 +296,7 @@ class TodoistProvider(BaseTodoProvider):
                 body["description"] = description
 
             if body:
-                async with httpx.AsyncClient() as client:
+                async with http_client() as client:
                     response = await client.post(
                         f"{self.api_base_url}/tasks/{task_id}",
                         headers=self._get_headers(),
@@ -336,7 +337,7 @@ class TodoistProvider(BaseTodoProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.delete(
                     f"{self.api_base_url}/tasks/{task_id}",
                     headers=self._get_headers(),
@@ -362,7 +363,7 @@ class TodoistProvider(BaseTodoProvider):
             if not await self.ensure_valid_token():
                 return {"success": False, "error": "Failed to refresh access token"}
 
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 response = await client.get(
                     f"{self.api_base_url}/projects",
                     headers=self._get_headers(),
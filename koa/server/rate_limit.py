@@ -1,54 +1,68 @@
 """Simple in-memory rate limiter for API endpoints."""
 
 import logging
+import math
 import time
-from collections import defaultdict
-from typing import Dict, List, Tuple
+from typing import Optional, Tuple
+
+from ..tenant_gate.rate_limiter import SlidingWindowCounter
 
 logger = logging.getLogger(__name__)
 
 
 class RateLimiter:
-    """Token bucket rate limiter keyed by client identifier.
+    """Sliding-window rate limiter keyed by client identifier.
+
+    Per-minute counts use 1-second buckets and per-hour counts 1-minute
+    buckets, so each check is O(1) regardless of the limits, and clients
+    idle for an hour are dropped.
 
     Args:
         requests_per_minute: Max requests per minute per client.
         requests_per_hour: Max requests per hour per client.
+        max_clients: Optional cap on tracked clients (least recently seen
+            are forgotten first).
     """
 
     def __init__(
         self,
         requests_per_minute: int = 20,
         requests_per_hour: int = 200,
+        max_clients: Optional[int] = None,
     ):
         self.rpm = requests_per_minute
         self.rph = requests_per_hour
-        self._minute_windows: Dict[str, List[float]] = defaultdict(list)
-        self._hour_windows: Dict[str, List[float]] = defaultdict(list)
+        self._minute = SlidingWindowCounter(60, buckets=60, max_keys=max_clients)
+        self._hour = SlidingWindowCounter(3600, buckets=60, max_keys=max_clients)
+
+    def __len__(self) -> int:
+        """Number of clients currently tracked."""
+        return len(self._hour)
 
     def check(self, client_id: str) -> Tuple[bool, dict]:
         """Check if request is allowed. Returns (allowed, info_dict)."""
         now = time.monotonic()
-        minute_ago = now - 60
-        hour_ago = now - 3600
-
-        # Clean old entries
-        self._minute_windows[client_id] = [
-            t for t in self._minute_windows[client_id] if t > minute_ago
-        ]
-        self._hour_windows[client_id] = [t for t in self._hour_windows[client_id] if t > hour_ago]
-
-        minute_count = len(self._minute_windows[client_id])
-        hour_count = len(self._hour_windows[client_id])
+        minute_count = self._minute.count(client_id, now)
+        hour_count = self._hour.count(client_id, now)
 
         if minute_count >= self.rpm:
-            return False, {"reason": "rate_limited", "retry_after": 60, "limit": "per_minute"}
+            retry_after = math.ceil(self._minute.retry_after(client_id, now)) or 1
+            return False, {
+                "reason": "rate_limited",
+                "retry_after": retry_after,
+                "limit": "per_minute",
+            }
         if hour_count >= self.rph:
-            return False, {"reason": "rate_limited", "retry_after": 3600, "limit": "per_hour"}
+            retry_after = math.ceil(self._hour.retry_after(client_id, now)) or 1
+            return False, {
+                "reason": "rate_limited",
+                "retry_after": retry_after,
+                "limit": "per_hour",
+            }
 
         # Record request
-        self._minute_windows[client_id].append(now)
-        self._hour_windows[client_id].append(now)
+        self._minute.add(client_id, now)
+        self._hour.add(client_id, now)
 
         return True, {
             "remaining_minute": self.rpm - minute_count - 1,
@@ -5,13 +5,14 @@ import dataclasses
 import json
 import logging
 import os
+from typing import Optional
 
-import httpx
 from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse, StreamingResponse
 
 from koa.streaming.models import AgentEvent, EventType
 
+from ...http_pool import http_client
 from ..app import require_app, verify_api_key
 from ..models import ChatRequest, ChatResponse
 
@@ -26,8 +27,13 @@ async def _post_stream_result(
     tenant_id: str,
     final_response: str,
     tool_calls: list,
+    true_memory_proposals: Optional[list] = None,
 ) -> None:
-    """POST the stream result back to koiai so it can persist chat history."""
+    """POST the stream result back to koiai so it can persist chat history.
+
+    ``true_memory_proposals`` is set when the client disconnected before the
+    TRUE_MEMORY_PROPOSALS event could be delivered on the stream.
+    """
     if not _KOIAI_CALLBACK_URL:
         return
     payload = {
@@ -35,8 +41,10 @@ async def _post_stream_result(
         "response": final_response,
         "tool_calls": tool_calls,
     }
+    if true_memory_proposals:
+        payload["true_memory_proposals"] = true_memory_proposals
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
+        async with http_client(timeout=15) as client:
             resp = await client.post(
                 _KOIAI_CALLBACK_URL,
                 json=payload,
@@ -94,6 +102,10 @@ async def stream(req: ChatRequest):
     _SENTINEL = object()
     queue: asyncio.Queue = asyncio.Queue()
     execution_end_data_holder: list = []  # mutable container for closure
+    # True-memory proposals arrive after EXECUTION_END; the ones the client
+    # never received go to the callback instead.
+    undelivered_proposals: list = []
+    stream_closed = asyncio.Event()
 
     async def _run_orchestrator():
         try:
@@ -105,6 +117,8 @@ async def stream(req: ChatRequest):
             ):
                 if event.type == EventType.EXECUTION_END:
                     execution_end_data_holder.append(event.data)
+                elif event.type == EventType.TRUE_MEMORY_PROPOSALS:
+                    undelivered_proposals.extend(event.data.get("proposals", []))
                 await queue.put(event)
         except Exception as e:
             logger.error(f"Orchestrator error: {e}", exc_info=True)
@@ -131,6 +145,12 @@ async def stream(req: ChatRequest):
             await queue.put(_SENTINEL)
             # Fire callback after orchestrator completes
             if execution_end_data_holder and _KOIAI_CALLBACK_URL:
+                if undelivered_proposals:
+                    # Let the client drain the queue (or disconnect) first.
+                    try:
+                        await asyncio.wait_for(stream_closed.wait(), timeout=10)
+                    except asyncio.TimeoutError:
+                        pass
                 ed = execution_end_data_holder[0]
                 # ed is an AgentResult dataclass, not a dict
                 final_resp = getattr(ed, "raw_message", "") or ""
@@ -143,6 +163,7 @@ async def stream(req: ChatRequest):
                     tenant_id=req.tenant_id,
                     final_response=final_resp,
                     tool_calls=tool_calls,
+                    true_memory_proposals=undelivered_proposals,
                 )
 
     async def event_generator():
@@ -179,10 +200,14 @@ async def stream(req: ChatRequest):
                     default=_default,
                 )
                 yield f"data: {data}\n\n"
+                if event.type == EventType.TRUE_MEMORY_PROPOSALS:
+                    undelivered_proposals.clear()
             yield "data: [DONE]\n\n"
         except (asyncio.CancelledError, GeneratorExit):
             # Client disconnected — let the orchestrator task keep running
             pass
+        finally:
+            stream_closed.set()
 
     return StreamingResponse(
         event_generator(),
@@ -245,6 +270,21 @@ async def clear_session(tenant_id: str = "default"):
     return {"status": "ok", "message": "Session history cleared"}
 
 
+def _args_summary(value) -> dict:
+    """``args_summary`` as an object.
+
+    Rows written before the batched history insert hold the arguments as a
+    JSON-encoded string inside the JSONB column; decode those so every row
+    has the same shape.
+    """
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return {}
+    return value if isinstance(value, dict) else {}
+
+
 @router.get("/api/actions", dependencies=[Depends(verify_api_key)])
 async def get_actions(tenant_id: str, limit: int = 50, offset: int = 0):
     """Get paginated action history for a tenant."""
@@ -279,7 +319,7 @@ async def get_actions(tenant_id: str, limit: int = 50, offset: int = 0):
                     "tool_name": r["tool_name"],
                     "agent_name": r["agent_name"],
                     "summary": r["summary"],
-                    "args_summary": r["args_summary"],
+                    "args_summary": _args_summary(r["args_summary"]),
                     "success": r["success"],
                     "result_status": r["result_status"],
                     "duration_ms": r["duration_ms"],
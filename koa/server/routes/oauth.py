@@ -5,11 +5,11 @@ import os
 from typing import Optional
 from urllib.parse import urlencode
 
-import httpx
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
 
 from ...errors import E, KoaError
+from ...http_pool import http_client
 from ..app import (
     get_base_url,
     oauth_success_html,
@@ -260,7 +260,7 @@ async def todoist_oauth_callback(request: Request, code: str, state: str):
         )
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             response = await client.post(
                 "https://todoist.com/oauth/access_token",
                 data={"client_id": client_id, "client_secret": client_secret, "code": code},
@@ -271,7 +271,7 @@ async def todoist_oauth_callback(request: Request, code: str, state: str):
 
         access_token = data["access_token"]
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             response = await client.post(
                 "https://api.todoist.com/sync/v9/sync",
                 headers={"Authorization": f"Bearer {access_token}"},
@@ -6,7 +6,10 @@ these.
 
 Writes raw sensor rows into the ``tenant_default`` schema (migration 011).
 Upserts are idempotent per (user_id, natural key) so retries + backfill are
-safe.
+safe.  Each payload is COPY'd into a temp table and merged with one
+``INSERT ... SELECT ... ON CONFLICT`` per batch of :data:`BULK_BATCH_SIZE`
+rows; ``/api/sensing/{kind}/ndjson`` accepts the same records as a
+streamed (optionally gzipped) NDJSON body.
 
 Aggregation / reflection does **not** happen here — that runs in the
 reflection agents on a cron. This endpoint just persists.
@@ -16,13 +19,29 @@ from __future__ import annotations
 
 import json
 import logging
+import time
+import zlib
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
-
-from fastapi import APIRouter, Depends
-from pydantic import BaseModel, Field
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from fastapi import APIRouter, Depends, Query, Request
+from pydantic import BaseModel, Field, ValidationError
 
 from ...errors import E, KoaError
+from ...memory.lifecycle import health_rollup
+from ...observability.metrics import observe
 from ..app import require_app, verify_api_key
 
 logger = logging.getLogger(__name__)
@@ -81,6 +100,9 @@ class HealthSample(BaseModel):
 
 class HealthKitIngest(_BaseIngest):
     samples: List[HealthSample] = Field(default_factory=list)
+    timezone: Optional[str] = Field(
+        None, description="IANA zone the daily rollup cuts local days in (default UTC)."
+    )
 
 
 class MotionSegment(BaseModel):
@@ -138,6 +160,287 @@ class EventKitIngest(_BaseIngest):
     reminders: List[Reminder] = Field(default_factory=list)
 
 
+# ---------------------------------------------------------------- Bulk writes
+
+#: Rows per COPY + merge transaction.  Larger uploads are split so a single
+#: backfill never holds one long transaction.
+BULK_BATCH_SIZE = 5000
+
+#: Longest NDJSON line accepted by the streaming endpoint.
+MAX_NDJSON_LINE_BYTES = 1 << 20
+
+#: Largest NDJSON body accepted by the streaming endpoint, after gunzipping.
+MAX_NDJSON_BODY_BYTES = 256 << 20
+
+
+@dataclass(frozen=True)
+class _BulkTable:
+    """Staging + merge SQL for one sensing table.
+
+    ``columns`` are COPY'd into a temp table (with an ordinal so the last
+    duplicate of a key in a batch wins, as sequential upserts would) and
+    merged with one ``INSERT ... SELECT ... ON CONFLICT``.  ``constants``
+    are SQL expressions written on insert and update alike.
+
+    JSONB columns are staged as text: the pool's jsonb codec is text-only,
+    and binary COPY needs a binary encoder.
+    """
+
+    table: str
+    columns: Tuple[Tuple[str, str], ...]
+    key: Tuple[str, ...]
+    constants: Tuple[Tuple[str, str], ...] = ()
+
+    @property
+    def stage(self) -> str:
+        return f"_stage_{self.table}"
+
+    @property
+    def json_positions(self) -> Tuple[int, ...]:
+        return tuple(i for i, (_, pg_type) in enumerate(self.columns) if pg_type == "JSONB")
+
+    @property
+    def stage_sql(self) -> str:
+        cols = ", ".join(
+            f"{name} {'TEXT' if pg_type == 'JSONB' else pg_type}" for name, pg_type in self.columns
+        )
+        return f"CREATE TEMP TABLE {self.stage} (_ord INTEGER, {cols}) ON COMMIT DROP"
+
+    @property
+    def merge_sql(self) -> str:
+        names = [name for name, _ in self.columns]
+        key = ", ".join(self.key)
+        target = ", ".join(names + [name for name, _ in self.constants])
+        selected = [
+            f"{name}::jsonb" if pg_type == "JSONB" else name for name, pg_type in self.columns
+        ]
+        select = ", ".join(selected + [expr for _, expr in self.constants])
+        updates = [f"{n} = EXCLUDED.{n}" for n in names if n not in self.key]
+        updates += [f"{name} = {expr}" for name, expr in self.constants]
+        return (
+            f"INSERT INTO tenant_default.{self.table} ({target}) "
+            f"SELECT DISTINCT ON ({key}) {select} FROM {self.stage} "
+            f"ORDER BY {key}, _ord DESC "
+            f"ON CONFLICT ({key}) DO UPDATE SET {', '.join(updates)}"
+        )
+
+
+_HEALTH = _BulkTable(
+    "health_samples",
+    (
+        ("user_id", "TEXT"),
+        ("type", "TEXT"),
+        ("started_at", "TIMESTAMPTZ"),
+        ("ended_at", "TIMESTAMPTZ"),
+        ("value", "DOUBLE PRECISION"),
+        ("unit", "TEXT"),
+        ("metadata", "JSONB"),
+        ("source", "TEXT"),
+    ),
+    key=("user_id", "type", "started_at"),
+)
+
+_MOTION = _BulkTable(
+    "motion_segments",
+    (
+        ("user_id", "TEXT"),
+        ("started_at", "TIMESTAMPTZ"),
+        ("ended_at", "TIMESTAMPTZ"),
+        ("activity", "TEXT"),
+        ("confidence", "DOUBLE PRECISION"),
+        ("metadata", "JSONB"),
+    ),
+    key=("user_id", "started_at", "activity"),
+)
+
+_CONTACTS = _BulkTable(
+    "device_contacts",
+    (
+        ("user_id", "TEXT"),
+        ("contact_hash", "TEXT"),
+        ("display_name", "TEXT"),
+        ("channel_hints", "JSONB"),
+        ("last_interaction_at", "TIMESTAMPTZ"),
+        ("interaction_count", "INTEGER"),
+        ("metadata", "JSONB"),
+    ),
+    key=("user_id", "contact_hash"),
+    constants=(("updated_at", "NOW()"),),
+)
+
+_EVENTS = _BulkTable(
+    "local_calendar_events",
+    (
+        ("user_id", "TEXT"),
+        ("event_id", "TEXT"),
+        ("calendar_name", "TEXT"),
+        ("title", "TEXT"),
+        ("starts_at", "TIMESTAMPTZ"),
+        ("ends_at", "TIMESTAMPTZ"),
+        ("all_day", "BOOLEAN"),
+        ("location", "TEXT"),
+        ("notes", "TEXT"),
+        ("attendees", "JSONB"),
+        ("metadata", "JSONB"),
+    ),
+    key=("user_id", "event_id"),
+    constants=(("source", "'eventkit'"), ("updated_at", "NOW()")),
+)
+
+_REMINDERS = _BulkTable(
+    "local_reminders",
+    (
+        ("user_id", "TEXT"),
+        ("reminder_id", "TEXT"),
+        ("list_name", "TEXT"),
+        ("title", "TEXT"),
+        ("notes", "TEXT"),
+        ("due_at", "TIMESTAMPTZ"),
+        ("completed", "BOOLEAN"),
+        ("completed_at", "TIMESTAMPTZ"),
+        ("priority", "INTEGER"),
+        ("metadata", "JSONB"),
+    ),
+    key=("user_id", "reminder_id"),
+    constants=(("updated_at", "NOW()"),),
+)
+
+
+def _health_row(user_id: str, s: HealthSample) -> Optional[tuple]:
+    start = _parse_ts(s.started_at)
+    if start is None:
+        return None
+    return (user_id, s.type, start, _parse_ts(s.ended_at), s.value, s.unit, s.metadata, s.source)
+
+
+def _motion_row(user_id: str, seg: MotionSegment) -> Optional[tuple]:
+    start = _parse_ts(seg.started_at)
+    end = _parse_ts(seg.ended_at)
+    if start is None or end is None:
+        return None
+    return (user_id, start, end, seg.activity, seg.confidence, seg.metadata)
+
+
+def _contact_row(user_id: str, c: DeviceContact) -> tuple:
+    return (
+        user_id,
+        c.contact_hash,
+        c.display_name,
+        c.channel_hints,
+        _parse_ts(c.last_interaction_at),
+        int(c.interaction_count or 0),
+        c.metadata,
+    )
+
+
+def _event_row(user_id: str, ev: CalendarEvent) -> tuple:
+    return (
+        user_id,
+        ev.event_id,
+        ev.calendar_name,
+        ev.title,
+        _parse_ts(ev.starts_at),
+        _parse_ts(ev.ends_at),
+        bool(ev.all_day),
+        ev.location,
+        ev.notes,
+        ev.attendees,
+        ev.metadata,
+    )
+
+
+def _reminder_row(user_id: str, r: Reminder) -> tuple:
+    return (
+        user_id,
+        r.reminder_id,
+        r.list_name,
+        r.title,
+        r.notes,
+        _parse_ts(r.due_at),
+        bool(r.completed),
+        _parse_ts(r.completed_at),
+        r.priority,
+        r.metadata,
+    )
+
+
+# Runs inside a batch's transaction after the merge, with the batch rows.
+_BatchHook = Callable[[Any, List[tuple]], Awaitable[None]]
+
+
+def _check_tz(tz_name: Optional[str]) -> str:
+    try:
+        health_rollup.resolve_tz(tz_name)
+    except ValueError as e:
+        raise KoaError(E.VALIDATION_ERROR, str(e))
+    return tz_name or "UTC"
+
+
+def _health_rollup_hook(tz_name: str) -> _BatchHook:
+    """Recompute the daily health rollup for the days a batch touched."""
+
+    async def refresh(conn, rows: List[tuple]) -> None:
+        starts: Dict[str, List[datetime]] = {}
+        for row in rows:
+            starts.setdefault(row[0], []).append(row[2])
+        for user_id, ts in starts.items():
+            days = health_rollup.local_dates(ts, tz_name)
+            await health_rollup.refresh_days(conn, user_id, days, tz_name)
+
+    return refresh
+
+
+async def _write_batch(
+    db, spec: _BulkTable, rows: List[tuple], after: Optional[_BatchHook] = None
+) -> Dict[str, Any]:
+    """COPY ``rows`` into a temp table and merge them in one transaction."""
+    started = time.monotonic()
+    json_positions = spec.json_positions
+    records = []
+    for i, row in enumerate(rows):
+        if json_positions:
+            row = tuple(_jsonify(v) if n in json_positions else v for n, v in enumerate(row))
+        records.append((i, *row))
+    async with db.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute(spec.stage_sql)
+            await conn.copy_records_to_table(
+                spec.stage,
+                records=records,
+                columns=["_ord", *(name for name, _ in spec.columns)],
+            )
+            await conn.execute(spec.merge_sql)
+            if after is not None:
+                await after(conn, rows)
+    elapsed = time.monotonic() - started
+    observe("koa_sensing_batch_seconds", {"table": spec.table}, elapsed)
+    return {"table": spec.table, "rows": len(rows), "ms": round(elapsed * 1000, 1)}
+
+
+async def write_rows(
+    db, spec: _BulkTable, rows: Iterable[Optional[tuple]], after: Optional[_BatchHook] = None
+) -> Dict[str, Any]:
+    """Bulk upsert ``rows`` in :data:`BULK_BATCH_SIZE` batches; ``None`` rows are skipped.
+
+    ``after`` runs in each batch's transaction once the batch is merged.
+    """
+    written = 0
+    batches: List[Dict[str, Any]] = []
+    batch: List[tuple] = []
+    for row in rows:
+        if row is None:
+            continue
+        batch.append(row)
+        if len(batch) >= BULK_BATCH_SIZE:
+            batches.append(await _write_batch(db, spec, batch, after))
+            written += len(batch)
+            batch = []
+    if batch:
+        batches.append(await _write_batch(db, spec, batch, after))
+        written += len(batch)
+    return {"written": written, "batches": batches}
+
+
 # ---------------------------------------------------------------- Endpoints
 
 
@@ -145,35 +448,14 @@ class EventKitIngest(_BaseIngest):
 async def ingest_healthkit(req: HealthKitIngest) -> Dict[str, Any]:
     if not req.samples:
         return {"written": 0}
+    tz_name = _check_tz(req.timezone)
     db = _require_db(require_app())
-    written = 0
-    for s in req.samples:
-        start = _parse_ts(s.started_at)
-        if start is None:
-            continue
-        await db.execute(
-            """
-            INSERT INTO tenant_default.health_samples
-                (user_id, type, started_at, ended_at, value, unit, metadata, source)
-            VALUES ($1,$2,$3,$4,$5,$6,$7::jsonb,$8)
-            ON CONFLICT (user_id, type, started_at) DO UPDATE SET
-                ended_at = EXCLUDED.ended_at,
-                value = EXCLUDED.value,
-                unit = EXCLUDED.unit,
-                metadata = EXCLUDED.metadata,
-                source = EXCLUDED.source
-            """,
-            req.user_id,
-            s.type,
-            start,
-            _parse_ts(s.ended_at),
-            s.value,
-            s.unit,
-            _jsonify(s.metadata),
-            s.source,
-        )
-        written += 1
-    return {"written": written}
+    return await write_rows(
+        db,
+        _HEALTH,
+        (_health_row(req.user_id, s) for s in req.samples),
+        after=_health_rollup_hook(tz_name),
+    )
 
 
 @router.post("/api/sensing/motion", dependencies=[Depends(verify_api_key)])
@@ -181,31 +463,7 @@ async def ingest_motion(req: MotionIngest) -> Dict[str, Any]:
     if not req.segments:
         return {"written": 0}
     db = _require_db(require_app())
-    written = 0
-    for seg in req.segments:
-        start = _parse_ts(seg.started_at)
-        end = _parse_ts(seg.ended_at)
-        if start is None or end is None:
-            continue
-        await db.execute(
-            """
-            INSERT INTO tenant_default.motion_segments
-                (user_id, started_at, ended_at, activity, confidence, metadata)
-            VALUES ($1,$2,$3,$4,$5,$6::jsonb)
-            ON CONFLICT (user_id, started_at, activity) DO UPDATE SET
-                ended_at = EXCLUDED.ended_at,
-                confidence = EXCLUDED.confidence,
-                metadata = EXCLUDED.metadata
-            """,
-            req.user_id,
-            start,
-            end,
-            seg.activity,
-            seg.confidence,
-            _jsonify(seg.metadata),
-        )
-        written += 1
-    return {"written": written}
+    return await write_rows(db, _MOTION, (_motion_row(req.user_id, s) for s in req.segments))
 
 
 @router.post("/api/sensing/contacts", dependencies=[Depends(verify_api_key)])
@@ -213,105 +471,154 @@ async def ingest_contacts(req: ContactsIngest) -> Dict[str, Any]:
     if not req.contacts:
         return {"written": 0}
     db = _require_db(require_app())
-    written = 0
-    for c in req.contacts:
-        await db.execute(
-            """
-            INSERT INTO tenant_default.device_contacts
-                (user_id, contact_hash, display_name, channel_hints,
-                 last_interaction_at, interaction_count, metadata, updated_at)
-            VALUES ($1,$2,$3,$4::jsonb,$5,$6,$7::jsonb, NOW())
-            ON CONFLICT (user_id, contact_hash) DO UPDATE SET
-                display_name = EXCLUDED.display_name,
-                channel_hints = EXCLUDED.channel_hints,
-                last_interaction_at = EXCLUDED.last_interaction_at,
-                interaction_count = EXCLUDED.interaction_count,
-                metadata = EXCLUDED.metadata,
-                updated_at = NOW()
-            """,
-            req.user_id,
-            c.contact_hash,
-            c.display_name,
-            _jsonify(c.channel_hints),
-            _parse_ts(c.last_interaction_at),
-            int(c.interaction_count or 0),
-            _jsonify(c.metadata),
-        )
-        written += 1
-    return {"written": written}
+    return await write_rows(db, _CONTACTS, (_contact_row(req.user_id, c) for c in req.contacts))
 
 
 @router.post("/api/sensing/eventkit", dependencies=[Depends(verify_api_key)])
 async def ingest_eventkit(req: EventKitIngest) -> Dict[str, Any]:
     db = _require_db(require_app())
-    ev_written = 0
-    for ev in req.events:
-        await db.execute(
-            """
-            INSERT INTO tenant_default.local_calendar_events
-                (user_id, event_id, calendar_name, title, starts_at, ends_at,
-                 all_day, location, notes, attendees, metadata, source, updated_at)
-            VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10::jsonb,$11::jsonb,'eventkit', NOW())
-            ON CONFLICT (user_id, event_id) DO UPDATE SET
-                calendar_name = EXCLUDED.calendar_name,
-                title = EXCLUDED.title,
-                starts_at = EXCLUDED.starts_at,
-                ends_at = EXCLUDED.ends_at,
-                all_day = EXCLUDED.all_day,
-                location = EXCLUDED.location,
-                notes = EXCLUDED.notes,
-                attendees = EXCLUDED.attendees,
-                metadata = EXCLUDED.metadata,
-                source = 'eventkit',
-                updated_at = NOW()
-            """,
-            req.user_id,
-            ev.event_id,
-            ev.calendar_name,
-            ev.title,
-            _parse_ts(ev.starts_at),
-            _parse_ts(ev.ends_at),
-            bool(ev.all_day),
-            ev.location,
-            ev.notes,
-            _jsonify(ev.attendees),
-            _jsonify(ev.metadata),
-        )
-        ev_written += 1
-
-    rem_written = 0
-    for r in req.reminders:
-        await db.execute(
-            """
-            INSERT INTO tenant_default.local_reminders
-                (user_id, reminder_id, list_name, title, notes, due_at,
-                 completed, completed_at, priority, metadata, updated_at)
-            VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10::jsonb, NOW())
-            ON CONFLICT (user_id, reminder_id) DO UPDATE SET
-                list_name = EXCLUDED.list_name,
-                title = EXCLUDED.title,
-                notes = EXCLUDED.notes,
-                due_at = EXCLUDED.due_at,
-                completed = EXCLUDED.completed,
-                completed_at = EXCLUDED.completed_at,
-                priority = EXCLUDED.priority,
-                metadata = EXCLUDED.metadata,
-                updated_at = NOW()
-            """,
-            req.user_id,
-            r.reminder_id,
-            r.list_name,
-            r.title,
-            r.notes,
-            _parse_ts(r.due_at),
-            bool(r.completed),
-            _parse_ts(r.completed_at),
-            r.priority,
-            _jsonify(r.metadata),
+    events = await write_rows(db, _EVENTS, (_event_row(req.user_id, e) for e in req.events))
+    reminders = await write_rows(
+        db, _REMINDERS, (_reminder_row(req.user_id, r) for r in req.reminders)
+    )
+    return {
+        "events_written": events["written"],
+        "reminders_written": reminders["written"],
+        "batches": events["batches"] + reminders["batches"],
+    }
+
+
+# ---------------------------------------------------------------- Streaming (NDJSON)
+
+# kind -> {record type: (model, table, row builder)}.  EventKit lines carry
+# ``"kind": "reminder"`` for reminders; every other stream has one type.
+_NDJSON_KINDS: Dict[str, Dict[str, Tuple[Any, _BulkTable, Callable[[str, Any], Any]]]] = {
+    "healthkit": {"": (HealthSample, _HEALTH, _health_row)},
+    "motion": {"": (MotionSegment, _MOTION, _motion_row)},
+    "contacts": {"": (DeviceContact, _CONTACTS, _contact_row)},
+    "eventkit": {
+        "": (CalendarEvent, _EVENTS, _event_row),
+        "event": (CalendarEvent, _EVENTS, _event_row),
+        "reminder": (Reminder, _REMINDERS, _reminder_row),
+    },
+}
+
+
+def _inflate(inflate: Any, data: bytes) -> Iterator[bytes]:
+    """Gunzip ``data`` in pieces of at most :data:`MAX_NDJSON_LINE_BYTES`."""
+    if inflate is None:
+        yield data
+        return
+    while True:
+        try:
+            out = inflate.decompress(data, MAX_NDJSON_LINE_BYTES)
+        except zlib.error as e:
+            raise KoaError(E.VALIDATION_ERROR, f"Invalid gzip body: {e}")
+        yield out
+        data = inflate.unconsumed_tail
+        if not data and len(out) < MAX_NDJSON_LINE_BYTES:
+            return
+
+
+async def _ndjson_lines(request: Request) -> AsyncIterator[bytes]:
+    """Yield the non-empty lines of an NDJSON body, gunzipping on the fly.
+
+    A body larger than :data:`MAX_NDJSON_BODY_BYTES` once decompressed is
+    rejected; inflating in bounded pieces keeps a gzip bomb from being
+    expanded in memory first.  A gzip stream that ends early is rejected
+    rather than read as a shorter body.
+    """
+    encoding = request.headers.get("content-encoding", "").lower()
+    inflate = zlib.decompressobj(16 + zlib.MAX_WBITS) if "gzip" in encoding else None
+    pending = b""
+    size = 0
+    async for raw in request.stream():
+        for chunk in _inflate(inflate, raw):
+            size += len(chunk)
+            if size > MAX_NDJSON_BODY_BYTES:
+                raise KoaError(E.VALIDATION_ERROR, "NDJSON body too large")
+            *lines, pending = (pending + chunk).split(b"\n")
+            if len(pending) > MAX_NDJSON_LINE_BYTES:
+                raise KoaError(E.VALIDATION_ERROR, "NDJSON line too long")
+            for line in lines:
+                if line.strip():
+                    yield line
+    if inflate is not None:
+        pending += inflate.flush()
+        if not inflate.eof:
+            raise KoaError(E.VALIDATION_ERROR, "Invalid gzip body: truncated stream")
+    for line in pending.split(b"\n"):
+        if line.strip():
+            yield line
+
+
+@router.post("/api/sensing/{kind}/ndjson", dependencies=[Depends(verify_api_key)])
+async def ingest_ndjson(
+    kind: str,
+    user_id: str,
+    request: Request,
+    tz_name: Optional[str] = Query(None, alias="timezone"),
+) -> Dict[str, Any]:
+    """Streaming variant of the ingest endpoints.
+
+    The body is one JSON record per line (``Content-Encoding: gzip``
+    allowed), in the shape of the matching JSON endpoint's list items.
+    Records are written in :data:`BULK_BATCH_SIZE` batches while the body
+    is still arriving.  Malformed lines are counted and skipped.
+    ``timezone`` is the healthkit rollup zone, as on the JSON endpoint.
+    """
+    types = _NDJSON_KINDS.get(kind)
+    if types is None:
+        raise KoaError(
+            E.VALIDATION_ERROR, f"kind must be one of {sorted(_NDJSON_KINDS)}, got '{kind}'"
         )
-        rem_written += 1
+    hooks = {_HEALTH.table: _health_rollup_hook(_check_tz(tz_name))}
+    db = _require_db(require_app())
+    pending: Dict[str, List[tuple]] = {}
+    written: Dict[str, int] = {}
+    batches: List[Dict[str, Any]] = []
+    rejected = 0
+    errors: List[str] = []
+
+    async for lineno, line in _aenumerate(_ndjson_lines(request), start=1):
+        try:
+            record = json.loads(line)
+            model, spec, build = types[str(record.pop("kind", "") or "")]
+            row = build(user_id, model.model_validate(record))
+        except (ValueError, KeyError, TypeError, AttributeError, ValidationError) as e:
+            rejected += 1
+            if len(errors) < 10:
+                errors.append(f"line {lineno}: {str(e).splitlines()[0][:200]}")
+            continue
+        if row is None:
+            continue
+        batch = pending.setdefault(spec.table, [])
+        batch.append(row)
+        if len(batch) >= BULK_BATCH_SIZE:
+            batches.append(await _write_batch(db, spec, batch, hooks.get(spec.table)))
+            written[spec.table] = written.get(spec.table, 0) + len(batch)
+            pending[spec.table] = []
+
+    specs = {spec.table: spec for _, spec, _ in types.values()}
+    for table, batch in pending.items():
+        if batch:
+            batches.append(await _write_batch(db, specs[table], batch, hooks.get(table)))
+            written[table] = written.get(table, 0) + len(batch)
+
+    return {
+        "written": sum(written.values()),
+        "written_by_table": written,
+        "rejected": rejected,
+        "errors": errors,
+        "batches": batches,
+    }
 
-    return {"events_written": ev_written, "reminders_written": rem_written}
+
+async def _aenumerate(items: AsyncIterator[Any], start: int = 0) -> AsyncIterator[Tuple[int, Any]]:
+    index = start
+    async for item in items:
+        yield index, item
+        index += 1
 
 
 # ---------------------------------------------------------------- Read
@@ -329,36 +636,7 @@ _SUMMARY_ACCUM = {
 }
 
 
-@router.get("/api/sensing/healthkit/summary", dependencies=[Depends(verify_api_key)])
-async def health_daily_summary(
-    user_id: str,
-    date: Optional[str] = None,
-):
-    """Return a single-day health summary computed on the fly from
-    ``health_samples``. ``date`` is YYYY-MM-DD (UTC); defaults to today UTC."""
-    from datetime import date as _date
-    from datetime import timedelta
-
-    db = _require_db(require_app())
-    if date:
-        try:
-            d = _date.fromisoformat(date)
-        except ValueError:
-            raise KoaError(E.VALIDATION, "date must be YYYY-MM-DD")
-    else:
-        d = datetime.now(timezone.utc).date()
-    start = datetime(d.year, d.month, d.day, tzinfo=timezone.utc)
-    end = start + timedelta(days=1)
-
-    rows = await db.fetch(
-        """SELECT type, value, started_at, ended_at
-           FROM tenant_default.health_samples
-           WHERE user_id = $1 AND started_at >= $2 AND started_at < $3""",
-        user_id,
-        start,
-        end,
-    )
-
+def _summary_from_rollup(d, metrics: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
     out: Dict[str, Any] = {
         "date": d.isoformat(),
         "steps": 0,
@@ -370,51 +648,90 @@ async def health_daily_summary(
         "resting_hr": None,
         "heart_rate_avg": None,
         "mood": None,
-        "sample_count": len(rows),
+        "sample_count": sum(m["sample_count"] for m in metrics.values()),
     }
-    avg_buckets: Dict[str, List[float]] = {}
-    for r in rows:
-        t = r["type"]
-        spec = _SUMMARY_ACCUM.get(t)
-        if not spec:
+    for metric, (field, op) in _SUMMARY_ACCUM.items():
+        row = metrics.get(metric)
+        if row is None:
             continue
-        field, op = spec
-        v = r["value"]
-        if op == "sum_value_int" and v is not None:
-            out[field] += int(v)
+        if op == "sum_value_int":
+            out[field] = int(row["value_sum"] or 0)
         elif op == "sum_minutes":
-            # prefer duration from started_at/ended_at; fallback to value
-            if r["ended_at"] and r["started_at"]:
-                secs = (r["ended_at"] - r["started_at"]).total_seconds()
-                out[field] += int(secs // 60)
-            elif v is not None:
-                out[field] += int(v)
-        elif op == "avg" and v is not None:
-            avg_buckets.setdefault(field, []).append(float(v))
-    for field, xs in avg_buckets.items():
-        if xs:
-            out[field] = round(sum(xs) / len(xs), 2)
+            # whole minutes from started_at/ended_at; value when no end
+            out[field] = int(row["minutes"])
+        elif op == "avg":
+            out[field] = health_rollup.metric_avg(row)
+    return out
+
 
+async def _moods(db, user_id: str, start, end) -> Dict[Any, str]:
     try:
-        st = await db.fetchrow(
-            "SELECT mood FROM tenant_default.user_state WHERE user_id = $1 AND local_date = $2",
+        rows = await db.fetch(
+            """SELECT local_date, mood FROM tenant_default.user_state
+               WHERE user_id = $1 AND local_date >= $2 AND local_date <= $3""",
             user_id,
-            d,
+            start,
+            end,
         )
-        if st and st["mood"]:
-            out["mood"] = st["mood"]
+        return {r["local_date"]: r["mood"] for r in rows if r["mood"]}
     except Exception as e:
         logger.debug("user_state mood lookup failed: %s", e)
+        return {}
+
+
+@router.get("/api/sensing/healthkit/summary", dependencies=[Depends(verify_api_key)])
+async def health_daily_summary(
+    user_id: str,
+    date: Optional[str] = None,
+):
+    """Return a single-day health summary from the daily rollup.
+
+    ``date`` is YYYY-MM-DD in the zone the samples were uploaded with (UTC
+    unless the client sends ``timezone``); defaults to today UTC."""
+    from datetime import date as _date
 
+    db = _require_db(require_app())
+    if date:
+        try:
+            d = _date.fromisoformat(date)
+        except ValueError:
+            raise KoaError(E.VALIDATION_ERROR, "date must be YYYY-MM-DD")
+    else:
+        d = datetime.now(timezone.utc).date()
+
+    days = await health_rollup.fetch_days(db, user_id, d, d)
+    out = _summary_from_rollup(d, days.get(d, {}))
+    out["mood"] = (await _moods(db, user_id, d, d)).get(d)
     return out
 
 
+@router.get("/api/sensing/healthkit/daily", dependencies=[Depends(verify_api_key)])
+async def health_daily_range(user_id: str, days: int = 7):
+    """Per-day health summaries for the last ``days`` days (1..90), oldest
+    first; days without samples are omitted.  Reads only the rollup."""
+    from datetime import timedelta
+
+    if days < 1 or days > 90:
+        raise KoaError(E.VALIDATION_ERROR, "days must be 1..90")
+    db = _require_db(require_app())
+    today = datetime.now(timezone.utc).date()
+    start = today - timedelta(days=days - 1)
+    rollup = await health_rollup.fetch_days(db, user_id, start, today)
+    moods = await _moods(db, user_id, start, today)
+    daily = []
+    for d, metrics in rollup.items():
+        summary = _summary_from_rollup(d, metrics)
+        summary["mood"] = moods.get(d)
+        daily.append(summary)
+    return {"days": days, "daily": daily}
+
+
 @router.get("/api/sensing/healthkit/state", dependencies=[Depends(verify_api_key)])
 async def health_recent_state(user_id: str, days: int = 7):
     from datetime import timedelta
 
     if days < 1 or days > 90:
-        raise KoaError(E.VALIDATION, "days must be 1..90")
+        raise KoaError(E.VALIDATION_ERROR, "days must be 1..90")
     db = _require_db(require_app())
     today = datetime.now(timezone.utc).date()
     start = today - timedelta(days=days - 1)
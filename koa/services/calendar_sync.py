@@ -7,17 +7,30 @@ upstream provider.
 Design
 ------
 * Runs every 24h (initial delay 60s so the app finishes startup).
-* For every tenant that has at least one calendar credential, iterates over
-  every account, instantiates the appropriate provider via
-  ``CalendarProviderFactory``, fetches events in the window
-  ``[now - LOOKBACK_DAYS, now + LOOKAHEAD_DAYS]``, then upserts each event
-  into ``tenant_default.local_calendar_events``.
+* Tenants with at least one calendar credential are synced on a worker pool
+  of ``max_concurrency`` tenants; provider API pages are paced by a token
+  bucket per provider (``PROVIDER_RATE_LIMITS``) shared by all workers.
+* Incremental sync: each account's provider sync token (Google
+  ``nextSyncToken``, Graph ``deltaLink``) is kept in
+  ``tenant_default.calendar_sync_state`` and each pass fetches only changes
+  since it.  Without a token — first sync, or after the provider
+  invalidated it (HTTP 410), or when the last full listing is older than
+  ``FULL_RESYNC_DAYS`` — a full listing of
+  ``[now - LOOKBACK_DAYS, now + LOOKAHEAD_DAYS]`` is done instead, and that
+  account's mirrored rows in the window it no longer returns are pruned.
+  The periodic full listing moves the window forward, picking up events
+  that were already beyond it at the previous full sync.
+  Providers without incremental support fall back to listing the window
+  ``[now - LOOKBACK_DAYS, now + LOOKAHEAD_DAYS]``.
+* Each fetched page is written with one upsert statement (plus one delete
+  for cancelled events), in one transaction.
 * ``event_id`` is namespaced per source ("google:<calendar_id>:<event_id>")
   so iOS EventKit ingestion (which uses raw EventKit UUIDs) never collides
   with Google rows.
-* Deduplication: Google version wins.  Before upserting a Google event we
-  delete any other row for the same user with a matching ``metadata->>
-  'ical_uid'`` (which is stable across iOS subscribed-from-Google copies).
+* Deduplication: Google version wins.  Before upserting Google events we
+  delete rows from other sources for the same user with a matching
+  ``metadata->>'ical_uid'`` (which is stable across iOS subscribed-from-Google
+  copies).
 * Token persistence: each provider is created with a callback that writes the
   refreshed credentials back to ``CredentialStore``.  This fixes the
   pre-existing bug where refreshed access_tokens were never persisted.
@@ -26,13 +39,15 @@ Design
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from ..constants import CALENDAR_SERVICES
+from ..observability.metrics import counter, observe
 from ..providers.calendar.factory import CalendarProviderFactory
+from ..tenant_gate.rate_limiter import TokenBucketLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -43,9 +58,24 @@ SYNC_INTERVAL_S = 24 * 60 * 60
 LOOKBACK_DAYS = 7
 LOOKAHEAD_DAYS = 60
 
-# Cap per-account events per run (Google paginates; we just need agenda volume)
+# Redo the full listing this often so the lookahead window keeps moving
+FULL_RESYNC_DAYS = 7
+
+# Cap per-account events for providers without incremental sync
 MAX_RESULTS_PER_ACCOUNT = 250
 
+# Events per page for incremental / full sync (one upsert per page)
+PAGE_SIZE = 250
+
+# Tenants synced concurrently by sync_all_tenants
+MAX_CONCURRENT_TENANTS = 8
+
+# Provider -> (burst, page requests per second), shared by all workers
+PROVIDER_RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    "google": (10, 5.0),
+    "microsoft": (10, 5.0),
+}
+
 # Map credential.service -> provider name expected by CalendarProviderFactory
 _SERVICE_TO_PROVIDER = {
     "google_calendar": "google",
@@ -58,16 +88,31 @@ class CalendarSyncService:
     ``tenant_default.local_calendar_events``.
     """
 
-    def __init__(self, db, credential_store, interval_s: int = SYNC_INTERVAL_S):
+    def __init__(
+        self,
+        db,
+        credential_store,
+        interval_s: int = SYNC_INTERVAL_S,
+        max_concurrency: int = MAX_CONCURRENT_TENANTS,
+        rate_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+    ):
         """
         Args:
             db: koa.db.Database instance (asyncpg pool).
             credential_store: koa.credentials.CredentialStore instance.
-            interval_s: Seconds between full sync passes (default 24h).
+            interval_s: Seconds between sync passes (default 24h).
+            max_concurrency: Tenants synced at once by ``sync_all_tenants``.
+            rate_limits: Provider -> (burst, pages per second); defaults to
+                ``PROVIDER_RATE_LIMITS``.
         """
         self._db = db
         self._credential_store = credential_store
         self._interval_s = interval_s
+        self._max_concurrency = max(1, max_concurrency)
+        self._rate_limiters = {
+            provider: TokenBucketLimiter(burst, per_second)
+            for provider, (burst, per_second) in (rate_limits or PROVIDER_RATE_LIMITS).items()
+        }
         self._running = False
         self._task: Optional[asyncio.Task] = None
 
@@ -115,23 +160,30 @@ class CalendarSyncService:
     # ------------------------------------------------------------------
 
     async def sync_all_tenants(self) -> Dict[str, Any]:
-        """Iterate every tenant that has at least one calendar credential and
-        sync each of their calendar accounts. Returns a summary dict.
+        """Sync every tenant that has at least one calendar credential, up to
+        ``max_concurrency`` at a time. Returns a summary dict.
         """
+        started = time.monotonic()
         tenant_ids = await self._list_tenants_with_calendars()
         logger.info("CalendarSync: %d tenant(s) with calendar accounts", len(tenant_ids))
 
-        total_events = 0
-        total_accounts = 0
-        for tenant_id in tenant_ids:
-            try:
-                result = await self.sync_tenant(tenant_id)
-                total_events += result.get("events", 0)
-                total_accounts += result.get("accounts", 0)
-            except Exception as e:
-                logger.error("CalendarSync: tenant %s failed: %s", tenant_id, e, exc_info=True)
+        semaphore = asyncio.Semaphore(self._max_concurrency)
 
-        return {"tenants": len(tenant_ids), "accounts": total_accounts, "events": total_events}
+        async def run(tenant_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.sync_tenant(tenant_id)
+                except Exception as e:
+                    logger.error("CalendarSync: tenant %s failed: %s", tenant_id, e, exc_info=True)
+                    return {}
+
+        results = await asyncio.gather(*(run(t) for t in tenant_ids))
+        observe("koa_calendar_sync_pass_seconds", {}, time.monotonic() - started)
+        return {
+            "tenants": len(tenant_ids),
+            "accounts": sum(r.get("accounts", 0) for r in results),
+            "events": sum(r.get("events", 0) for r in results),
+        }
 
     async def sync_tenant(self, tenant_id: str) -> Dict[str, Any]:
         """Sync every calendar account for a single tenant. Public so it can
@@ -222,41 +274,218 @@ class CalendarSyncService:
             )
             return 0
 
+        calendar_id = getattr(provider, "calendar_id", None) or "primary"
+        written = await self._sync_changes(
+            tenant_id, provider_name, account_name, calendar_id, provider
+        )
+        if written is None:
+            written = await self._sync_window(
+                tenant_id, provider_name, account_name, calendar_id, provider
+            )
+        return written
+
+    async def _sync_changes(
+        self,
+        tenant_id: str,
+        source: str,
+        account_name: str,
+        calendar_id: str,
+        provider,
+    ) -> Optional[int]:
+        """Page through the provider's changes since the stored sync token.
+
+        Returns events written, or ``None`` if the provider has no
+        incremental sync.  The new token is stored only once every page has
+        been written, so a failed pass is retried from the old token.
+        """
+        token = await self._load_sync_token(tenant_id, source, account_name, calendar_id)
+        full = token is None
         now = datetime.now(timezone.utc)
         time_min = now - timedelta(days=LOOKBACK_DAYS)
         time_max = now + timedelta(days=LOOKAHEAD_DAYS)
+        page_token: Optional[str] = None
+        seen: set = set()
+        written = 0
+
+        while True:
+            await self._throttle(source)
+            page = await provider.list_event_changes(
+                sync_token=token,
+                page_token=page_token,
+                time_min=time_min if full else None,
+                time_max=time_max if full else None,
+                calendar_id=calendar_id,
+                page_size=PAGE_SIZE,
+            )
+            if page.get("unsupported"):
+                return None
+            if page.get("full_sync_required") and not full:
+                logger.info(
+                    "CalendarSync: sync token for %s/%s/%s invalidated; full resync",
+                    tenant_id,
+                    source,
+                    account_name,
+                )
+                counter("koa_calendar_sync_full_resyncs_total", {"provider": source})
+                await self._save_sync_token(tenant_id, source, account_name, calendar_id, None)
+                token, full, page_token, seen, written = None, True, None, set(), 0
+                continue
+            if not page.get("success"):
+                logger.warning(
+                    "CalendarSync: list_event_changes failed for %s/%s: %s",
+                    source,
+                    account_name,
+                    page.get("error"),
+                )
+                return written
+
+            events = page.get("events") or []
+            written += await self._write_page(
+                user_id=tenant_id,
+                source=source,
+                account_name=account_name,
+                calendar_id=calendar_id,
+                raw_events=events,
+                deleted_ids=page.get("deleted") or [],
+            )
+            if full:
+                seen.update(_local_event_id(source, calendar_id, ev) for ev in events)
+            page_token = page.get("next_page_token")
+            if not page_token:
+                break
+
+        if full:
+            await self._prune_unseen(
+                tenant_id, source, account_name, calendar_id, time_min, time_max, seen
+            )
+        await self._save_sync_token(
+            tenant_id, source, account_name, calendar_id, page.get("next_sync_token"), full=full
+        )
+        return written
 
+    async def _sync_window(
+        self,
+        tenant_id: str,
+        source: str,
+        account_name: str,
+        calendar_id: str,
+        provider,
+    ) -> int:
+        """List the whole mirror window (providers without incremental sync)."""
+        now = datetime.now(timezone.utc)
+        await self._throttle(source)
         result = await provider.list_events(
-            time_min=time_min, time_max=time_max, max_results=MAX_RESULTS_PER_ACCOUNT
+            time_min=now - timedelta(days=LOOKBACK_DAYS),
+            time_max=now + timedelta(days=LOOKAHEAD_DAYS),
+            max_results=MAX_RESULTS_PER_ACCOUNT,
         )
         if not result.get("success"):
             logger.warning(
                 "CalendarSync: list_events failed for %s/%s: %s",
-                service,
+                source,
                 account_name,
                 result.get("error"),
             )
             return 0
+        return await self._write_page(
+            user_id=tenant_id,
+            source=source,
+            account_name=account_name,
+            calendar_id=calendar_id,
+            raw_events=result.get("data") or [],
+            deleted_ids=[],
+        )
 
-        events = result.get("data") or []
-        written = 0
-        for ev in events:
-            try:
-                if await self._upsert_event(
-                    user_id=tenant_id,
-                    source=provider_name,
-                    account_name=account_name,
-                    raw_event=ev,
-                    calendar_id=getattr(provider, "calendar_id", None) or "primary",
-                ):
-                    written += 1
-            except Exception as e:
-                logger.error(
-                    "CalendarSync: upsert failed for event %s: %s",
-                    ev.get("event_id"),
-                    e,
-                )
-        return written
+    async def _throttle(self, source: str) -> None:
+        """Wait for a page-request token from ``source``'s rate limiter."""
+        limiter = self._rate_limiters.get(source)
+        if limiter is None:
+            return
+        while True:
+            allowed, retry_after = await limiter.acquire(source)
+            if allowed:
+                return
+            await asyncio.sleep(retry_after)
+
+    async def _load_sync_token(
+        self, user_id: str, source: str, account_name: str, calendar_id: str
+    ) -> Optional[str]:
+        """The stored token, or None if absent or due for a periodic full listing."""
+        return await self._db.fetchval(
+            """
+            SELECT sync_token FROM tenant_default.calendar_sync_state
+            WHERE user_id = $1 AND source = $2 AND account_name = $3 AND calendar_id = $4
+              AND last_full_sync_at > NOW() - make_interval(days => $5)
+            """,
+            user_id,
+            source,
+            account_name,
+            calendar_id,
+            FULL_RESYNC_DAYS,
+        )
+
+    async def _save_sync_token(
+        self,
+        user_id: str,
+        source: str,
+        account_name: str,
+        calendar_id: str,
+        sync_token: Optional[str],
+        *,
+        full: bool = False,
+    ) -> None:
+        await self._db.execute(
+            """
+            INSERT INTO tenant_default.calendar_sync_state
+                (user_id, source, account_name, calendar_id, sync_token,
+                 last_full_sync_at, updated_at)
+            VALUES ($1, $2, $3, $4, $5, CASE WHEN $6 THEN NOW() END, NOW())
+            ON CONFLICT (user_id, source, account_name, calendar_id) DO UPDATE SET
+                sync_token = EXCLUDED.sync_token,
+                last_full_sync_at = COALESCE(
+                    EXCLUDED.last_full_sync_at, calendar_sync_state.last_full_sync_at
+                ),
+                updated_at = NOW()
+            """,
+            user_id,
+            source,
+            account_name,
+            calendar_id,
+            sync_token,
+            full,
+        )
+
+    async def _prune_unseen(
+        self,
+        user_id: str,
+        source: str,
+        account_name: str,
+        calendar_id: str,
+        time_min: datetime,
+        time_max: datetime,
+        seen: Iterable[str],
+    ) -> None:
+        """After a full listing, drop this account's mirrored rows in the
+        window that the provider no longer has (deleted while no sync token
+        was held).  Other accounts of the same source usually share the
+        ``primary`` calendar id, so the account name must match too."""
+        await self._db.execute(
+            """
+            DELETE FROM tenant_default.local_calendar_events
+            WHERE user_id = $1
+              AND starts_with(event_id, $2)
+              AND metadata->>'account_name' = $3
+              AND starts_at >= $4
+              AND starts_at < $5
+              AND NOT (event_id = ANY($6::text[]))
+            """,
+            user_id,
+            f"{source}:{calendar_id}:",
+            account_name,
+            time_min,
+            time_max,
+            list(seen),
+        )
 
     def _make_persist_callback(
         self, tenant_id: str, service: str, account_name: str
@@ -283,100 +512,139 @@ class CalendarSyncService:
 
         return _cb
 
-    async def _upsert_event(
+    async def _write_page(
         self,
         *,
         user_id: str,
         source: str,
         account_name: str,
-        raw_event: dict,
         calendar_id: str,
-    ) -> bool:
-        """Upsert a single provider event row, applying iCalUID-based dedup.
-
-        Returns True if a row was written, False if skipped (e.g., missing
-        timestamps).
-        """
-        starts_at = raw_event.get("start")
-        ends_at = raw_event.get("end")
-        if not starts_at or not ends_at:
-            return False
-
-        # Provider-specific id fields
-        provider_event_id = raw_event.get("event_id") or raw_event.get("id")
-        if not provider_event_id:
-            return False
-
-        # Namespace the local event_id so different sources never collide
-        event_id = f"{source}:{calendar_id}:{provider_event_id}"
-
-        ical_uid = raw_event.get("ical_uid") or raw_event.get("iCalUID") or raw_event.get("uid")
-
-        title = raw_event.get("summary") or raw_event.get("title") or "(No title)"
-        location = raw_event.get("location") or None
-        notes = raw_event.get("description") or raw_event.get("notes") or None
-        attendees = raw_event.get("attendees") or []
-        all_day = bool(raw_event.get("all_day", False))
-
-        metadata = {
-            "source": source,
-            "account_name": account_name,
-            "calendar_id": calendar_id,
-        }
-        if ical_uid:
-            metadata["ical_uid"] = ical_uid
-        if raw_event.get("html_link"):
-            metadata["html_link"] = raw_event["html_link"]
-        if raw_event.get("organizer"):
-            metadata["organizer"] = raw_event["organizer"]
-        if raw_event.get("status"):
-            metadata["status"] = raw_event["status"]
-
-        # Dedup: if Google version, drop any other-source rows with same iCalUID
-        # so the Google copy becomes authoritative.
-        if source == "google" and ical_uid:
-            await self._db.execute(
-                """
-                DELETE FROM tenant_default.local_calendar_events
-                WHERE user_id = $1
-                  AND event_id <> $2
-                  AND metadata->>'ical_uid' = $3
-                """,
-                user_id,
-                event_id,
-                ical_uid,
-            )
+        raw_events: List[dict],
+        deleted_ids: List[str],
+    ) -> int:
+        """Apply one page of provider events in a single transaction: one
+        delete for cancelled events, one iCalUID dedup delete and one
+        upsert for the rest. Returns the number of rows upserted."""
+        records: Dict[str, Dict[str, Any]] = {}
+        for ev in raw_events:
+            rec = _event_record(source, account_name, calendar_id, ev)
+            if rec is not None:
+                records[rec["event_id"]] = rec  # last copy of an id wins
+        deleted = [f"{source}:{calendar_id}:{i}" for i in deleted_ids if i]
+        if not records and not deleted:
+            return 0
 
-        await self._db.execute(
-            """
-            INSERT INTO tenant_default.local_calendar_events
-                (user_id, event_id, calendar_name, title, starts_at, ends_at,
-                 all_day, location, notes, attendees, metadata, source, updated_at)
-            VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10::jsonb,$11::jsonb,$12, NOW())
-            ON CONFLICT (user_id, event_id) DO UPDATE SET
-                calendar_name = EXCLUDED.calendar_name,
-                title = EXCLUDED.title,
-                starts_at = EXCLUDED.starts_at,
-                ends_at = EXCLUDED.ends_at,
-                all_day = EXCLUDED.all_day,
-                location = EXCLUDED.location,
-                notes = EXCLUDED.notes,
-                attendees = EXCLUDED.attendees,
-                metadata = EXCLUDED.metadata,
-                source = EXCLUDED.source,
-                updated_at = NOW()
-            """,
-            user_id,
-            event_id,
-            account_name,
-            title,
-            starts_at,
-            ends_at,
-            all_day,
-            location,
-            notes,
-            json.dumps(attendees),
-            json.dumps(metadata),
-            source,
-        )
-        return True
+        rows = list(records.values())
+        async with self._db.acquire() as conn:
+            async with conn.transaction():
+                if deleted:
+                    await conn.execute(
+                        """
+                        DELETE FROM tenant_default.local_calendar_events
+                        WHERE user_id = $1 AND event_id = ANY($2::text[])
+                        """,
+                        user_id,
+                        deleted,
+                    )
+                if not rows:
+                    return 0
+                # Dedup: the Google copy is authoritative, so drop other-source
+                # rows (e.g. iOS subscribed copies) with the same iCalUID.
+                if source == "google":
+                    await conn.execute(
+                        """
+                        DELETE FROM tenant_default.local_calendar_events t
+                        USING jsonb_to_recordset($2::jsonb) AS r(event_id text, metadata jsonb)
+                        WHERE t.user_id = $1
+                          AND t.source IS DISTINCT FROM $3
+                          AND t.metadata->>'ical_uid' = r.metadata->>'ical_uid'
+                        """,
+                        user_id,
+                        rows,
+                        source,
+                    )
+                await conn.execute(
+                    """
+                    INSERT INTO tenant_default.local_calendar_events
+                        (user_id, event_id, calendar_name, title, starts_at, ends_at,
+                         all_day, location, notes, attendees, metadata, source, updated_at)
+                    SELECT $1, r.event_id, r.calendar_name, r.title, r.starts_at, r.ends_at,
+                           r.all_day, r.location, r.notes, r.attendees, r.metadata, $3, NOW()
+                    FROM jsonb_to_recordset($2::jsonb) AS r(
+                        event_id text, calendar_name text, title text,
+                        starts_at timestamptz, ends_at timestamptz, all_day boolean,
+                        location text, notes text, attendees jsonb, metadata jsonb)
+                    ON CONFLICT (user_id, event_id) DO UPDATE SET
+                        calendar_name = EXCLUDED.calendar_name,
+                        title = EXCLUDED.title,
+                        starts_at = EXCLUDED.starts_at,
+                        ends_at = EXCLUDED.ends_at,
+                        all_day = EXCLUDED.all_day,
+                        location = EXCLUDED.location,
+                        notes = EXCLUDED.notes,
+                        attendees = EXCLUDED.attendees,
+                        metadata = EXCLUDED.metadata,
+                        source = EXCLUDED.source,
+                        updated_at = NOW()
+                    """,
+                    user_id,
+                    rows,
+                    source,
+                )
+        return len(rows)
+
+
+def _local_event_id(source: str, calendar_id: str, raw_event: dict) -> str:
+    """Namespace the provider id so different sources never collide."""
+    provider_event_id = raw_event.get("event_id") or raw_event.get("id")
+    return f"{source}:{calendar_id}:{provider_event_id}"
+
+
+def _json_ts(value: Any) -> Any:
+    """Timestamp for ``jsonb_to_recordset``; naive datetimes are UTC."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+    return value
+
+
+def _event_record(
+    source: str, account_name: str, calendar_id: str, raw_event: dict
+) -> Optional[Dict[str, Any]]:
+    """Row for one provider event, or None if it lacks timestamps or an id."""
+    starts_at = raw_event.get("start")
+    ends_at = raw_event.get("end")
+    if not starts_at or not ends_at:
+        return None
+    if not (raw_event.get("event_id") or raw_event.get("id")):
+        return None
+
+    ical_uid = raw_event.get("ical_uid") or raw_event.get("iCalUID") or raw_event.get("uid")
+
+    metadata = {
+        "source": source,
+        "account_name": account_name,
+        "calendar_id": calendar_id,
+    }
+    if ical_uid:
+        metadata["ical_uid"] = ical_uid
+    if raw_event.get("html_link"):
+        metadata["html_link"] = raw_event["html_link"]
+    if raw_event.get("organizer"):
+        metadata["organizer"] = raw_event["organizer"]
+    if raw_event.get("status"):
+        metadata["status"] = raw_event["status"]
+
+    return {
+        "event_id": _local_event_id(source, calendar_id, raw_event),
+        "calendar_name": account_name,
+        "title": raw_event.get("summary") or raw_event.get("title") or "(No title)",
+        "starts_at": _json_ts(starts_at),
+        "ends_at": _json_ts(ends_at),
+        "all_day": bool(raw_event.get("all_day", False)),
+        "location": raw_event.get("location") or None,
+        "notes": raw_event.get("description") or raw_event.get("notes") or None,
+        "attendees": raw_event.get("attendees") or [],
+        "metadata": metadata,
+    }
@@ -26,6 +26,8 @@ from typing import Any, Dict, List, Optional
 import httpx
 from pydantic import BaseModel, Field, field_validator, model_validator
 
+from ..http_pool import http_client
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -1077,7 +1079,7 @@ class ProfileExtractionService:
             if not await provider.ensure_valid_token():
                 return []
 
-            async with httpx.AsyncClient(limits=httpx.Limits(max_connections=50)) as client:
+            async with http_client() as client:
                 queries = [
                     "category:primary in:inbox",
                     "category:primary -in:inbox -in:trash -in:spam",
@@ -1120,7 +1122,7 @@ class ProfileExtractionService:
             if not await provider.ensure_valid_token():
                 return []
 
-            async with httpx.AsyncClient(limits=httpx.Limits(max_connections=30)) as client:
+            async with http_client() as client:
                 for i in range(0, len(emails), CONTENT_BATCH_SIZE):
                     batch = emails[i : i + CONTENT_BATCH_SIZE]
                     results = await asyncio.gather(
@@ -1495,7 +1497,7 @@ class ProfileExtractionService:
         """POST extracted profile to callback URL."""
         payload = {"tenant_id": tenant_id, "profile": profile}
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
+            async with http_client(timeout=30) as client:
                 resp = await client.post(url, json=payload, headers=headers or {})
                 resp.raise_for_status()
             logger.info(f"Profile callback sent to {url} for tenant {tenant_id}")
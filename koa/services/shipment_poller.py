@@ -1,25 +1,45 @@
-"""ShipmentPoller — hourly background task that refreshes shipment statuses
+"""ShipmentPoller — background task that refreshes shipment statuses
 and notifies users when a package status changes.
 
-Runs every hour. For each user with active shipments:
-1. Check if current time is within waking hours (9am-10pm) in user's timezone
-2. Poll 17Track for fresh status on all non-delivered shipments
-3. Compare old status with new status
-4. If changed: send notification via CallbackNotification
-5. Update DB with new data
+Each cycle (every ``POLL_TICK_S``):
+1. Load every active non-delivered shipment with its tenant's timezone in one query
+2. Keep shipments whose tenant is in waking hours (9am-10pm local) and whose
+   status-based interval (``STATUS_POLL_INTERVALS_S``) has elapsed
+3. Refresh them through ``TrackingProvider.track_many`` — one 17TRACK request
+   per carrier per 40 numbers, a few in flight at once
+4. Write all results back in a single UPDATE
+5. Notify each tenant whose shipments changed status via CallbackNotification
 """
 
 import asyncio
 import logging
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
-POLL_INTERVAL_S = 3600  # 1 hour
+POLL_TICK_S = 900  # 15 minutes
+POLL_INTERVAL_S = 3600  # default per-shipment interval
+TRACK_CONCURRENCY = 4  # 17TRACK requests in flight per cycle
 WAKING_HOUR_START = 9  # 9 AM
 WAKING_HOUR_END = 22  # 10 PM
 
+# How long to wait between polls of one shipment, by current status.
+# Packages close to delivery change often; label-only or stale ones rarely.
+STATUS_POLL_INTERVALS_S = {
+    "out_for_delivery": 1200,
+    "available_for_pickup": 3600,
+    "delivery_failure": 3600,
+    "exception": 3600,
+    "in_transit": 7200,
+    "info_received": 6 * 3600,
+    "pending": 6 * 3600,
+    "not_found": 6 * 3600,
+    "unknown": 6 * 3600,
+    "expired": 24 * 3600,
+}
+
 # Human-readable status labels
 STATUS_LABELS = {
     "delivered": "Delivered",
@@ -31,11 +51,40 @@ STATUS_LABELS = {
     "expired": "Expired",
 }
 
+_ACTIVE_SHIPMENTS_SQL = """
+    SELECT s.tenant_id, s.tracking_number, s.carrier, s.status, s.description,
+           s.updated_at, tp.profile->>'timezone' AS tz
+    FROM shipments s
+    LEFT JOIN tenant_profiles tp ON tp.tenant_id = s.tenant_id
+    WHERE s.is_active = TRUE AND LOWER(COALESCE(s.status, '')) != 'delivered'
+"""
+
+_APPLY_RESULTS_SQL = """
+    UPDATE shipments s SET
+        carrier = COALESCE(NULLIF(s.carrier, ''), r.carrier),
+        tracking_url = COALESCE(r.tracking_url, s.tracking_url),
+        status = r.status,
+        last_update = COALESCE(r.last_update, s.last_update),
+        estimated_delivery = COALESCE(r.estimated_delivery, s.estimated_delivery),
+        tracking_history = COALESCE(r.tracking_history, s.tracking_history),
+        is_active = r.status != 'delivered',
+        updated_at = NOW()
+    FROM jsonb_to_recordset($1::jsonb) AS r(
+        tenant_id TEXT, tracking_number TEXT, carrier TEXT, tracking_url TEXT,
+        status TEXT, last_update TEXT, estimated_delivery TEXT, tracking_history JSONB
+    )
+    WHERE s.tenant_id = r.tenant_id AND s.tracking_number = r.tracking_number
+"""
+
 
 def _status_label(status: str) -> str:
     return STATUS_LABELS.get(status, status.replace("_", " ").title())
 
 
+def _poll_interval(status: Optional[str]) -> int:
+    return STATUS_POLL_INTERVALS_S.get((status or "unknown").lower(), POLL_INTERVAL_S)
+
+
 class ShipmentPoller:
     """Background service that polls shipment statuses and notifies on changes."""
 
@@ -49,6 +98,9 @@ class ShipmentPoller:
         self._notification = notification
         self._running = False
         self._task: Optional[asyncio.Task] = None
+        # (tenant_id, tracking_number) -> monotonic time of the last attempt,
+        # so numbers 17TRACK keeps failing on still wait out their interval.
+        self._attempted: Dict[Tuple[str, str], float] = {}
 
     async def start(self) -> None:
         if self._running:
@@ -78,117 +130,61 @@ class ShipmentPoller:
                 break
             except Exception as e:
                 logger.error(f"ShipmentPoller error: {e}")
-            await asyncio.sleep(POLL_INTERVAL_S)
+            await asyncio.sleep(POLL_TICK_S)
 
     async def _poll_all_users(self) -> None:
-        """Find all users with active non-delivered shipments and poll them."""
-        rows = await self._db.fetch(
-            "SELECT DISTINCT tenant_id FROM shipments "
-            "WHERE is_active = TRUE AND LOWER(COALESCE(status, '')) != 'delivered'"
-        )
-        if not rows:
-            return
-
-        logger.info(f"ShipmentPoller: checking {len(rows)} user(s)")
-        for row in rows:
-            tenant_id = row["tenant_id"]
-            try:
-                tz = await self._get_user_timezone(tenant_id)
-                if not self._is_waking_hours(tz):
-                    continue
-                await self._poll_user(tenant_id)
-            except Exception as e:
-                logger.warning(f"ShipmentPoller: error polling {tenant_id}: {e}")
-
-    async def _get_user_timezone(self, tenant_id: str) -> str:
-        """Read timezone from tenant_profiles, default to UTC."""
-        try:
-            row = await self._db.fetchrow(
-                "SELECT profile->>'timezone' AS tz FROM tenant_profiles WHERE tenant_id = $1",
-                tenant_id,
-            )
-            if row and row["tz"]:
-                return row["tz"]
-        except Exception:
-            pass
-        return "UTC"
-
-    @staticmethod
-    def _is_waking_hours(tz_name: str) -> bool:
-        """Return True if current time in the given timezone is 9am-10pm."""
-        try:
-            try:
-                from zoneinfo import ZoneInfo
-
-                tz = ZoneInfo(tz_name)
-            except ImportError:
-                import pytz
-
-                tz = pytz.timezone(tz_name)
-            local_now = datetime.now(tz)
-            return WAKING_HOUR_START <= local_now.hour < WAKING_HOUR_END
-        except Exception:
-            # Invalid timezone — default to allowing poll
-            return True
-
-    async def _poll_user(self, tenant_id: str) -> None:
-        """Poll all active non-delivered shipments for one user."""
-        from koa.builtin_agents.shipment.shipment_repo import ShipmentRepository
+        """Refresh every due shipment across all users in one batched pass."""
         from koa.providers.shipment import TrackingProvider
+        from koa.providers.shipment.carrier_detector import normalize_tracking_number
 
         provider = TrackingProvider()
         if not provider.api_key:
             return
 
-        repo = ShipmentRepository(self._db)
-        shipments = await repo.get_user_shipments(tenant_id, is_active=True)
-        if not shipments:
+        rows = await self._db.fetch(_ACTIVE_SHIPMENTS_SQL)
+        due = self._due_shipments([dict(r) for r in rows])
+        if not due:
             return
 
-        changes: List[Dict[str, Any]] = []
-
-        for shipment in shipments:
-            old_status = (shipment.get("status") or "unknown").lower()
-            if old_status == "delivered":
-                continue
-
-            tn = shipment["tracking_number"]
-            carrier = shipment.get("carrier", "")
+        logger.info(
+            f"ShipmentPoller: refreshing {len(due)} shipment(s) "
+            f"for {len({s['tenant_id'] for s in due})} user(s)"
+        )
 
-            try:
-                result = await provider.track(tn, carrier)
-            except Exception as e:
-                logger.debug(f"Failed to poll {tn}: {e}")
-                continue
+        results = await provider.track_many(
+            ((s["tracking_number"], s.get("carrier")) for s in due),
+            concurrency=TRACK_CONCURRENCY,
+        )
 
-            if not result.get("success"):
+        updates: List[Dict[str, Any]] = []
+        changes: Dict[str, List[Dict[str, Any]]] = {}
+        for shipment in due:
+            result = results.get(
+                (shipment.get("carrier"), normalize_tracking_number(shipment["tracking_number"]))
+            )
+            if not result or not result.get("success"):
                 continue
 
+            old_status = (shipment.get("status") or "unknown").lower()
             new_status = (result.get("status") or "unknown").lower()
-
-            # Update DB regardless
-            await repo.upsert_shipment(
-                tenant_id=tenant_id,
-                tracking_number=tn,
-                carrier=carrier or result.get("carrier", ""),
-                tracking_url=result.get("tracking_url"),
-                status=new_status,
-                description=shipment.get("description"),
-                last_update=result.get("last_update"),
-                estimated_delivery=result.get("estimated_delivery"),
-                tracking_history=result.get("events", []),
+            updates.append(
+                {
+                    "tenant_id": shipment["tenant_id"],
+                    "tracking_number": shipment["tracking_number"],
+                    "carrier": result.get("carrier"),
+                    "tracking_url": result.get("tracking_url"),
+                    "status": new_status,
+                    "last_update": result.get("last_update"),
+                    "estimated_delivery": result.get("estimated_delivery"),
+                    "tracking_history": result.get("events", []),
+                }
             )
 
-            # Auto-archive delivered
-            if new_status == "delivered":
-                await repo.archive_shipment_by_tracking(tenant_id, tn)
-
-            # Record change
             if new_status != old_status:
-                changes.append(
+                changes.setdefault(shipment["tenant_id"], []).append(
                     {
-                        "tracking_number": tn,
-                        "carrier": carrier,
+                        "tracking_number": shipment["tracking_number"],
+                        "carrier": shipment.get("carrier"),
                         "description": shipment.get("description"),
                         "old_status": old_status,
                         "new_status": new_status,
@@ -197,8 +193,67 @@ class ShipmentPoller:
                     }
                 )
 
-        if changes:
-            await self._notify_changes(tenant_id, changes)
+        if updates:
+            # Delivered shipments are archived (is_active = FALSE) by the same UPDATE.
+            await self._db.execute(_APPLY_RESULTS_SQL, updates)
+
+        for tenant_id, tenant_changes in changes.items():
+            await self._notify_changes(tenant_id, tenant_changes)
+
+    def _due_shipments(self, shipments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Shipments in their user's waking hours whose status interval has elapsed.
+
+        Returned shipments are recorded as attempted now.
+        """
+        now = datetime.now(timezone.utc)
+        mono_now = time.monotonic()
+        waking: Dict[str, bool] = {}
+        due = []
+        seen = set()
+        for s in shipments:
+            key = (s["tenant_id"], s["tracking_number"])
+            seen.add(key)
+
+            tz = s.get("tz") or "UTC"
+            if tz not in waking:
+                waking[tz] = self._is_waking_hours(tz)
+            if not waking[tz]:
+                continue
+
+            interval = _poll_interval(s.get("status"))
+            updated_at = s.get("updated_at")
+            if updated_at is not None:
+                if updated_at.tzinfo is None:
+                    updated_at = updated_at.replace(tzinfo=timezone.utc)
+                if (now - updated_at).total_seconds() < interval:
+                    continue
+            attempted = self._attempted.get(key)
+            if attempted is not None and mono_now - attempted < interval:
+                continue
+            self._attempted[key] = mono_now
+            due.append(s)
+
+        # Forget shipments that were delivered or removed since the last cycle.
+        self._attempted = {k: v for k, v in self._attempted.items() if k in seen}
+        return due
+
+    @staticmethod
+    def _is_waking_hours(tz_name: str) -> bool:
+        """Return True if current time in the given timezone is 9am-10pm."""
+        try:
+            try:
+                from zoneinfo import ZoneInfo
+
+                tz = ZoneInfo(tz_name)
+            except ImportError:
+                import pytz
+
+                tz = pytz.timezone(tz_name)
+            local_now = datetime.now(tz)
+            return WAKING_HOUR_START <= local_now.hour < WAKING_HOUR_END
+        except Exception:
+            # Invalid timezone — default to allowing poll
+            return True
 
     async def _notify_changes(self, tenant_id: str, changes: List[Dict[str, Any]]) -> None:
         """Send a notification about shipment status changes."""
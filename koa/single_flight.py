@@ -0,0 +1,98 @@
+"""Request coalescing for identical concurrent calls.
+
+Bursty traffic (cron briefings for every user at 8:00) sends many identical
+classifier, summarizer and embedding requests at the same moment.
+:class:`SingleFlight` lets concurrent callers with the same key share one
+in-flight call: the first caller starts it, later callers await the same
+result, and the key is released as soon as the call finishes, so nothing
+is cached beyond the call itself.
+
+Cancellation is per caller: the shared call runs as its own task and a
+cancelled caller only stops waiting.  The call is cancelled when *every*
+caller waiting for it has been cancelled.
+
+Calls are counted in ``koa_single_flight_calls_total`` labelled with the
+flight name and ``role`` (``leader`` for calls that ran, ``coalesced`` for
+callers that shared one).
+
+Usage::
+
+    flight = SingleFlight("embedding")
+    vector = await flight.do(text, lambda: embed(text))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from .observability.metrics import counter
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    __slots__ = ("task", "loop", "waiters", "callers")
+
+    def __init__(self, task: asyncio.Task, loop: asyncio.AbstractEventLoop) -> None:
+        self.task = task
+        self.loop = loop
+        self.waiters = 0
+        self.callers = 0
+
+
+class SingleFlight:
+    """Share one in-flight call among concurrent callers with the same key.
+
+    Args:
+        name: Label for metrics.
+        share: Applied to the result for each caller of a call that had
+            more than one, e.g. ``copy.deepcopy`` for mutable results.
+    """
+
+    def __init__(self, name: str, share: Optional[Callable[[Any], Any]] = None) -> None:
+        self.name = name
+        self.share = share
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return ``await fn()``, sharing the call with concurrent same-key callers."""
+        flight = self._join(key, fn)
+        flight.waiters += 1
+        flight.callers += 1
+        try:
+            result = await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()  # nobody is waiting any more
+        if flight.callers > 1 and self.share is not None:
+            return self.share(result)
+        return result
+
+    def _join(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> _Flight:
+        loop = asyncio.get_running_loop()
+        flight = self._flights.get(key)
+        if flight is not None and flight.loop is loop and not flight.task.done():
+            counter("koa_single_flight_calls_total", {"name": self.name, "role": "coalesced"})
+            return flight
+
+        task = asyncio.ensure_future(fn())
+        flight = _Flight(task, loop)
+        self._flights[key] = flight
+        task.add_done_callback(lambda _: self._release(key, flight))
+        counter("koa_single_flight_calls_total", {"name": self.name, "role": "leader"})
+        return flight
+
+    def _release(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled() and flight.task.exception() is not None:
+            # Retrieved here so a call whose callers all left does not warn.
+            logger.debug(
+                "[SingleFlight:%s] shared call failed: %s", self.name, flight.task.exception()
+            )
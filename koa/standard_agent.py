@@ -60,6 +60,7 @@ from .constants import COMPLETE_TASK_SCHEMA, COMPLETE_TASK_TOOL_NAME
 from .fields import InputField
 from .llm.base import LLMResponse
 from .llm.base import ToolCall as LLMToolCall
+from .llm.response_cache import cached_completion
 from .message import Message
 from .models import AgentTool, AgentToolContext, RequiredField, ToolOutput
 from .protocols import LLMClientProtocol
@@ -172,6 +173,7 @@ class StandardAgent(BaseAgent):
     max_complete_task_retries: int = 3
     tool_timeout: float = 30.0  # seconds per tool call
     max_tool_result_chars: int = 4000  # truncate tool results beyond this
+    cached_extraction_chars: int = 200  # field extractions from shorter inputs are cached
 
     _COMPLETE_TASK_INSTRUCTION = (
         "\n\nIMPORTANT: When you have finished the task, you MUST call the "
@@ -974,10 +976,18 @@ User message: "{user_input}"
 
 Return JSON only."""
 
-        response = await self.llm_client.chat_completion(
-            messages=[{"role": "user", "content": prompt}],
-            config={"response_format": {"type": "json_object"}},
-        )
+        messages = [{"role": "user", "content": prompt}]
+        config = {"response_format": {"type": "json_object"}}
+        if len(user_input) <= self.cached_extraction_chars:
+            response = await cached_completion(
+                self.llm_client,
+                messages,
+                scope=f"extract_fields:{self.__class__.__name__}",
+                tenant_id=self.tenant_id,
+                config=config,
+            )
+        else:
+            response = await self.llm_client.chat_completion(messages=messages, config=config)
 
         # Parse JSON response
         content = response.content if hasattr(response, "content") else str(response)
@@ -72,6 +72,9 @@ class EventType(str, Enum):
     AGENT_START = "agent_start"
     AGENT_END = "agent_end"
 
+    # Memory events
+    TRUE_MEMORY_PROPOSALS = "true_memory_proposals"
+
 
 @dataclass
 class AgentEvent:
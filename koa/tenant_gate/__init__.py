@@ -11,14 +11,17 @@ ReAct loop.  Every request acquires a :class:`GateTicket` via
   double-execute side effects.
 
 Default implementations are in-memory (single-process).  Production
-deployments with multiple workers must supply a shared backend (Redis,
-Postgres) — see :class:`GateBackend` for the protocol.  The gate refuses
+deployments with multiple workers must supply a shared backend —
+:class:`RedisGateBackend` or :class:`PostgresGateBackend` (see
+:class:`SharedGateBackend` for the protocol).  Shared backends lease
+rate-limit tokens and batch budget updates so the hot path does not pay a
+round trip per request.  The gate refuses
 to initialize with an in-memory backend when ``strict=True`` so that
 production configs fail-closed.
 """
 
-from .backends import GateBackend, InMemoryGateBackend
-from .budget import BudgetTracker, TokenCost
+from .backends import GateBackend, InMemoryGateBackend, SharedGateBackend
+from .budget import BudgetTracker, SharedBudgetTracker, TokenCost
 from .gate import (
     GateDecision,
     GateRejected,
@@ -32,7 +35,9 @@ from .idempotency import (
     InMemoryIdempotencyStore,
     make_idempotency_key,
 )
-from .rate_limiter import SlidingWindowLimiter, TokenBucketLimiter
+from .pg_backend import PostgresGateBackend, PostgresIdempotencyStore
+from .rate_limiter import LeasedTokenBucketLimiter, SlidingWindowLimiter, TokenBucketLimiter
+from .redis_backend import RedisGateBackend, RedisIdempotencyStore
 
 __all__ = [
     "BudgetTracker",
@@ -44,6 +49,13 @@ __all__ = [
     "IdempotencyStore",
     "InMemoryGateBackend",
     "InMemoryIdempotencyStore",
+    "LeasedTokenBucketLimiter",
+    "PostgresGateBackend",
+    "PostgresIdempotencyStore",
+    "RedisGateBackend",
+    "RedisIdempotencyStore",
+    "SharedBudgetTracker",
+    "SharedGateBackend",
     "SlidingWindowLimiter",
     "TenantGate",
     "TenantGateConfig",
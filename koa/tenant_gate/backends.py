@@ -3,13 +3,13 @@
 The gate delegates its state (rate-limit counters, concurrency counts,
 budgets) to a backend so single-process installations can use an
 in-memory implementation while horizontally-scaled deployments plug in
-Redis/Postgres.
+Redis/Postgres (see :mod:`.redis_backend` and :mod:`.pg_backend`).
 """
 
 from __future__ import annotations
 
 import asyncio
-from typing import Dict, Protocol
+from typing import Dict, Protocol, Tuple
 
 
 class GateBackend(Protocol):
@@ -30,6 +30,49 @@ class GateBackend(Protocol):
     async def get_inflight(self, tenant_id: str) -> int: ...
 
 
+class SharedGateBackend(GateBackend, Protocol):
+    """Gate backend that also holds rate-limit and budget state.
+
+    When :class:`TenantGate` is given one of these it swaps its process-local
+    limiter/tracker for :class:`LeasedTokenBucketLimiter` /
+    :class:`SharedBudgetTracker`, which batch round trips to the backend
+    instead of making one per request.
+    """
+
+    async def lease_tokens(
+        self,
+        tenant_id: str,
+        want: float,
+        capacity: float,
+        refill_per_second: float,
+    ) -> float:
+        """Take up to ``want`` rate-limit tokens; return how many were granted."""
+        ...
+
+    async def return_tokens(
+        self,
+        tenant_id: str,
+        tokens: float,
+        capacity: float,
+        refill_per_second: float,
+    ) -> None:
+        """Give back leased tokens that were not spent (never above ``capacity``)."""
+        ...
+
+    async def add_usage(
+        self,
+        tenant_id: str,
+        tokens: int,
+        cost_usd: float,
+        window_seconds: float,
+    ) -> Tuple[int, float, float]:
+        """Add a usage delta (may be zero) to the tenant's current window.
+
+        Returns ``(window_tokens, window_cost_usd, window_remaining_s)``.
+        """
+        ...
+
+
 class InMemoryGateBackend:
     """Process-local concurrency counter.  Not production-safe."""
 
@@ -9,14 +9,23 @@ The tracker is eventually-consistent: we record usage after each LLM call
 finishes rather than pre-reserving.  On over-budget the *next* request is
 rejected so a single in-flight request can overshoot by at most one call —
 acceptable for budgets on the order of thousands of tokens.
+
+:class:`SharedBudgetTracker` keeps the counters in a
+:class:`~.backends.SharedGateBackend` so every worker sees the same totals.
 """
 
 from __future__ import annotations
 
 import asyncio
+import logging
 import time
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .backends import SharedGateBackend
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -104,3 +113,110 @@ class BudgetTracker:
             w = _Window(start=now)
             self._windows[tenant_id] = w
         return w
+
+
+@dataclass
+class _SharedWindow:
+    synced_at: float
+    tokens: int = 0
+    cost: float = 0.0
+    remaining: float = 0.0
+    pending_tokens: int = 0
+    pending_cost: float = 0.0
+
+
+class SharedBudgetTracker:
+    """Budget tracker backed by a shared store.
+
+    Usage is accumulated locally and pushed to the backend at most once per
+    ``sync_interval`` seconds per tenant; checks are answered from the last
+    synced totals plus unsynced local usage.  Other workers' usage is
+    therefore visible with up to ``sync_interval`` of lag, which widens the
+    overshoot described in the module docstring by one interval.
+
+    Call :meth:`flush` on shutdown so pending usage is not lost.
+    """
+
+    def __init__(
+        self,
+        backend: "SharedGateBackend",
+        limits: BudgetLimits,
+        sync_interval: float = 1.0,
+    ) -> None:
+        self._backend = backend
+        self._limits = limits
+        self._sync_interval = sync_interval
+        self._windows: Dict[str, _SharedWindow] = {}
+        self._lock = asyncio.Lock()
+
+    async def check(self, tenant_id: str) -> Tuple[bool, str]:
+        """Return ``(allowed, reason)`` without recording anything."""
+        if self._limits.tokens_per_window is None and self._limits.cost_per_window_usd is None:
+            return True, ""
+        w = await self._synced(tenant_id)
+        if (
+            self._limits.tokens_per_window is not None
+            and w.tokens + w.pending_tokens >= self._limits.tokens_per_window
+        ):
+            return False, "token_budget_exceeded"
+        if (
+            self._limits.cost_per_window_usd is not None
+            and w.cost + w.pending_cost >= self._limits.cost_per_window_usd
+        ):
+            return False, "cost_budget_exceeded"
+        return True, ""
+
+    async def record(self, tenant_id: str, usage: TokenCost) -> None:
+        async with self._lock:
+            w = self._windows.get(tenant_id)
+            if w is None:
+                w = _SharedWindow(synced_at=float("-inf"))
+                self._windows[tenant_id] = w
+            w.pending_tokens += usage.total_tokens
+            w.pending_cost += max(0.0, usage.cost_usd)
+        try:
+            await self._synced(tenant_id)
+        except Exception as exc:
+            # Usage stays pending and is retried on the next sync.
+            logger.warning("Budget sync failed for %s: %s", tenant_id, exc)
+
+    async def snapshot(self, tenant_id: str) -> Dict[str, float]:
+        w = await self._synced(tenant_id, force=True)
+        return {
+            "tokens": w.tokens,
+            "cost_usd": w.cost,
+            "window_remaining_s": w.remaining,
+            "tokens_limit": self._limits.tokens_per_window or 0,
+            "cost_limit_usd": self._limits.cost_per_window_usd or 0.0,
+        }
+
+    async def flush(self) -> None:
+        """Push all pending usage to the backend."""
+        for tenant_id in list(self._windows):
+            await self._synced(tenant_id, force=True)
+
+    async def _synced(self, tenant_id: str, force: bool = False) -> _SharedWindow:
+        """Return the tenant's window, syncing with the backend if it is stale."""
+        now = time.monotonic()
+        async with self._lock:
+            w = self._windows.get(tenant_id)
+            if w is None:
+                w = _SharedWindow(synced_at=float("-inf"))
+                self._windows[tenant_id] = w
+            if not force and now - w.synced_at < self._sync_interval:
+                return w
+            tokens, cost = w.pending_tokens, w.pending_cost
+            w.pending_tokens, w.pending_cost = 0, 0.0
+            w.synced_at = now
+        try:
+            totals = await self._backend.add_usage(
+                tenant_id, tokens, cost, self._limits.window_seconds
+            )
+        except Exception:
+            async with self._lock:
+                # Keep the usage for the next attempt.
+                w.pending_tokens += tokens
+                w.pending_cost += cost
+            raise
+        w.tokens, w.cost, w.remaining = totals
+        return w
@@ -15,12 +15,12 @@ import logging
 import os
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, Optional, Union
 
 from ..observability.metrics import counter
 from .backends import GateBackend, InMemoryGateBackend
-from .budget import BudgetLimits, BudgetTracker, TokenCost
-from .rate_limiter import TokenBucketLimiter
+from .budget import BudgetLimits, BudgetTracker, SharedBudgetTracker, TokenCost
+from .rate_limiter import LeasedTokenBucketLimiter, TokenBucketLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +57,11 @@ class TenantGateConfig:
     cost_per_window_usd: Optional[float] = None
     budget_window_seconds: float = 24 * 3600.0
 
+    # Shared backends only: rate-limit tokens leased per round trip
+    # (defaults to 10% of the burst) and how often budget usage is synced.
+    rate_lease_size: Optional[float] = None
+    budget_sync_interval_seconds: float = 1.0
+
     # When ``strict=True``, refuse to initialize with an in-memory backend
     # (fail-closed for production).  The server startup should set
     # ``strict = os.environ.get("KOA_ENV") == "production"``.
@@ -123,27 +128,43 @@ class TenantGate:
             raise RuntimeError(
                 "TenantGate configured with strict=True but backend is not "
                 "multi-process safe. Provide a Redis/Postgres-backed GateBackend "
-                "for production deployments."
+                "(RedisGateBackend, PostgresGateBackend) for production deployments."
             )
+        # Rate limit + budget state move into the backend when it can hold them.
+        shared = self._backend.multiprocess_safe and hasattr(self._backend, "lease_tokens")
         # Rate limiter (token bucket)
-        self._rate: Optional[TokenBucketLimiter] = None
+        self._rate: Optional[Union[TokenBucketLimiter, LeasedTokenBucketLimiter]] = None
         if config.rpm and config.rpm > 0:
             capacity = config.rpm_burst or config.rpm
             # rpm → per second refill
-            self._rate = TokenBucketLimiter(
-                capacity=capacity,
-                refill_per_second=config.rpm / 60.0,
-            )
+            if shared:
+                self._rate = LeasedTokenBucketLimiter(
+                    self._backend,
+                    capacity=capacity,
+                    refill_per_second=config.rpm / 60.0,
+                    lease_size=config.rate_lease_size,
+                )
+            else:
+                self._rate = TokenBucketLimiter(
+                    capacity=capacity,
+                    refill_per_second=config.rpm / 60.0,
+                )
         # Budget
-        self._budget: Optional[BudgetTracker] = None
+        self._budget: Optional[Union[BudgetTracker, SharedBudgetTracker]] = None
         if config.tokens_per_window or config.cost_per_window_usd:
-            self._budget = BudgetTracker(
-                BudgetLimits(
-                    tokens_per_window=config.tokens_per_window,
-                    cost_per_window_usd=config.cost_per_window_usd,
-                    window_seconds=config.budget_window_seconds,
-                )
+            limits = BudgetLimits(
+                tokens_per_window=config.tokens_per_window,
+                cost_per_window_usd=config.cost_per_window_usd,
+                window_seconds=config.budget_window_seconds,
             )
+            if shared:
+                self._budget = SharedBudgetTracker(
+                    self._backend,
+                    limits,
+                    sync_interval=config.budget_sync_interval_seconds,
+                )
+            else:
+                self._budget = BudgetTracker(limits)
 
     async def check(self, tenant_id: str) -> GateDecision:
         """Run admission checks without acquiring; useful for pre-flight validation."""
@@ -213,3 +234,11 @@ class TenantGate:
                     await self._backend.decr_inflight(tenant_id)
                 except Exception as exc:  # pragma: no cover
                     logger.warning("decr_inflight failed for %s: %s", tenant_id, exc)
+
+    async def aclose(self) -> None:
+        """Flush usage still buffered for a shared backend."""
+        if isinstance(self._budget, SharedBudgetTracker):
+            try:
+                await self._budget.flush()
+            except Exception as exc:
+                logger.warning("Budget flush failed on shutdown: %s", exc)
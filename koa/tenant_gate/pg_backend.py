@@ -0,0 +1,265 @@
+"""PostgreSQL-backed tenant gate state.
+
+Reuses the application's :class:`~koa.db.database.Database` pool, so a
+deployment that already runs Postgres needs no extra infrastructure.
+Tables are created by migration ``014_tenant_gate``.
+
+- Rate-limit buckets and budget windows are single rows updated with
+  atomic ``INSERT ... ON CONFLICT DO UPDATE`` statements; all time math
+  uses the database clock, so replicas never disagree about refill.
+- In-flight slots are individual rows with an expiry, so a crashed worker
+  cannot leak concurrency forever.  Admission is serialized per tenant with
+  ``pg_advisory_xact_lock``.
+- Idempotency claims are a single upsert that only overwrites expired keys.
+"""
+
+from __future__ import annotations
+
+import json
+import uuid
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .idempotency import IdempotencyRecord
+
+if TYPE_CHECKING:
+    from ..db.database import Database
+
+
+class PostgresGateBackend:
+    """Shared concurrency, rate-limit and budget counters in Postgres.
+
+    Args:
+        db: Initialized application database.
+        inflight_ttl_seconds: Lifetime of an in-flight slot; should exceed
+            the longest expected request.
+    """
+
+    multiprocess_safe: bool = True
+
+    def __init__(self, db: "Database", inflight_ttl_seconds: float = 900.0) -> None:
+        self._db = db
+        self._inflight_ttl = inflight_ttl_seconds
+        # Slot ids this process holds, so decr releases one of its own.
+        self._slots: Dict[str, List[str]] = {}
+
+    # -- Concurrency --
+
+    async def incr_inflight(self, tenant_id: str) -> int:
+        slot_id = uuid.uuid4().hex
+        async with self._db.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    "SELECT pg_advisory_xact_lock(hashtext('koa_gate:' || $1))", tenant_id
+                )
+                await conn.execute(
+                    "DELETE FROM tenant_default.tenant_gate_inflight "
+                    "WHERE tenant_id = $1 AND expires_at <= NOW()",
+                    tenant_id,
+                )
+                await conn.execute(
+                    "INSERT INTO tenant_default.tenant_gate_inflight "
+                    "(slot_id, tenant_id, expires_at) "
+                    "VALUES ($1, $2, NOW() + make_interval(secs => $3))",
+                    slot_id,
+                    tenant_id,
+                    float(self._inflight_ttl),
+                )
+                n = await conn.fetchval(
+                    "SELECT COUNT(*) FROM tenant_default.tenant_gate_inflight WHERE tenant_id = $1",
+                    tenant_id,
+                )
+        self._slots.setdefault(tenant_id, []).append(slot_id)
+        return int(n)
+
+    async def decr_inflight(self, tenant_id: str) -> int:
+        slots = self._slots.get(tenant_id)
+        if slots:
+            await self._db.execute(
+                "DELETE FROM tenant_default.tenant_gate_inflight WHERE slot_id = $1", slots.pop()
+            )
+            if not slots:
+                del self._slots[tenant_id]
+        return await self.get_inflight(tenant_id)
+
+    async def get_inflight(self, tenant_id: str) -> int:
+        n = await self._db.fetchval(
+            "SELECT COUNT(*) FROM tenant_default.tenant_gate_inflight "
+            "WHERE tenant_id = $1 AND expires_at > NOW()",
+            tenant_id,
+        )
+        return int(n or 0)
+
+    # -- Rate limit --
+
+    async def lease_tokens(
+        self,
+        tenant_id: str,
+        want: float,
+        capacity: float,
+        refill_per_second: float,
+    ) -> float:
+        async with self._db.acquire() as conn:
+            async with conn.transaction():
+                # Create-or-lock the bucket row in one statement.
+                row = await conn.fetchrow(
+                    """
+                    INSERT INTO tenant_default.tenant_gate_buckets (tenant_id, tokens, updated_at)
+                    VALUES ($1, $2, clock_timestamp())
+                    ON CONFLICT (tenant_id) DO UPDATE SET tenant_id = EXCLUDED.tenant_id
+                    RETURNING tokens,
+                              EXTRACT(EPOCH FROM clock_timestamp() - updated_at) AS elapsed
+                    """,
+                    tenant_id,
+                    float(capacity),
+                )
+                available = min(
+                    capacity, row["tokens"] + max(0.0, float(row["elapsed"])) * refill_per_second
+                )
+                granted = max(0.0, min(want, available))
+                await conn.execute(
+                    "UPDATE tenant_default.tenant_gate_buckets "
+                    "SET tokens = $2, updated_at = clock_timestamp() "
+                    "WHERE tenant_id = $1",
+                    tenant_id,
+                    available - granted,
+                )
+        return granted
+
+    async def return_tokens(
+        self,
+        tenant_id: str,
+        tokens: float,
+        capacity: float,
+        refill_per_second: float,
+    ) -> None:
+        await self._db.execute(
+            """
+            UPDATE tenant_default.tenant_gate_buckets
+            SET tokens = LEAST(
+                    $3,
+                    tokens
+                    + GREATEST(0, EXTRACT(EPOCH FROM clock_timestamp() - updated_at)) * $4
+                    + $2
+                ),
+                updated_at = clock_timestamp()
+            WHERE tenant_id = $1
+            """,
+            tenant_id,
+            float(tokens),
+            float(capacity),
+            float(refill_per_second),
+        )
+
+    # -- Budget --
+
+    async def add_usage(
+        self,
+        tenant_id: str,
+        tokens: int,
+        cost_usd: float,
+        window_seconds: float,
+    ) -> Tuple[int, float, float]:
+        row = await self._db.fetchrow(
+            """
+            INSERT INTO tenant_default.tenant_gate_usage AS u
+                (tenant_id, window_start, tokens, cost_usd)
+            VALUES ($1, NOW(), $2, $3)
+            ON CONFLICT (tenant_id) DO UPDATE SET
+                window_start = CASE WHEN u.window_start <= NOW() - make_interval(secs => $4)
+                                    THEN NOW() ELSE u.window_start END,
+                tokens = CASE WHEN u.window_start <= NOW() - make_interval(secs => $4)
+                              THEN $2 ELSE u.tokens + $2 END,
+                cost_usd = CASE WHEN u.window_start <= NOW() - make_interval(secs => $4)
+                                THEN $3 ELSE u.cost_usd + $3 END
+            RETURNING tokens, cost_usd,
+                      $4 - EXTRACT(EPOCH FROM NOW() - window_start) AS remaining
+            """,
+            tenant_id,
+            int(tokens),
+            float(cost_usd),
+            float(window_seconds),
+        )
+        return int(row["tokens"]), float(row["cost_usd"]), max(0.0, float(row["remaining"]))
+
+
+class PostgresIdempotencyStore:
+    """Idempotency records in ``tenant_default.tenant_gate_idempotency``.
+
+    Results are stored as JSONB (non-JSON values via ``str``).  Timestamps
+    in returned records are epoch seconds.  Expired rows are reclaimed by
+    :meth:`begin`; call :meth:`purge_expired` periodically to bound the
+    table.
+    """
+
+    def __init__(self, db: "Database", default_ttl_seconds: float = 3600.0) -> None:
+        self._db = db
+        self.default_ttl = default_ttl_seconds
+
+    async def begin(
+        self, key: str, ttl_seconds: Optional[float] = None
+    ) -> Tuple[bool, Optional[IdempotencyRecord]]:
+        ttl = ttl_seconds or self.default_ttl
+        claimed = await self._db.fetchval(
+            """
+            INSERT INTO tenant_default.tenant_gate_idempotency AS i
+                (key, status, result, created_at, expires_at)
+            VALUES ($1, 'in_flight', NULL, NOW(), NOW() + make_interval(secs => $2))
+            ON CONFLICT (key) DO UPDATE SET
+                status = 'in_flight',
+                result = NULL,
+                created_at = NOW(),
+                expires_at = EXCLUDED.expires_at
+            WHERE i.expires_at <= NOW()
+            RETURNING key
+            """,
+            key,
+            float(ttl),
+        )
+        if claimed is not None:
+            return True, None
+        return False, await self.get(key)
+
+    async def complete(self, key: str, result: Any) -> None:
+        await self._db.execute(
+            "UPDATE tenant_default.tenant_gate_idempotency SET status = 'completed', result = $2 "
+            "WHERE key = $1",
+            key,
+            # The pool's JSONB codec has no ``default=``; coerce odd types here.
+            json.loads(json.dumps(result, default=str)),
+        )
+
+    async def fail(self, key: str) -> None:
+        await self._db.execute(
+            "DELETE FROM tenant_default.tenant_gate_idempotency WHERE key = $1", key
+        )
+
+    async def get(self, key: str) -> Optional[IdempotencyRecord]:
+        row = await self._db.fetchrow(
+            """
+            SELECT status, result,
+                   EXTRACT(EPOCH FROM created_at) AS created_at,
+                   EXTRACT(EPOCH FROM expires_at) AS expires_at
+            FROM tenant_default.tenant_gate_idempotency
+            WHERE key = $1 AND expires_at > NOW()
+            """,
+            key,
+        )
+        if row is None:
+            return None
+        return IdempotencyRecord(
+            key=key,
+            created_at=float(row["created_at"]),
+            status=row["status"],
+            result=row["result"],
+            expires_at=float(row["expires_at"]),
+        )
+
+    async def purge_expired(self) -> int:
+        """Delete expired records; returns the number removed."""
+        status = await self._db.execute(
+            "DELETE FROM tenant_default.tenant_gate_idempotency WHERE expires_at <= NOW()"
+        )
+        try:
+            return int(status.split()[-1])
+        except (AttributeError, ValueError, IndexError):
+            return 0
@@ -2,22 +2,34 @@
 
 Two independent algorithms so callers can pick based on traffic shape:
 
-- :class:`SlidingWindowLimiter` — exact count of requests in the last N
-  seconds.  Use when strict bursts-per-minute SLAs matter.
+- :class:`SlidingWindowLimiter` — count of requests in the last N seconds,
+  kept in a fixed ring of sub-window buckets (see
+  :class:`SlidingWindowCounter`).  Use when strict bursts-per-minute SLAs
+  matter.
 - :class:`TokenBucketLimiter` — classic refill-over-time bucket.  Smoother
   behavior under bursty load but allows short spikes.
 
 Both are ``asyncio``-safe and keyed by ``tenant_id``.  Both expose a
 consistent ``acquire(tenant_id)`` interface that returns ``(allowed, retry_after)``.
+
+:class:`LeasedTokenBucketLimiter` offers the same interface over a
+:class:`~.backends.SharedGateBackend` for multi-worker deployments.
 """
 
 from __future__ import annotations
 
 import asyncio
+import logging
 import time
-from collections import deque
+from array import array
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Deque, Dict, Tuple
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .backends import SharedGateBackend
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -66,31 +78,238 @@ class TokenBucketLimiter:
             return False, deficit / self.refill
 
 
+@dataclass
+class _Lease:
+    tokens: float
+    expires_at: float
+
+
+class LeasedTokenBucketLimiter:
+    """Token bucket whose state lives in a shared backend.
+
+    Instead of a round trip per request, each worker leases a small batch
+    of tokens (``lease_size``) from the shared bucket and spends them
+    locally.  Leased tokens are never lost: a worker that keeps serving a
+    tenant carries the unspent remainder into its next lease, and a lease
+    left idle for ``lease_ttl`` seconds is handed back to the shared bucket
+    (on the worker's next ``acquire``) so an idle worker cannot hoard
+    capacity.  The cluster-wide rate therefore matches the configured
+    limit and never exceeds it.
+
+    Args:
+        backend: Shared state store.
+        capacity: Maximum tokens (burst size).
+        refill_per_second: Steady-state rate.
+        lease_size: Tokens taken per round trip.  Defaults to 10% of
+            ``capacity`` (at least 1).
+        lease_ttl: Seconds a lease may sit unused before it is returned.
+    """
+
+    def __init__(
+        self,
+        backend: "SharedGateBackend",
+        capacity: float,
+        refill_per_second: float,
+        lease_size: Optional[float] = None,
+        lease_ttl: float = 1.0,
+    ) -> None:
+        if capacity <= 0 or refill_per_second <= 0:
+            raise ValueError("capacity and refill_per_second must be > 0")
+        self.capacity = float(capacity)
+        self.refill = float(refill_per_second)
+        self.lease_size = float(lease_size or max(1.0, self.capacity * 0.1))
+        self.lease_ttl = float(lease_ttl)
+        self._backend = backend
+        # Least recently used first, so idle leases are found from the front.
+        self._leases: "OrderedDict[str, _Lease]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tenant_id: str, cost: float = 1.0) -> Tuple[bool, float]:
+        """Try to consume ``cost`` tokens; see :meth:`TokenBucketLimiter.acquire`."""
+        now = time.monotonic()
+        async with self._lock:
+            idle = self._collect_idle(now, keep=tenant_id)
+            lease = self._take(tenant_id, cost, now)
+            want = 0.0 if lease is None else max(self.lease_size, cost - lease.tokens)
+        # Round trips outside the lock so one tenant's lease cannot stall others.
+        await self._give_back(idle)
+        if lease is None:
+            return True, 0.0
+        granted = await self._backend.lease_tokens(tenant_id, want, self.capacity, self.refill)
+        async with self._lock:
+            lease = self._lease_for(tenant_id, time.monotonic())
+            lease.tokens += granted
+            if lease.tokens >= cost:
+                lease.tokens -= cost
+                return True, 0.0
+            return False, (cost - lease.tokens) / self.refill
+
+    def _lease_for(self, tenant_id: str, now: float) -> _Lease:
+        """The tenant's lease, kept alive for another ``lease_ttl`` seconds."""
+        lease = self._leases.get(tenant_id)
+        if lease is None:
+            lease = _Lease(tokens=0.0, expires_at=now + self.lease_ttl)
+            self._leases[tenant_id] = lease
+        else:
+            lease.expires_at = now + self.lease_ttl
+            self._leases.move_to_end(tenant_id)
+        return lease
+
+    def _take(self, tenant_id: str, cost: float, now: float) -> Optional[_Lease]:
+        """Spend from the local lease; return it if it needs topping up."""
+        lease = self._lease_for(tenant_id, now)
+        if lease.tokens >= cost:
+            lease.tokens -= cost
+            return None
+        return lease
+
+    def _collect_idle(self, now: float, keep: str) -> Dict[str, float]:
+        """Drop leases unused for ``lease_ttl``; returns their unspent tokens."""
+        idle: Dict[str, float] = {}
+        while self._leases:
+            tenant_id, lease = next(iter(self._leases.items()))
+            if lease.expires_at > now or tenant_id == keep:
+                break
+            del self._leases[tenant_id]
+            if lease.tokens > 0:
+                idle[tenant_id] = lease.tokens
+        return idle
+
+    async def _give_back(self, idle: Dict[str, float]) -> None:
+        for tenant_id, tokens in idle.items():
+            try:
+                await self._backend.return_tokens(tenant_id, tokens, self.capacity, self.refill)
+            except Exception as e:
+                logger.debug(f"Returning {tokens:g} leased tokens for {tenant_id} failed: {e}")
+
+
+class _WindowState:
+    __slots__ = ("counts", "head", "total")
+
+    def __init__(self, buckets: int, head: int) -> None:
+        self.counts = array("I", bytes(4 * buckets))
+        self.head = head  # absolute index of the newest bucket
+        self.total = 0
+
+
+class SlidingWindowCounter:
+    """Per-key event counts over a sliding window, in O(1) amortized time.
+
+    The window is split into ``buckets`` equal sub-windows held in a fixed
+    ring, so memory per key is constant and a request only touches the
+    buckets that expired since that key was last seen.  Counts are
+    conservative: an event is forgotten between ``window_seconds - width``
+    and ``window_seconds`` after it happened, where ``width`` is one bucket.
+
+    Keys idle for a full window hold no information and are evicted
+    oldest-first on access.  ``max_keys`` additionally caps the key count by
+    evicting the least recently seen key (forgetting its history).
+
+    Not locked: callers on the event loop use it synchronously, async
+    callers wrap it in their own lock.
+
+    Args:
+        window_seconds: Window size.
+        buckets: Ring size; higher is more precise but uses more memory.
+        max_keys: Optional hard cap on tracked keys.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float,
+        buckets: int = 60,
+        max_keys: Optional[int] = None,
+    ) -> None:
+        if window_seconds <= 0 or buckets <= 0:
+            raise ValueError("window_seconds and buckets must be > 0")
+        self.window_seconds = float(window_seconds)
+        self.buckets = buckets
+        self.max_keys = max_keys
+        self._width = self.window_seconds / buckets
+        # Least recently seen first
+        self._states: "OrderedDict[str, _WindowState]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def count(self, key: str, now: float) -> int:
+        """Events recorded for ``key`` within the window ending at ``now``."""
+        return self._state(key, now).total
+
+    def add(self, key: str, now: float, n: int = 1) -> int:
+        """Record ``n`` events at ``now``; returns the new window count."""
+        state = self._state(key, now)
+        slot = state.head % self.buckets
+        state.counts[slot] = min(state.counts[slot] + n, 0xFFFFFFFF)
+        state.total += n
+        return state.total
+
+    def retry_after(self, key: str, now: float) -> float:
+        """Seconds until the oldest counted event leaves the window."""
+        state = self._state(key, now)
+        if not state.total:
+            return 0.0
+        for age in range(self.buckets - 1, -1, -1):
+            if state.counts[(state.head - age) % self.buckets]:
+                expires = (state.head - age + self.buckets) * self._width
+                return max(0.0, expires - now)
+        return 0.0
+
+    def _state(self, key: str, now: float) -> _WindowState:
+        head = int(now // self._width)
+        self._evict(head)
+        state = self._states.get(key)
+        if state is None:
+            state = _WindowState(self.buckets, head)
+            self._states[key] = state
+            if self.max_keys is not None and len(self._states) > self.max_keys:
+                self._states.popitem(last=False)
+            return state
+        self._states.move_to_end(key)
+        elapsed = head - state.head
+        if elapsed >= self.buckets:
+            state.counts = array("I", bytes(4 * self.buckets))
+            state.total = 0
+        elif elapsed > 0:
+            counts = state.counts
+            for i in range(state.head + 1, head + 1):
+                slot = i % self.buckets
+                state.total -= counts[slot]
+                counts[slot] = 0
+        if elapsed > 0:
+            state.head = head
+        return state
+
+    def _evict(self, head: int) -> None:
+        states = self._states
+        while states:
+            state = next(iter(states.values()))
+            if head - state.head < self.buckets:
+                break
+            states.popitem(last=False)
+
+
 class SlidingWindowLimiter:
     """Sliding-window request counter.
 
     Args:
         max_requests: Max requests allowed in ``window_seconds``.
         window_seconds: Sliding window size.
+        buckets: Sub-window count; see :class:`SlidingWindowCounter`.
     """
 
-    def __init__(self, max_requests: int, window_seconds: float) -> None:
+    def __init__(self, max_requests: int, window_seconds: float, buckets: int = 60) -> None:
         if max_requests <= 0 or window_seconds <= 0:
             raise ValueError("max_requests and window_seconds must be > 0")
         self.max_requests = max_requests
         self.window_seconds = float(window_seconds)
-        self._events: Dict[str, Deque[float]] = {}
+        self._counter = SlidingWindowCounter(window_seconds, buckets=buckets)
         self._lock = asyncio.Lock()
 
     async def acquire(self, tenant_id: str) -> Tuple[bool, float]:
         now = time.monotonic()
         async with self._lock:
-            q = self._events.setdefault(tenant_id, deque())
-            cutoff = now - self.window_seconds
-            while q and q[0] < cutoff:
-                q.popleft()
-            if len(q) < self.max_requests:
-                q.append(now)
+            if self._counter.count(tenant_id, now) < self.max_requests:
+                self._counter.add(tenant_id, now)
                 return True, 0.0
-            retry_after = self.window_seconds - (now - q[0])
-            return False, max(0.0, retry_after)
+            return False, self._counter.retry_after(tenant_id, now)
@@ -0,0 +1,222 @@
+"""Redis-backed tenant gate state.
+
+:class:`RedisGateBackend` implements :class:`~.backends.SharedGateBackend`
+and :class:`RedisIdempotencyStore` implements
+:class:`~.idempotency.IdempotencyStore` using only single-key atomic
+commands (``INCRBYFLOAT``, ``HINCRBY``, ``SET NX``), so any server speaking
+the Redis protocol works — Redis, Valkey, KeyDB, or an in-process stand-in
+in tests.  No Lua scripting is required.
+
+Requires the optional ``redis`` package (``pip install koa[redis]``) unless a
+client object is passed in directly.
+
+Rate limits use fixed windows of ``capacity / refill_per_second`` seconds
+aligned to the epoch, so the long-run rate matches the token bucket but a
+tenant can burst up to ``2 * capacity`` across a window boundary.  Windows
+are keyed on wall-clock time; replicas are assumed to run NTP.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import time
+from typing import Any, Optional, Tuple
+
+from .idempotency import IdempotencyRecord
+
+DEFAULT_KEY_PREFIX = "koa:gate"
+
+
+def _connect(url: str) -> Any:
+    try:
+        import redis.asyncio as aioredis
+    except ImportError:
+        raise ImportError("redis package required for Redis gate backend: pip install redis")
+    return aioredis.from_url(url, decode_responses=True)
+
+
+class RedisGateBackend:
+    """Shared concurrency, rate-limit and budget counters in Redis.
+
+    Args:
+        client: A ``redis.asyncio.Redis``-compatible client.  Created from
+            ``url`` when omitted.
+        url: Connection URL used when ``client`` is not given.
+        key_prefix: Namespace for all keys.
+        inflight_ttl_seconds: Expiry refreshed on every in-flight increment,
+            so counts leaked by a crashed worker eventually reset.
+    """
+
+    multiprocess_safe: bool = True
+
+    def __init__(
+        self,
+        client: Any = None,
+        *,
+        url: str = "redis://localhost:6379",
+        key_prefix: str = DEFAULT_KEY_PREFIX,
+        inflight_ttl_seconds: int = 900,
+    ) -> None:
+        self._client = client if client is not None else _connect(url)
+        self._prefix = key_prefix
+        self._inflight_ttl = inflight_ttl_seconds
+
+    # -- Concurrency --
+
+    async def incr_inflight(self, tenant_id: str) -> int:
+        key = f"{self._prefix}:inflight:{tenant_id}"
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, self._inflight_ttl)
+            n, _ = await pipe.execute()
+        return int(n)
+
+    async def decr_inflight(self, tenant_id: str) -> int:
+        key = f"{self._prefix}:inflight:{tenant_id}"
+        n = int(await self._client.decr(key))
+        if n < 0:
+            # The key expired under a long-running request; don't go negative.
+            await self._client.incr(key)
+            n = 0
+        return n
+
+    async def get_inflight(self, tenant_id: str) -> int:
+        value = await self._client.get(f"{self._prefix}:inflight:{tenant_id}")
+        return max(0, int(value or 0))
+
+    # -- Rate limit --
+
+    async def lease_tokens(
+        self,
+        tenant_id: str,
+        want: float,
+        capacity: float,
+        refill_per_second: float,
+    ) -> float:
+        window = capacity / refill_per_second
+        index = int(time.time() // window)
+        key = f"{self._prefix}:rate:{tenant_id}:{index}"
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.incrbyfloat(key, want)
+            pipe.expire(key, int(math.ceil(window)) + 1)
+            used, _ = await pipe.execute()
+        # Over-subscription is never given back: later callers in this
+        # window simply see an exhausted counter.
+        return max(0.0, min(want, capacity - (float(used) - want)))
+
+    async def return_tokens(
+        self,
+        tenant_id: str,
+        tokens: float,
+        capacity: float,
+        refill_per_second: float,
+    ) -> None:
+        window = capacity / refill_per_second
+        key = f"{self._prefix}:rate:{tenant_id}:{int(time.time() // window)}"
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.incrbyfloat(key, -tokens)
+            pipe.expire(key, int(math.ceil(window)) + 1)
+            used, _ = await pipe.execute()
+        if float(used) < 0:
+            # The lease came from an earlier window; this one owes nothing.
+            async with self._client.pipeline(transaction=True) as pipe:
+                pipe.incrbyfloat(key, -float(used))
+                await pipe.execute()
+
+    # -- Budget --
+
+    async def add_usage(
+        self,
+        tenant_id: str,
+        tokens: int,
+        cost_usd: float,
+        window_seconds: float,
+    ) -> Tuple[int, float, float]:
+        now = time.time()
+        index = int(now // window_seconds)
+        key = f"{self._prefix}:usage:{tenant_id}:{index}"
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.hincrby(key, "tokens", int(tokens))
+            pipe.hincrbyfloat(key, "cost_usd", float(cost_usd))
+            pipe.expire(key, int(math.ceil(window_seconds)) + 1)
+            total_tokens, total_cost, _ = await pipe.execute()
+        remaining = (index + 1) * window_seconds - now
+        return int(total_tokens), float(total_cost), remaining
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class RedisIdempotencyStore:
+    """Idempotency records stored as JSON strings with a native Redis TTL.
+
+    ``begin`` is a single ``SET NX PX``; results must be JSON-serializable
+    (non-JSON values are stored via ``str``).  Timestamps in returned
+    records are wall-clock epoch seconds.
+    """
+
+    def __init__(
+        self,
+        client: Any = None,
+        *,
+        url: str = "redis://localhost:6379",
+        key_prefix: str = f"{DEFAULT_KEY_PREFIX}:idem",
+        default_ttl_seconds: float = 3600.0,
+    ) -> None:
+        self._client = client if client is not None else _connect(url)
+        self._prefix = key_prefix
+        self.default_ttl = default_ttl_seconds
+
+    async def begin(
+        self, key: str, ttl_seconds: Optional[float] = None
+    ) -> Tuple[bool, Optional[IdempotencyRecord]]:
+        ttl = ttl_seconds or self.default_ttl
+        for _ in range(2):
+            now = time.time()
+            rec = IdempotencyRecord(
+                key=key, created_at=now, status="in_flight", expires_at=now + ttl
+            )
+            claimed = await self._client.set(
+                self._key(key), self._dump(rec), nx=True, px=int(ttl * 1000)
+            )
+            if claimed:
+                return True, None
+            existing = await self.get(key)
+            if existing is not None:
+                return False, existing
+            # Expired between SET and GET; try to claim again.
+        return False, None
+
+    async def complete(self, key: str, result: Any) -> None:
+        rec = await self.get(key)
+        if rec is None:
+            return
+        rec.status = "completed"
+        rec.result = result
+        await self._client.set(self._key(key), self._dump(rec), xx=True, keepttl=True)
+
+    async def fail(self, key: str) -> None:
+        await self._client.delete(self._key(key))
+
+    async def get(self, key: str) -> Optional[IdempotencyRecord]:
+        raw = await self._client.get(self._key(key))
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return IdempotencyRecord(key=key, **data)
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}:{key}"
+
+    @staticmethod
+    def _dump(rec: IdempotencyRecord) -> str:
+        return json.dumps(
+            {
+                "created_at": rec.created_at,
+                "status": rec.status,
+                "result": rec.result,
+                "expires_at": rec.expires_at,
+            },
+            default=str,
+        )
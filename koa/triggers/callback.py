@@ -6,6 +6,8 @@ from typing import Any, Dict, Optional
 
 import httpx
 
+from ..http_pool import http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,7 +45,7 @@ class CallbackNotification:
 
         for attempt in range(2):  # 1 initial + 1 retry
             try:
-                async with httpx.AsyncClient(timeout=self._timeout) as client:
+                async with http_client(timeout=self._timeout) as client:
                     response = await client.post(self._callback_url, json=payload)
                     response.raise_for_status()
                 logger.info(f"Callback notification sent for tenant {tenant_id}")
@@ -0,0 +1,201 @@
+"""CronCluster — multi-node coordination for CronService.
+
+With several API replicas sharing one ``cron_jobs`` table, each replica
+runs its own :class:`CronService`.  A ``CronCluster`` keeps them from
+stepping on each other:
+
+- **Membership**: every node upserts a heartbeat row in ``cron_nodes``.
+  Nodes whose heartbeat is older than ``node_ttl_s`` are considered dead.
+- **Partitioning**: each job is owned by one live node, chosen by
+  rendezvous (highest-random-weight) hashing on ``job_id``.  Adding a node
+  moves only ~1/N of the jobs, so firing capacity scales horizontally.
+- **Claiming**: before firing, the owner takes a lease on the row with
+  ``FOR UPDATE SKIP LOCKED``.  The claim is fenced on the persisted
+  ``next_run_at_ms`` so a node with a stale in-memory copy cannot re-fire
+  a run another node already completed, and two nodes that briefly
+  disagree about membership cannot both fire the same run.
+- **Takeover**: when a node dies its heartbeat lapses, its jobs rehash to
+  the survivors, and its leases expire after ``lease_ttl_s``.
+
+Requires migration ``015_cron_cluster`` and :class:`PostgresCronJobStore`.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import socket
+import uuid
+from typing import Dict, List, Optional
+
+from .models import CronJob
+
+logger = logging.getLogger(__name__)
+
+# How often each node heartbeats and pulls other nodes' job changes
+HEARTBEAT_INTERVAL_S = 10.0
+
+# A node missing this many seconds of heartbeats is considered dead
+NODE_TTL_S = 30.0
+
+# Lease lifetime; must exceed the longest job run
+LEASE_TTL_S = 15 * 60.0
+
+_CLAIM_SQL = """
+    WITH candidates AS (
+        SELECT c.id
+        FROM cron_jobs c
+        JOIN unnest($2::text[], $3::bigint[]) AS t(id, next_run_at_ms) ON c.id = t.id
+        WHERE c.deleted_at IS NULL
+          AND c.enabled
+          AND c.next_run_at_ms IS NOT DISTINCT FROM t.next_run_at_ms
+          AND (c.lease_owner IS NULL OR c.lease_owner = $1 OR c.lease_expires_at < NOW())
+        FOR UPDATE OF c SKIP LOCKED
+    )
+    UPDATE cron_jobs
+    SET lease_owner = $1, lease_expires_at = NOW() + make_interval(secs => $4)
+    FROM candidates
+    WHERE cron_jobs.id = candidates.id
+    RETURNING cron_jobs.id
+"""
+
+
+def _weight(node_id: str, job_id: str) -> int:
+    digest = hashlib.blake2b(f"{node_id}\x00{job_id}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def default_node_id() -> str:
+    """Host name + pid + random suffix; unique per process start."""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class CronCluster:
+    """Membership, job partitioning and leases for multi-node cron.
+
+    Args:
+        db: Database instance (koa.db.Database) with asyncpg pool.
+        node_id: Unique id for this process; generated when omitted.
+        heartbeat_interval_s: Heartbeat / refresh period.
+        node_ttl_s: Heartbeat age after which a node is considered dead.
+        lease_ttl_s: Lease lifetime for a claimed job run.
+    """
+
+    def __init__(
+        self,
+        db,
+        node_id: Optional[str] = None,
+        heartbeat_interval_s: float = HEARTBEAT_INTERVAL_S,
+        node_ttl_s: float = NODE_TTL_S,
+        lease_ttl_s: float = LEASE_TTL_S,
+    ):
+        self._db = db
+        self.node_id = node_id or default_node_id()
+        self.heartbeat_interval_s = heartbeat_interval_s
+        self.node_ttl_s = node_ttl_s
+        self.lease_ttl_s = lease_ttl_s
+        self._live_nodes: List[str] = [self.node_id]
+
+    @property
+    def live_nodes(self) -> List[str]:
+        return list(self._live_nodes)
+
+    async def heartbeat(self) -> List[str]:
+        """Refresh this node's heartbeat and the live-node list."""
+        await self._db.execute(
+            """
+            INSERT INTO tenant_default.cron_nodes (node_id, heartbeat_at) VALUES ($1, NOW())
+            ON CONFLICT (node_id) DO UPDATE SET heartbeat_at = NOW()
+            """,
+            self.node_id,
+        )
+        rows = await self._db.fetch(
+            "SELECT node_id FROM tenant_default.cron_nodes "
+            "WHERE heartbeat_at > NOW() - make_interval(secs => $1) ORDER BY node_id",
+            float(self.node_ttl_s),
+        )
+        nodes = [row["node_id"] for row in rows]
+        if self.node_id not in nodes:
+            nodes.append(self.node_id)
+        if nodes != self._live_nodes:
+            logger.info(f"[CronCluster] Live nodes changed: {nodes}")
+        self._live_nodes = nodes
+        return nodes
+
+    async def leave(self) -> None:
+        """Deregister and release this node's leases (graceful shutdown)."""
+        try:
+            await self._db.execute(
+                "UPDATE cron_jobs SET lease_owner = NULL, lease_expires_at = NULL "
+                "WHERE lease_owner = $1",
+                self.node_id,
+            )
+            await self._db.execute(
+                "DELETE FROM tenant_default.cron_nodes WHERE node_id = $1", self.node_id
+            )
+        except Exception as e:
+            logger.warning(f"[CronCluster] Failed to leave cluster cleanly: {e}")
+
+    def owner_of(self, job_id: str) -> str:
+        """Live node responsible for ``job_id`` (rendezvous hashing)."""
+        return max(self._live_nodes, key=lambda node: _weight(node, job_id))
+
+    def owns(self, job_id: str) -> bool:
+        return self.owner_of(job_id) == self.node_id
+
+    async def claim(self, jobs: List[CronJob]) -> List[CronJob]:
+        """Lease the given due runs; returns the jobs this node may fire.
+
+        A job is claimed only if its persisted ``next_run_at_ms`` still
+        matches the in-memory copy and no other live lease holds it.
+        """
+        if not jobs:
+            return []
+        rows = await self._db.fetch(
+            _CLAIM_SQL,
+            self.node_id,
+            [job.id for job in jobs],
+            [job.state.next_run_at_ms for job in jobs],
+            float(self.lease_ttl_s),
+        )
+        claimed = {row["id"] for row in rows}
+        return [job for job in jobs if job.id in claimed]
+
+    async def release(self, job_id: str, claimed_next_run_at_ms: Optional[int]) -> None:
+        """Drop the lease once the run has been persisted.
+
+        The lease is kept (and left to expire) if the row still shows the
+        claimed due time, i.e. the run's outcome never reached the database;
+        releasing early would let another node fire the same run again.
+        """
+        await self._db.execute(
+            """
+            UPDATE cron_jobs SET lease_owner = NULL, lease_expires_at = NULL
+            WHERE id = $1 AND lease_owner = $2
+              AND (deleted_at IS NOT NULL OR NOT enabled
+                   OR next_run_at_ms IS DISTINCT FROM $3)
+            """,
+            job_id,
+            self.node_id,
+            claimed_next_run_at_ms,
+        )
+
+    def shard_counts(self, job_ids: List[str]) -> Dict[str, int]:
+        """Jobs per live node; for status output and tests."""
+        counts = {node: 0 for node in self._live_nodes}
+        for job_id in job_ids:
+            counts[self.owner_of(job_id)] += 1
+        return counts
+
+    async def run_heartbeats(self, on_beat=None) -> None:
+        """Heartbeat forever; ``on_beat`` is awaited after each beat."""
+        while True:
+            try:
+                await self.heartbeat()
+                if on_beat is not None:
+                    await on_beat()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[CronCluster] Heartbeat failed: {e}")
+            await asyncio.sleep(self.heartbeat_interval_s)
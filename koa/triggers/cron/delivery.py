@@ -125,11 +125,11 @@ class CronDeliveryHandler:
             headers["Authorization"] = f"Bearer {job.delivery.webhook_token}"
 
         try:
-            import httpx
+            from ...http_pool import http_client
         except ImportError:
             raise RuntimeError("httpx required for webhook delivery")
 
-        async with httpx.AsyncClient(timeout=WEBHOOK_TIMEOUT_SECONDS) as client:
+        async with http_client(timeout=WEBHOOK_TIMEOUT_SECONDS) as client:
             response = await client.post(
                 url,
                 content=json.dumps(payload, ensure_ascii=False),
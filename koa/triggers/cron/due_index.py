@@ -0,0 +1,118 @@
+"""DueIndex — min-heap of job due times with lazy invalidation.
+
+Both cron stores keep one of these next to their ``_jobs`` dict so the
+timer loop can ask "what is due?" and "when is the next job due?" without
+scanning every job.
+
+Entries are ``(next_run_at_ms, job_id)``.  Updating a job pushes a new
+entry and leaves the old one in the heap; stale entries are discarded when
+they reach the top.  An entry is live only if it matches both the latest
+time pushed for that job and the job's current state, so jobs that were
+disabled, deleted, started running, or rescheduled are skipped cheaply.
+
+Jobs mutated in place must be passed back through the store's ``update``
+(or ``reindex`` after bulk changes).  A job whose time was changed in place
+is re-pushed at its current time once its old entry surfaces, so it is
+never lost, only possibly fired late.
+"""
+
+import heapq
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from .models import CronJob
+
+# Rebuild the heap once stale entries outnumber live ones by this factor
+_COMPACT_RATIO = 2
+_COMPACT_MIN = 64
+
+
+def _due_at(job: CronJob) -> Optional[int]:
+    """Time at which ``job`` should fire, or None if it is not schedulable."""
+    if not job.enabled or job.state.running_at_ms is not None:
+        return None
+    return job.state.next_run_at_ms
+
+
+class DueIndex:
+    """Due-time index over a ``job_id -> CronJob`` mapping owned by a store."""
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[int, str]] = []
+        # Latest time pushed per job; heap entries that disagree are stale.
+        self._scheduled: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._scheduled)
+
+    def rebuild(self, jobs: Mapping[str, CronJob]) -> None:
+        """Index every job from scratch (O(n))."""
+        self._scheduled = {}
+        for job_id, job in jobs.items():
+            when = _due_at(job)
+            if when is not None:
+                self._scheduled[job_id] = when
+        self._heap = [(when, job_id) for job_id, when in self._scheduled.items()]
+        heapq.heapify(self._heap)
+
+    def push(self, job: CronJob) -> None:
+        """(Re)index ``job`` at its current due time."""
+        when = _due_at(job)
+        if when is None:
+            self._scheduled.pop(job.id, None)
+            return
+        if self._scheduled.get(job.id) == when:
+            return
+        self._scheduled[job.id] = when
+        heapq.heappush(self._heap, (when, job.id))
+        if len(self._heap) > _COMPACT_RATIO * len(self._scheduled) + _COMPACT_MIN:
+            self._compact()
+
+    def discard(self, job_id: str) -> None:
+        self._scheduled.pop(job_id, None)
+
+    def peek(self, jobs: Mapping[str, CronJob]) -> Optional[int]:
+        """Earliest due time among indexed jobs (amortized O(log n))."""
+        heap = self._heap
+        while heap:
+            when, job_id = heap[0]
+            if self._is_live(when, job_id, jobs):
+                return when
+            self._drop_top(jobs)
+        return None
+
+    def pop_due(self, jobs: Mapping[str, CronJob], now_ms: int) -> List[CronJob]:
+        """Remove and return jobs due at or before ``now_ms``, earliest first.
+
+        Returned jobs are no longer indexed; the store's ``update`` puts them
+        back once their next run has been computed.
+        """
+        heap = self._heap
+        due: List[CronJob] = []
+        while heap and heap[0][0] <= now_ms:
+            when, job_id = heap[0]
+            if self._is_live(when, job_id, jobs):
+                heapq.heappop(heap)
+                del self._scheduled[job_id]
+                due.append(jobs[job_id])
+            else:
+                self._drop_top(jobs)
+        return due
+
+    def _is_live(self, when: int, job_id: str, jobs: Mapping[str, CronJob]) -> bool:
+        if self._scheduled.get(job_id) != when:
+            return False
+        job = jobs.get(job_id)
+        return job is not None and _due_at(job) == when
+
+    def _drop_top(self, jobs: Mapping[str, CronJob]) -> None:
+        when, job_id = heapq.heappop(self._heap)
+        if self._scheduled.get(job_id) == when:
+            # The job's latest entry, but its state moved on without update().
+            del self._scheduled[job_id]
+            job = jobs.get(job_id)
+            if job is not None:
+                self.push(job)
+
+    def _compact(self) -> None:
+        self._heap = [(when, job_id) for job_id, when in self._scheduled.items()]
+        heapq.heapify(self._heap)
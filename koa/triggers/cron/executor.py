@@ -81,6 +81,7 @@ class CronExecutor:
 
         # Mark as running
         job.state.running_at_ms = now
+        self._store.update(job)
         await self._store.save()
 
         # Emit started event
@@ -160,6 +161,7 @@ class CronExecutor:
             if next_run is not None and next_run - end_ms < MIN_REFIRE_GAP_MS:
                 next_run = end_ms + MIN_REFIRE_GAP_MS
             job.state.next_run_at_ms = next_run
+            self._store.update(job)
 
         # Save
         await self._store.save()
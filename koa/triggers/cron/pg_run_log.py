@@ -17,7 +17,8 @@ class PostgresCronRunLog:
     """PostgreSQL persistence for cron run history.
 
     Implements the same interface as CronRunLog (append, get_runs, prune,
-    delete_log, list_job_ids).
+    delete_log, list_job_ids).  Newest-first reads and pruning are served
+    by the ``(job_id, created_at DESC)`` indexes from migration 016.
     """
 
     def __init__(self, db):
@@ -103,11 +104,11 @@ class PostgresCronRunLog:
             result = await self._db.execute(
                 """
                 DELETE FROM cron_runs
-                WHERE job_id = $1 AND id NOT IN (
+                WHERE id IN (
                     SELECT id FROM cron_runs
                     WHERE job_id = $1
                     ORDER BY created_at DESC
-                    LIMIT $2
+                    OFFSET $2
                 )
                 """,
                 job_id,
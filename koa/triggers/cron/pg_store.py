@@ -5,24 +5,65 @@ table in PostgreSQL so jobs survive container restarts and support
 multi-user isolation natively.
 """
 
+import asyncio
 import json
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 
+from .due_index import DueIndex
 from .models import CronJob
 
 logger = logging.getLogger(__name__)
 
+_UPSERT_SQL = """
+    INSERT INTO cron_jobs (id, user_id, name, enabled, data, created_at, updated_at,
+                           next_run_at_ms, changed_at)
+    SELECT id, user_id, name, enabled, data::jsonb,
+           to_timestamp(created_ms / 1000.0), to_timestamp(updated_ms / 1000.0),
+           next_run_at_ms, clock_timestamp()
+    FROM unnest($1::text[], $2::text[], $3::text[], $4::bool[], $5::text[],
+                $6::bigint[], $7::bigint[], $8::bigint[])
+        AS t(id, user_id, name, enabled, data, created_ms, updated_ms, next_run_at_ms)
+    ON CONFLICT (id) DO UPDATE SET
+        user_id = EXCLUDED.user_id,
+        name = EXCLUDED.name,
+        enabled = EXCLUDED.enabled,
+        data = EXCLUDED.data,
+        updated_at = EXCLUDED.updated_at,
+        next_run_at_ms = EXCLUDED.next_run_at_ms,
+        changed_at = EXCLUDED.changed_at
+"""
+
+# Re-read rows changed this long before the last refresh, to cover
+# transactions that committed after a later-stamped one.
+REFRESH_OVERLAP_S = 5.0
+
+
+def _upsert_columns(jobs: List[CronJob]) -> tuple:
+    """Column arrays for :data:`_UPSERT_SQL`."""
+    return (
+        [j.id for j in jobs],
+        [j.user_id for j in jobs],
+        [j.name for j in jobs],
+        [j.enabled for j in jobs],
+        [json.dumps(j.to_dict(), ensure_ascii=False) for j in jobs],
+        [j.created_at_ms for j in jobs],
+        [j.updated_at_ms for j in jobs],
+        [j.state.next_run_at_ms for j in jobs],
+    )
+
 
 class PostgresCronJobStore:
     """PostgreSQL persistence for cron jobs.
 
     Implements the same interface as CronJobStore (get, list, add, update,
-    remove, find_by_name, find_by_hint, get_next_due_time) but backed by
+    remove, find_by_name, find_by_hint, get_next_due_time, pop_due_jobs) but backed by
     the ``cron_jobs`` table.
 
-    Jobs are cached in memory for fast access by the timer loop, and
-    synced to the database on every write.
+    Jobs are cached in memory for fast access by the timer loop.  Writes
+    mark the job dirty and :meth:`save` flushes only dirty jobs and pending
+    soft-deletes, one multi-row statement each.  Jobs mutated in place must
+    go through :meth:`update` to be persisted.
     """
 
     def __init__(self, db):
@@ -32,12 +73,18 @@ class PostgresCronJobStore:
         """
         self._db = db
         self._jobs: Dict[str, CronJob] = {}
-        self._pending_soft_deletes: List[str] = []
+        self._due = DueIndex()
+        self._dirty: Set[str] = set()
+        self._pending_soft_deletes: Set[str] = set()
+        self._flush_lock = asyncio.Lock()
+        self._synced_at = None  # DB timestamp of the last load/refresh
 
     async def load(self) -> None:
         """Load all active (non-deleted) jobs from database into memory cache."""
+        self._synced_at = await self._db.fetchval("SELECT clock_timestamp()")
         rows = await self._db.fetch("SELECT id, data FROM cron_jobs WHERE deleted_at IS NULL")
         self._jobs = {}
+        self._dirty.clear()
         for row in rows:
             try:
                 data = row["data"] if isinstance(row["data"], dict) else json.loads(row["data"])
@@ -47,50 +94,96 @@ class PostgresCronJobStore:
             except Exception as e:
                 logger.warning(f"Skipping invalid cron job {row['id']}: {e}")
 
+        self._due.rebuild(self._jobs)
         logger.info(f"Loaded {len(self._jobs)} cron jobs from database")
 
-    async def _persist(self, job: CronJob) -> None:
-        """Write a single job to the database."""
-        data = job.to_dict()
-        await self._db.execute(
-            """
-            INSERT INTO cron_jobs (id, user_id, name, enabled, data, created_at, updated_at)
-            VALUES ($1, $2, $3, $4, $5::jsonb, to_timestamp($6 / 1000.0), to_timestamp($7 / 1000.0))
-            ON CONFLICT (id) DO UPDATE SET
-                user_id = EXCLUDED.user_id,
-                name = EXCLUDED.name,
-                enabled = EXCLUDED.enabled,
-                data = EXCLUDED.data,
-                updated_at = EXCLUDED.updated_at
-            """,
-            job.id,
-            job.user_id,
-            job.name,
-            job.enabled,
-            json.dumps(data, ensure_ascii=False),
-            job.created_at_ms,
-            job.updated_at_ms,
-        )
-
     async def save(self) -> None:
-        """Persist all jobs to database and flush pending soft-deletes."""
-        # Flush soft-deletes
-        for job_id in self._pending_soft_deletes:
+        """Flush dirty jobs and pending soft-deletes to the database.
+
+        Upserts go out as one ``INSERT ... SELECT FROM unnest(...)`` and
+        soft-deletes as one ``UPDATE ... WHERE id = ANY(...)``, in a single
+        transaction.  On failure the ids stay queued for the next save.
+        """
+        async with self._flush_lock:
+            dirty = [self._jobs[job_id] for job_id in self._dirty if job_id in self._jobs]
+            deletes = list(self._pending_soft_deletes)
+            if not dirty and not deletes:
+                return
+            self._dirty.clear()
+            self._pending_soft_deletes.clear()
+
             try:
-                await self._db.execute(
-                    "UPDATE cron_jobs SET enabled = false, deleted_at = now(), updated_at = now() WHERE id = $1",
-                    job_id,
-                )
+                async with self._db.acquire() as conn:
+                    async with conn.transaction():
+                        if deletes:
+                            await conn.execute(
+                                "UPDATE cron_jobs SET enabled = false, deleted_at = now(), "
+                                "updated_at = now(), changed_at = clock_timestamp() "
+                                "WHERE id = ANY($1::text[])",
+                                deletes,
+                            )
+                        if dirty:
+                            await conn.execute(_UPSERT_SQL, *_upsert_columns(dirty))
             except Exception as e:
-                logger.error(f"Failed to soft-delete cron job {job_id}: {e}")
-        self._pending_soft_deletes.clear()
+                logger.error(
+                    f"Failed to persist {len(dirty)} cron job(s) and "
+                    f"{len(deletes)} soft-delete(s): {e}"
+                )
+                # Re-queue for the next save; jobs removed meanwhile stay removed.
+                for job in dirty:
+                    if job.id in self._jobs:
+                        self._dirty.add(job.id)
+                for job_id in deletes:
+                    if job_id not in self._jobs:
+                        self._pending_soft_deletes.add(job_id)
 
-        # Upsert all current jobs
-        for job in self._jobs.values():
+    async def refresh(self) -> int:
+        """Pull rows other nodes changed since the last load/refresh.
+
+        Used in multi-node mode (see :mod:`.cluster`).  Jobs with unsaved
+        local changes or a local run in progress keep the local copy.
+        Returns the number of jobs added, replaced or dropped.
+        """
+        if self._synced_at is None:
+            await self.load()
+            return len(self._jobs)
+        synced_at = await self._db.fetchval("SELECT clock_timestamp()")
+        rows = await self._db.fetch(
+            """
+            SELECT id, data, deleted_at IS NOT NULL AS deleted
+            FROM cron_jobs
+            WHERE changed_at > $1::timestamptz - make_interval(secs => $2)
+            """,
+            self._synced_at,
+            REFRESH_OVERLAP_S,
+        )
+        self._synced_at = synced_at
+        changed = 0
+        for row in rows:
+            job_id = row["id"]
+            local = self._jobs.get(job_id)
+            if job_id in self._dirty or (
+                local is not None and local.state.running_at_ms is not None
+            ):
+                continue
+            if row["deleted"]:
+                if self._jobs.pop(job_id, None) is not None:
+                    self._due.discard(job_id)
+                    changed += 1
+                continue
             try:
-                await self._persist(job)
+                data = row["data"] if isinstance(row["data"], dict) else json.loads(row["data"])
+                data["id"] = job_id
+                job = CronJob.from_dict(data)
             except Exception as e:
-                logger.error(f"Failed to persist cron job {job.id}: {e}")
+                logger.warning(f"Skipping invalid cron job {job_id}: {e}")
+                continue
+            if local is not None and local.to_dict() == job.to_dict():
+                continue
+            self._jobs[job_id] = job
+            self._due.push(job)
+            changed += 1
+        return changed
 
     def get(self, job_id: str) -> Optional[CronJob]:
         return self._jobs.get(job_id)
@@ -111,28 +204,41 @@ class PostgresCronJobStore:
 
     def add(self, job: CronJob) -> None:
         self._jobs[job.id] = job
+        self._due.push(job)
+        self._dirty.add(job.id)
+        self._pending_soft_deletes.discard(job.id)
 
     def update(self, job: CronJob) -> None:
-        self._jobs[job.id] = job
+        """Store ``job`` and reindex it; call after mutating a job in place."""
+        self.add(job)
+
+    def reindex(self) -> None:
+        """Rebuild the due-time index and mark every job for persistence.
+
+        Use after bulk in-place changes (e.g. :func:`recompute_next_runs`).
+        """
+        self._due.rebuild(self._jobs)
+        self._dirty.update(self._jobs)
 
     def remove(self, job_id: str) -> bool:
+        self._due.discard(job_id)
+        self._dirty.discard(job_id)
         removed = self._jobs.pop(job_id, None) is not None
         if removed:
-            self._pending_soft_deletes.append(job_id)
+            self._pending_soft_deletes.add(job_id)
         return removed
 
     def get_next_due_time(self) -> Optional[int]:
         """Return the earliest next_run_at_ms across all enabled, non-running jobs."""
-        earliest: Optional[int] = None
-        for job in self._jobs.values():
-            if not job.enabled:
-                continue
-            if job.state.running_at_ms is not None:
-                continue
-            nra = job.state.next_run_at_ms
-            if nra is not None and (earliest is None or nra < earliest):
-                earliest = nra
-        return earliest
+        return self._due.peek(self._jobs)
+
+    def pop_due_jobs(self, now_ms: int) -> List[CronJob]:
+        """Return enabled, non-running jobs due at or before ``now_ms``.
+
+        Only touches due entries.  Returned jobs leave the due index until
+        they are passed back through :meth:`update`.
+        """
+        return self._due.pop_due(self._jobs, now_ms)
 
     def find_by_name(self, name: str, user_id: Optional[str] = None) -> Optional[CronJob]:
         """Find a job by exact or partial name match."""
@@ -1,11 +1,13 @@
 """CronRunLog — per-job JSONL run history with pruning."""
 
+import asyncio
 import json
 import logging
 import os
+import shutil
 import tempfile
 from pathlib import Path
-from typing import List, Optional
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
 
 from .models import CronRunEntry
 
@@ -15,21 +17,58 @@ DEFAULT_MAX_BYTES = 2_000_000  # 2 MB
 DEFAULT_KEEP_LINES = 2000
 
 
+# Block size for reading log files backwards
+READ_BLOCK_SIZE = 64 * 1024
+
+
+def _reverse_lines(f: BinaryIO, block_size: int = READ_BLOCK_SIZE) -> Iterator[Tuple[int, bytes]]:
+    """Yield ``(start_offset, line)`` from the end of ``f`` backwards.
+
+    Reads ``block_size`` bytes at a time, so finding the newest N lines
+    costs O(bytes in those lines), not O(file size).
+    """
+    f.seek(0, os.SEEK_END)
+    pos = f.tell()
+    tail = b""
+    while pos > 0:
+        step = min(block_size, pos)
+        pos -= step
+        f.seek(pos)
+        chunk = f.read(step) + tail
+        lines = chunk.split(b"\n")
+        cursor = pos + len(chunk)
+        for line in reversed(lines[1:]):
+            start = cursor - len(line)
+            yield start, line
+            cursor = start - 1
+        tail = lines[0]
+    yield 0, tail
+
+
 class CronRunLog:
     """Per-job JSONL run history.
 
     Stores one ``{job_id}.jsonl`` file per job in ``{data_dir}/runs/``.
     Supports automatic pruning when files exceed size limits.
+
+    Reads seek backwards from the end of the file, so newest-first pages
+    only touch the bytes they return.  All file I/O runs in a worker
+    thread to keep the event loop free.
     """
 
     def __init__(self, data_dir: str = "~/.koa/cron"):
         self._runs_dir = Path(os.path.expanduser(data_dir)) / "runs"
+        # Serializes append/prune per job so a prune can't drop a fresh line
+        self._locks: Dict[str, asyncio.Lock] = {}
 
     def _job_log_path(self, job_id: str) -> Path:
         """Return path for a job's log file, preventing directory traversal."""
         safe_id = job_id.replace("/", "_").replace("\\", "_").replace("..", "_")
         return self._runs_dir / f"{safe_id}.jsonl"
 
+    def _lock(self, job_id: str) -> asyncio.Lock:
+        return self._locks.setdefault(job_id, asyncio.Lock())
+
     async def append(
         self,
         entry: CronRunEntry,
@@ -37,24 +76,22 @@ class CronRunLog:
         keep_lines: int = DEFAULT_KEEP_LINES,
     ) -> None:
         """Append a run entry and prune if file is too large."""
-        self._runs_dir.mkdir(parents=True, exist_ok=True)
         path = self._job_log_path(entry.job_id)
+        line = (json.dumps(entry.to_dict(), ensure_ascii=False) + "\n").encode("utf-8")
 
-        line = json.dumps(entry.to_dict(), ensure_ascii=False) + "\n"
-
-        try:
-            with open(path, "a", encoding="utf-8") as f:
-                f.write(line)
-        except Exception as e:
-            logger.warning(f"Failed to append run log for {entry.job_id}: {e}")
-            return
-
-        # Prune if file exceeds max_bytes
-        try:
-            if path.stat().st_size > max_bytes:
-                await self.prune(entry.job_id, max_bytes=max_bytes, keep_lines=keep_lines)
-        except Exception as e:
-            logger.debug(f"Prune check failed (non-fatal): {e}")
+        async with self._lock(entry.job_id):
+            try:
+                size = await asyncio.to_thread(self._append_sync, path, line)
+            except Exception as e:
+                logger.warning(f"Failed to append run log for {entry.job_id}: {e}")
+                return
+
+            # Prune if file exceeds max_bytes
+            if size > max_bytes:
+                try:
+                    await asyncio.to_thread(self._prune_sync, path, max_bytes, keep_lines)
+                except Exception as e:
+                    logger.debug(f"Prune check failed (non-fatal): {e}")
 
     async def get_runs(
         self,
@@ -65,86 +102,142 @@ class CronRunLog:
     ) -> List[CronRunEntry]:
         """Read run entries for a job, newest first."""
         path = self._job_log_path(job_id)
-        if not path.exists():
-            return []
-
-        entries: List[CronRunEntry] = []
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        d = json.loads(line)
-                        entry = CronRunEntry.from_dict(d)
-                        if status_filter and entry.status != status_filter:
-                            continue
-                        entries.append(entry)
-                    except Exception:
-                        continue
+            return await asyncio.to_thread(self._read_sync, path, limit, offset, status_filter)
         except Exception as e:
             logger.warning(f"Failed to read run log for {job_id}: {e}")
             return []
 
-        # Newest first
-        entries.reverse()
-
-        # Apply offset + limit
-        return entries[offset : offset + limit]
-
     async def prune(
         self,
         job_id: str,
         max_bytes: int = DEFAULT_MAX_BYTES,
         keep_lines: int = DEFAULT_KEEP_LINES,
     ) -> int:
-        """Prune old entries, keeping the most recent keep_lines. Returns lines removed."""
-        path = self._job_log_path(job_id)
-        if not path.exists():
-            return 0
+        """Prune old entries, keeping the most recent keep_lines. Returns lines removed.
 
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-        except Exception:
-            return 0
-
-        if len(lines) <= keep_lines:
-            return 0
-
-        removed = len(lines) - keep_lines
-        kept = lines[-keep_lines:]
-
-        # Atomic rewrite
-        try:
-            dir_path = path.parent
-            fd, tmp_path = tempfile.mkstemp(prefix=".run-", suffix=".tmp", dir=str(dir_path))
-            try:
-                os.write(fd, "".join(kept).encode("utf-8"))
-            finally:
-                os.close(fd)
-            os.replace(tmp_path, str(path))
-        except Exception as e:
-            logger.warning(f"Failed to prune run log for {job_id}: {e}")
+        The kept tail is also capped at half of ``max_bytes`` so that one
+        prune frees enough room for many appends, even with large entries.
+        """
+        path = self._job_log_path(job_id)
+        async with self._lock(job_id):
             try:
-                os.unlink(tmp_path)
-            except Exception:
-                pass
-            return 0
-
-        return removed
+                return await asyncio.to_thread(self._prune_sync, path, max_bytes, keep_lines)
+            except Exception as e:
+                logger.warning(f"Failed to prune run log for {job_id}: {e}")
+                return 0
 
     async def delete_log(self, job_id: str) -> None:
         """Delete the run log file for a job."""
         path = self._job_log_path(job_id)
-        try:
-            path.unlink(missing_ok=True)
-        except Exception as e:
-            logger.warning(f"Failed to delete run log for {job_id}: {e}")
+        async with self._lock(job_id):
+            try:
+                await asyncio.to_thread(path.unlink, missing_ok=True)
+            except Exception as e:
+                logger.warning(f"Failed to delete run log for {job_id}: {e}")
+        self._locks.pop(job_id, None)
 
     async def list_job_ids(self) -> List[str]:
         """List all job IDs that have run logs."""
-        if not self._runs_dir.exists():
+
+        def _list() -> List[str]:
+            if not self._runs_dir.exists():
+                return []
+            return [p.stem for p in self._runs_dir.glob("*.jsonl")]
+
+        return await asyncio.to_thread(_list)
+
+    # ------------------------------------------------------------------
+    # Blocking helpers (run via asyncio.to_thread)
+    # ------------------------------------------------------------------
+
+    def _append_sync(self, path: Path, line: bytes) -> int:
+        """Append ``line``; returns the new file size."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "ab") as f:
+            f.write(line)
+            return f.tell()
+
+    @staticmethod
+    def _read_sync(
+        path: Path, limit: int, offset: int, status_filter: Optional[str]
+    ) -> List[CronRunEntry]:
+        if limit <= 0:
+            return []
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
             return []
-        return [p.stem for p in self._runs_dir.glob("*.jsonl")]
+
+        entries: List[CronRunEntry] = []
+        skipped = 0
+        with f:
+            for _, raw in _reverse_lines(f):
+                raw = raw.strip()
+                if not raw:
+                    continue
+                try:
+                    entry = CronRunEntry.from_dict(json.loads(raw))
+                except Exception:
+                    continue
+                if status_filter and entry.status != status_filter:
+                    continue
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                entries.append(entry)
+                if len(entries) >= limit:
+                    break
+        return entries
+
+    @staticmethod
+    def _prune_sync(path: Path, max_bytes: int, keep_lines: int) -> int:
+        """Rewrite ``path`` keeping only its newest lines, in bounded memory."""
+        keep_bytes = max_bytes // 2 if max_bytes > 0 else None
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return 0
+
+        with f:
+            end = f.seek(0, os.SEEK_END)
+            cut = end
+            kept = 0
+            for start, raw in _reverse_lines(f):
+                if not raw.strip():
+                    continue
+                if kept >= keep_lines or (
+                    keep_bytes is not None and kept and end - start > keep_bytes
+                ):
+                    break
+                kept += 1
+                cut = start
+            else:
+                return 0  # everything fits
+
+            # Count the dropped lines without loading them
+            f.seek(0)
+            removed = 0
+            remaining = cut
+            while remaining > 0:
+                block = f.read(min(READ_BLOCK_SIZE, remaining))
+                if not block:
+                    break
+                removed += block.count(b"\n")
+                remaining -= len(block)
+
+            # Atomic rewrite: stream the kept tail into a temp file
+            fd, tmp_path = tempfile.mkstemp(prefix=".run-", suffix=".tmp", dir=str(path.parent))
+            try:
+                with os.fdopen(fd, "wb") as out:
+                    f.seek(cut)
+                    shutil.copyfileobj(f, out, READ_BLOCK_SIZE)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        try:
+            os.replace(tmp_path, str(path))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return removed
@@ -1,8 +1,9 @@
 """CronService — timer-based scheduler with CRUD API, matching OpenClaw's CronService."""
 
 import asyncio
+import heapq
 import logging
-from typing import Callable, List, Optional
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
 from .executor import CronExecutor
 from .models import (
@@ -17,6 +18,9 @@ from .run_log import CronRunLog
 from .schedule import compute_job_next_run_at_ms, now_ms, recompute_next_runs
 from .store import CronJobStore
 
+if TYPE_CHECKING:
+    from .cluster import CronCluster
+
 logger = logging.getLogger(__name__)
 
 # Maximum sleep interval before checking again
@@ -35,6 +39,11 @@ class CronService:
     Timer-based: sleeps until the next job is due (capped at 60s),
     then fires all due jobs. Can be woken immediately when jobs are
     added, updated, or removed.
+
+    With a :class:`~.cluster.CronCluster` (multi-node mode) the service
+    only fires jobs this node owns and has leased, pulls other nodes'
+    changes on every heartbeat, and re-checks due jobs it could not claim
+    once per heartbeat in case their owner died.
     """
 
     def __init__(
@@ -43,14 +52,19 @@ class CronService:
         executor: CronExecutor,
         run_log: Optional[CronRunLog] = None,
         on_event: Optional[Callable[[CronEvent], None]] = None,
+        cluster: Optional["CronCluster"] = None,
     ):
         self._store = store
         self._executor = executor
         self._run_log = run_log
         self._on_event = on_event
+        self._cluster = cluster
         self._running = False
         self._loop_task: Optional[asyncio.Task] = None
+        self._cluster_task: Optional[asyncio.Task] = None
         self._wake = asyncio.Event()
+        # (recheck_at_ms, job_id) for due jobs another node owns or holds
+        self._deferred: List[Tuple[int, str]] = []
 
     # ------------------------------------------------------------------
     # Lifecycle
@@ -63,22 +77,40 @@ class CronService:
 
         # Load store if not loaded
         await self._store.load()
+        if self._cluster:
+            await self._cluster.heartbeat()
 
-        # Clear stale running markers
+        # Startup repairs only touch this node's jobs; the rest belong to
+        # live peers in multi-node mode.
         all_jobs = self._store.list(include_disabled=True)
-        cleared = self._executor.clear_stuck_jobs(all_jobs)
+        own_jobs = [j for j in all_jobs if self._cluster is None or self._cluster.owns(j.id)]
+        before = {job.id: _schedule_state(job) for job in own_jobs}
+
+        # Clear stale running markers
+        cleared = self._executor.clear_stuck_jobs(own_jobs)
         if cleared:
             logger.info(f"Cleared {cleared} stuck running markers on startup")
-            await self._store.save()
 
         # Recompute schedules
-        recompute_next_runs(all_jobs)
+        recompute_next_runs(own_jobs)
+        for job in own_jobs:
+            if _schedule_state(job) != before[job.id]:
+                self._store.update(job)
         await self._store.save()
 
         # Start timer loop
         self._running = True
         self._loop_task = asyncio.create_task(self._timer_loop())
-        logger.info(f"CronService started ({len(all_jobs)} jobs loaded)")
+        if self._cluster:
+            self._cluster_task = asyncio.create_task(
+                self._cluster.run_heartbeats(self._on_cluster_heartbeat)
+            )
+            logger.info(
+                f"CronService started ({len(all_jobs)} jobs loaded, node "
+                f"{self._cluster.node_id}, {len(self._cluster.live_nodes)} live node(s))"
+            )
+        else:
+            logger.info(f"CronService started ({len(all_jobs)} jobs loaded)")
 
     async def stop(self) -> None:
         """Stop the cron scheduler."""
@@ -91,6 +123,15 @@ class CronService:
             except asyncio.CancelledError:
                 pass
             self._loop_task = None
+        if self._cluster_task:
+            self._cluster_task.cancel()
+            try:
+                await self._cluster_task
+            except asyncio.CancelledError:
+                pass
+            self._cluster_task = None
+        if self._cluster:
+            await self._cluster.leave()
         logger.info("CronService stopped")
 
     # ------------------------------------------------------------------
@@ -214,7 +255,7 @@ class CronService:
         running = [j for j in all_jobs if j.state.running_at_ms is not None]
         next_due = self._store.get_next_due_time()
 
-        return {
+        result = {
             "running": self._running,
             "total_jobs": len(all_jobs),
             "enabled_jobs": len(enabled),
@@ -222,6 +263,10 @@ class CronService:
             "next_due_at_ms": next_due,
             "next_due_in_seconds": (max(0, (next_due - now_ms()) / 1000) if next_due else None),
         }
+        if self._cluster:
+            result["node_id"] = self._cluster.node_id
+            result["live_nodes"] = self._cluster.live_nodes
+        return result
 
     async def get_runs(self, job_id: str, limit: int = 20) -> List[CronRunEntry]:
         """Get run history for a job."""
@@ -247,6 +292,8 @@ class CronService:
     async def _tick(self) -> None:
         """Single timer tick: compute sleep, wait, fire due jobs."""
         next_due = self._store.get_next_due_time()
+        if self._deferred and (next_due is None or self._deferred[0][0] < next_due):
+            next_due = self._deferred[0][0]
         now = now_ms()
 
         if next_due is not None:
@@ -273,12 +320,16 @@ class CronService:
         due_jobs: List[CronJob] = []
         missed_jobs: List[CronJob] = []
 
-        for job in self._store.list(include_disabled=False):
-            if job.state.running_at_ms is not None:
-                continue
+        # The store's due index only yields enabled, non-running jobs whose
+        # next_run_at_ms <= now, so idle ticks don't touch the other jobs.
+        candidates = self._store.pop_due_jobs(now)
+        claims: Dict[str, Optional[int]] = {}
+        if self._cluster:
+            candidates = await self._claim(candidates, now)
+            claims = {job.id: job.state.next_run_at_ms for job in candidates}
+
+        for job in candidates:
             nra = job.state.next_run_at_ms
-            if nra is None or nra > now:
-                continue
 
             # Skip one-shot "at" jobs that are too far overdue
             if isinstance(job.schedule, AtSchedule) and (now - nra) > AT_OVERDUE_THRESHOLD_MS:
@@ -323,6 +374,9 @@ class CronService:
                 self._store.update(job)
         if missed_jobs:
             await self._store.save()
+            for job in missed_jobs:
+                if job.id in claims:
+                    await self._release(job.id, claims[job.id])
 
         if not due_jobs:
             return
@@ -330,15 +384,60 @@ class CronService:
         logger.info(f"Firing {len(due_jobs)} due cron job(s)")
 
         # Execute concurrently (respecting per-job max_concurrent_runs)
-        tasks = [self._safe_execute(job) for job in due_jobs]
+        tasks = [self._safe_execute(job, claims) for job in due_jobs]
         await asyncio.gather(*tasks)
 
-    async def _safe_execute(self, job: CronJob) -> None:
+    async def _safe_execute(
+        self, job: CronJob, claims: Optional[Dict[str, Optional[int]]] = None
+    ) -> None:
         """Execute a job with error isolation."""
         try:
             await self._executor.execute(job)
         except Exception as e:
             logger.error(f"Cron job {job.id} execution error: {e}")
+        if claims and job.id in claims:
+            await self._release(job.id, claims[job.id])
+
+    # ------------------------------------------------------------------
+    # Multi-node
+    # ------------------------------------------------------------------
+
+    async def _claim(self, candidates: List[CronJob], now: int) -> List[CronJob]:
+        """Keep the due jobs this node owns and could lease; defer the rest."""
+        by_id = {job.id: job for job in candidates}
+        while self._deferred and self._deferred[0][0] <= now:
+            _, job_id = heapq.heappop(self._deferred)
+            job = self._store.get(job_id)
+            if job is None or job_id in by_id or not job.enabled:
+                continue
+            nra = job.state.next_run_at_ms
+            if job.state.running_at_ms is None and nra is not None and nra <= now:
+                by_id[job_id] = job
+
+        mine = [job for job in by_id.values() if self._cluster.owns(job.id)]
+        try:
+            claimed = await self._cluster.claim(mine)
+        except Exception as e:
+            logger.error(f"Cron claim failed, deferring {len(mine)} job(s): {e}")
+            claimed = []
+
+        claimed_ids = {job.id for job in claimed}
+        recheck_at = now + int(self._cluster.heartbeat_interval_s * 1000)
+        for job_id in by_id:
+            if job_id not in claimed_ids:
+                heapq.heappush(self._deferred, (recheck_at, job_id))
+        return claimed
+
+    async def _release(self, job_id: str, claimed_next_run_at_ms: Optional[int]) -> None:
+        try:
+            await self._cluster.release(job_id, claimed_next_run_at_ms)
+        except Exception as e:
+            logger.warning(f"Failed to release cron lease for {job_id}: {e}")
+
+    async def _on_cluster_heartbeat(self) -> None:
+        """Pull other nodes' job changes and wake the timer if any arrived."""
+        if await self._store.refresh():
+            self._reschedule()
 
     # ------------------------------------------------------------------
     # Helpers
@@ -354,3 +453,13 @@ class CronService:
                 self._on_event(event)
             except Exception as e:
                 logger.debug(f"Event handler error: {e}")
+
+
+def _schedule_state(job: CronJob) -> tuple:
+    """Fields the startup repairs may change; used to find jobs to persist."""
+    return (
+        job.enabled,
+        job.state.next_run_at_ms,
+        job.state.running_at_ms,
+        job.state.schedule_error_count,
+    )
@@ -5,14 +5,19 @@ import logging
 import os
 import tempfile
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 
+from .due_index import DueIndex
 from .models import CronJob
 
 logger = logging.getLogger(__name__)
 
 STORE_VERSION = 1
 
+# Rewrite the snapshot once the journal holds this many entries, or as many
+# entries as there are jobs, whichever is larger.
+JOURNAL_COMPACT_MIN = 256
+
 
 class CronJobStore:
     """JSON file persistence for cron jobs.
@@ -20,11 +25,26 @@ class CronJobStore:
     Stores all jobs in a single JSON file. Uses atomic writes
     (temp file + rename) with automatic .bak backup, matching
     OpenClaw's store.ts pattern.
+
+    Changes between snapshots are appended to a journal next to the
+    snapshot (``jobs.journal``, one JSON record per line) so a save only
+    writes the jobs touched since the last one.  The snapshot is rewritten
+    and the journal truncated once the journal outgrows the job count.
+    Each snapshot carries a generation number that its journal records
+    repeat; records from an older generation are already folded into the
+    snapshot and are skipped on replay.
+    Jobs mutated in place must go through :meth:`update` to be persisted.
     """
 
     def __init__(self, store_path: str = "~/.koa/cron/jobs.json"):
         self._store_path = Path(os.path.expanduser(store_path))
+        self._journal_path = self._store_path.with_suffix(".journal")
         self._jobs: Dict[str, CronJob] = {}
+        self._due = DueIndex()
+        self._dirty: Set[str] = set()
+        self._deleted: Set[str] = set()
+        self._journal_entries = 0
+        self._generation = 0
 
     @property
     def store_path(self) -> Path:
@@ -32,39 +52,121 @@ class CronJobStore:
 
     async def load(self) -> None:
         """Load jobs from disk. Creates empty store if file doesn't exist."""
+        self._jobs = {}
+        self._dirty.clear()
+        self._deleted.clear()
+        self._generation = 0
         if not self._store_path.exists():
-            self._jobs = {}
             logger.info(f"Cron store not found at {self._store_path}, starting empty")
-            return
+        else:
+            try:
+                raw = self._store_path.read_text(encoding="utf-8")
+                data = json.loads(raw)
+                version = data.get("version", 1)
+                if version != STORE_VERSION:
+                    logger.warning(
+                        f"Cron store version mismatch: expected {STORE_VERSION}, got {version}"
+                    )
+                self._generation = data.get("generation", 0)
 
-        try:
-            raw = self._store_path.read_text(encoding="utf-8")
-            data = json.loads(raw)
-            version = data.get("version", 1)
-            if version != STORE_VERSION:
-                logger.warning(
-                    f"Cron store version mismatch: expected {STORE_VERSION}, got {version}"
-                )
-
-            self._jobs = {}
-            for job_dict in data.get("jobs", []):
-                try:
-                    job = CronJob.from_dict(job_dict)
-                    self._jobs[job.id] = job
-                except Exception as e:
-                    logger.warning(f"Skipping invalid job entry: {e}")
+                for job_dict in data.get("jobs", []):
+                    try:
+                        job = CronJob.from_dict(job_dict)
+                        self._jobs[job.id] = job
+                    except Exception as e:
+                        logger.warning(f"Skipping invalid job entry: {e}")
+
+                logger.info(f"Loaded {len(self._jobs)} cron jobs from {self._store_path}")
+            except Exception as e:
+                logger.error(f"Failed to load cron store from {self._store_path}: {e}")
+                self._jobs = {}
+        self._replay_journal()
+        self._due.rebuild(self._jobs)
 
-            logger.info(f"Loaded {len(self._jobs)} cron jobs from {self._store_path}")
+    def _replay_journal(self) -> None:
+        """Apply journal entries written after the last snapshot."""
+        self._journal_entries = 0
+        if not self._journal_path.exists():
+            return
+        try:
+            raw = self._journal_path.read_bytes()
         except Exception as e:
-            logger.error(f"Failed to load cron store from {self._store_path}: {e}")
-            self._jobs = {}
+            logger.error(f"Failed to read cron journal {self._journal_path}: {e}")
+            return
+        complete = raw.rfind(b"\n") + 1
+        if complete < len(raw):
+            # A crash mid-append leaves a line without its newline.  Cut it
+            # off so the next save does not append onto the fragment.
+            logger.warning(
+                f"Truncating torn cron journal tail ({len(raw) - complete} bytes) "
+                f"in {self._journal_path}"
+            )
+            try:
+                with open(self._journal_path, "r+b") as f:
+                    f.truncate(complete)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except Exception as e:
+                logger.error(f"Failed to truncate cron journal {self._journal_path}: {e}")
+            raw = raw[:complete]
+        for line in raw.decode("utf-8", errors="replace").splitlines():
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                if entry.get("generation", 0) < self._generation:
+                    continue
+                if entry.get("op") == "del":
+                    self._jobs.pop(entry["id"], None)
+                else:
+                    job = CronJob.from_dict(entry["job"])
+                    self._jobs[job.id] = job
+            except Exception as e:
+                logger.warning(f"Skipping invalid cron journal entry: {e}")
+                continue
+            self._journal_entries += 1
+        if self._journal_entries:
+            logger.info(f"Replayed {self._journal_entries} cron journal entries")
 
     async def save(self) -> None:
-        """Persist jobs to disk with atomic write and backup."""
+        """Persist changed jobs, compacting into the snapshot when due."""
+        pending = len(self._dirty) + len(self._deleted)
+        if not self._store_path.exists() or (
+            self._journal_entries + pending > max(JOURNAL_COMPACT_MIN, len(self._jobs))
+        ):
+            self._write_snapshot()
+            return
+        if not pending:
+            return
+
+        gen = self._generation
+        lines = [
+            json.dumps({"op": "del", "id": job_id, "generation": gen}) for job_id in self._deleted
+        ]
+        lines.extend(
+            json.dumps(
+                {"op": "put", "job": self._jobs[job_id].to_dict(), "generation": gen},
+                ensure_ascii=False,
+            )
+            for job_id in self._dirty
+            if job_id in self._jobs
+        )
+        with open(self._journal_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_entries += len(lines)
+        self._dirty.clear()
+        self._deleted.clear()
+
+    def _write_snapshot(self) -> None:
+        """Rewrite the full snapshot atomically and truncate the journal."""
         self._store_path.parent.mkdir(parents=True, exist_ok=True)
 
+        generation = self._generation + 1
         store_data = {
             "version": STORE_VERSION,
+            "generation": generation,
             "jobs": [job.to_dict() for job in self._jobs.values()],
         }
         content = json.dumps(store_data, indent=2, ensure_ascii=False)
@@ -95,6 +197,18 @@ class CronJobStore:
             except Exception:
                 pass
             raise
+        self._generation = generation
+
+        # The snapshot now covers everything.  If we crash before the unlink,
+        # the leftover journal records carry an older generation and are
+        # skipped on the next load instead of undoing newer changes.
+        try:
+            self._journal_path.unlink()
+        except FileNotFoundError:
+            pass
+        self._journal_entries = 0
+        self._dirty.clear()
+        self._deleted.clear()
 
     def get(self, job_id: str) -> Optional[CronJob]:
         return self._jobs.get(job_id)
@@ -116,25 +230,41 @@ class CronJobStore:
 
     def add(self, job: CronJob) -> None:
         self._jobs[job.id] = job
+        self._due.push(job)
+        self._dirty.add(job.id)
+        self._deleted.discard(job.id)
 
     def update(self, job: CronJob) -> None:
-        self._jobs[job.id] = job
+        """Store ``job`` and reindex it; call after mutating a job in place."""
+        self.add(job)
+
+    def reindex(self) -> None:
+        """Rebuild the due-time index and mark every job for persistence.
+
+        Use after bulk in-place changes (e.g. :func:`recompute_next_runs`).
+        """
+        self._due.rebuild(self._jobs)
+        self._dirty.update(self._jobs)
 
     def remove(self, job_id: str) -> bool:
-        return self._jobs.pop(job_id, None) is not None
+        self._due.discard(job_id)
+        self._dirty.discard(job_id)
+        removed = self._jobs.pop(job_id, None) is not None
+        if removed:
+            self._deleted.add(job_id)
+        return removed
 
     def get_next_due_time(self) -> Optional[int]:
         """Return the earliest next_run_at_ms across all enabled, non-running jobs."""
-        earliest: Optional[int] = None
-        for job in self._jobs.values():
-            if not job.enabled:
-                continue
-            if job.state.running_at_ms is not None:
-                continue
-            nra = job.state.next_run_at_ms
-            if nra is not None and (earliest is None or nra < earliest):
-                earliest = nra
-        return earliest
+        return self._due.peek(self._jobs)
+
+    def pop_due_jobs(self, now_ms: int) -> List[CronJob]:
+        """Return enabled, non-running jobs due at or before ``now_ms``.
+
+        Only touches due entries.  Returned jobs leave the due index until
+        they are passed back through :meth:`update`.
+        """
+        return self._due.pop_due(self._jobs, now_ms)
 
     def find_by_name(self, name: str, user_id: Optional[str] = None) -> Optional[CronJob]:
         """Find a job by exact or partial name match."""
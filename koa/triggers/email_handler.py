@@ -1,15 +1,26 @@
-"""Koa Email Event Handler — LLM-powered email importance evaluation."""
+"""Koa Email Event Handler — LLM-powered email importance evaluation.
 
+Incoming emails are collected per tenant into micro-batches (up to
+``MAX_BATCH_SIZE`` emails or ``BATCH_WINDOW_S`` seconds, whichever comes
+first) and triaged with one LLM call per batch.  ``handle_email`` returns
+once its batch has been processed.
+"""
+
+import asyncio
 import json
 import logging
-from typing import Any, Dict, Optional, Set
-
-import httpx
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from ..http_pool import http_client
 from ..llm.base import BaseLLMClient
+from ..observability.metrics import observe
+from .email_triage import ProcessedEmails, SenderReputation, SenderStats
 
 logger = logging.getLogger(__name__)
 
+BATCH_WINDOW_S = 0.25
+MAX_BATCH_SIZE = 16
+
 _IMPORTANCE_SYSTEM_PROMPT = """\
 You are an email classifier. Evaluate the email and respond with ONLY a JSON object.
 
@@ -65,16 +76,26 @@ Examples:
 - Address change: {"section": "identity", "field": "address", "value": "123 New St, Seattle", "detail": "New address confirmed"}
 """
 
+_BATCH_SUFFIX = """
+BATCH MODE:
+You will receive several emails, each starting with a line "### Email <n>".
+Evaluate each one independently with the tasks above. Respond with ONLY a JSON array
+containing one object per email, in the same order, each with the fields above plus "id": <n>.
+"""
+
 
 class EmailEventHandler:
     """Handles email events by evaluating importance and detecting subscriptions via LLM.
 
-    A single LLM call classifies importance AND detects subscriptions simultaneously.
+    Emails are triaged in per-tenant micro-batches; a single LLM call classifies
+    importance AND detects subscriptions for every email in the batch.
 
     Args:
         llm_client: LLM client for evaluation
         callback_url: URL to POST important email notifications to
         database: Optional asyncpg pool for subscription storage
+        batch_window_s: Longest an email waits for its batch to fill
+        max_batch_size: Emails per LLM call
     """
 
     def __init__(
@@ -82,43 +103,146 @@ class EmailEventHandler:
         llm_client: BaseLLMClient,
         callback_url: str,
         database=None,
+        batch_window_s: float = BATCH_WINDOW_S,
+        max_batch_size: int = MAX_BATCH_SIZE,
     ):
         self._llm_client = llm_client
         self._callback_url = callback_url
-        self._processed_ids: Set[str] = set()
         self._database = database
+        self._batch_window_s = batch_window_s
+        self._max_batch_size = max(1, max_batch_size)
+        self._processed = ProcessedEmails(database)
+        self._reputation = SenderReputation(database)
+        self._pending: Dict[str, List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+        self._batches: Set[asyncio.Task] = set()
 
     async def handle_email(self, tenant_id: str, data: Dict[str, Any]) -> None:
         """Process an incoming email event.
 
-        Single LLM call evaluates importance and detects subscriptions.
-        If important, POSTs a callback. If subscription detected, upserts to DB.
+        Queues the email into the tenant's current batch and waits for the
+        batch to be triaged.  If important, POSTs a callback. If subscription
+        detected, upserts to DB.
         """
         message_id = data.get("message_id", "")
 
-        # Duplicate prevention
-        if message_id and message_id in self._processed_ids:
+        # Duplicate prevention (this process; replicas are checked per batch)
+        if message_id and not self._processed.add(tenant_id, message_id):
             logger.debug(f"Skipping duplicate email: {message_id}")
             return
-        if message_id:
-            self._processed_ids.add(message_id)
 
-        sender = data.get("sender", "")
-        subject = data.get("subject", "")
-        snippet = data.get("snippet", "")
+        future = asyncio.get_running_loop().create_future()
+        queue = self._pending.setdefault(tenant_id, [])
+        queue.append((data, future))
+        if len(queue) >= self._max_batch_size:
+            self._start_batch(tenant_id)
+        elif tenant_id not in self._timers:
+            self._timers[tenant_id] = asyncio.create_task(self._flush_after_window(tenant_id))
+        # Shield so a disconnected caller doesn't cancel the batch's bookkeeping.
+        await asyncio.shield(future)
+
+    async def aclose(self) -> None:
+        """Triage everything still queued and wait for running batches."""
+        for tenant_id in list(self._pending):
+            self._start_batch(tenant_id)
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+
+    def _start_batch(self, tenant_id: str) -> None:
+        timer = self._timers.pop(tenant_id, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        batch = self._pending.pop(tenant_id, [])
+        if not batch:
+            return
+        task = asyncio.create_task(self._run_batch(tenant_id, batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
 
-        # Fast check: skip senders the user consistently ignores (learned from interactions)
+    async def _flush_after_window(self, tenant_id: str) -> None:
+        await asyncio.sleep(self._batch_window_s)
+        self._start_batch(tenant_id)
+
+    async def _run_batch(
+        self, tenant_id: str, batch: List[Tuple[Dict[str, Any], asyncio.Future]]
+    ) -> None:
+        emails = [data for data, _ in batch]
+        # Ids this batch holds: all of them in memory, those it claimed in the DB.
+        held = {e.get("message_id", "") for e in emails} - {""}
+        failed: Set[str] = set()
+        try:
+            if self._database:
+                held = await self._processed.claim(tenant_id, list(held))
+                emails = [e for e in emails if not e.get("message_id") or e["message_id"] in held]
+            if emails:
+                failed = await self._triage_batch(tenant_id, emails)
+        except Exception as e:
+            logger.error(f"Email triage batch failed for {tenant_id}: {e}")
+            failed = held
+        finally:
+            # Let a redelivery of anything not triaged try again.
+            if failed:
+                await self._processed.release(tenant_id, failed & held)
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+    async def _triage_batch(self, tenant_id: str, emails: List[Dict[str, Any]]) -> Set[str]:
+        """Filter learned-ignore senders, evaluate and act on one claimed batch.
+
+        Returns the message ids whose evaluation or handling failed.
+        """
+        observe("koa_email_triage_batch_size", {}, len(emails))
+
+        reputation: Dict[str, SenderStats] = {}
         if self._database:
-            try:
-                skip = await self._is_learned_ignore_sender(tenant_id, sender)
-                if skip:
-                    logger.debug(f"Skipping email from learned-ignore sender: {sender}")
-                    return
-            except Exception:
-                pass
+            reputation = await self._reputation.lookup(
+                tenant_id, (e.get("sender", "") for e in emails)
+            )
+
+        # Fast check: skip senders the user consistently ignores (learned from interactions)
+        to_evaluate = []
+        for email in emails:
+            if reputation.get(email.get("sender", ""), SenderStats()).ignored:
+                logger.debug(f"Skipping email from learned-ignore sender: {email.get('sender')}")
+                continue
+            to_evaluate.append(email)
+        if not to_evaluate:
+            return set()
+
+        evaluations = await self._evaluate_batch(to_evaluate)
+        results = await asyncio.gather(
+            *(
+                self._act_on_evaluation(
+                    tenant_id,
+                    email,
+                    evaluation,
+                    reputation.get(email.get("sender", ""), SenderStats()),
+                )
+                for email, evaluation in zip(to_evaluate, evaluations)
+            ),
+            return_exceptions=True,
+        )
+        failed = set()
+        for email, evaluation, result in zip(to_evaluate, evaluations, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Handling email {email.get('message_id', '')} failed: {result}")
+            if evaluation is None or isinstance(result, Exception):
+                failed.add(email.get("message_id", ""))
+        return failed - {""}
+
+    async def _act_on_evaluation(
+        self,
+        tenant_id: str,
+        data: Dict[str, Any],
+        evaluation: Optional[Dict[str, Any]],
+        sender_stats: SenderStats,
+    ) -> None:
+        """Store detected subscriptions/profile updates and notify if important."""
+        message_id = data.get("message_id", "")
+        sender = data.get("sender", "")
+        subject = data.get("subject", "")
 
-        # Single LLM call for both importance and subscription detection
-        evaluation = await self._evaluate_email(sender, subject, snippet)
         if evaluation is None:
             logger.warning(f"LLM evaluation failed for email {message_id}")
             return
@@ -148,15 +272,10 @@ class EmailEventHandler:
         is_important = evaluation.get("important", False)
 
         # Override: force-notify for learned priority senders
-        if not is_important and self._database:
-            try:
-                is_priority = await self._is_learned_priority_sender(tenant_id, sender)
-                if is_priority:
-                    is_important = True
-                    evaluation["reason"] = "Learned priority sender (user always reads these)"
-                    logger.info(f"Force-notifying for priority sender: {sender}")
-            except Exception:
-                pass
+        if not is_important and sender_stats.priority:
+            is_important = True
+            evaluation["reason"] = "Learned priority sender (user always reads these)"
+            logger.info(f"Force-notifying for priority sender: {sender}")
 
         if not is_important:
             logger.debug(
@@ -275,50 +394,65 @@ class EmailEventHandler:
             f"Profile updated from email: {section}.{field} = {value} for tenant {tenant_id[:8]}"
         )
 
-    async def _is_learned_ignore_sender(self, tenant_id: str, sender: str) -> bool:
-        """Check if this sender is in the user's learned ignore list."""
-        row = await self._database.fetchrow(
-            """SELECT COUNT(*) as cnt FROM notification_interactions
-               WHERE user_id = $1 AND sender = $2 AND action = 'dismissed'
-                 AND created_at > NOW() - INTERVAL '30 days'""",
-            tenant_id,
-            sender,
-        )
-        dismissed = row["cnt"] if row else 0
-        if dismissed < 3:
-            return False
-        # Check they never tapped
-        row2 = await self._database.fetchrow(
-            """SELECT COUNT(*) as cnt FROM notification_interactions
-               WHERE user_id = $1 AND sender = $2 AND action = 'tapped'
-                 AND created_at > NOW() - INTERVAL '30 days'""",
-            tenant_id,
-            sender,
-        )
-        tapped = row2["cnt"] if row2 else 0
-        return tapped == 0
-
-    async def _is_learned_priority_sender(self, tenant_id: str, sender: str) -> bool:
-        """Check if this sender is in the user's learned priority list."""
-        row = await self._database.fetchrow(
-            """SELECT COUNT(*) as cnt FROM notification_interactions
-               WHERE user_id = $1 AND sender = $2 AND action = 'tapped'
-                 AND created_at > NOW() - INTERVAL '30 days'""",
-            tenant_id,
-            sender,
-        )
-        tapped = row["cnt"] if row else 0
-        if tapped < 3:
-            return False
-        row2 = await self._database.fetchrow(
-            """SELECT COUNT(*) as cnt FROM notification_interactions
-               WHERE user_id = $1 AND sender = $2 AND action = 'dismissed'
-                 AND created_at > NOW() - INTERVAL '30 days'""",
-            tenant_id,
-            sender,
-        )
-        dismissed = row2["cnt"] if row2 else 0
-        return dismissed == 0
+    async def _evaluate_batch(self, emails: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """Evaluate a batch with one LLM call; returns one evaluation per email.
+
+        A single email uses the per-email prompt.  Emails missing from (or
+        unparseable in) the batch response are evaluated individually.
+        """
+        if len(emails) == 1:
+            email = emails[0]
+            return [
+                await self._evaluate_email(
+                    email.get("sender", ""), email.get("subject", ""), email.get("snippet", "")
+                )
+            ]
+
+        blocks = [
+            f"### Email {i}\n"
+            f"Sender: {e.get('sender', '')}\n"
+            f"Subject: {e.get('subject', '')}\n"
+            f"Preview: {e.get('snippet', '')}"
+            for i, e in enumerate(emails, 1)
+        ]
+        by_id: Dict[int, Dict[str, Any]] = {}
+        try:
+            response = await self._llm_client.chat_completion(
+                messages=[
+                    {"role": "system", "content": _IMPORTANCE_SYSTEM_PROMPT + _BATCH_SUFFIX},
+                    {"role": "user", "content": "\n\n".join(blocks)},
+                ],
+                config={"temperature": 0.0, "max_tokens": min(512 * len(emails), 8192)},
+            )
+            parsed = _parse_json(response.content)
+            if isinstance(parsed, dict):
+                parsed = parsed.get("emails") or parsed.get("results") or []
+            for position, item in enumerate(parsed if isinstance(parsed, list) else [], 1):
+                if not isinstance(item, dict):
+                    continue
+                try:
+                    item_id = int(item.get("id", position))
+                except (TypeError, ValueError):
+                    item_id = position
+                by_id.setdefault(item_id, item)
+        except Exception as e:
+            logger.error(f"Batched email evaluation failed for {len(emails)} emails: {e}")
+
+        missing = [i for i in range(1, len(emails) + 1) if i not in by_id]
+        if missing:
+            logger.warning(f"Batched evaluation missed {len(missing)} email(s); retrying singly")
+            singles = await asyncio.gather(
+                *(
+                    self._evaluate_email(
+                        emails[i - 1].get("sender", ""),
+                        emails[i - 1].get("subject", ""),
+                        emails[i - 1].get("snippet", ""),
+                    )
+                    for i in missing
+                )
+            )
+            by_id.update({i: result for i, result in zip(missing, singles) if result})
+        return [by_id.get(i) for i in range(1, len(emails) + 1)]
 
     async def _evaluate_email(
         self, sender: str, subject: str, snippet: str
@@ -339,11 +473,7 @@ class EmailEventHandler:
                 ],
                 config={"temperature": 0.0, "max_tokens": 512},
             )
-            content = response.content.strip()
-            # Strip markdown fences if present
-            if content.startswith("```"):
-                content = content.split("\n", 1)[-1].rsplit("```", 1)[0].strip()
-            return json.loads(content)
+            return _parse_json(response.content)
         except (json.JSONDecodeError, Exception) as e:
             logger.error(f"Email importance evaluation failed: {e}")
             return None
@@ -371,7 +501,7 @@ class EmailEventHandler:
             },
         }
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_client() as client:
                 resp = await client.post(
                     self._callback_url,
                     json=payload,
@@ -381,3 +511,12 @@ class EmailEventHandler:
                 logger.info(f"Email callback sent for message {message_id}")
         except Exception as e:
             logger.error(f"Email callback failed for {message_id}: {e}")
+
+
+def _parse_json(content: str) -> Any:
+    """``json.loads`` an LLM reply, tolerating markdown fences."""
+    content = content.strip()
+    # Strip markdown fences if present
+    if content.startswith("```"):
+        content = content.split("\n", 1)[-1].rsplit("```", 1)[0].strip()
+    return json.loads(content)
@@ -0,0 +1,250 @@
+"""Per-user state the email handler consults before and after triage.
+
+* :class:`SenderReputation` — how often the user tapped or dismissed
+  notifications from a sender over the last 30 days.  Counts come from
+  ``sender_reputation_daily``, which a trigger on
+  ``notification_interactions`` keeps current (see migration 020).  When
+  that trigger is not attached (the table did not exist when the migration
+  ran), the raw interactions are counted instead; when the table does not
+  exist at all, every sender has zero counts.  Lookups are cached in a
+  bounded in-memory LRU for ``ttl_s`` seconds, so a burst of mail from one
+  sender costs at most one query.
+* :class:`ProcessedEmails` — dedupe of email events.  A bounded TTL set in
+  memory answers repeats on this process; ``processed_email_events`` makes
+  the claim atomic across restarts and replicas.  Claims for emails that
+  could not be triaged are released so a redelivery is tried again.
+
+Both degrade to memory when no database is configured or a query fails.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+REPUTATION_WINDOW_DAYS = 30
+LEARNED_THRESHOLD = 3  # interactions of one kind, with none of the other
+
+_SOURCE_SQL = """SELECT
+    to_regclass('tenant_default.notification_interactions') IS NOT NULL AS has_table,
+    EXISTS (
+        SELECT 1 FROM pg_trigger
+        WHERE tgname = 'trg_sender_reputation'
+          AND tgrelid = to_regclass('tenant_default.notification_interactions')
+    ) AS attached"""
+
+_ROLLUP_SQL = """SELECT sender, SUM(tapped)::int AS tapped,
+          SUM(dismissed)::int AS dismissed
+   FROM tenant_default.sender_reputation_daily
+   WHERE user_id = $1 AND sender = ANY($2::text[])
+     AND day > (NOW() AT TIME ZONE 'UTC')::date - $3::int
+   GROUP BY sender"""
+
+_RAW_SQL = """SELECT sender, COUNT(*) FILTER (WHERE action = 'tapped')::int AS tapped,
+          COUNT(*) FILTER (WHERE action = 'dismissed')::int AS dismissed
+   FROM tenant_default.notification_interactions
+   WHERE user_id = $1 AND sender = ANY($2::text[])
+     AND action IN ('tapped', 'dismissed')
+     AND created_at > NOW() - make_interval(days => $3::int)
+   GROUP BY sender"""
+
+
+class SenderStats(NamedTuple):
+    tapped: int = 0
+    dismissed: int = 0
+
+    @property
+    def ignored(self) -> bool:
+        """The user keeps dismissing this sender and never opens it."""
+        return self.dismissed >= LEARNED_THRESHOLD and self.tapped == 0
+
+    @property
+    def priority(self) -> bool:
+        """The user always opens this sender and never dismisses it."""
+        return self.tapped >= LEARNED_THRESHOLD and self.dismissed == 0
+
+
+class SenderReputation:
+    """Cached ``{sender: SenderStats}`` per user.
+
+    Args:
+        database: Optional :class:`koa.db.Database`.
+        ttl_s: How long a looked-up sender is served from memory.
+        max_entries: Bound on cached (user, sender) pairs.
+    """
+
+    def __init__(
+        self,
+        database: Optional[Any] = None,
+        ttl_s: float = 300.0,
+        max_entries: int = 10_000,
+    ) -> None:
+        self._db = database
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[Tuple[str, str], Tuple[float, SenderStats]]" = OrderedDict()
+        self._query: Optional[str] = None
+
+    async def lookup(self, user_id: str, senders: Iterable[str]) -> Dict[str, SenderStats]:
+        """Stats for each non-empty sender; unknown senders get zero counts."""
+        now = time.monotonic()
+        out: Dict[str, SenderStats] = {}
+        missing: List[str] = []
+        for sender in set(senders):
+            if not sender:
+                continue
+            cached = self._memory.get((user_id, sender))
+            if cached and cached[0] > now:
+                self._memory.move_to_end((user_id, sender))
+                out[sender] = cached[1]
+            else:
+                missing.append(sender)
+
+        if missing and self._db is not None:
+            try:
+                query = await self._lookup_query()
+                rows = (
+                    await self._db.fetch(query, user_id, missing, REPUTATION_WINDOW_DAYS)
+                    if query
+                    else []
+                )
+            except Exception as e:
+                logger.debug(f"Sender reputation lookup failed for {user_id}: {e}")
+                return out
+            found = {r["sender"]: SenderStats(r["tapped"] or 0, r["dismissed"] or 0) for r in rows}
+            for sender in missing:
+                out[sender] = found.get(sender, SenderStats())
+                self._remember(user_id, sender, out[sender], now)
+        return out
+
+    async def _lookup_query(self) -> str:
+        """The rollup query, the raw-count one if the trigger is missing, or
+        ``""`` if there are no interactions to count."""
+        if self._query is None:
+            source = await self._db.fetchrow(_SOURCE_SQL)
+            if source["attached"]:
+                self._query = _ROLLUP_SQL
+            elif source["has_table"]:
+                logger.warning(
+                    "trg_sender_reputation is not attached to notification_interactions; "
+                    "counting raw interactions for sender reputation"
+                )
+                self._query = _RAW_SQL
+            else:
+                logger.info("notification_interactions does not exist; sender reputation is off")
+                self._query = ""
+        return self._query
+
+    def invalidate(self, user_id: str, sender: Optional[str] = None) -> None:
+        """Drop cached stats for one sender, or all of ``user_id``'s senders."""
+        for key in [k for k in self._memory if k[0] == user_id and sender in (None, k[1])]:
+            del self._memory[key]
+
+    def _remember(self, user_id: str, sender: str, stats: SenderStats, now: float) -> None:
+        self._memory[(user_id, sender)] = (now + self.ttl_s, stats)
+        self._memory.move_to_end((user_id, sender))
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+
+class ProcessedEmails:
+    """Email events already triaged, keyed by ``(tenant_id, message_id)``.
+
+    Args:
+        database: Optional :class:`koa.db.Database` for the shared tier.
+        ttl_s: How long a message id is remembered.
+        max_entries: Bound on the in-memory tier (oldest evicted first).
+        prune_every_s: Minimum gap between deletes of expired rows.
+    """
+
+    def __init__(
+        self,
+        database: Optional[Any] = None,
+        ttl_s: float = 7 * 86400.0,
+        max_entries: int = 50_000,
+        prune_every_s: float = 3600.0,
+    ) -> None:
+        self._db = database
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.prune_every_s = prune_every_s
+        self._memory: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._last_prune = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def add(self, tenant_id: str, message_id: str) -> bool:
+        """Remember ``message_id`` locally; ``False`` if it was already seen."""
+        now = time.monotonic()
+        while self._memory:
+            oldest = next(iter(self._memory.values()))
+            if oldest > now and len(self._memory) < self.max_entries:
+                break
+            self._memory.popitem(last=False)
+        key = (tenant_id, message_id)
+        if key in self._memory:
+            return False
+        self._memory[key] = now + self.ttl_s
+        return True
+
+    async def claim(self, tenant_id: str, message_ids: List[str]) -> Set[str]:
+        """The subset of ``message_ids`` no replica has processed yet.
+
+        Claims them in one statement; without a database (or when it fails)
+        every id is treated as new.
+        """
+        ids = list(dict.fromkeys(m for m in message_ids if m))
+        if not ids or self._db is None:
+            return set(ids)
+        try:
+            rows = await self._db.fetch(
+                """INSERT INTO tenant_default.processed_email_events (tenant_id, message_id)
+                   SELECT $1, unnest($2::text[])
+                   ON CONFLICT (tenant_id, message_id) DO NOTHING
+                   RETURNING message_id""",
+                tenant_id,
+                ids,
+            )
+        except Exception as e:
+            logger.warning(f"Processed-email claim failed, using in-memory dedupe: {e}")
+            return set(ids)
+        await self._maybe_prune()
+        return {r["message_id"] for r in rows}
+
+    async def release(self, tenant_id: str, message_ids: Iterable[str]) -> None:
+        """Forget ``message_ids`` so a redelivery is processed again.
+
+        For emails that could not be triaged; only pass ids this process
+        claimed, or another replica's claim is dropped.
+        """
+        ids = list(dict.fromkeys(m for m in message_ids if m))
+        for message_id in ids:
+            self._memory.pop((tenant_id, message_id), None)
+        if not ids or self._db is None:
+            return
+        try:
+            await self._db.execute(
+                "DELETE FROM tenant_default.processed_email_events "
+                "WHERE tenant_id = $1 AND message_id = ANY($2::text[])",
+                tenant_id,
+                ids,
+            )
+        except Exception as e:
+            logger.warning(f"Releasing processed-email claims failed: {e}")
+
+    async def _maybe_prune(self) -> None:
+        now = time.monotonic()
+        if now - self._last_prune < self.prune_every_s:
+            return
+        self._last_prune = now
+        try:
+            await self._db.execute(
+                "DELETE FROM tenant_default.processed_email_events "
+                "WHERE processed_at < NOW() - make_interval(secs => $1)",
+                float(self.ttl_s),
+            )
+        except Exception as e:
+            logger.debug(f"Processed-email prune failed: {e}")
@@ -0,0 +1,81 @@
+"""Shared state tables for the tenant gate.
+
+Backs ``koa.tenant_gate.pg_backend`` so rate limits, budgets, concurrency
+caps and idempotency keys hold across all workers instead of per process:
+
+  * ``tenant_gate_buckets``     — one token-bucket row per tenant.
+  * ``tenant_gate_usage``       — current budget window per tenant.
+  * ``tenant_gate_inflight``    — one row per admitted request, with an
+    expiry so slots leaked by a crashed worker age out.
+  * ``tenant_gate_idempotency`` — tool-call dedupe records with TTL.
+
+Revision ID: 014
+Revises: 013
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "014"
+down_revision: Union[str, None] = "013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = "tenant_default"
+
+
+def upgrade() -> None:
+    op.execute(f'CREATE SCHEMA IF NOT EXISTS "{SCHEMA}";')
+    op.execute(f'SET search_path TO "{SCHEMA}", public, extensions;')
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS tenant_gate_buckets (
+            tenant_id TEXT PRIMARY KEY,
+            tokens DOUBLE PRECISION NOT NULL,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+    """)
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS tenant_gate_usage (
+            tenant_id TEXT PRIMARY KEY,
+            window_start TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            tokens BIGINT NOT NULL DEFAULT 0,
+            cost_usd DOUBLE PRECISION NOT NULL DEFAULT 0
+        );
+    """)
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS tenant_gate_inflight (
+            slot_id TEXT PRIMARY KEY,
+            tenant_id TEXT NOT NULL,
+            expires_at TIMESTAMPTZ NOT NULL
+        );
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tenant_gate_inflight_tenant "
+        "ON tenant_gate_inflight(tenant_id, expires_at);"
+    )
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS tenant_gate_idempotency (
+            key TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            result JSONB NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            expires_at TIMESTAMPTZ NOT NULL
+        );
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tenant_gate_idempotency_expires "
+        "ON tenant_gate_idempotency(expires_at);"
+    )
+
+
+def downgrade() -> None:
+    op.execute(f'SET search_path TO "{SCHEMA}", public, extensions;')
+    op.execute("DROP TABLE IF EXISTS tenant_gate_idempotency;")
+    op.execute("DROP TABLE IF EXISTS tenant_gate_inflight;")
+    op.execute("DROP TABLE IF EXISTS tenant_gate_usage;")
+    op.execute("DROP TABLE IF EXISTS tenant_gate_buckets;")
@@ -0,0 +1,76 @@
+"""Multi-node cron: node heartbeats and per-job leases.
+
+Lets several API replicas share one ``cron_jobs`` table without firing a
+job twice (see ``koa.triggers.cron.cluster``):
+
+  * ``cron_nodes`` — one row per live scheduler, refreshed by heartbeat.
+    Jobs are partitioned across live nodes by rendezvous hashing.
+  * ``cron_jobs.lease_owner`` / ``lease_expires_at`` — claimed with
+    ``FOR UPDATE SKIP LOCKED`` before a job fires; an expired lease can be
+    taken over when its node dies.
+  * ``cron_jobs.next_run_at_ms`` — the persisted due time, used to fence
+    claims so a node with a stale in-memory copy cannot re-fire a run
+    another node already completed.
+  * ``cron_jobs.changed_at`` — bumped on every write so nodes can pull
+    each other's changes incrementally.
+
+Revision ID: 015
+Revises: 014
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "015"
+down_revision: Union[str, None] = "014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = "tenant_default"
+
+
+def upgrade() -> None:
+    op.execute(f'CREATE SCHEMA IF NOT EXISTS "{SCHEMA}";')
+    op.execute(f'SET search_path TO "{SCHEMA}", public, extensions;')
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS cron_nodes (
+            node_id TEXT PRIMARY KEY,
+            started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            heartbeat_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+    """)
+
+    op.execute("""
+        ALTER TABLE cron_jobs
+        ADD COLUMN IF NOT EXISTS next_run_at_ms BIGINT NULL,
+        ADD COLUMN IF NOT EXISTS lease_owner TEXT NULL,
+        ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ NULL,
+        ADD COLUMN IF NOT EXISTS changed_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+    """)
+    # Older rows hold the job as a JSON string inside the JSONB column;
+    # unwrap them so the due time can be read out of the document.
+    op.execute("""
+        UPDATE cron_jobs SET data = (data #>> '{}')::jsonb
+        WHERE jsonb_typeof(data) = 'string';
+    """)
+    op.execute("""
+        UPDATE cron_jobs
+        SET next_run_at_ms = (data #>> '{state,nextRunAtMs}')::BIGINT
+        WHERE next_run_at_ms IS NULL;
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_cron_jobs_changed_at ON cron_jobs(changed_at);")
+
+
+def downgrade() -> None:
+    op.execute(f'SET search_path TO "{SCHEMA}", public, extensions;')
+    op.execute("DROP INDEX IF EXISTS idx_cron_jobs_changed_at;")
+    op.execute("""
+        ALTER TABLE cron_jobs
+        DROP COLUMN IF EXISTS changed_at,
+        DROP COLUMN IF EXISTS lease_expires_at,
+        DROP COLUMN IF EXISTS lease_owner,
+        DROP COLUMN IF EXISTS next_run_at_ms;
+    """)
+    op.execute("DROP TABLE IF EXISTS cron_nodes;")
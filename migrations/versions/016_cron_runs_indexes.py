@@ -0,0 +1,50 @@
+"""Index cron_runs for newest-first reads per job.
+
+``PostgresCronRunLog.get_runs`` pages a job's runs by ``created_at DESC``,
+optionally filtered by status, and ``prune`` deletes everything past the
+newest N rows of a job:
+
+  * ``idx_cron_runs_job_created`` — ``(job_id, created_at DESC)`` with
+    ``id`` included, so pruning finds the rows to drop with an index-only
+    scan.  Replaces ``idx_cron_runs_job_id`` from 004, which it covers.
+  * ``idx_cron_runs_job_status_created`` — serves status-filtered pages
+    without walking the job's other runs.
+
+Revision ID: 016
+Revises: 015
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "016"
+down_revision: Union[str, None] = "015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = "tenant_default"
+
+
+def upgrade() -> None:
+    op.execute(f'CREATE SCHEMA IF NOT EXISTS "{SCHEMA}";')
+    op.execute(f'SET search_path TO "{SCHEMA}", public, extensions;')
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_cron_runs_job_created
+        ON cron_runs (job_id, created_at DESC) INCLUDE (id);
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_cron_runs_job_status_created
+        ON cron_runs (job_id, status, created_at DESC);
+    """)
+    op.execute("DROP INDEX IF EXISTS idx_cron_runs_job_id;")
+
+
+def downgrade() -> None:
+    op.execute(f'SET search_path TO "{SCHEMA}", public, extensions;')
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_cron_runs_job_id ON cron_runs (job_id, created_at DESC);"
+    )
+    op.execute("DROP INDEX IF EXISTS idx_cron_runs_job_status_created;")
+    op.execute("DROP INDEX IF EXISTS idx_cron_runs_job_created;")
@@ -0,0 +1,50 @@
+"""Shared tier for the ReAct rolling-summary cache.
+
+Backs ``koa.orchestrator.summary_cache.SummaryCache`` so summaries of
+aged-out conversation prefixes survive restarts and are reused by every
+replica:
+
+  * ``context_summaries`` — one row per summarized prefix, keyed by tenant,
+    session and the prefix's chained hash.  The cache keeps the newest few
+    rows per tenant session.
+
+Revision ID: 017
+Revises: 016
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "017"
+down_revision: Union[str, None] = "016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = "tenant_default"
+
+
+def upgrade() -> None:
+    op.execute(f'CREATE SCHEMA IF NOT EXISTS "{SCHEMA}";')
+    op.execute(f'SET search_path TO "{SCHEMA}", public, extensions;')
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS context_summaries (
+            tenant_id TEXT NOT NULL,
+            session_id TEXT NOT NULL,
+            prefix_hash TEXT NOT NULL,
+            message_count INTEGER NOT NULL,
+            summary TEXT NOT NULL,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (tenant_id, session_id, prefix_hash)
+        );
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_context_summaries_session_updated "
+        "ON context_summaries(tenant_id, session_id, updated_at DESC);"
+    )
+
+
+def downgrade() -> None:
+    op.execute(f'SET search_path TO "{SCHEMA}", public, extensions;')
+    op.execute("DROP TABLE IF EXISTS context_summaries;")
@@ -0,0 +1,67 @@
+"""Per-day health rollup maintained at ingest time.
+
+Backs ``koa.memory.lifecycle.health_rollup``:
+
+  * ``health_daily_rollup`` — one row per (user, local day, metric) with
+    counts, value sum/min/max and summed minutes, recomputed from
+    ``health_samples`` for every day an upload touches.  ``tz`` records the
+    timezone the day was cut in.
+
+Existing samples are backfilled in UTC days, matching what the summary
+endpoint used to compute on the fly.
+
+Revision ID: 018
+Revises: 017
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "018"
+down_revision: Union[str, None] = "017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = "tenant_default"
+
+
+def upgrade() -> None:
+    op.execute(f'CREATE SCHEMA IF NOT EXISTS "{SCHEMA}";')
+    op.execute(f'SET search_path TO "{SCHEMA}", public, extensions;')
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS health_daily_rollup (
+            user_id TEXT NOT NULL,
+            local_date DATE NOT NULL,
+            metric TEXT NOT NULL,
+            tz TEXT NOT NULL DEFAULT 'UTC',
+            sample_count INTEGER NOT NULL,
+            value_count INTEGER NOT NULL,
+            value_sum DOUBLE PRECISION NULL,
+            value_min DOUBLE PRECISION NULL,
+            value_max DOUBLE PRECISION NULL,
+            minutes DOUBLE PRECISION NOT NULL DEFAULT 0,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (user_id, local_date, metric)
+        );
+    """)
+
+    op.execute("""
+        INSERT INTO health_daily_rollup
+            (user_id, local_date, metric, tz, sample_count, value_count,
+             value_sum, value_min, value_max, minutes)
+        SELECT user_id, (started_at AT TIME ZONE 'UTC')::date, type, 'UTC',
+               COUNT(*), COUNT(value), SUM(value), MIN(value), MAX(value),
+               COALESCE(SUM(CASE WHEN ended_at IS NOT NULL
+                                 THEN FLOOR(EXTRACT(EPOCH FROM (ended_at - started_at)) / 60)
+                                 ELSE TRUNC(value) END), 0)
+        FROM health_samples
+        GROUP BY user_id, (started_at AT TIME ZONE 'UTC')::date, type
+        ON CONFLICT (user_id, local_date, metric) DO NOTHING;
+    """)
+
+
+def downgrade() -> None:
+    op.execute(f'SET search_path TO "{SCHEMA}", public, extensions;')
+    op.execute("DROP TABLE IF EXISTS health_daily_rollup;")
@@ -0,0 +1,46 @@
+"""Incremental calendar sync state.
+
+Backs ``koa.services.calendar_sync.CalendarSyncService``:
+
+  * ``calendar_sync_state`` — the provider's sync token (Google
+    ``nextSyncToken``, Graph ``deltaLink``) per mirrored calendar, so each
+    pass fetches only changes.  A NULL token means the next pass does a
+    full listing.
+
+Revision ID: 019
+Revises: 018
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "019"
+down_revision: Union[str, None] = "018"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = "tenant_default"
+
+
+def upgrade() -> None:
+    op.execute(f'CREATE SCHEMA IF NOT EXISTS "{SCHEMA}";')
+    op.execute(f'SET search_path TO "{SCHEMA}", public, extensions;')
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS calendar_sync_state (
+            user_id TEXT NOT NULL,
+            source TEXT NOT NULL,
+            account_name TEXT NOT NULL,
+            calendar_id TEXT NOT NULL,
+            sync_token TEXT NULL,
+            last_full_sync_at TIMESTAMPTZ NULL,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (user_id, source, account_name, calendar_id)
+        );
+    """)
+
+
+def downgrade() -> None:
+    op.execute(f'SET search_path TO "{SCHEMA}", public, extensions;')
+    op.execute("DROP TABLE IF EXISTS calendar_sync_state;")
@@ -0,0 +1,123 @@
+"""Email triage state: sender reputation aggregate and processed-email keys.
+
+Backs ``koa.triggers.email_handler.EmailEventHandler``:
+
+  * ``sender_reputation_daily`` — tapped/dismissed counts per (user, sender,
+    UTC day), bumped by a trigger on every ``notification_interactions``
+    insert so the handler reads a few pre-aggregated rows instead of
+    counting raw interactions per email.  The trigger is attached (and the
+    last 30 days backfilled) only when ``notification_interactions`` exists
+    in this database; without it the handler counts raw interactions.
+  * ``processed_email_events`` — one row per (tenant, message id) already
+    triaged, so redelivered events are skipped across restarts and
+    replicas.  Rows older than the handler's dedupe TTL are pruned by the
+    handler.
+
+Revision ID: 020
+Revises: 019
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "020"
+down_revision: Union[str, None] = "019"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = "tenant_default"
+
+
+def upgrade() -> None:
+    op.execute(f'CREATE SCHEMA IF NOT EXISTS "{SCHEMA}";')
+    op.execute(f'SET search_path TO "{SCHEMA}", public, extensions;')
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS sender_reputation_daily (
+            user_id TEXT NOT NULL,
+            sender TEXT NOT NULL,
+            day DATE NOT NULL,
+            tapped INTEGER NOT NULL DEFAULT 0,
+            dismissed INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, sender, day)
+        );
+    """)
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS processed_email_events (
+            tenant_id TEXT NOT NULL,
+            message_id TEXT NOT NULL,
+            processed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (tenant_id, message_id)
+        );
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_processed_email_events_processed_at "
+        "ON processed_email_events(processed_at);"
+    )
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION "{SCHEMA}".bump_sender_reputation()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            IF NEW.action IN ('tapped', 'dismissed') AND COALESCE(NEW.sender, '') <> '' THEN
+                INSERT INTO "{SCHEMA}".sender_reputation_daily
+                    (user_id, sender, day, tapped, dismissed)
+                VALUES (
+                    NEW.user_id,
+                    NEW.sender,
+                    (COALESCE(NEW.created_at, NOW()) AT TIME ZONE 'UTC')::date,
+                    (NEW.action = 'tapped')::int,
+                    (NEW.action = 'dismissed')::int
+                )
+                ON CONFLICT (user_id, sender, day) DO UPDATE SET
+                    tapped = sender_reputation_daily.tapped + EXCLUDED.tapped,
+                    dismissed = sender_reputation_daily.dismissed + EXCLUDED.dismissed;
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+    """)
+
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF to_regclass('notification_interactions') IS NOT NULL THEN
+                DROP TRIGGER IF EXISTS trg_sender_reputation ON notification_interactions;
+                CREATE TRIGGER trg_sender_reputation
+                    AFTER INSERT ON notification_interactions
+                    FOR EACH ROW EXECUTE FUNCTION "{SCHEMA}".bump_sender_reputation();
+
+                INSERT INTO sender_reputation_daily (user_id, sender, day, tapped, dismissed)
+                SELECT user_id, sender, (created_at AT TIME ZONE 'UTC')::date,
+                       COUNT(*) FILTER (WHERE action = 'tapped'),
+                       COUNT(*) FILTER (WHERE action = 'dismissed')
+                FROM notification_interactions
+                WHERE created_at > NOW() - INTERVAL '30 days'
+                  AND action IN ('tapped', 'dismissed')
+                  AND COALESCE(sender, '') <> ''
+                GROUP BY user_id, sender, (created_at AT TIME ZONE 'UTC')::date
+                ON CONFLICT (user_id, sender, day) DO NOTHING;
+            END IF;
+        END;
+        $$;
+    """)
+
+
+def downgrade() -> None:
+    op.execute(f'SET search_path TO "{SCHEMA}", public, extensions;')
+    op.execute("""
+        DO $$
+        BEGIN
+            IF to_regclass('notification_interactions') IS NOT NULL THEN
+                DROP TRIGGER IF EXISTS trg_sender_reputation ON notification_interactions;
+            END IF;
+        END;
+        $$;
+    """)
+    op.execute(f'DROP FUNCTION IF EXISTS "{SCHEMA}".bump_sender_reputation();')
+    op.execute("DROP TABLE IF EXISTS processed_email_events;")
+    op.execute("DROP TABLE IF EXISTS sender_reputation_daily;")
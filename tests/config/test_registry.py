@@ -1,5 +1,7 @@
 """Tests for tenant-aware credential filtering in AgentRegistry."""
 
+import copy
+import json
 from unittest.mock import AsyncMock
 
 import pytest
@@ -124,3 +126,130 @@ class TestCredentialFiltering:
         assert "_EmailAgent" in desc
         assert "_SmartHomeAgent" not in desc
         assert "_MapsAgent" in desc
+
+
+class TestCompiledIndex:
+    @pytest.mark.asyncio
+    async def test_same_key_returns_shared_tuple(self):
+        _register_test_agents()
+        registry = AgentRegistry()
+        store = _make_credential_store(["gmail"])
+
+        first = await registry.get_all_agent_tool_schemas(tenant_id="t1", credential_store=store)
+        second = await registry.get_all_agent_tool_schemas(tenant_id="t2", credential_store=store)
+
+        assert isinstance(first, tuple)
+        assert first is second
+
+    @pytest.mark.asyncio
+    async def test_shared_schemas_are_read_only(self):
+        _register_test_agents()
+        registry = AgentRegistry()
+
+        first = await registry.get_all_agent_tool_schemas()
+        function = first[0]["function"]
+        with pytest.raises(TypeError):
+            function["description"] = "tampered"
+        with pytest.raises(TypeError):
+            function["parameters"]["required"].append("injected")
+
+        own = copy.deepcopy(first[0])
+        own["function"]["description"] = "tampered"
+        own["function"]["parameters"]["required"].append("injected")
+        assert type(own) is dict
+
+        second = await registry.get_all_agent_tool_schemas()
+        assert second[0]["function"]["description"] != "tampered"
+        assert "injected" not in second[0]["function"]["parameters"]["required"]
+        assert json.loads(json.dumps(second[0])) == second[0]
+
+    @pytest.mark.asyncio
+    async def test_domain_and_all_paths_share_schema_objects(self):
+        @valet(domain="travel")
+        class _TripAgent:
+            """Trip agent"""
+
+        registry = AgentRegistry()
+        all_schemas = await registry.get_all_agent_tool_schemas()
+        travel = await registry.get_domain_agent_tool_schemas(["travel"])
+
+        assert [s["function"]["name"] for s in travel] == ["_TripAgent"]
+        assert any(s is travel[0] for s in all_schemas)
+
+    @pytest.mark.asyncio
+    async def test_registration_invalidates_index(self):
+        _register_test_agents()
+        registry = AgentRegistry()
+        before = await registry.get_all_agent_tool_schemas()
+        desc_before = await registry.get_agent_descriptions()
+
+        @valet
+        class _LateAgent:
+            """Registered after the index was compiled"""
+
+        after = await registry.get_all_agent_tool_schemas()
+        assert "_LateAgent" not in [s["function"]["name"] for s in before]
+        assert "_LateAgent" in [s["function"]["name"] for s in after]
+        assert "_LateAgent" not in desc_before
+        assert "_LateAgent" in await registry.get_agent_descriptions()
+
+    @pytest.mark.asyncio
+    async def test_schema_version_served_from_index(self):
+        _EmailAgent, _, _ = _register_test_agents()
+        from koa.agents.decorator import get_schema_version
+
+        registry = AgentRegistry()
+        assert registry.get_schema_version("_EmailAgent") == get_schema_version(_EmailAgent)
+        assert registry.get_schema_version("_Missing") is None
+
+    @pytest.mark.asyncio
+    async def test_repeat_calls_do_not_rebuild_index(self, monkeypatch):
+        import koa.agents.decorator as decorator_module
+
+        for i in range(20):
+            valet(domain="productivity")(type(f"_BenchAgent{i}", (), {"__doc__": "Bench"}))
+
+        calls = {"n": 0}
+        original = decorator_module.generate_tool_schema
+
+        def counting(agent_cls):
+            calls["n"] += 1
+            return original(agent_cls)
+
+        monkeypatch.setattr(decorator_module, "generate_tool_schema", counting)
+
+        registry = AgentRegistry()
+        first = await registry.get_domain_agent_tool_schemas(["productivity"])
+        compiled_calls = calls["n"]
+        assert compiled_calls >= 20
+
+        for _ in range(10):
+            again = await registry.get_domain_agent_tool_schemas(["productivity"])
+            await registry.get_all_agent_tool_schemas()
+            await registry.get_agent_descriptions()
+            own = copy.deepcopy(again[0])
+            own["function"]["name"] = "mutated"
+
+        assert calls["n"] == compiled_calls
+        assert again is first
+        assert all(s["function"]["name"] != "mutated" for s in again)
+
+    @pytest.mark.asyncio
+    async def test_llm_client_hands_litellm_its_own_copy(self, monkeypatch):
+        import litellm
+
+        from koa.llm.litellm_client import LiteLLMClient
+
+        _register_test_agents()
+        schemas = await AgentRegistry().get_all_agent_tool_schemas()
+
+        async def rewriting_acompletion(**params):
+            # What litellm's Gemini mapping does to every tool
+            for tool in params["tools"]:
+                tool["function"]["parameters"].pop("$defs", {})
+            raise RuntimeError("stop after the request is built")
+
+        monkeypatch.setattr(litellm, "acompletion", rewriting_acompletion)
+        client = LiteLLMClient(model="gemini-1.5-pro", provider_name="gemini", api_key="x")
+        with pytest.raises(RuntimeError, match="stop after"):
+            await client._call_api([{"role": "user", "content": "hi"}], tools=list(schemas))
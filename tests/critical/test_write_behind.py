@@ -0,0 +1,184 @@
+"""WriteBehindSink batches telemetry off the request path, bounded and flushed on close."""
+
+import asyncio
+import logging
+import os
+
+import pytest
+
+from koa.observability.write_behind import WriteBehindSink, log_spill
+from koa.orchestrator.audit_logger import AuditLogger
+
+PG_DSN = os.environ.get("KOA_TEST_DATABASE_URL")
+
+
+class _Recorder:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    async def __call__(self, batch):
+        if self.fail:
+            raise ConnectionError("db down")
+        self.batches.append(list(batch))
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_written_without_waiting_for_interval():
+    writer = _Recorder()
+    sink = WriteBehindSink("test", max_batch=3, flush_interval_s=60)
+    sink.register("rows", writer)
+
+    for i in range(7):
+        assert sink.submit("rows", i)
+    assert writer.batches == []  # submit never writes inline
+    await asyncio.sleep(0.01)
+
+    assert writer.batches == [[0, 1, 2], [3, 4, 5], [6]]
+    assert sink.pending == 0
+    await sink.aclose()
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_written_after_interval():
+    writer = _Recorder()
+    sink = WriteBehindSink("test", max_batch=100, flush_interval_s=0.02)
+    sink.register("rows", writer)
+
+    sink.submit("rows", "a")
+    await asyncio.sleep(0.005)
+    assert writer.batches == []
+    await asyncio.sleep(0.05)
+    assert writer.batches == [["a"]]
+    await sink.aclose()
+
+
+@pytest.mark.asyncio
+async def test_overload_and_writer_failure_spill():
+    spilled = []
+    sink = WriteBehindSink("test", max_batch=100, flush_interval_s=60, max_pending=2)
+    sink.register("rows", _Recorder(fail=True), spill=spilled.extend)
+
+    assert sink.submit("rows", 1) and sink.submit("rows", 2)
+    assert not sink.submit("rows", 3)
+    assert spilled == [3]
+
+    await sink.flush()
+    assert spilled == [3, 1, 2]
+    assert sink.pending == 0
+    await sink.aclose()
+
+
+@pytest.mark.asyncio
+async def test_aclose_flushes_then_spills_late_records(caplog):
+    writer = _Recorder()
+    sink = WriteBehindSink("test", max_batch=100, flush_interval_s=60)
+    sink.register("rows", writer)
+    sink.submit("rows", {"id": 1})
+
+    await sink.aclose()
+    assert writer.batches == [[{"id": 1}]]
+
+    with caplog.at_level(logging.WARNING, logger="koa.write_behind"):
+        assert not sink.submit("rows", {"id": 2})
+    assert any('"id": 2' in r.getMessage() for r in caplog.records)
+
+
+class _SlowRecorder(_Recorder):
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+        self.started = asyncio.Event()
+
+    async def __call__(self, batch):
+        self.started.set()
+        await asyncio.sleep(self.delay)
+        self.batches.append(list(batch))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("delay, timeout", [(0.05, 5.0), (5.0, 0.05)])
+async def test_aclose_during_slow_write_loses_nothing(delay, timeout):
+    writer = _SlowRecorder(delay)
+    spilled = []
+    sink = WriteBehindSink("test", max_batch=2, flush_interval_s=60)
+    sink.register("rows", writer, spill=spilled.extend)
+
+    for i in range(5):
+        sink.submit("rows", i)
+    await writer.started.wait()  # the background task is inside flush()
+
+    await sink.aclose(timeout=timeout)
+    written = [r for batch in writer.batches for r in batch]
+    assert sorted(written + spilled) == [0, 1, 2, 3, 4]
+    assert sink.pending == 0
+
+
+def test_spill_log_leaves_out_omitted_fields(caplog):
+    spill = log_spill("intent_feedback", omit=("user_message",))
+    with caplog.at_level(logging.WARNING, logger="koa.write_behind"):
+        spill([{"tenant_id": "t1", "user_message": "my card number is 4111"}])
+    (record,) = caplog.records
+    assert '"tenant_id": "t1"' in record.getMessage()
+    assert "4111" not in record.getMessage()
+
+
+@pytest.mark.asyncio
+async def test_audit_entries_are_serialized_by_the_sink(caplog):
+    sink = WriteBehindSink("test", max_batch=100, flush_interval_s=60)
+    audit = AuditLogger(tenant_id="t1")
+    audit.attach_sink(sink)
+
+    with caplog.at_level(logging.INFO, logger="koa.audit"):
+        audit.log_phase("intent_analysis", {"domains": ["travel"]})
+        assert not [r for r in caplog.records if r.name == "koa.audit"]
+        await sink.aclose()
+
+    (record,) = [r for r in caplog.records if r.name == "koa.audit"]
+    assert '"phase": "intent_analysis"' in record.getMessage()
+
+
+def test_tool_call_history_rows_skip_internal_tools():
+    history = pytest.importorskip("koa.builtin_agents.tools.action_history")
+    rows = history.tool_call_history_rows(
+        "t1",
+        [
+            {"name": "complete_task"},
+            {"name": "web_search", "args_summary": {"query": "koa"}, "duration_ms": 12},
+        ],
+    )
+    assert len(rows) == 1
+    assert rows[0][:5] == ("t1", "web_search", None, "web_search: koa", '{"query": "koa"}')
+
+
+@pytest.mark.skipif(not PG_DSN, reason="KOA_TEST_DATABASE_URL not set")
+@pytest.mark.asyncio
+async def test_tool_call_history_batch_insert():
+    history = pytest.importorskip("koa.builtin_agents.tools.action_history")
+    from koa.db import Database
+
+    db = Database(PG_DSN, min_size=1, max_size=2)
+    await db.initialize()
+    try:
+        await db.execute("DELETE FROM tool_call_history WHERE tenant_id = 'wb-test'")
+        rows = history.tool_call_history_rows(
+            "wb-test",
+            [
+                {"name": "web_search", "args_summary": {"query": "a"}, "success": True},
+                {"name": "EmailAgent", "args_summary": {"task_instruction": "send"}},
+            ],
+        )
+        await history.insert_tool_call_history_rows(db, rows)
+
+        stored = await db.fetch(
+            "SELECT tool_name, summary, args_summary, created_at FROM tool_call_history "
+            "WHERE tenant_id = 'wb-test' ORDER BY tool_name"
+        )
+        assert [(r["tool_name"], r["summary"]) for r in stored] == [
+            ("EmailAgent", "send"),
+            ("web_search", "web_search: a"),
+        ]
+        assert all(r["created_at"] is not None for r in stored)
+    finally:
+        await db.execute("DELETE FROM tool_call_history WHERE tenant_id = 'wb-test'")
+        await db.close()
@@ -1,5 +1,7 @@
 """Tests for koa.llm.base — BaseLLMClient pure logic methods"""
 
+import asyncio
+
 import pytest
 
 from koa.llm.base import (
@@ -247,3 +249,44 @@ class TestLLMResponse:
         assert d["content"] == "hi"
         assert d["stop_reason"] == "end_turn"
         assert d["usage"]["total_tokens"] == 30
+
+
+# =========================================================================
+# chat_completion request coalescing
+# =========================================================================
+
+
+class SlowStubLLMClient(StubLLMClient):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.api_calls = 0
+
+    async def _call_api(self, messages, tools=None, **kwargs):
+        self.api_calls += 1
+        await asyncio.sleep(0.01)
+        return LLMResponse(content=messages[-1]["content"], tool_calls=[])
+
+
+class TestRequestCoalescing:
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_requests_share_one_call(self):
+        client = SlowStubLLMClient(model="gpt-4o")
+        messages = [{"role": "user", "content": "brief me"}]
+        responses = await asyncio.gather(
+            *(client.chat_completion(messages, config={"temperature": 0}) for _ in range(5)),
+            client.chat_completion([{"role": "user", "content": "other"}]),
+        )
+        assert client.api_calls == 2
+        assert [r.content for r in responses] == ["brief me"] * 5 + ["other"]
+        responses[0].tool_calls.append("x")
+        assert responses[1].tool_calls == []
+
+        await client.chat_completion(messages, config={"temperature": 0})
+        assert client.api_calls == 3  # nothing is kept once the call finishes
+
+    @pytest.mark.asyncio
+    async def test_coalescing_can_be_disabled(self):
+        client = SlowStubLLMClient(model="gpt-4o", coalesce_requests=False)
+        messages = [{"role": "user", "content": "brief me"}]
+        await asyncio.gather(*(client.chat_completion(messages) for _ in range(3)))
+        assert client.api_calls == 3
@@ -174,3 +174,70 @@ class TestIsAnthropicModel:
 
     def test_gemini_model(self):
         assert is_anthropic_model("gemini", "gemini-pro") is False
+
+
+def _transcript(n=200):
+    """System prompt + ``n`` turns with tool calls and large tool results."""
+    messages = [{"role": "system", "content": "System " * 500}]
+    for i in range(n):
+        if i % 4 == 0:
+            messages.append({"role": "user", "content": [{"type": "text", "text": f"Q{i}"}]})
+        elif i % 4 == 1:
+            messages.append(
+                {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [
+                        {
+                            "id": f"call_{i}",
+                            "type": "function",
+                            "function": {"name": "search", "arguments": '{"q": "x"}'},
+                        }
+                    ],
+                }
+            )
+        elif i % 4 == 2:
+            rows = [{"id": j, "title": f"result {j}", "tags": ["a", "b"]} for j in range(50)]
+            messages.append({"role": "tool", "tool_call_id": f"call_{i - 1}", "content": rows})
+        else:
+            messages.append({"role": "assistant", "content": f"A{i} " * 200})
+    return messages
+
+
+class TestCopyOnWrite:
+    def test_caller_transcript_is_never_mutated(self):
+        messages = _transcript()
+        original = copy.deepcopy(messages)
+        result = apply_anthropic_cache_control(messages)
+
+        assert messages == original
+        assert result is not messages
+
+    def test_only_marked_messages_are_copied(self):
+        messages = _transcript()
+        result = apply_anthropic_cache_control(messages)
+
+        marked = [i for i, (a, b) in enumerate(zip(messages, result)) if a is not b]
+        assert marked == [0, 198, 199, 200]
+        assert result[197] is messages[197]
+        # List content: the marked block is a copy, earlier blocks are shared
+        user = _transcript(1) + [{"role": "user", "content": [{"text": "a"}, {"text": "b"}]}]
+        out = apply_anthropic_cache_control(user)
+        assert out[-1]["content"][0] is user[-1]["content"][0]
+        assert "cache_control" not in user[-1]["content"][1]
+
+    def test_benchmark_200_message_transcript(self):
+        import time
+
+        messages = _transcript()
+        start = time.perf_counter()
+        for _ in range(50):
+            apply_anthropic_cache_control(messages)
+        copy_on_write = (time.perf_counter() - start) / 50
+
+        start = time.perf_counter()
+        for _ in range(5):
+            copy.deepcopy(messages)  # what every call used to do
+        deep = (time.perf_counter() - start) / 5
+
+        assert copy_on_write < deep / 20
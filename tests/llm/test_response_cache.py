@@ -0,0 +1,199 @@
+"""Tests for the LLM response cache used by deterministic helper calls."""
+
+import pytest
+
+from koa.llm.base import LLMConfig, LLMResponse
+from koa.llm.response_cache import (
+    ResponseCache,
+    cached_completion,
+    configure_response_cache,
+    get_response_cache,
+)
+from koa.llm.router import ModelRouter, RoutingRule
+from koa.observability.metrics import configure_metrics, get_metrics_registry
+
+
+class _Client:
+    provider = "fake"
+
+    def __init__(self, content="ok"):
+        self.config = LLMConfig(model="fake-model")
+        self.content = content
+        self.calls = []
+
+    async def chat_completion(self, messages, **kwargs):
+        self.calls.append((messages, kwargs))
+        return LLMResponse(content=self.content, model="fake-model", raw_response={"id": 1})
+
+
+class _Embedder:
+    """Maps known phrases to fixed vectors."""
+
+    VECTORS = {
+        "what's on my calendar today": [1.0, 0.0, 0.0],
+        "whats on my calendar for today": [0.99, 0.1, 0.0],
+        "send an email to sam": [0.0, 1.0, 0.0],
+    }
+
+    async def embed(self, texts):
+        return [self.VECTORS.get(t.casefold(), [0.0, 0.0, 1.0]) for t in texts]
+
+
+def _prompt(text, system="classify"):
+    return [{"role": "system", "content": system}, {"role": "user", "content": text}]
+
+
+@pytest.fixture
+def default_cache():
+    previous = get_response_cache()
+    cache = ResponseCache()
+    configure_response_cache(cache)
+    yield cache
+    configure_response_cache(previous)
+
+
+@pytest.mark.asyncio
+async def test_exact_hit_on_normalized_prompt():
+    cache, client = ResponseCache(), _Client()
+    first = await cache.chat_completion(
+        client, _prompt("What's on my  calendar today"), scope="t", fold_case=True
+    )
+    first.content = "mutated"
+    second = await cache.chat_completion(
+        client, _prompt("what's on my calendar today\n"), scope="t", fold_case=True
+    )
+    assert len(client.calls) == 1
+    assert second.content == "ok"
+    assert second.raw_response is None
+
+    await cache.chat_completion(client, _prompt("what's on my calendar today"), scope="other")
+    await cache.chat_completion(
+        client, _prompt("what's on my calendar today"), scope="t", max_tokens=5
+    )
+    assert len(client.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_tenant_isolation_unless_shared():
+    cache, client = ResponseCache(), _Client()
+    await cache.chat_completion(client, _prompt("hi"), scope="t", tenant_id="a")
+    await cache.chat_completion(client, _prompt("hi"), scope="t", tenant_id="b")
+    assert len(client.calls) == 2
+
+    await cache.chat_completion(client, _prompt("hi"), scope="t", tenant_id="a", shared=True)
+    await cache.chat_completion(client, _prompt("hi"), scope="t", tenant_id="b", shared=True)
+    assert len(client.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_ttl_and_lru_eviction(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("koa.llm.response_cache.time.monotonic", lambda: clock[0])
+    cache, client = ResponseCache(max_entries=2, ttl_s=10), _Client()
+
+    for text in ("a", "b", "a", "c"):  # "b" is least recently used when "c" arrives
+        await cache.chat_completion(client, _prompt(text), scope="t")
+    assert len(cache) == 2 and len(client.calls) == 3
+    await cache.chat_completion(client, _prompt("b"), scope="t")
+    assert len(client.calls) == 4
+
+    clock[0] += 11
+    await cache.chat_completion(client, _prompt("b"), scope="t")
+    assert len(client.calls) == 5
+
+
+@pytest.mark.asyncio
+async def test_responses_without_text_are_not_cached():
+    cache, client = ResponseCache(), _Client(content="")
+    await cache.chat_completion(client, _prompt("hi"), scope="t")
+    await cache.chat_completion(client, _prompt("hi"), scope="t")
+    assert len(client.calls) == 2 and len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_semantic_tier_stays_within_tenant_and_prompt():
+    cache, client = ResponseCache(embedder=_Embedder()), _Client()
+    ask = cache.chat_completion
+    await ask(
+        client, _prompt("what's on my calendar today"), scope="t", tenant_id="a", semantic=True
+    )
+
+    await ask(
+        client, _prompt("whats on my calendar for today"), scope="t", tenant_id="a", semantic=True
+    )
+    assert len(client.calls) == 1
+
+    await ask(client, _prompt("send an email to sam"), scope="t", tenant_id="a", semantic=True)
+    await ask(
+        client, _prompt("whats on my calendar for today"), scope="t", tenant_id="b", semantic=True
+    )
+    await ask(
+        client,
+        _prompt("whats on my calendar for today", system="other"),
+        scope="t",
+        tenant_id="a",
+        semantic=True,
+    )
+    assert len(client.calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_hit_and_miss_metrics():
+    configure_metrics(enabled=True)
+    try:
+        before = get_metrics_registry().snapshot()["counters"]
+        cache, client = ResponseCache(), _Client()
+        for _ in range(3):
+            await cache.chat_completion(client, _prompt("hi"), scope="metrics-test")
+        after = get_metrics_registry().snapshot()["counters"]
+    finally:
+        configure_metrics(enabled=False)
+
+    def delta(result):
+        key = f"koa_llm_cache_requests_total{{result={result},scope=metrics-test}}"
+        return after.get(key, 0) - before.get(key, 0)
+
+    assert (delta("hit"), delta("miss")) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_cached_completion_passes_through_without_cache():
+    assert get_response_cache() is None
+    client = _Client()
+    for _ in range(2):
+        await cached_completion(client, _prompt("hi"), scope="t", config={"temperature": 0})
+    assert [kwargs for _, kwargs in client.calls] == [{"config": {"temperature": 0}}] * 2
+
+
+@pytest.mark.asyncio
+async def test_router_shares_first_turn_scores_across_tenants(default_cache):
+    client = _Client(content='{"score": 20, "reasoning": "simple lookup"}')
+
+    class _Registry:
+        def get(self, name):
+            return client
+
+    router = ModelRouter(_Registry(), classifier_provider="fast", rules=[RoutingRule(1, 100, "x")])
+    first = await router.route([{"role": "user", "content": "What's on my calendar today?"}], "a")
+    second = await router.route([{"role": "user", "content": "what's on my calendar today?"}], "b")
+    assert first.score == second.score == 20
+    assert len(client.calls) == 1
+
+    history = [
+        {"role": "user", "content": "book a table"},
+        {"role": "assistant", "content": "where?"},
+        {"role": "user", "content": "what's on my calendar today?"},
+    ]
+    await router.route(history, "a")
+    await router.route(history, "b")
+    assert len(client.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_graceful_error_replies_are_never_cached(default_cache):
+    from koa.orchestrator.graceful_response import generate_graceful_error
+
+    client = _Client(content="Oops, hiccup on my end!")
+    for _ in range(2):
+        assert await generate_graceful_error(RuntimeError("x"), client) == client.content
+    assert len(client.calls) == 2 and len(default_cache) == 0
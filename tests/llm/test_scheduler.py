@@ -0,0 +1,216 @@
+"""Tests for hedged requests and AIMD concurrency limits per LLM provider."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from koa.llm.base import LLMConfig, LLMResponse
+from koa.llm.scheduler import AIMDLimiter, LatencyWindow, ProviderScheduler
+from koa.orchestrator.llm_manager import LLMManagerMixin
+from koa.orchestrator.react_config import ReactLoopConfig
+
+
+class RateLimitError(Exception):
+    pass
+
+
+class _Client:
+    def __init__(self, provider, delay=0.0, errors=()):
+        self.provider = provider
+        self.config = LLMConfig(model="m")
+        self.delay = delay
+        self.errors = list(errors)
+        self.calls = 0
+        self.cancelled = 0
+
+    async def chat_completion(self, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return LLMResponse(content=self.provider)
+
+
+class _Host(LLMManagerMixin):
+    def __init__(self, primary, fallback, scheduler, **config):
+        self.llm_client = primary
+        self._react_config = ReactLoopConfig(
+            fallback_providers=["backup"], llm_retry_base_delay=0.0, **config
+        )
+        self._context_manager = None
+        self._model_router = SimpleNamespace(registry={"backup": fallback})
+        self._circuit_breakers = {}
+        self._provider_scheduler = scheduler
+
+
+def test_latency_window_percentile():
+    window = LatencyWindow(size=100)
+    assert window.percentile(95) is None
+    for ms in range(1, 101):
+        window.record(ms / 1000)
+    assert window.percentile(50) == 0.05
+    assert window.percentile(95) == 0.095
+    assert window.percentile(100) == 0.1
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_over_the_limit():
+    limiter = AIMDLimiter(initial_limit=2)
+    await limiter.acquire()
+    await limiter.acquire()
+    assert limiter.available == 0
+
+    third = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not third.done()
+    limiter.release()
+    await asyncio.sleep(0)
+    assert third.done() and limiter.in_flight == 2
+
+
+def test_limiter_additive_increase_multiplicative_decrease():
+    limiter = AIMDLimiter(initial_limit=8, decrease_interval_s=60)
+    for _ in range(8):
+        limiter.on_success()
+    assert 8.9 < limiter.limit < 9.0
+
+    limiter.on_overload()
+    limiter.on_overload()  # same burst, counted once
+    assert 4.4 < limiter.limit < 4.5
+
+
+@pytest.mark.asyncio
+async def test_hedge_cancels_the_slower_call():
+    scheduler = ProviderScheduler()
+    slow, fast = _Client("slow", delay=5), _Client("fast", delay=0.01)
+
+    result, hedged, hedge_won = await scheduler.hedge(
+        lambda: slow.chat_completion(), lambda: fast.chat_completion(), delay=0.02
+    )
+    assert (result.content, hedged, hedge_won) == ("fast", True, True)
+    await asyncio.sleep(0)
+    assert slow.cancelled == 1
+
+    result, hedged, hedge_won = await scheduler.hedge(
+        lambda: fast.chat_completion(), lambda: slow.chat_completion(), delay=0.5
+    )
+    assert (result.content, hedged, hedge_won) == ("fast", False, False)
+    assert slow.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_returns_primary_error_when_both_fail():
+    scheduler = ProviderScheduler()
+
+    async def failing(delay, name):
+        await asyncio.sleep(delay)
+        return RuntimeError(name)
+
+    result, hedged, hedge_won = await scheduler.hedge(
+        lambda: failing(0.05, "primary"), lambda: failing(0.0, "hedge"), delay=0.01
+    )
+    assert str(result) == "primary" and hedged and not hedge_won
+
+    result, hedged, hedge_won = await scheduler.hedge(
+        lambda: failing(0.0, "primary"), lambda: failing(0.0, "hedge"), delay=0.5
+    )
+    assert str(result) == "primary" and not hedged and not hedge_won
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_on_fallback_provider():
+    scheduler = ProviderScheduler(min_samples=5)
+    primary, backup = _Client("primary", delay=5), _Client("backup")
+    for _ in range(5):
+        scheduler.latencies(primary).record(0.01)
+    host = _Host(primary, backup, scheduler, hedge_percentile=95.0)
+
+    response = await asyncio.wait_for(host._llm_call_with_retry([], None), timeout=1)
+    assert response.content == "backup"
+    await asyncio.sleep(0)
+    assert primary.cancelled == 1
+    assert scheduler.limiter(primary).in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_latency_history_or_config():
+    scheduler = ProviderScheduler(min_samples=5)
+    primary, backup = _Client("primary", delay=0.05), _Client("backup")
+
+    response = await _Host(primary, backup, scheduler, hedge_percentile=95.0)._llm_call_with_retry(
+        [], None
+    )
+    assert response.content == "primary" and backup.calls == 0
+
+    for _ in range(5):
+        scheduler.latencies(primary).record(0.001)
+    response = await _Host(primary, backup, scheduler)._llm_call_with_retry([], None)
+    assert response.content == "primary" and backup.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_primary_falls_back_when_no_hedge_was_launched():
+    unavailable = [RuntimeError("503 service unavailable")] * 3
+    scheduler = ProviderScheduler(min_samples=5)
+    primary, backup = _Client("primary", errors=unavailable), _Client("backup")
+    host = _Host(primary, backup, scheduler, hedge_percentile=95.0, llm_max_retries=1)
+
+    response = await host._llm_call_with_retry([], None)  # no latency history
+    assert response.content == "backup" and backup.calls == 1
+
+    for _ in range(5):
+        scheduler.latencies(primary).record(1.0)
+    primary.errors = list(unavailable)
+    response = await host._llm_call_with_retry([], None)  # fails before the delay
+    assert response.content == "backup" and backup.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_shrinks_provider_concurrency():
+    scheduler = ProviderScheduler(initial_limit=16)
+    primary = _Client("primary", errors=[RateLimitError("429 too many requests")])
+    host = _Host(primary, _Client("backup"), scheduler)
+
+    response = await host._llm_call_with_retry([], None)
+    assert response.content == "primary"
+    assert 8.0 <= scheduler.limiter(primary).limit < 8.2
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_unlimited_unless_opted_in():
+    scheduler = ProviderScheduler()
+    client = _Client("primary")
+    held = [await scheduler.acquire(client) for _ in range(500)]
+    scheduler.overloaded(client)
+    assert scheduler.has_capacity(client)
+    for lease in held:
+        lease.release()
+
+
+@pytest.mark.asyncio
+async def test_stream_holds_its_slot_until_closed():
+    class _StreamingClient(_Client):
+        async def stream_completion(self, **kwargs):
+            for part in ("a", "b"):
+                yield SimpleNamespace(content=part)
+
+    scheduler = ProviderScheduler(initial_limit=1, max_limit=1)
+    primary = _StreamingClient("primary")
+    host = _Host(primary, _Client("backup"), scheduler)
+    limiter = scheduler.limiter(primary)
+
+    stream = await host._llm_call_with_retry([], None, stream=True)
+    assert limiter.in_flight == 1
+    queued = asyncio.ensure_future(host._llm_call_with_retry([], None))
+    await asyncio.sleep(0.01)
+    assert not queued.done()
+
+    assert [chunk.content async for chunk in stream] == ["a", "b"]
+    await stream.aclose()
+    assert (await asyncio.wait_for(queued, timeout=1)).content == "primary"
+    assert limiter.in_flight == 0
@@ -0,0 +1,155 @@
+"""Tests for the per-day health rollup kept current by sensing ingestion."""
+
+import asyncio
+import os
+import uuid
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from koa.memory.lifecycle import daily_log_aggregator, health_rollup
+from koa.memory.lifecycle.weekly_reflector import _build_user_prompt
+from koa.server.routes import sensing
+
+PG_DSN = os.environ.get("KOA_TEST_DATABASE_URL")
+
+
+def test_local_dates_follow_the_upload_timezone():
+    late_evening = datetime(2026, 3, 2, 4, 30, tzinfo=timezone.utc)
+    assert health_rollup.local_dates([late_evening], "UTC") == {date(2026, 3, 2)}
+    assert health_rollup.local_dates([late_evening], "America/New_York") == {date(2026, 3, 1)}
+    with pytest.raises(ValueError):
+        health_rollup.resolve_tz("Mars/Olympus_Mons")
+
+
+def test_summary_from_rollup():
+    metrics = {
+        "steps": {"sample_count": 3, "value_count": 3, "value_sum": 4200.0, "minutes": 0},
+        "sleep": {"sample_count": 2, "value_count": 0, "value_sum": None, "minutes": 430},
+        "heart_rate": {"sample_count": 4, "value_count": 3, "value_sum": 200.0, "minutes": 0},
+    }
+    out = sensing._summary_from_rollup(date(2026, 3, 1), metrics)
+    assert (out["steps"], out["sleep_minutes"], out["heart_rate_avg"]) == (4200, 430, 66.67)
+    assert out["sample_count"] == 9 and out["hrv_avg_ms"] is None
+
+
+def test_weekly_prompt_prefers_rollup_health():
+    rows = [{"local_date": "2026-03-01", "payload": {"health": {"steps": {"total": 1.0}}}}]
+    prompt = _build_user_prompt(
+        "u", date(2026, 2, 24), date(2026, 3, 2), rows, health_days={"2026-03-01": {"x": 1}}
+    )
+    assert '"x": 1' in prompt and '"steps"' not in prompt
+
+
+@pytest.mark.skipif(not PG_DSN, reason="KOA_TEST_DATABASE_URL not set")
+@pytest.mark.asyncio
+async def test_rollup_tracks_late_and_resent_samples(monkeypatch):
+    from koa.db import Database
+
+    db = Database(PG_DSN, min_size=1, max_size=2)
+    await db.initialize()
+    monkeypatch.setattr(sensing, "require_app", lambda: SimpleNamespace(database=db))
+    user = f"rollup-{uuid.uuid4()}"
+    tz = "America/New_York"
+
+    def hr(ts, value):
+        return {"type": "heart_rate", "started_at": ts, "value": value}
+
+    async def ingest(samples):
+        await sensing.ingest_healthkit(
+            sensing.HealthKitIngest(user_id=user, timezone=tz, samples=samples)
+        )
+
+    try:
+        # 23:30 local on Mar 1 is 04:30 UTC on Mar 2.
+        await ingest(
+            [
+                hr("2026-03-01T15:00:00Z", 60),
+                hr("2026-03-02T04:30:00Z", 80),
+                {
+                    "type": "sleep",
+                    "started_at": "2026-03-02T05:00:00Z",
+                    "ended_at": "2026-03-02T12:10:30Z",
+                },
+            ]
+        )
+        await ingest([hr("2026-03-01T15:00:00Z", 60)])  # re-sent
+        await ingest([hr("2026-03-01T20:00:00Z", 100)])  # late arrival
+
+        days = await health_rollup.fetch_days(db, user, date(2026, 3, 1), date(2026, 3, 2))
+        assert days[date(2026, 3, 1)]["heart_rate"]["sample_count"] == 3
+        assert health_rollup.metric_avg(days[date(2026, 3, 1)]["heart_rate"]) == 80.0
+        assert days[date(2026, 3, 2)]["sleep"]["minutes"] == 430
+        assert days[date(2026, 3, 1)]["heart_rate"]["tz"] == tz
+
+        summary = await sensing.health_daily_summary(user, "2026-03-01")
+        assert summary["heart_rate_avg"] == 80.0 and summary["sample_count"] == 3
+
+        health = await daily_log_aggregator._health_summary(
+            db, user, None, None, date(2026, 3, 1), tz
+        )
+        assert health == {"heart_rate": {"count": 3, "total": 240.0, "avg": 80.0}}
+
+        # A reader in another zone falls back to the raw samples.
+        start, end = daily_log_aggregator._local_day_bounds(date(2026, 3, 1), "UTC")
+        health = await daily_log_aggregator._health_summary(
+            db, user, start, end, date(2026, 3, 1), "UTC"
+        )
+        assert health["heart_rate"]["count"] == 2
+    finally:
+        for table in ("health_samples", "health_daily_rollup"):
+            await db.execute(f"DELETE FROM tenant_default.{table} WHERE user_id = $1", user)
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_recent_state_rejects_out_of_range_days():
+    from koa.errors import E, KoaError
+
+    with pytest.raises(KoaError) as exc:
+        await sensing.health_recent_state("u", days=0)
+    assert exc.value.code == E.VALIDATION_ERROR and exc.value.status_code == 400
+
+
+@pytest.mark.skipif(not PG_DSN, reason="KOA_TEST_DATABASE_URL not set")
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_for_one_user_serialize(monkeypatch):
+    from koa.db import Database
+
+    db = Database(PG_DSN, min_size=1, max_size=3)
+    await db.initialize()
+    monkeypatch.setattr(sensing, "require_app", lambda: SimpleNamespace(database=db))
+    user = f"rollup-{uuid.uuid4()}"
+    day = date(2026, 3, 1)
+    release = asyncio.Event()
+
+    async def refresh(hold):
+        async with db.acquire() as conn:
+            async with conn.transaction():
+                await health_rollup.refresh_days(conn, user, [day])
+                if hold:
+                    await release.wait()
+
+    try:
+        await sensing.ingest_healthkit(
+            sensing.HealthKitIngest(
+                user_id=user,
+                samples=[{"type": "steps", "started_at": "2026-03-01T10:00:00Z", "value": 5}],
+            )
+        )
+        first = asyncio.ensure_future(refresh(hold=True))
+        await asyncio.sleep(0.1)
+        second = asyncio.ensure_future(refresh(hold=False))
+        await asyncio.sleep(0.2)
+        assert not second.done()  # waits for the first transaction
+
+        release.set()
+        await asyncio.wait_for(asyncio.gather(first, second), timeout=5)
+        days = await health_rollup.fetch_days(db, user, day, day)
+        assert days[day]["steps"]["sample_count"] == 1
+    finally:
+        release.set()
+        for table in ("health_samples", "health_daily_rollup"):
+            await db.execute(f"DELETE FROM tenant_default.{table} WHERE user_id = $1", user)
+        await db.close()
@@ -331,3 +331,76 @@ class TestKeepRecent:
     def test_empty(self):
         result = ContextManager._keep_recent([], keep=5)
         assert result == []
+
+
+# =========================================================================
+# TokenLedger
+# =========================================================================
+
+
+class _CountingEncoding:
+    """Stand-in tokenizer: one token per whitespace-separated word."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode_ordinary(self, text):
+        self.calls += 1
+        return text.split()
+
+
+class TestTokenLedger:
+    def test_counts_each_message_once(self, small_cm):
+        small_cm._encoding = encoding = _CountingEncoding()
+        ledger = small_cm.track([{"role": "system", "content": "you are helpful"}])
+        ledger.append({"role": "user", "content": "hello there"})
+        assert ledger.tokens == (4 + 3) + (4 + 2)
+        assert encoding.calls == 2
+
+        for _ in range(5):
+            assert small_cm.estimate_tokens(ledger) == 13
+        assert encoding.calls == 2
+
+    def test_derived_ledgers_reuse_counts(self, small_cm):
+        small_cm._encoding = encoding = _CountingEncoding()
+        msgs = [{"role": "system", "content": "sys"}] + [
+            {"role": "user", "content": f"message {i}"} for i in range(10)
+        ]
+        ledger = small_cm.track(msgs)
+        trimmed = small_cm.force_trim(ledger)
+        assert trimmed.tokens == (4 + 1) + 5 * (4 + 2)  # system + last 5
+        assert small_cm.track(list(trimmed), like=ledger).tokens == trimmed.tokens
+        assert encoding.calls == 11
+
+    def test_total_follows_list_mutations(self, default_cm):
+        ledger = default_cm.track([{"role": "user", "content": "a" * 40}])
+        ledger += [{"role": "user", "content": "b" * 80}, {"role": "user", "content": "c" * 8}]
+        ledger.insert(0, {"role": "system", "content": "d" * 4})
+        ledger.pop()
+        del ledger[0]
+        ledger[0] = {"role": "user", "content": "e" * 4}
+        assert ledger.tokens == sum(map(default_cm.count_message_tokens, ledger))
+        ledger.clear()
+        assert ledger.tokens == 0
+
+    def test_truncation_keeps_the_ledger(self, small_cm):
+        ledger = small_cm.track(
+            [{"role": "user", "content": "q"}, {"role": "tool", "content": "x" * 500}]
+        )
+        truncated = small_cm.truncate_all_tool_results(ledger)
+        counted = sum(map(small_cm.count_message_tokens, truncated))
+        assert truncated.tokens == counted < ledger.tokens
+        assert small_cm.estimate_tokens(list(truncated)) == counted
+
+    def test_copies_are_plain_lists(self, default_cm):
+        import copy
+        import pickle
+
+        ledger = default_cm.track([{"role": "user", "content": "hi"}])
+        for clone in (copy.copy(ledger), copy.deepcopy(ledger), pickle.loads(pickle.dumps(ledger))):
+            assert type(clone) is list and clone == ledger
+
+    def test_json_after_a_prose_header_is_sized_as_json(self):
+        body = '{"id": 1, "tags": ["a", "b"]}, ' * 100
+        text = "Search results for the query below. " * 20 + body
+        assert ContextManager._estimate_string_tokens(text) == len(text) // 3
@@ -5,8 +5,10 @@ Tests cover:
 - _parse_result() — single intent, multi intent, domain validation, downgrade logic
 - _extract_json() — clean JSON, wrapped JSON, invalid input
 - _fallback() — safe defaults
+- Fused complexity scoring and the PreflightCache
 """
 
+import asyncio
 import json
 from dataclasses import dataclass
 from typing import Optional
@@ -14,11 +16,18 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from koa.llm.router import ModelRouter, RoutingDecision, RoutingRule
 from koa.orchestrator.intent_analyzer import (
+    COMPLEXITY_PROMPT_SECTION,
+    FAST_PATH_COMPLEXITY,
     MAX_SUB_TASKS,
     VALID_DOMAINS,
+    IntentAnalysis,
     IntentAnalyzer,
+    PreflightCache,
 )
+from koa.orchestrator.orchestrator import Orchestrator
+from koa.result import AgentResult, AgentStatus
 
 # ── Mock LLM Response ──
 
@@ -392,6 +401,221 @@ class TestAnalyze:
         assert config["temperature"] == 0.0
 
 
+# ── Tests: fused pre-flight (complexity + cache) ──
+
+
+class TestPreflight:
+    @pytest.mark.asyncio
+    async def test_complexity_scored_in_same_call(self):
+        response = json.dumps(
+            {"intent_type": "single", "domains": ["travel"], "sub_tasks": [], "complexity": 85}
+        )
+        client = _make_llm_client(response)
+        analyzer = IntentAnalyzer(llm_client=client, score_complexity=True)
+
+        result = await analyzer.analyze("Plan a 5-day trip to Japan")
+
+        assert result.complexity == 85
+        client.chat_completion.assert_called_once()
+        system = client.chat_completion.call_args.kwargs["messages"][0]["content"]
+        assert system.endswith(COMPLEXITY_PROMPT_SECTION)
+
+    @pytest.mark.asyncio
+    async def test_complexity_missing_or_out_of_range(self):
+        analyzer = IntentAnalyzer(llm_client=AsyncMock())
+        assert analyzer._parse_result({"domains": ["travel"]}, "x").complexity == -1
+        assert analyzer._parse_result({"complexity": "lots"}, "x").complexity == -1
+        assert analyzer._parse_result({"complexity": 250}, "x").complexity == 100
+
+    @pytest.mark.asyncio
+    async def test_fast_path_reports_trivial_complexity(self):
+        client = _make_llm_client("{}")
+        analyzer = IntentAnalyzer(llm_client=client, score_complexity=True)
+
+        result = await analyzer.analyze("thanks!")
+
+        assert result.source == "fast_path"
+        assert result.complexity == FAST_PATH_COMPLEXITY
+        client.chat_completion.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_llm_for_same_state(self):
+        response = json.dumps({"intent_type": "single", "domains": ["productivity"]})
+        client = _make_llm_client(response)
+        cache = PreflightCache()
+        analyzer = IntentAnalyzer(llm_client=client, cache=cache)
+        history = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "Hey!"}]
+
+        first = await analyzer.analyze("What's on my calendar?", history, tenant_id="t1")
+        first.domains.append("mutated")
+        again = await analyzer.analyze("  what's on my   CALENDAR? ", history, tenant_id="t1")
+
+        assert client.chat_completion.call_count == 1
+        assert again.domains == ["productivity"]
+        assert again.raw_message == "  what's on my   CALENDAR? "
+
+        # Another tenant or a different history tail is a miss
+        await analyzer.analyze("What's on my calendar?", history, tenant_id="t2")
+        await analyzer.analyze("What's on my calendar?", history[:1], tenant_id="t1")
+        assert client.chat_completion.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_fallback_results_are_not_cached(self):
+        client = _make_failing_llm_client(RuntimeError("API down"))
+        cache = PreflightCache()
+        analyzer = IntentAnalyzer(llm_client=client, cache=cache)
+
+        await analyzer.analyze("test message")
+
+        assert len(cache) == 0
+
+    def test_cache_expires_and_evicts(self, monkeypatch):
+        from koa.orchestrator import intent_analyzer
+
+        now = [1000.0]
+        monkeypatch.setattr(intent_analyzer.time, "monotonic", lambda: now[0])
+        cache = PreflightCache(max_entries=2, ttl_s=10)
+        analysis = IntentAnalyzer(llm_client=None)._fallback("x")
+        keys = [PreflightCache.key("t", f"m{i}", []) for i in range(3)]
+        for key in keys:
+            cache.put(key, analysis)
+
+        assert len(cache) == 2 and cache.get(keys[0]) is None
+        now[0] += 11
+        assert cache.get(keys[2]) is None
+
+    def test_router_maps_preflight_score_without_classifier_call(self):
+        registry = MagicMock()
+        router = ModelRouter(
+            registry=registry,
+            rules=[RoutingRule(1, 50, "cheap"), RoutingRule(51, 100, "strong")],
+        )
+
+        decision = router.route_score(85, reasoning="preflight")
+
+        assert decision.provider == "strong"
+        assert decision.score == 85
+        registry.get.assert_called_once_with("strong")
+
+
+# ── Tests: pre-flight stage in the orchestrator pipeline ──
+
+
+def _clarifying_intent(message, context=None):
+    return IntentAnalysis(
+        intent_type="single",
+        domains=["general"],
+        raw_message=message,
+        needs_clarification=True,
+        clarification_question="Which one?",
+        source="llm",
+    )
+
+
+def _orchestrator(**kwargs):
+    momex = MagicMock()
+    momex.search = AsyncMock(return_value=[])
+    momex.add = AsyncMock()
+    orchestrator = Orchestrator(momex=momex, llm_client=MagicMock(), **kwargs)
+    orchestrator._initialized = True
+    return orchestrator
+
+
+def _pipeline(orchestrator, message="book it"):
+    return orchestrator._execute_message_inner("t1", message, None, {}, "req-1", None)
+
+
+class TestPreflightPipeline:
+    @pytest.mark.asyncio
+    async def test_classifier_runs_alongside_context_preparation(self):
+        orchestrator = _orchestrator()
+        started = asyncio.Event()
+        prepare_context = orchestrator.prepare_context
+
+        async def analyze(message, context):
+            started.set()
+            return _clarifying_intent(message)
+
+        async def slow_prepare_context(*args):
+            await started.wait()  # would deadlock if the classifier ran after
+            return await prepare_context(*args)
+
+        orchestrator._analyze_intent = analyze
+        orchestrator.prepare_context = slow_prepare_context
+
+        events = await asyncio.wait_for(_collect(_pipeline(orchestrator)), timeout=2)
+        assert events[-1].data.raw_message == "Which one?"
+
+    @pytest.mark.asyncio
+    async def test_classifier_is_cancelled_when_a_pending_agent_replies(self):
+        orchestrator = _orchestrator()
+        cancelled = asyncio.Event()
+
+        async def analyze(message, context):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def restored_agent_replies(tenant_id, message, context):
+            await asyncio.sleep(0)
+            return AgentResult(agent_type="A", status=AgentStatus.COMPLETED, raw_message="done")
+
+        orchestrator._analyze_intent = analyze
+        orchestrator._check_pending_agents = restored_agent_replies
+
+        events = await _collect(_pipeline(orchestrator, "yes"))
+        assert events[-1].data.raw_message == "done"
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_no_classifier_call_while_an_agent_is_waiting(self):
+        orchestrator = _orchestrator()
+        orchestrator._analyze_intent = AsyncMock(side_effect=_clarifying_intent)
+        orchestrator._has_waiting_agents = AsyncMock(return_value=True)
+        orchestrator._check_pending_agents = AsyncMock(
+            return_value=AgentResult(agent_type="A", status=AgentStatus.COMPLETED)
+        )
+
+        await _collect(_pipeline(orchestrator, "yes"))
+        orchestrator._analyze_intent.assert_not_called()
+
+        # The waiting agent did not take the message: classify it now.
+        orchestrator._check_pending_agents = AsyncMock(return_value=None)
+        events = await _collect(_pipeline(orchestrator))
+        assert events[-1].data.raw_message == "Which one?"
+        orchestrator._analyze_intent.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_embedding_hit_is_scored_once_in_preflight(self):
+        embedded = IntentAnalysis(
+            intent_type="single", domains=["travel"], raw_message="fly me", source="embedding"
+        )
+        embedding_router = MagicMock()
+        embedding_router.classify = AsyncMock(return_value=embedded)
+        model_router = MagicMock()
+        model_router.route = AsyncMock(
+            return_value=RoutingDecision(provider="strong", score=80, reasoning="", latency_ms=1)
+        )
+        orchestrator = _orchestrator(
+            model_router=model_router, intent_embedding_router=embedding_router
+        )
+
+        history = [{"role": "assistant", "content": "Where to?"}]
+        intent = await orchestrator._analyze_intent(
+            "fly me", {"tenant_id": "t1", "conversation_history": history}
+        )
+
+        assert intent.complexity == 80
+        model_router.route.assert_awaited_once()
+        assert model_router.route.call_args.args[0][-1] == {"role": "user", "content": "fly me"}
+
+
+async def _collect(events):
+    return [event async for event in events]
+
+
 # ── Tests: VALID_DOMAINS ──
 
 
@@ -0,0 +1,132 @@
+"""Tests for the vectorized EmbeddingRouter (prototype matrix, k-means, tenants)."""
+
+import random
+import time
+
+import pytest
+
+from koa.orchestrator import intent_embedding
+from koa.orchestrator.intent_embedding import EmbeddingRouter, Exemplar, _PrototypeMatrix
+
+
+class _TableEmbedder:
+    """Returns a fixed vector per text."""
+
+    def __init__(self, table):
+        self.table = table
+
+    async def embed(self, texts):
+        return [list(self.table[t]) for t in texts]
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend_kind(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(intent_embedding, "_HAS_NUMPY", False)
+    return request.param
+
+
+def test_matrix_scores_best_prototype_per_domain(backend_kind):
+    matrix = _PrototypeMatrix(
+        {
+            "travel": [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]],
+            "general": [[0.0, 0.0, 1.0]],
+        }
+    )
+    assert matrix.domains == ["travel", "general"]
+    assert matrix.scores([0.0, 2.0, 0.0]) == pytest.approx([1.0, 0.0])
+    assert matrix.scores([0.0, 0.0, 0.0]) == [0.0, 0.0]
+    assert matrix.scores([1.0, 0.0]) == [0.0, 0.0]  # dimension mismatch
+
+
+@pytest.mark.asyncio
+async def test_multiple_prototypes_keep_clusters_apart(backend_kind):
+    # "lifestyle" has two unrelated clusters; its centroid sits between them.
+    table = {
+        "lights a": [1.0, 0.0, 0.0, 0.0],
+        "lights b": [0.98, 0.2, 0.0, 0.0],
+        "package a": [0.0, 0.0, 1.0, 0.0],
+        "package b": [0.0, 0.0, 0.98, 0.2],
+        "flight a": [0.0, 1.0, 0.0, 0.0],
+        "flight b": [0.0, 0.98, 0.0, 0.2],
+        "query": [0.0, 0.1, 1.0, 0.0],
+    }
+    exemplars = [
+        Exemplar("lights a", "lifestyle"),
+        Exemplar("lights b", "lifestyle"),
+        Exemplar("package a", "lifestyle"),
+        Exemplar("package b", "lifestyle"),
+        Exemplar("flight a", "travel"),
+        Exemplar("flight b", "travel"),
+    ]
+
+    centroid = EmbeddingRouter(_TableEmbedder(table), hit_threshold=0.9)
+    await centroid.fit(exemplars)
+    assert await centroid.classify("query") is None
+
+    router = EmbeddingRouter(_TableEmbedder(table), hit_threshold=0.9, prototypes_per_domain=2)
+    await router.fit(exemplars)
+    assert router._matrix.size == 4
+    result = await router.classify("query")
+    assert result is not None and result.domains == ["lifestyle"]
+
+
+@pytest.mark.asyncio
+async def test_tenant_exemplars_only_apply_to_that_tenant(backend_kind):
+    table = {
+        "hi": [1.0, 0.0, 0.0],
+        "hello": [0.95, 0.3, 0.0],
+        "mail": [0.0, 1.0, 0.0],
+        "email": [0.0, 0.95, 0.3],
+        "ping the ops channel": [0.0, 0.0, 1.0],
+        "page ops": [0.0, 0.3, 0.95],
+    }
+    router = EmbeddingRouter(_TableEmbedder(table), hit_threshold=0.9)
+    await router.fit(
+        [
+            Exemplar("hi", "general"),
+            Exemplar("hello", "general"),
+            Exemplar("mail", "communication"),
+            Exemplar("email", "communication"),
+        ]
+    )
+    await router.fit_tenant(
+        "acme",
+        [
+            Exemplar("ping the ops channel", "communication"),
+            Exemplar("page ops", "communication"),
+        ],
+    )
+
+    assert await router.classify("ping the ops channel") is None
+    result = await router.classify("ping the ops channel", tenant_id="acme")
+    assert result is not None and result.domains == ["communication"]
+    assert (await router.classify("hi", tenant_id="acme")).domains == ["general"]
+
+    router.remove_tenant("acme")
+    assert await router.classify("ping the ops channel", tenant_id="acme") is None
+
+
+@pytest.mark.asyncio
+async def test_classify_1k_prototypes_under_a_millisecond():
+    pytest.importorskip("numpy")
+    dim, n_exemplars = 384, 1_000
+    rng = random.Random(7)
+    domains = sorted(intent_embedding.VALID_DOMAINS)
+    table = {f"ex{i}": [rng.gauss(0, 1) for _ in range(dim)] for i in range(n_exemplars)}
+    table["query"] = table["ex0"]
+    router = EmbeddingRouter(
+        _TableEmbedder(table), prototypes_per_domain=n_exemplars, hit_threshold=0.5
+    )
+    await router.fit([Exemplar(f"ex{i}", domains[i % len(domains)]) for i in range(n_exemplars)])
+    assert router._matrix.size == n_exemplars
+
+    rounds = 200
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = await router.classify("query")
+    per_call = (time.perf_counter() - start) / rounds
+    assert result is not None and result.domains == [domains[0]]
+    assert per_call < 1e-3, f"classify took {per_call * 1e3:.3f} ms"
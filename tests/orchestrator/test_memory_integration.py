@@ -7,6 +7,7 @@ import pytest
 
 from koa.orchestrator.orchestrator import Orchestrator
 from koa.result import AgentResult, AgentStatus
+from koa.streaming.models import AgentEvent, EventType
 
 
 class DummyMomex:
@@ -97,3 +98,74 @@ async def test_post_process_persists_persistent_memory_turns():
     assert updated.metadata["memory_write"]["stored"] is True
     assert len(momex.add_calls) == 1
     assert momex.add_calls[0]["tenant_id"] == "tenant-1"
+
+
+class GatedLLM:
+    """LLM whose completion blocks until ``release`` is set, then fails."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.calls = 0
+
+    async def chat_completion(self, **kwargs):
+        self.calls += 1
+        await self.release.wait()
+        raise RuntimeError("use the rule-based fallback")
+
+
+def _orchestrator_with_pipeline(llm):
+    orchestrator = Orchestrator(momex=DummyMomex(), llm_client=llm)
+    orchestrator._initialized = True
+
+    async def inner(tenant_id, message, images, metadata, request_id, ticket):
+        context = await orchestrator.prepare_context(tenant_id, message, metadata)
+        context["request_id"] = request_id
+        result = AgentResult(
+            agent_type="Orchestrator",
+            status=AgentStatus.COMPLETED,
+            raw_message="Nice to meet you, Alice.",
+        )
+        result = await orchestrator.post_process(result, context)
+        yield AgentEvent(type=EventType.EXECUTION_END, data=result)
+
+    orchestrator._execute_message_inner = inner
+    return orchestrator
+
+
+@pytest.mark.asyncio
+async def test_true_memory_proposals_follow_execution_end():
+    llm = GatedLLM()
+    orchestrator = _orchestrator_with_pipeline(llm)
+    events = orchestrator.stream_message("tenant-1", "My name is Alice Johnson.")
+
+    end = await events.__anext__()
+    assert end.type == EventType.EXECUTION_END
+    assert "true_memory_proposals" not in end.data.metadata
+    await asyncio.sleep(0)
+    assert llm.calls == 1  # extraction is running, but did not hold the answer back
+
+    llm.release.set()
+    (proposals,) = [event async for event in events]
+    assert proposals.type == EventType.TRUE_MEMORY_PROPOSALS
+    assert proposals.data["proposals"][0]["fact_key"] == "full_name"
+    assert orchestrator._true_memory_tasks == {}
+
+
+@pytest.mark.asyncio
+async def test_handle_message_merges_deferred_proposals():
+    llm = GatedLLM()
+    llm.release.set()
+    orchestrator = _orchestrator_with_pipeline(llm)
+
+    result = await orchestrator.handle_message("tenant-1", "My name is Alice Johnson.")
+    assert result.metadata["true_memory_proposals"][0]["value"] == "Alice Johnson"
+
+
+@pytest.mark.asyncio
+async def test_gate_skips_true_memory_extraction():
+    llm = GatedLLM()
+    orchestrator = _orchestrator_with_pipeline(llm)
+
+    events = [event async for event in orchestrator.stream_message("tenant-1", "What time is it?")]
+    assert [event.type for event in events] == [EventType.EXECUTION_END]
+    assert llm.calls == 0
@@ -0,0 +1,320 @@
+"""Tests for streaming mode of the ReAct loop (``ReactLoopConfig.stream_llm``)."""
+
+import asyncio
+import json
+
+import pytest
+
+from koa.llm.base import StreamChunk, ToolCallDelta
+from koa.models import AgentTool
+from koa.orchestrator.llm_manager import LLMManagerMixin
+from koa.orchestrator.react_config import COMPLETE_TASK_TOOL_NAME, ReactLoopConfig
+from koa.orchestrator.react_loop import ReactLoopMixin, TimedResult, _StreamedTurn
+from koa.orchestrator.stream_assembly import JSONStringFieldDecoder, ToolCallAssembler
+from koa.streaming.models import EventType
+
+WEATHER_SCHEMA = {
+    "type": "function",
+    "function": {
+        "name": "get_weather",
+        "parameters": {
+            "type": "object",
+            "properties": {"city": {"type": "string"}},
+            "required": ["city"],
+        },
+    },
+}
+
+
+def _split(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+# ----------------------------------------------------------------------
+# Assembly helpers
+# ----------------------------------------------------------------------
+
+
+def test_assembler_reports_call_once_next_index_starts():
+    assembler = ToolCallAssembler()
+    assert assembler.feed([ToolCallDelta(0, id="a", name="get_weather", arguments='{"ci')]) == []
+    assert assembler.feed([ToolCallDelta(0, arguments='ty": "Oslo"}')]) == []
+    done = assembler.feed([ToolCallDelta(1, id="b", name="complete_task")])
+    assert [(tc.id, tc.name, tc.arguments) for tc in done] == [
+        ("a", "get_weather", {"city": "Oslo"})
+    ]
+    assert [tc.id for tc in assembler.finish()] == ["b"]
+    assert assembler.finish() == []
+
+
+def test_assembler_keeps_invalid_json_arguments_raw():
+    assembler = ToolCallAssembler()
+    assembler.feed([ToolCallDelta(0, id="a", name="get_weather", arguments='{"city": ')])
+    assert assembler.finish()[0].arguments == '{"city": '
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 1000])
+def test_decoder_matches_json_loads_for_any_split(size):
+    value = 'Line one\n"quoted" \\ tab\t café \U0001f600 end'
+    text = json.dumps({"note": "x", "result": value})
+    decoder = JSONStringFieldDecoder("result")
+    pieces = []
+    received = ""
+    for part in _split(text, size):
+        received += part
+        pieces.append(decoder.feed(received))
+    assert decoder.done
+    assert "".join(pieces) == decoder.value == value
+
+
+# ----------------------------------------------------------------------
+# Streaming turn
+# ----------------------------------------------------------------------
+
+
+class _StreamingClient:
+    """Fake client whose ``stream_completion`` replays scripted chunks.
+
+    ``failures`` errors are raised before the first chunk; an item that is
+    an exception is raised mid-stream.
+    """
+
+    def __init__(self, chunks, failures=0, gate=None):
+        self.chunks = chunks
+        self.failures = failures
+        self.gate = gate
+        self.calls = 0
+        self.provider = "fake"
+
+    async def stream_completion(self, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("connection reset")
+        for i, chunk in enumerate(self.chunks):
+            if isinstance(chunk, Exception):
+                raise chunk
+            if self.gate is not None and i == len(self.chunks) - 1:
+                await self.gate.wait()
+            yield chunk
+            await asyncio.sleep(0)
+
+
+class _Loop(ReactLoopMixin, LLMManagerMixin):
+    def __init__(self, client):
+        self.llm_client = client
+        self._react_config = ReactLoopConfig(llm_retry_base_delay=0, stream_llm=True)
+        self._circuit_breakers = {}
+
+
+def _tool_chunks(weather_args, answer):
+    payload = json.dumps({"result": answer})
+    chunks = [
+        StreamChunk(tool_call_deltas=[ToolCallDelta(0, id="w1", name="get_weather")]),
+        *[
+            StreamChunk(tool_call_deltas=[ToolCallDelta(0, arguments=part)])
+            for part in _split(weather_args, 4)
+        ],
+        StreamChunk(tool_call_deltas=[ToolCallDelta(1, id="c1", name=COMPLETE_TASK_TOOL_NAME)]),
+    ]
+    chunks += [
+        StreamChunk(tool_call_deltas=[ToolCallDelta(1, arguments=part)])
+        for part in _split(payload, 3)
+    ]
+    return chunks
+
+
+async def _collect(
+    loop, streamed, execute, tool_schemas=(WEATHER_SCHEMA,), early_tools=("get_weather",)
+):
+    return [
+        event
+        async for event in loop._stream_llm_turn(
+            streamed,
+            [{"role": "user", "content": "hi"}],
+            list(tool_schemas),
+            1,
+            execute,
+            early_tools,
+        )
+    ]
+
+
+async def test_answer_chunks_are_emitted_before_stream_ends():
+    answer = "Hello there, this is the final answer."
+    payload = json.dumps({"result": answer})
+    gate = asyncio.Event()
+    chunks = [StreamChunk(tool_call_deltas=[ToolCallDelta(0, id="c1", name="complete_task")])]
+    chunks += [
+        StreamChunk(tool_call_deltas=[ToolCallDelta(0, arguments=part)])
+        for part in _split(payload, 5)
+    ]
+    chunks.append(StreamChunk(is_final=True))  # held back by the gate
+    loop = _Loop(_StreamingClient(chunks, gate=gate))
+    streamed = _StreamedTurn()
+
+    events = loop._stream_llm_turn(streamed, [], [WEATHER_SCHEMA], 1, None)
+    first = await events.__anext__()
+    second = await events.__anext__()
+    assert first.type == EventType.MESSAGE_START
+    assert second.type == EventType.MESSAGE_CHUNK and answer.startswith(second.data["chunk"])
+    assert not gate.is_set()
+
+    gate.set()
+    rest = [event async for event in events]
+    text = second.data["chunk"] + "".join(
+        e.data["chunk"] for e in rest if e.type == EventType.MESSAGE_CHUNK
+    )
+    assert text == answer
+    assert rest[-1].type == EventType.MESSAGE_END
+    assert streamed.already_sent(answer)
+    assert streamed.response.tool_calls[0].arguments == {"result": answer}
+
+
+async def test_valid_tool_starts_while_model_is_still_streaming():
+    started = asyncio.Event()
+    seen_before_end = []
+
+    async def execute(tc):
+        started.set()
+        return TimedResult(result=f"sunny in {tc.arguments['city']}", duration_ms=0)
+
+    class _Probe(_StreamingClient):
+        async def stream_completion(self, **kwargs):
+            async for chunk in super().stream_completion(**kwargs):
+                yield chunk
+            await asyncio.sleep(0)
+            seen_before_end.append(started.is_set())
+
+    loop = _Loop(_Probe(_tool_chunks('{"city": "Oslo"}', "It is sunny.")))
+    streamed = _StreamedTurn()
+    events = await _collect(loop, streamed, execute)
+
+    assert seen_before_end == [True]
+    assert (await streamed.tool_tasks["w1"]).result == "sunny in Oslo"
+    # complete_task came after another tool: the answer is left to the turn
+    assert not any(e.type == EventType.MESSAGE_CHUNK for e in events)
+    assert [tc.name for tc in streamed.response.tool_calls] == ["get_weather", "complete_task"]
+
+
+async def test_invalid_tool_call_is_not_started():
+    async def execute(tc):  # pragma: no cover - must not run
+        raise AssertionError("started an invalid call")
+
+    loop = _Loop(_StreamingClient(_tool_chunks('{"town": "Oslo"}', "done")))
+    streamed = _StreamedTurn()
+    await _collect(loop, streamed, execute)
+    assert streamed.tool_tasks == {}
+    assert streamed.response.tool_calls[0].arguments == {"town": "Oslo"}
+
+
+async def test_failure_before_first_chunk_is_retried():
+    answer = "Recovered."
+    chunks = [
+        StreamChunk(
+            tool_call_deltas=[
+                ToolCallDelta(
+                    0, id="c1", name="complete_task", arguments=json.dumps({"result": answer})
+                )
+            ]
+        )
+    ]
+    client = _StreamingClient(chunks, failures=2)
+    loop = _Loop(client)
+    streamed = _StreamedTurn()
+    events = await _collect(loop, streamed, None)
+
+    assert client.calls == 3
+    assert [e.type for e in events] == [
+        EventType.MESSAGE_START,
+        EventType.MESSAGE_CHUNK,
+        EventType.MESSAGE_END,
+    ]
+    assert streamed.answer == answer
+
+
+async def test_failure_mid_stream_closes_message_without_retry():
+    payload = json.dumps({"result": "A long answer that never finishes"})
+    chunks = [
+        StreamChunk(tool_call_deltas=[ToolCallDelta(0, id="c1", name="complete_task")]),
+        StreamChunk(tool_call_deltas=[ToolCallDelta(0, arguments=payload[:20])]),
+        RuntimeError("stream dropped"),
+    ]
+    client = _StreamingClient(chunks)
+    loop = _Loop(client)
+    streamed = _StreamedTurn()
+
+    events = []
+    with pytest.raises(RuntimeError, match="stream dropped"):
+        async for event in loop._stream_llm_turn(streamed, [], [WEATHER_SCHEMA], 1, None):
+            events.append(event)
+
+    assert client.calls == 1  # output was already visible: never retried
+    assert events[0].type == EventType.MESSAGE_START
+    assert events[-1].type == EventType.MESSAGE_END
+    assert streamed.answer is None
+    assert loop._get_circuit_breaker(client).failure_count == 1
+
+
+async def test_failure_mid_stream_cancels_started_tools():
+    release = asyncio.Event()
+    tasks = []
+
+    async def execute(tc):
+        tasks.append(asyncio.current_task())
+        await release.wait()
+
+    chunks = _tool_chunks('{"city": "Oslo"}', "x")[:-1] + [RuntimeError("stream dropped")]
+    loop = _Loop(_StreamingClient(chunks))
+    streamed = _StreamedTurn()
+    with pytest.raises(RuntimeError):
+        await _collect(loop, streamed, execute)
+
+    assert streamed.tool_tasks == {}
+    await asyncio.sleep(0)
+    assert len(tasks) == 1 and tasks[0].cancelled()
+
+
+async def test_failure_mid_stream_never_ran_side_effecting_tool():
+    # The orchestrator may re-run the whole loop on a fallback model after a
+    # stream error, so a write tool must not have run on the failed stream.
+    executed = []
+
+    async def execute(tc):
+        executed.append(tc.name)
+
+    chunks = _tool_chunks('{"city": "Oslo"}', "x")[:-1] + [RuntimeError("stream dropped")]
+    loop = _Loop(_StreamingClient(chunks))
+    streamed = _StreamedTurn()
+    with pytest.raises(RuntimeError):
+        await _collect(loop, streamed, execute, early_tools=())
+
+    await asyncio.sleep(0)
+    assert executed == [] and streamed.tool_tasks == {}
+
+
+def test_only_read_only_or_idempotent_tools_start_early():
+    def tool(name, **kwargs):
+        return AgentTool(name=name, description="", parameters={}, executor=None, **kwargs)
+
+    loop = _Loop(None)
+    tools = [
+        tool("get_weather"),
+        tool("send_email", risk_level="write"),
+        tool("upsert_note", risk_level="write", idempotent=True),
+        tool("read_secret", needs_approval=True),
+    ]
+    assert loop._early_start_tools(tools) == {"get_weather", "upsert_note"}
+    assert loop._early_start_tools(None) == set()
+
+
+async def test_text_reply_streams_content():
+    chunks = [StreamChunk(content=part) for part in ["Sorry, ", "please ", "retry."]]
+    loop = _Loop(_StreamingClient(chunks + [StreamChunk(is_final=True)]))
+    streamed = _StreamedTurn()
+    events = [event async for event in loop._stream_text_reply(streamed, [], 3)]
+
+    assert [e.type for e in events] == [EventType.MESSAGE_START] + [EventType.MESSAGE_CHUNK] * 3 + [
+        EventType.MESSAGE_END
+    ]
+    assert streamed.response.content == "Sorry, please retry."
+    assert streamed.already_sent("Sorry, please retry.")
@@ -0,0 +1,161 @@
+"""Tests for the rolling-summary cache used by ``_summarize_and_trim``."""
+
+import os
+import uuid
+
+import pytest
+
+from koa.llm.base import LLMResponse
+from koa.orchestrator.context_manager import ContextManager
+from koa.orchestrator.react_config import ReactLoopConfig
+from koa.orchestrator.react_loop import ReactLoopMixin
+from koa.orchestrator.summary_cache import SummaryCache, prefix_digests
+
+PG_DSN = os.environ.get("KOA_TEST_DATABASE_URL")
+
+
+class _SummarizerLLM:
+    def __init__(self):
+        self.requests = []
+
+    async def chat_completion(self, messages, **kwargs):
+        self.requests.append(messages)
+        return LLMResponse(content=f"summary #{len(self.requests)}")
+
+
+class _Loop(ReactLoopMixin):
+    def __init__(self, cache):
+        self.llm_client = _SummarizerLLM()
+        self._context_manager = ContextManager(
+            ReactLoopConfig(
+                context_token_limit=100, context_trim_threshold=0.5, max_history_messages=3
+            )
+        )
+        self._summary_cache = cache
+
+
+def _history(n):
+    return [{"role": "system", "content": "sys"}] + [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i} " + "x" * 40}
+        for i in range(n)
+    ]
+
+
+def test_prefix_digests_chain_and_ignore_cache_markers():
+    msgs = _history(4)[1:]
+    digests = prefix_digests(msgs)
+    assert digests[:2] == prefix_digests(msgs[:2])
+    assert len(set(digests)) == 4
+
+    marked = [dict(m) for m in msgs]
+    marked[0]["content"] = [{"type": "text", "text": msgs[0]["content"]}]
+    marked_again = [dict(m) for m in marked]
+    marked_again[0]["content"] = [
+        {"type": "text", "text": msgs[0]["content"], "cache_control": {"type": "ephemeral"}}
+    ]
+    assert prefix_digests(marked) == prefix_digests(marked_again)
+
+
+@pytest.mark.asyncio
+async def test_same_prefix_reuses_summary_without_llm_call():
+    loop = _Loop(SummaryCache())
+    first = await loop._summarize_and_trim(_history(10), session_id="s1")
+    second = await loop._summarize_and_trim(_history(10), session_id="s1")
+
+    assert len(loop.llm_client.requests) == 1
+    assert first == second
+    assert "summary #1" in second[1]["content"]
+
+
+@pytest.mark.asyncio
+async def test_grown_history_folds_only_new_messages():
+    loop = _Loop(SummaryCache())
+    await loop._summarize_and_trim(_history(10), session_id="s1")
+    result = await loop._summarize_and_trim(_history(12), session_id="s1")
+
+    system, excerpt = loop.llm_client.requests[1]
+    assert "[Existing summary]\nsummary #1" in system["content"]
+    assert "message 7" in excerpt["content"] and "message 8" in excerpt["content"]
+    assert "message 6" not in excerpt["content"]
+    assert "summary #2" in result[1]["content"]
+
+
+@pytest.mark.asyncio
+async def test_sessions_and_memory_bound_are_respected():
+    cache = SummaryCache(max_entries=1)
+    loop = _Loop(cache)
+    await loop._summarize_and_trim(_history(10), session_id="s1")
+    await loop._summarize_and_trim(_history(10), session_id="s2")
+    assert len(loop.llm_client.requests) == 2
+    assert len(cache) == 1
+
+    await loop._summarize_and_trim(_history(10), session_id="s1")
+    assert len(loop.llm_client.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_same_session_id_is_not_shared_between_tenants():
+    loop = _Loop(SummaryCache())
+    await loop._summarize_and_trim(_history(10), session_id="s1", tenant_id="a")
+    await loop._summarize_and_trim(_history(10), session_id="s1", tenant_id="b")
+    assert len(loop.llm_client.requests) == 2
+
+
+@pytest.mark.skipif(not PG_DSN, reason="KOA_TEST_DATABASE_URL not set")
+@pytest.mark.asyncio
+async def test_database_tier_survives_restart():
+    from koa.db import Database
+
+    db = Database(PG_DSN, min_size=1, max_size=2)
+    await db.initialize()
+    session = f"summary-{uuid.uuid4()}"
+    try:
+        await _Loop(SummaryCache(database=db))._summarize_and_trim(_history(10), session_id=session)
+
+        restarted = _Loop(SummaryCache(database=db))
+        result = await restarted._summarize_and_trim(_history(10), session_id=session)
+        assert restarted.llm_client.requests == []
+        assert "summary #1" in result[1]["content"]
+
+        cache = SummaryCache(database=db, keep_per_session=2)
+        for n in (12, 14, 16):
+            await _Loop(cache)._summarize_and_trim(_history(n), session_id=session)
+        rows = await db.fetchval(
+            "SELECT COUNT(*) FROM tenant_default.context_summaries WHERE session_id = $1",
+            session,
+        )
+        assert rows == 2
+    finally:
+        await db.execute(
+            "DELETE FROM tenant_default.context_summaries WHERE session_id = $1", session
+        )
+        await db.close()
+
+
+@pytest.mark.skipif(not PG_DSN, reason="KOA_TEST_DATABASE_URL not set")
+@pytest.mark.asyncio
+async def test_database_tier_is_scoped_per_tenant():
+    from koa.db import Database
+
+    db = Database(PG_DSN, min_size=1, max_size=2)
+    await db.initialize()
+    session = f"summary-{uuid.uuid4()}"
+    try:
+        cache = SummaryCache(database=db, keep_per_session=1)
+        await _Loop(cache)._summarize_and_trim(_history(10), session_id=session, tenant_id="a")
+        await _Loop(cache)._summarize_and_trim(_history(12), session_id=session, tenant_id="b")
+        rows = await db.fetch(
+            "SELECT tenant_id FROM tenant_default.context_summaries "
+            "WHERE session_id = $1 ORDER BY tenant_id",
+            session,
+        )
+        assert [r["tenant_id"] for r in rows] == ["a", "b"]
+
+        other = _Loop(SummaryCache(database=db))
+        await other._summarize_and_trim(_history(10), session_id=session, tenant_id="b")
+        assert len(other.llm_client.requests) == 1
+    finally:
+        await db.execute(
+            "DELETE FROM tenant_default.context_summaries WHERE session_id = $1", session
+        )
+        await db.close()
@@ -0,0 +1,129 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from koa.providers.email.gmail import GmailProvider
+from koa.providers.email.outlook import OutlookProvider
+
+
+def _credentials(provider: str) -> dict:
+    return {
+        "provider": provider,
+        "account_name": "primary",
+        "email": "me@example.com",
+        "access_token": "token",
+    }
+
+
+def _response(status_code: int, payload=None) -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = payload or {}
+    response.text = ""
+    return response
+
+
+def _metadata(msg_id: str) -> dict:
+    return {
+        "labelIds": ["UNREAD"],
+        "snippet": f"snippet {msg_id}",
+        "payload": {"headers": [{"name": "Subject", "value": f"subject {msg_id}"}]},
+    }
+
+
+class TestGmailSearchHydration:
+    @pytest.mark.asyncio
+    async def test_hydrates_concurrently_and_keeps_order(self):
+        provider = GmailProvider(_credentials("gmail"))
+        in_flight = 0
+        peak = 0
+
+        async def fake_request(method, url, **kwargs):
+            nonlocal in_flight, peak
+            if url.endswith("/users/me/messages"):
+                return _response(200, {"messages": [{"id": f"m{i}"} for i in range(6)]})
+            msg_id = url.rsplit("/", 1)[-1]
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # Finish in reverse order to prove ordering is preserved
+            await asyncio.sleep(0.01 * (6 - int(msg_id[1:])))
+            in_flight -= 1
+            return _response(200, _metadata(msg_id))
+
+        provider._oauth_request = fake_request
+        result = await provider.search_emails(query="x", max_results=6)
+
+        assert result["success"] is True
+        assert [e["message_id"] for e in result["data"]] == [f"m{i}" for i in range(6)]
+        assert peak > 1
+
+    @pytest.mark.asyncio
+    async def test_failed_item_is_skipped(self):
+        provider = GmailProvider(_credentials("gmail"))
+
+        async def fake_request(method, url, **kwargs):
+            if url.endswith("/users/me/messages"):
+                return _response(200, {"messages": [{"id": "a"}, {"id": "b"}, {"id": "c"}]})
+            if url.endswith("/b"):
+                raise RuntimeError("boom")
+            return _response(200, _metadata(url.rsplit("/", 1)[-1]))
+
+        provider._oauth_request = fake_request
+        result = await provider.search_emails(max_results=3)
+
+        assert result["success"] is True
+        assert [e["message_id"] for e in result["data"]] == ["a", "c"]
+
+
+class TestGmailBatchModify:
+    @pytest.mark.asyncio
+    async def test_archive_uses_single_batch_modify(self):
+        provider = GmailProvider(_credentials("gmail"))
+        provider._oauth_request = AsyncMock(return_value=_response(204))
+
+        result = await provider.archive_emails(["a", "b", "c"])
+
+        assert result == {"success": True, "archived_count": 3}
+        provider._oauth_request.assert_awaited_once()
+        args, kwargs = provider._oauth_request.call_args
+        assert args[1].endswith("/users/me/messages/batchModify")
+        assert kwargs["json"] == {"ids": ["a", "b", "c"], "removeLabelIds": ["INBOX"]}
+
+    @pytest.mark.asyncio
+    async def test_permanent_delete_uses_batch_delete(self):
+        provider = GmailProvider(_credentials("gmail"))
+        provider._oauth_request = AsyncMock(return_value=_response(204))
+
+        result = await provider.delete_emails(["a", "b"], permanent=True)
+
+        assert result == {"success": True, "deleted_count": 2}
+        args, kwargs = provider._oauth_request.call_args
+        assert args[1].endswith("/users/me/messages/batchDelete")
+        assert kwargs["json"] == {"ids": ["a", "b"]}
+
+
+class TestOutlookGraphBatch:
+    @pytest.mark.asyncio
+    async def test_mark_as_read_chunks_into_graph_batches(self):
+        provider = OutlookProvider(_credentials("outlook"))
+        posted = []
+
+        async def fake_post(url, json=None, **kwargs):
+            posted.append(json["requests"])
+            return _response(
+                200, {"responses": [{"id": r["id"], "status": 200} for r in json["requests"]]}
+            )
+
+        client = MagicMock()
+        client.post = fake_post
+        cm = AsyncMock()
+        cm.__aenter__.return_value = client
+
+        with patch("koa.providers.email.outlook.http_client", return_value=cm):
+            result = await provider.mark_as_read([f"m{i}" for i in range(25)])
+
+        assert result == {"success": True, "marked_count": 25}
+        assert [len(chunk) for chunk in posted] == [20, 5]
+        assert posted[0][0]["method"] == "PATCH"
+        assert posted[0][0]["body"] == {"isRead": True}
@@ -38,7 +38,7 @@ class TestLocalBackendClient:
         async_cm.__aenter__.return_value = async_client
 
         with patch(
-            "koa.providers.local_backend.httpx.AsyncClient",
+            "koa.providers.local_backend.http_client",
             return_value=async_cm,
         ):
             client = LocalBackendClient("https://koiai.example", "svc-key")
@@ -66,7 +66,7 @@ class TestLocalBackendClient:
         async_cm.__aenter__.return_value = async_client
 
         with patch(
-            "koa.providers.local_backend.httpx.AsyncClient",
+            "koa.providers.local_backend.http_client",
             return_value=async_cm,
         ):
             client = LocalBackendClient("https://koiai.example", "svc-key")
@@ -93,7 +93,7 @@ class TestLocalBackendClient:
         async_cm.__aenter__.return_value = async_client
 
         with patch(
-            "koa.providers.local_backend.httpx.AsyncClient",
+            "koa.providers.local_backend.http_client",
             return_value=async_cm,
         ):
             client = LocalBackendClient("https://koiai.example", "svc-key")
@@ -129,7 +129,7 @@ class TestLocalBackendClient:
         async_cm.__aenter__.return_value = async_client
 
         with patch(
-            "koa.providers.local_backend.httpx.AsyncClient",
+            "koa.providers.local_backend.http_client",
             return_value=async_cm,
         ):
             client = LocalBackendClient("https://koiai.example", "svc-key")
@@ -155,7 +155,7 @@ class TestLocalBackendClient:
         async_cm.__aenter__.return_value = async_client
 
         with patch(
-            "koa.providers.local_backend.httpx.AsyncClient",
+            "koa.providers.local_backend.http_client",
             return_value=async_cm,
         ):
             client = LocalBackendClient("https://koiai.example", "svc-key")
@@ -198,7 +198,7 @@ class TestLocalBackendClient:
         }
 
         with patch(
-            "koa.providers.local_backend.httpx.AsyncClient",
+            "koa.providers.local_backend.http_client",
             return_value=async_cm,
         ):
             client = LocalBackendClient("https://koiai.example", "svc-key")
@@ -223,7 +223,7 @@ class TestLocalBackendClient:
         async_cm.__aenter__.return_value = async_client
 
         with patch(
-            "koa.providers.local_backend.httpx.AsyncClient",
+            "koa.providers.local_backend.http_client",
             return_value=async_cm,
         ):
             client = LocalBackendClient("https://koiai.example", "svc-key")
@@ -250,7 +250,7 @@ class TestLocalBackendClient:
         payload = {"title": "Buy milk", "due_at": "2026-04-12T17:00:00Z"}
 
         with patch(
-            "koa.providers.local_backend.httpx.AsyncClient",
+            "koa.providers.local_backend.http_client",
             return_value=async_cm,
         ):
             client = LocalBackendClient("https://koiai.example", "svc-key")
@@ -281,7 +281,7 @@ class TestLocalBackendClient:
         }
 
         with patch(
-            "koa.providers.local_backend.httpx.AsyncClient",
+            "koa.providers.local_backend.http_client",
             return_value=async_cm,
         ):
             client = LocalBackendClient("https://koiai.example", "svc-key")
@@ -308,7 +308,7 @@ class TestLocalBackendClient:
         payload = {"title": "Weekly sync", "location": "Room B"}
 
         with patch(
-            "koa.providers.local_backend.httpx.AsyncClient",
+            "koa.providers.local_backend.http_client",
             return_value=async_cm,
         ):
             client = LocalBackendClient("https://koiai.example", "svc-key")
@@ -333,7 +333,7 @@ class TestLocalBackendClient:
         async_cm.__aenter__.return_value = async_client
 
         with patch(
-            "koa.providers.local_backend.httpx.AsyncClient",
+            "koa.providers.local_backend.http_client",
             return_value=async_cm,
         ):
             client = LocalBackendClient("https://koiai.example", "svc-key")
@@ -358,7 +358,7 @@ class TestLocalBackendClient:
         async_cm.__aenter__.return_value = async_client
 
         with patch(
-            "koa.providers.local_backend.httpx.AsyncClient",
+            "koa.providers.local_backend.http_client",
             return_value=async_cm,
         ):
             client = LocalBackendClient("https://koiai.example", "svc-key")
@@ -395,7 +395,7 @@ class TestLocalBackendClient:
         payload = {"is_completed": True}
 
         with patch(
-            "koa.providers.local_backend.httpx.AsyncClient",
+            "koa.providers.local_backend.http_client",
             return_value=async_cm,
         ):
             client = LocalBackendClient("https://koiai.example", "svc-key")
@@ -420,7 +420,7 @@ class TestLocalBackendClient:
         async_cm.__aenter__.return_value = async_client
 
         with patch(
-            "koa.providers.local_backend.httpx.AsyncClient",
+            "koa.providers.local_backend.http_client",
             return_value=async_cm,
         ):
             client = LocalBackendClient("https://koiai.example", "svc-key")
@@ -0,0 +1,77 @@
+"""Tests for the action history route (``GET /api/actions``)."""
+
+import os
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from koa.server.routes import chat
+
+PG_DSN = os.environ.get("KOA_TEST_DATABASE_URL")
+
+
+class _DB:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def fetchval(self, query, *args):
+        return len(self.rows)
+
+    async def fetch(self, query, *args):
+        return self.rows
+
+
+def _row(args_summary):
+    return {
+        "id": uuid.uuid4(),
+        "tool_name": "web_search",
+        "agent_name": None,
+        "summary": "web_search: koa",
+        "args_summary": args_summary,
+        "success": True,
+        "result_status": None,
+        "duration_ms": 12,
+        "created_at": datetime(2026, 1, 2, tzinfo=timezone.utc),
+    }
+
+
+@pytest.mark.asyncio
+async def test_args_summary_is_always_an_object(monkeypatch):
+    db = _DB([_row({"query": "koa"}), _row('{"query": "old"}'), _row("not json"), _row(None)])
+    monkeypatch.setattr(chat, "require_app", lambda: SimpleNamespace(database=db))
+
+    result = await chat.get_actions("t1", limit=10)
+
+    assert [a["args_summary"] for a in result["actions"]] == [
+        {"query": "koa"},
+        {"query": "old"},
+        {},
+        {},
+    ]
+    assert result["total"] == 4 and not result["has_more"]
+
+
+@pytest.mark.skipif(not PG_DSN, reason="KOA_TEST_DATABASE_URL not set")
+@pytest.mark.asyncio
+async def test_batched_history_round_trips_through_route(monkeypatch):
+    history = pytest.importorskip("koa.builtin_agents.tools.action_history")
+    from koa.db import Database
+
+    db = Database(PG_DSN, min_size=1, max_size=2)
+    await db.initialize()
+    monkeypatch.setattr(chat, "require_app", lambda: SimpleNamespace(database=db))
+    tenant = f"actions-{uuid.uuid4()}"
+    try:
+        rows = history.tool_call_history_rows(
+            tenant, [{"name": "web_search", "args_summary": {"query": "koa"}}]
+        )
+        await history.insert_tool_call_history_rows(db, rows)
+
+        (action,) = (await chat.get_actions(tenant))["actions"]
+        assert action["args_summary"] == {"query": "koa"}
+        assert action["summary"] == "web_search: koa"
+    finally:
+        await db.execute("DELETE FROM tool_call_history WHERE tenant_id = $1", tenant)
+        await db.close()
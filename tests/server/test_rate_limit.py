@@ -0,0 +1,99 @@
+"""Tests for koa.server.rate_limit and the shared sliding-window counter."""
+
+import time
+
+import pytest
+
+from koa.server import rate_limit
+from koa.server.rate_limit import RateLimiter
+from koa.tenant_gate.rate_limiter import SlidingWindowCounter
+
+
+class _Clock:
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = _Clock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", c)
+    return c
+
+
+class TestSlidingWindowCounter:
+    def test_events_expire_after_window(self):
+        counter = SlidingWindowCounter(10, buckets=10)
+        counter.add("k", 100.0)
+        counter.add("k", 105.0)
+        assert counter.count("k", 109.5) == 2
+        assert counter.count("k", 110.5) == 1
+        assert counter.count("k", 115.5) == 0
+
+    def test_retry_after_points_at_oldest_bucket(self):
+        counter = SlidingWindowCounter(60, buckets=60)
+        counter.add("k", 100.2)
+        counter.add("k", 130.0)
+        assert counter.retry_after("k", 140.0) == pytest.approx(20.0)
+
+    def test_idle_keys_are_evicted(self):
+        counter = SlidingWindowCounter(10, buckets=10)
+        for i in range(100):
+            counter.add(f"k{i}", 100.0)
+        counter.add("fresh", 111.0)
+        assert len(counter) == 1
+
+    def test_max_keys_caps_tracked_keys(self):
+        counter = SlidingWindowCounter(60, max_keys=3)
+        for i in range(5):
+            counter.add(f"k{i}", 100.0)
+        assert len(counter) == 3
+        assert counter.count("k0", 100.0) == 0
+
+
+class TestRateLimiter:
+    def test_per_minute_limit(self, clock):
+        limiter = RateLimiter(requests_per_minute=3, requests_per_hour=100)
+        assert [limiter.check("c")[0] for _ in range(4)] == [True, True, True, False]
+        allowed, info = limiter.check("c")
+        assert info["limit"] == "per_minute"
+        assert 0 < info["retry_after"] <= 60
+        clock.now += 61
+        assert limiter.check("c")[0]
+
+    def test_per_hour_limit(self, clock):
+        limiter = RateLimiter(requests_per_minute=100, requests_per_hour=2)
+        limiter.check("c")
+        limiter.check("c")
+        allowed, info = limiter.check("c")
+        assert not allowed
+        assert info["limit"] == "per_hour"
+
+    def test_remaining_counts(self, clock):
+        limiter = RateLimiter(requests_per_minute=5, requests_per_hour=10)
+        assert limiter.check("c") == (True, {"remaining_minute": 4, "remaining_hour": 9})
+
+    def test_benchmark_many_clients_stable_latency_and_bounded_state(self, clock):
+        """100k distinct clients at 10k rps: flat per-batch latency, bounded state."""
+        limiter = RateLimiter(requests_per_minute=30, requests_per_hour=300)
+        rps = 10_000
+        batch_times = []
+        # 100k distinct clients over 10s, then a long tail of new clients so
+        # the first cohort ages out of the hour window.
+        for second in range(10):
+            start = time.perf_counter()
+            for i in range(rps):
+                limiter.check(f"client-{second * rps + i}")
+                clock.now += 1.0 / rps
+            batch_times.append(time.perf_counter() - start)
+        assert len(limiter) == 100_000
+
+        clock.now += 3600
+        limiter.check("late-client")
+        assert len(limiter) == 1
+
+        # No batch should be dramatically slower than the first.
+        assert max(batch_times) < 5 * batch_times[0] + 0.05
@@ -0,0 +1,184 @@
+"""Tests for COPY-based bulk sensing ingestion and the NDJSON request body."""
+
+import gzip
+import json
+import os
+import uuid
+
+import pytest
+
+from koa.errors import KoaError
+from koa.server.routes import sensing
+
+PG_DSN = os.environ.get("KOA_TEST_DATABASE_URL")
+
+
+class _Request:
+    def __init__(self, body: bytes, chunk: int = 7, headers=None):
+        self.body = body
+        self.chunk = chunk
+        self.headers = headers or {}
+
+    async def stream(self):
+        for i in range(0, len(self.body), self.chunk):
+            yield self.body[i : i + self.chunk]
+
+
+async def _lines(request):
+    return [line async for line in sensing._ndjson_lines(request)]
+
+
+def _ndjson(records):
+    return b"\n".join(json.dumps(r).encode() for r in records)
+
+
+@pytest.mark.asyncio
+async def test_ndjson_lines_split_across_chunks():
+    body = b'{"a": 1}\n\n{"b": 2}\r\n{"c": 3}'
+    assert [json.loads(line) for line in await _lines(_Request(body))] == [
+        {"a": 1},
+        {"b": 2},
+        {"c": 3},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_lines_gzip():
+    body = gzip.compress(_ndjson([{"n": i} for i in range(100)]))
+    request = _Request(body, chunk=16, headers={"content-encoding": "gzip"})
+    assert [json.loads(line)["n"] for line in await _lines(request)] == list(range(100))
+
+    with pytest.raises(KoaError):
+        await _lines(_Request(b"not gzip", headers={"content-encoding": "gzip"}))
+
+    truncated = _Request(body[: len(body) // 2], headers={"content-encoding": "gzip"})
+    with pytest.raises(KoaError):
+        await _lines(truncated)
+
+
+@pytest.mark.asyncio
+async def test_ndjson_line_length_is_capped(monkeypatch):
+    monkeypatch.setattr(sensing, "MAX_NDJSON_LINE_BYTES", 16)
+    with pytest.raises(KoaError):
+        await _lines(_Request(b'{"a": "' + b"x" * 64 + b'"}\n'))
+
+
+def test_gzip_body_is_inflated_in_bounded_pieces(monkeypatch):
+    monkeypatch.setattr(sensing, "MAX_NDJSON_LINE_BYTES", 64)
+    inflate = sensing.zlib.decompressobj(16 + sensing.zlib.MAX_WBITS)
+    pieces = list(sensing._inflate(inflate, gzip.compress(b"\n" * 1000)))
+    assert max(len(p) for p in pieces) <= 64
+    assert b"".join(pieces) == b"\n" * 1000
+
+
+@pytest.mark.asyncio
+async def test_decompressed_body_size_is_capped(monkeypatch):
+    monkeypatch.setattr(sensing, "MAX_NDJSON_BODY_BYTES", 4096)
+    bomb = gzip.compress(b"\n" * (1 << 20))
+    assert len(bomb) < 4096
+    with pytest.raises(KoaError, match="too large"):
+        await _lines(_Request(bomb, chunk=len(bomb), headers={"content-encoding": "gzip"}))
+
+    body = _ndjson([{"n": i} for i in range(10)])
+    request = _Request(gzip.compress(body), headers={"content-encoding": "gzip"})
+    assert len(await _lines(request)) == 10
+
+
+def test_merge_sql_keeps_last_duplicate_and_refreshes_constants():
+    sql = sensing._CONTACTS.merge_sql
+    assert "SELECT DISTINCT ON (user_id, contact_hash)" in sql
+    assert "ORDER BY user_id, contact_hash, _ord DESC" in sql
+    assert "ON CONFLICT (user_id, contact_hash) DO UPDATE SET" in sql
+    assert "contact_hash = EXCLUDED" not in sql
+    assert sql.endswith("updated_at = NOW()")
+
+
+@pytest.mark.skipif(not PG_DSN, reason="KOA_TEST_DATABASE_URL not set")
+@pytest.mark.asyncio
+async def test_bulk_upsert_batches_and_merges(monkeypatch):
+    from koa.db import Database
+
+    monkeypatch.setattr(sensing, "BULK_BATCH_SIZE", 4)
+    db = Database(PG_DSN, min_size=1, max_size=2)
+    await db.initialize()
+    user = f"sensing-{uuid.uuid4()}"
+    try:
+        samples = [
+            sensing.HealthSample(
+                type="steps",
+                started_at=f"2026-01-01T00:0{i}:00Z",
+                value=float(i),
+                metadata={"stage": "core"},
+            )
+            for i in range(6)
+        ]
+        # A repeated key in the same batch: the later value wins.
+        samples.append(
+            sensing.HealthSample(type="steps", started_at="2026-01-01T00:05:00Z", value=50.0)
+        )
+        samples.append(sensing.HealthSample(type="steps", started_at="not a timestamp", value=1))
+        result = await sensing.write_rows(
+            db, sensing._HEALTH, (sensing._health_row(user, s) for s in samples)
+        )
+        assert result["written"] == 7
+        assert [b["rows"] for b in result["batches"]] == [4, 3]
+
+        rows = await db.fetch(
+            "SELECT value, metadata FROM tenant_default.health_samples "
+            "WHERE user_id = $1 ORDER BY started_at",
+            user,
+        )
+        assert [r["value"] for r in rows] == [0.0, 1.0, 2.0, 3.0, 4.0, 50.0]
+        assert rows[0]["metadata"] == {"stage": "core"}
+
+        # Re-sending is idempotent and updates in place.
+        await sensing.write_rows(db, sensing._HEALTH, [sensing._health_row(user, samples[0])])
+        count = await db.fetchval(
+            "SELECT COUNT(*) FROM tenant_default.health_samples WHERE user_id = $1", user
+        )
+        assert count == 6
+    finally:
+        await db.execute("DELETE FROM tenant_default.health_samples WHERE user_id = $1", user)
+        await db.close()
+
+
+@pytest.mark.skipif(not PG_DSN, reason="KOA_TEST_DATABASE_URL not set")
+@pytest.mark.asyncio
+async def test_ndjson_eventkit_endpoint(monkeypatch):
+    from types import SimpleNamespace
+
+    from koa.db import Database
+
+    db = Database(PG_DSN, min_size=1, max_size=2)
+    await db.initialize()
+    monkeypatch.setattr(sensing, "require_app", lambda: SimpleNamespace(database=db))
+    user = f"sensing-{uuid.uuid4()}"
+    body = gzip.compress(
+        _ndjson(
+            [
+                {"event_id": "e1", "title": "Standup", "attendees": [{"name": "Sam"}]},
+                {"kind": "reminder", "reminder_id": "r1", "title": "Pay rent"},
+                {"kind": "reminder", "title": "missing id"},
+            ]
+        )
+        + b"\n{not json\n"
+    )
+    try:
+        result = await sensing.ingest_ndjson(
+            "eventkit", user, _Request(body, headers={"content-encoding": "gzip"}), tz_name=None
+        )
+        assert result["written"] == 2
+        assert result["written_by_table"] == {"local_calendar_events": 1, "local_reminders": 1}
+        assert result["rejected"] == 2
+        assert [e.split(":")[0] for e in result["errors"]] == ["line 3", "line 4"]
+
+        row = await db.fetchrow(
+            "SELECT attendees, source FROM tenant_default.local_calendar_events "
+            "WHERE user_id = $1",
+            user,
+        )
+        assert row["attendees"] == [{"name": "Sam"}] and row["source"] == "eventkit"
+    finally:
+        for table in ("local_calendar_events", "local_reminders"):
+            await db.execute(f"DELETE FROM tenant_default.{table} WHERE user_id = $1", user)
+        await db.close()
@@ -0,0 +1,262 @@
+"""Tests for incremental, concurrent CalendarSyncService passes."""
+
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from koa.providers.calendar.google import GoogleCalendarProvider
+from koa.services import calendar_sync
+from koa.services.calendar_sync import CalendarSyncService
+
+PG_DSN = os.environ.get("KOA_TEST_DATABASE_URL")
+
+
+def _event(event_id, title="Meeting", days=1, ical_uid=None):
+    start = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=days)
+    return {
+        "event_id": event_id,
+        "summary": title,
+        "start": start,
+        "end": start + timedelta(hours=1),
+        "attendees": ["a@example.com"],
+        "ical_uid": ical_uid,
+    }
+
+
+class _Provider:
+    """Serves scripted pages; ``changes`` maps a sync token to its pages."""
+
+    calendar_id = "cal@example.com"
+
+    def __init__(self, full_pages, changes=None):
+        self.full_pages = full_pages
+        self.changes = changes or {}
+        self.calls = []
+
+    async def list_event_changes(self, sync_token=None, page_token=None, time_min=None, **kwargs):
+        self.calls.append((sync_token, page_token, time_min is not None))
+        if sync_token is not None and sync_token not in self.changes:
+            return {"success": False, "full_sync_required": True}
+        pages = self.changes[sync_token] if sync_token else self.full_pages
+        index = int(page_token or 0)
+        events, deleted, next_token = pages[index]
+        last = index + 1 == len(pages)
+        return {
+            "success": True,
+            "events": events,
+            "deleted": deleted,
+            "next_page_token": None if last else str(index + 1),
+            "next_sync_token": next_token if last else None,
+        }
+
+
+class _Store:
+    async def list(self, tenant_id, service=None):
+        if service != "google_calendar":
+            return []
+        return [{"account_name": "primary", "credentials": {"access_token": "t"}}]
+
+
+@pytest.mark.asyncio
+async def test_tenants_run_on_a_bounded_pool(monkeypatch):
+    service = CalendarSyncService(db=None, credential_store=None, max_concurrency=3)
+    in_flight = peak = 0
+
+    async def tenants():
+        return [f"t{i}" for i in range(10)]
+
+    async def sync_tenant(tenant_id):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if tenant_id == "t3":
+            raise RuntimeError("boom")
+        return {"accounts": 1, "events": 2}
+
+    monkeypatch.setattr(service, "_list_tenants_with_calendars", tenants)
+    monkeypatch.setattr(service, "sync_tenant", sync_tenant)
+    result = await service.sync_all_tenants()
+    assert peak == 3
+    assert result == {"tenants": 10, "accounts": 9, "events": 18}
+
+
+@pytest.mark.asyncio
+async def test_provider_pages_are_rate_limited():
+    service = CalendarSyncService(db=None, credential_store=None, rate_limits={"google": (2, 50.0)})
+    started = time.monotonic()
+    for _ in range(4):
+        await service._throttle("google")
+    assert time.monotonic() - started >= 0.03
+    await service._throttle("unknown-provider")
+
+
+def test_event_record_normalizes_timestamps():
+    naive = datetime(2026, 5, 1, 9, 0)
+    rec = calendar_sync._event_record(
+        "google", "primary", "cal", {"id": "e1", "start": naive, "end": naive, "ical_uid": "u"}
+    )
+    assert rec["event_id"] == "google:cal:e1"
+    assert rec["starts_at"] == "2026-05-01T09:00:00+00:00"
+    assert rec["metadata"]["ical_uid"] == "u"
+    assert calendar_sync._event_record("google", "primary", "cal", {"id": "e1"}) is None
+
+
+@pytest.mark.skipif(not PG_DSN, reason="KOA_TEST_DATABASE_URL not set")
+@pytest.mark.asyncio
+async def test_incremental_sync_and_full_resync(monkeypatch):
+    from koa.db import Database
+
+    db = Database(PG_DSN, min_size=1, max_size=2)
+    await db.initialize()
+    user = f"calsync-{uuid.uuid4()}"
+    provider = _Provider(
+        full_pages=[
+            ([_event("a", ical_uid="series"), _event("b", ical_uid="series", days=8)], [], None),
+            ([_event("c", days=2)], [], "token-1"),
+        ],
+        changes={"token-1": [([_event("b", title="Moved", days=9)], ["a"], "token-2")]},
+    )
+    monkeypatch.setattr(
+        calendar_sync.CalendarProviderFactory,
+        "create_provider",
+        classmethod(lambda cls, creds, on_token_refreshed=None: provider),
+    )
+    service = CalendarSyncService(db, _Store(), rate_limits={})
+
+    async def events():
+        rows = await db.fetch(
+            "SELECT event_id, title, metadata FROM tenant_default.local_calendar_events "
+            "WHERE user_id = $1 ORDER BY event_id",
+            user,
+        )
+        return {r["event_id"].rsplit(":", 1)[-1]: r for r in rows}
+
+    try:
+        # An iOS copy of the same series is replaced by the Google rows.
+        await db.execute(
+            "INSERT INTO tenant_default.local_calendar_events "
+            "(user_id, event_id, title, starts_at, ends_at, metadata, source) "
+            "VALUES ($1, 'ios-1', 'copy', NOW(), NOW(), $2, 'eventkit')",
+            user,
+            {"ical_uid": "series"},
+        )
+
+        assert (await service.sync_tenant(user))["events"] == 3
+        rows = await events()
+        assert sorted(rows) == ["a", "b", "c"]
+        assert rows["a"]["metadata"]["ical_uid"] == "series"
+        assert provider.calls == [(None, None, True), (None, "1", True)]
+
+        provider.calls.clear()
+        await service.sync_tenant(user)
+        rows = await events()
+        assert sorted(rows) == ["b", "c"] and rows["b"]["title"] == "Moved"
+        assert provider.calls == [("token-1", None, False)]
+
+        # token-2 is unknown to the provider: full resync, pruning "b".
+        provider.full_pages = [([_event("c", days=2)], [], "token-3")]
+        provider.changes = {}
+        provider.calls.clear()
+        await service.sync_tenant(user)
+        assert sorted(await events()) == ["c"]
+        assert provider.calls == [("token-2", None, False), (None, None, True)]
+        token = await db.fetchval(
+            "SELECT sync_token FROM tenant_default.calendar_sync_state WHERE user_id = $1", user
+        )
+        assert token == "token-3"
+    finally:
+        for table in ("local_calendar_events", "calendar_sync_state"):
+            await db.execute(f"DELETE FROM tenant_default.{table} WHERE user_id = $1", user)
+        await db.close()
+
+
+@pytest.mark.skipif(not PG_DSN, reason="KOA_TEST_DATABASE_URL not set")
+@pytest.mark.asyncio
+async def test_full_resync_only_prunes_its_own_account(monkeypatch):
+    from koa.db import Database
+
+    db = Database(PG_DSN, min_size=1, max_size=2)
+    await db.initialize()
+    user = f"calsync-{uuid.uuid4()}"
+    # Both accounts mirror their own "primary" calendar.
+    providers = {
+        "work": _Provider(full_pages=[([_event("w1")], [], "work-1")]),
+        "home": _Provider(full_pages=[([_event("h1")], [], "home-1")]),
+    }
+    for p in providers.values():
+        p.calendar_id = "primary"
+
+    class _TwoAccounts:
+        async def list(self, tenant_id, service=None):
+            if service != "google_calendar":
+                return []
+            return [
+                {"account_name": name, "credentials": {"access_token": "t"}} for name in providers
+            ]
+
+    monkeypatch.setattr(
+        calendar_sync.CalendarProviderFactory,
+        "create_provider",
+        classmethod(lambda cls, creds, on_token_refreshed=None: providers[creds["account_name"]]),
+    )
+    service = CalendarSyncService(db, _TwoAccounts(), rate_limits={})
+
+    try:
+        await service.sync_tenant(user)
+        # "work" loses its token and does a full listing; "home" stays incremental.
+        providers["work"].full_pages = [([_event("w2")], [], "work-2")]
+        providers["home"].changes = {"home-1": [([], [], "home-2")]}
+        await service.sync_tenant(user)
+
+        rows = await db.fetch(
+            "SELECT event_id FROM tenant_default.local_calendar_events WHERE user_id = $1",
+            user,
+        )
+        assert sorted(r["event_id"] for r in rows) == ["google:primary:h1", "google:primary:w2"]
+    finally:
+        for table in ("local_calendar_events", "calendar_sync_state"):
+            await db.execute(f"DELETE FROM tenant_default.{table} WHERE user_id = $1", user)
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_google_change_pages():
+    provider = GoogleCalendarProvider({"provider": "google", "access_token": "t"})
+    requests = []
+
+    async def fake_request(method, url, params=None, **kwargs):
+        requests.append(params)
+        response = MagicMock()
+        response.status_code = 410 if params.get("syncToken") == "stale" else 200
+        response.json.return_value = {
+            "items": [
+                {"id": "e1", "iCalUID": "u1", "start": {"dateTime": "2026-05-01T09:00:00Z"}},
+                {"id": "e2", "status": "cancelled"},
+            ],
+            "nextSyncToken": "next",
+        }
+        return response
+
+    provider._oauth_request = fake_request
+    page = await provider.list_event_changes(
+        time_min=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        time_max=datetime(2026, 3, 1, tzinfo=timezone.utc),
+    )
+    assert [e["event_id"] for e in page["events"]] == ["e1"]
+    assert page["events"][0]["ical_uid"] == "u1"
+    assert page["deleted"] == ["e2"] and page["next_sync_token"] == "next"
+    assert "timeMin" in requests[0] and "timeMax" in requests[0]
+    assert "syncToken" not in requests[0]
+
+    page = await provider.list_event_changes(
+        sync_token="stale", time_min=datetime.now(), time_max=datetime.now()
+    )
+    assert page["full_sync_required"] and "timeMin" not in requests[1]
+    assert "timeMax" not in requests[1]
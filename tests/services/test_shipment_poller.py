@@ -0,0 +1,188 @@
+"""Tests for the batched, status-aware ShipmentPoller."""
+
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from koa.providers.shipment import tracking
+from koa.providers.shipment.tracking import TrackingProvider
+from koa.services.shipment_poller import ShipmentPoller
+
+PG_DSN = os.environ.get("KOA_TEST_DATABASE_URL")
+
+
+def _accepted(number, status="InTransit"):
+    return {
+        "number": number,
+        "carrier": 100003,
+        "track_info": {
+            "latest_status": {"status": status},
+            "latest_event": {"description": f"{status} scan"},
+            "tracking": {"providers": [{"provider": {"name": "FedEx"}, "events": []}]},
+        },
+    }
+
+
+def _rejected(number, code):
+    return {"number": number, "error": {"code": code, "message": "nope"}}
+
+
+class _Api:
+    """Stands in for ``TrackingProvider._post_batch``; records every request."""
+
+    def __init__(self, statuses=None, unregistered=(), invalid=()):
+        self.statuses = statuses or {}
+        self.unregistered = set(unregistered)
+        self.invalid = set(invalid)
+        self.calls = []
+
+    async def __call__(self, endpoint, numbers, carrier_code=None):
+        self.calls.append((endpoint, carrier_code, list(numbers)))
+        if endpoint == "register":
+            return {"code": 0, "data": {"accepted": [{"number": n} for n in numbers]}}
+        accepted, rejected = [], []
+        for n in numbers:
+            if n in self.unregistered:
+                rejected.append(_rejected(n, tracking.NOT_REGISTERED))
+            elif n in self.invalid:
+                rejected.append(_rejected(n, -18019901))
+            else:
+                accepted.append(_accepted(n, self.statuses.get(n, "InTransit")))
+        return {"code": 0, "data": {"accepted": accepted, "rejected": rejected}}
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    monkeypatch.setenv("TRACK17_API_KEY", "test-key")
+    return TrackingProvider()
+
+
+@pytest.mark.asyncio
+async def test_track_many_batches_by_carrier(provider, monkeypatch):
+    api = _Api(unregistered={"FX2"}, invalid={"UPS1"})
+    monkeypatch.setattr(provider, "_post_batch", api)
+    fedex = [(f"fx{i}", "fedex") for i in range(45)]
+
+    results = await provider.track_many(fedex + [("ups1", "UPS"), ("ups2", "ups")], concurrency=2)
+
+    info = sorted((c, len(n)) for e, c, n in api.calls if e == "gettrackinfo")
+    assert info == [(100002, 2), (100003, 5), (100003, 40)]
+    assert [(e, n) for e, _, n in api.calls if e == "register"] == [("register", ["FX2"])]
+    assert len(results) == 47
+    assert results[("fedex", "FX0")]["success"]
+    assert results[("fedex", "FX0")]["status"] == "in_transit"
+    assert results[("fedex", "FX2")]["just_added"] and not results[("fedex", "FX2")]["success"]
+    assert results[("UPS", "UPS1")]["error_code"] == -18019901
+
+
+@pytest.mark.asyncio
+async def test_track_many_fails_only_the_broken_chunk(provider, monkeypatch):
+    api = _Api()
+
+    async def flaky(endpoint, numbers, carrier_code=None):
+        if carrier_code == 100002:
+            raise ConnectionError("down")
+        return await api(endpoint, numbers, carrier_code)
+
+    monkeypatch.setattr(provider, "_post_batch", flaky)
+    results = await provider.track_many([("a1", "fedex"), ("b1", "ups")])
+    assert results[("fedex", "A1")]["success"]
+    assert not results[("ups", "B1")]["success"] and results[("ups", "B1")]["error"]
+
+
+@pytest.mark.asyncio
+async def test_track_many_keeps_same_number_apart_per_carrier(provider, monkeypatch):
+    api = _Api()
+
+    async def by_carrier(endpoint, numbers, carrier_code=None):
+        api.statuses = {"SAME1": "Delivered" if carrier_code == 100002 else "InTransit"}
+        return await api(endpoint, numbers, carrier_code)
+
+    monkeypatch.setattr(provider, "_post_batch", by_carrier)
+    results = await provider.track_many([("same1", "fedex"), ("SAME1", "ups")], concurrency=1)
+
+    assert results[("fedex", "SAME1")]["status"] == "in_transit"
+    assert results[("ups", "SAME1")]["status"] == "delivered"
+
+
+def test_due_shipments_follow_status_and_waking_hours(monkeypatch):
+    monkeypatch.setattr(ShipmentPoller, "_is_waking_hours", staticmethod(lambda tz: tz != "Night"))
+    now = datetime.now(timezone.utc)
+
+    def row(tn, status, age_min, tz="UTC"):
+        return {
+            "tenant_id": "t",
+            "tracking_number": tn,
+            "status": status,
+            "updated_at": now - timedelta(minutes=age_min),
+            "tz": tz,
+        }
+
+    poller = ShipmentPoller(db=None)
+    due = poller._due_shipments(
+        [
+            row("ofd", "out_for_delivery", 30),
+            row("transit-fresh", "in_transit", 30),
+            row("transit-stale", "in_transit", 150),
+            row("label", "info_received", 150),
+            row("asleep", "out_for_delivery", 300, tz="Night"),
+        ]
+    )
+    assert [s["tracking_number"] for s in due] == ["ofd", "transit-stale"]
+
+    # Numbers polled this cycle wait out their interval even if the poll failed.
+    assert poller._due_shipments([row("ofd", "out_for_delivery", 30)]) == []
+
+
+@pytest.mark.skipif(not PG_DSN, reason="KOA_TEST_DATABASE_URL not set")
+@pytest.mark.asyncio
+async def test_poll_cycle_updates_and_notifies_in_batches(monkeypatch):
+    from koa.db import Database
+
+    db = Database(PG_DSN, min_size=1, max_size=2)
+    await db.initialize()
+    monkeypatch.setenv("TRACK17_API_KEY", "test-key")
+    monkeypatch.setattr(ShipmentPoller, "_is_waking_hours", staticmethod(lambda tz: True))
+    api = _Api(statuses={"PKGA": "Delivered"}, unregistered={"PKGC"})
+    monkeypatch.setattr(TrackingProvider, "_post_batch", lambda self, *a: api(*a))
+
+    class _Notify:
+        sent = []
+
+        async def send(self, tenant_id, message, meta):
+            self.sent.append((tenant_id, message))
+
+    tenants = [f"ship-{uuid.uuid4()}" for _ in range(2)]
+    numbers = {tenants[0]: ["PKGA", "PKGB"], tenants[1]: ["PKGC"]}
+    try:
+        for tenant_id, tns in numbers.items():
+            for tn in tns:
+                await db.execute(
+                    "INSERT INTO shipments (tenant_id, tracking_number, carrier, status, "
+                    "updated_at) VALUES ($1, $2, 'fedex', 'in_transit', $3)",
+                    tenant_id,
+                    tn,
+                    datetime.now(timezone.utc) - timedelta(hours=3),
+                )
+
+        notify = _Notify()
+        await ShipmentPoller(db, notify)._poll_all_users()
+
+        assert [e for e, _, _ in api.calls] == ["gettrackinfo", "register"]
+        rows = {
+            r["tracking_number"]: r
+            for r in await db.fetch(
+                "SELECT * FROM shipments WHERE tenant_id = ANY($1::text[])", tenants
+            )
+        }
+        assert rows["PKGA"]["status"] == "delivered" and not rows["PKGA"]["is_active"]
+        assert rows["PKGB"]["status"] == "in_transit" and rows["PKGB"]["is_active"]
+        assert rows["PKGC"]["status"] == "in_transit"
+        assert notify.sent == [
+            (tenants[0], "Package update:\nPKGA: In Transit -> Delivered (Delivered scan)")
+        ]
+    finally:
+        await db.execute("DELETE FROM shipments WHERE tenant_id = ANY($1::text[])", tenants)
+        await db.close()
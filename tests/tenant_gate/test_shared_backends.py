@@ -0,0 +1,309 @@
+"""Shared tenant-gate backends — state holds across workers."""
+
+import os
+import time
+import uuid
+
+import pytest
+
+from koa.tenant_gate import (
+    GateRejected,
+    LeasedTokenBucketLimiter,
+    PostgresGateBackend,
+    PostgresIdempotencyStore,
+    RedisGateBackend,
+    RedisIdempotencyStore,
+    SharedBudgetTracker,
+    TenantGate,
+    TenantGateConfig,
+    TokenCost,
+)
+from koa.tenant_gate.budget import BudgetLimits
+
+PG_DSN = os.environ.get("KOA_TEST_DATABASE_URL")
+
+
+class _RedisStandIn:
+    """In-process stand-in for the Redis commands the gate uses."""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+        self.round_trips = 0
+
+    def _live(self, key):
+        exp = self.expiry.get(key)
+        if exp is not None and exp <= time.monotonic():
+            self.data.pop(key, None)
+            self.expiry.pop(key, None)
+        return key in self.data
+
+    # Commands
+    def _incrbyfloat(self, key, amount):
+        value = float(self.data.get(key, 0)) + amount if self._live(key) else amount
+        self.data[key] = value
+        return value
+
+    def _incr(self, key, amount=1):
+        value = int(self.data.get(key, 0)) + amount if self._live(key) else amount
+        self.data[key] = value
+        return value
+
+    def _expire(self, key, seconds):
+        if self._live(key):
+            self.expiry[key] = time.monotonic() + seconds
+        return True
+
+    def _hincr(self, key, field, amount, cast):
+        self._live(key)
+        h = self.data.setdefault(key, {})
+        h[field] = cast(h.get(field, 0)) + amount
+        return h[field]
+
+    async def incr(self, key):
+        self.round_trips += 1
+        return self._incr(key)
+
+    async def decr(self, key):
+        self.round_trips += 1
+        return self._incr(key, -1)
+
+    async def get(self, key):
+        self.round_trips += 1
+        return self.data.get(key) if self._live(key) else None
+
+    async def set(self, key, value, nx=False, xx=False, px=None, keepttl=False):
+        self.round_trips += 1
+        exists = self._live(key)
+        if (nx and exists) or (xx and not exists):
+            return None
+        self.data[key] = value
+        if px is not None:
+            self.expiry[key] = time.monotonic() + px / 1000
+        elif not keepttl:
+            self.expiry.pop(key, None)
+        return True
+
+    async def delete(self, key):
+        self.round_trips += 1
+        self.expiry.pop(key, None)
+        return 1 if self.data.pop(key, None) is not None else 0
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+
+class _Pipeline:
+    def __init__(self, server):
+        self._server = server
+        self._ops = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def incr(self, key):
+        self._ops.append(lambda s: s._incr(key))
+
+    def incrbyfloat(self, key, amount):
+        self._ops.append(lambda s: s._incrbyfloat(key, amount))
+
+    def hincrby(self, key, field, amount):
+        self._ops.append(lambda s: s._hincr(key, field, amount, int))
+
+    def hincrbyfloat(self, key, field, amount):
+        self._ops.append(lambda s: s._hincr(key, field, amount, float))
+
+    def expire(self, key, seconds):
+        self._ops.append(lambda s: s._expire(key, seconds))
+
+    async def execute(self):
+        self._server.round_trips += 1
+        return [op(self._server) for op in self._ops]
+
+
+@pytest.mark.asyncio
+async def test_leased_limiter_enforces_limit_across_workers():
+    server = _RedisStandIn()
+    workers = [
+        LeasedTokenBucketLimiter(
+            RedisGateBackend(server), capacity=10, refill_per_second=0.001, lease_size=3
+        )
+        for _ in range(2)
+    ]
+    admitted = 0
+    for i in range(30):
+        ok, retry = await workers[i % 2].acquire("t")
+        admitted += ok
+        if not ok:
+            assert retry > 0
+    assert admitted == 10
+
+
+@pytest.mark.asyncio
+async def test_leased_limiter_amortizes_round_trips():
+    server = _RedisStandIn()
+    limiter = LeasedTokenBucketLimiter(
+        RedisGateBackend(server), capacity=100, refill_per_second=100.0, lease_size=10
+    )
+    for _ in range(50):
+        assert (await limiter.acquire("t"))[0]
+    assert server.round_trips == 5
+
+
+@pytest.mark.asyncio
+async def test_shared_budget_visible_to_other_workers():
+    server = _RedisStandIn()
+    limits = BudgetLimits(tokens_per_window=100, window_seconds=3600)
+    a = SharedBudgetTracker(RedisGateBackend(server), limits, sync_interval=0.0)
+    b = SharedBudgetTracker(RedisGateBackend(server), limits, sync_interval=0.0)
+
+    assert (await b.check("t")) == (True, "")
+    await a.record("t", TokenCost(prompt_tokens=60, completion_tokens=40, cost_usd=0.5))
+    assert (await b.check("t")) == (False, "token_budget_exceeded")
+    snap = await b.snapshot("t")
+    assert snap["tokens"] == 100
+    assert snap["cost_usd"] == pytest.approx(0.5)
+
+
+@pytest.mark.asyncio
+async def test_shared_budget_buffers_until_flush():
+    server = _RedisStandIn()
+    limits = BudgetLimits(tokens_per_window=1000, window_seconds=3600)
+    tracker = SharedBudgetTracker(RedisGateBackend(server), limits, sync_interval=60.0)
+
+    await tracker.check("t")
+    trips = server.round_trips
+    for _ in range(10):
+        await tracker.record("t", TokenCost(prompt_tokens=10))
+    assert server.round_trips == trips
+    await tracker.flush()
+    assert (await RedisGateBackend(server).add_usage("t", 0, 0.0, 3600))[0] == 100
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_shared_between_gates():
+    server = _RedisStandIn()
+    config = TenantGateConfig(max_concurrent_per_tenant=1, strict=True)
+    gate_a = TenantGate(config, backend=RedisGateBackend(server))
+    gate_b = TenantGate(config, backend=RedisGateBackend(server))
+
+    async with gate_a.acquire("t"):
+        with pytest.raises(GateRejected) as exc:
+            async with gate_b.acquire("t"):
+                pass
+        assert exc.value.reason == "too_many_in_flight"
+    async with gate_b.acquire("t"):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_gate_uses_shared_limiter_for_shared_backend():
+    gate = TenantGate(
+        TenantGateConfig(rpm=60, tokens_per_window=10, strict=False),
+        backend=RedisGateBackend(_RedisStandIn()),
+    )
+    assert isinstance(gate._rate, LeasedTokenBucketLimiter)
+    assert isinstance(gate._budget, SharedBudgetTracker)
+
+
+@pytest.mark.asyncio
+async def test_redis_idempotency_roundtrip():
+    store = RedisIdempotencyStore(_RedisStandIn())
+
+    is_new, existing = await store.begin("k", 60)
+    assert is_new and existing is None
+    is_new, existing = await store.begin("k", 60)
+    assert not is_new and existing.status == "in_flight"
+
+    await store.complete("k", {"sent": True})
+    rec = await store.get("k")
+    assert rec.status == "completed"
+    assert rec.result == {"sent": True}
+
+    await store.fail("k")
+    assert (await store.begin("k", 60))[0]
+
+
+@pytest.mark.asyncio
+async def test_leased_limiter_admits_steady_traffic_under_the_limit(monkeypatch):
+    clock = [1_000_000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    server = _RedisStandIn()
+    # 120 rpm; the tenant sends 60 rpm, alternating between two workers.
+    workers = [
+        LeasedTokenBucketLimiter(RedisGateBackend(server), capacity=120, refill_per_second=2.0)
+        for _ in range(2)
+    ]
+    for i in range(300):
+        ok, _ = await workers[i % 2].acquire("t")
+        assert ok, f"request {i} rejected"
+        clock[0] += 1.0
+
+
+@pytest.mark.asyncio
+async def test_idle_lease_is_returned_to_the_shared_bucket(monkeypatch):
+    clock = [1_000_000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    server = _RedisStandIn()
+    a, b = (
+        LeasedTokenBucketLimiter(
+            RedisGateBackend(server), capacity=10, refill_per_second=0.001, lease_size=5
+        )
+        for _ in range(2)
+    )
+    assert (await a.acquire("t"))[0]  # leases 5, spends 1
+    clock[0] += 2.0
+    assert (await a.acquire("other"))[0]  # hands back t's 4 unspent tokens
+    admitted = 0
+    for _ in range(12):
+        admitted += (await b.acquire("t"))[0]
+    assert admitted == 9
+
+
+@pytest.mark.skipif(not PG_DSN, reason="KOA_TEST_DATABASE_URL not set")
+@pytest.mark.asyncio
+async def test_postgres_backend_against_migrated_schema():
+    from koa.db import Database
+
+    db = Database(PG_DSN, min_size=1, max_size=2)
+    await db.initialize()
+    tenant = f"gate-{uuid.uuid4()}"
+    key = f"idem-{uuid.uuid4()}"
+    try:
+        a, b = PostgresGateBackend(db), PostgresGateBackend(db)
+        assert await a.incr_inflight(tenant) == 1
+        assert await b.incr_inflight(tenant) == 2
+        assert await a.decr_inflight(tenant) == 1
+        assert await b.get_inflight(tenant) == 1
+        await b.decr_inflight(tenant)
+
+        lease = dict(capacity=5, refill_per_second=0.001)
+        assert await a.lease_tokens(tenant, 4, **lease) == 4
+        assert await b.lease_tokens(tenant, 4, **lease) == pytest.approx(1, abs=0.01)
+        await a.return_tokens(tenant, 3, **lease)
+        assert await b.lease_tokens(tenant, 4, **lease) == pytest.approx(3, abs=0.01)
+
+        await a.add_usage(tenant, 60, 0.25, 3600)
+        tokens, cost, remaining = await b.add_usage(tenant, 40, 0.25, 3600)
+        assert tokens == 100
+        assert cost == pytest.approx(0.5)
+        assert 0 < remaining <= 3600
+
+        store = PostgresIdempotencyStore(db)
+        assert await store.begin(key, 60) == (True, None)
+        is_new, existing = await store.begin(key, 60)
+        assert not is_new and existing.status == "in_flight"
+        await store.complete(key, {"sent": True})
+        assert (await store.get(key)).result == {"sent": True}
+        await store.fail(key)
+        assert (await store.begin(key, 60))[0]
+    finally:
+        for table in ("tenant_gate_inflight", "tenant_gate_buckets", "tenant_gate_usage"):
+            await db.execute(f"DELETE FROM tenant_default.{table} WHERE tenant_id = $1", tenant)
+        await db.execute("DELETE FROM tenant_default.tenant_gate_idempotency WHERE key = $1", key)
+        await db.close()
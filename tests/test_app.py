@@ -1,6 +1,7 @@
 """Tests for koa.app — config loading and env var mapping"""
 
 import os
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -118,3 +119,33 @@ class TestCredentialsLoading:
 
         assert os.environ.get("COMPOSIO_API_KEY") == "from-env"
         monkeypatch.delenv("COMPOSIO_API_KEY", raising=False)
+
+
+# =========================================================================
+# shutdown
+# =========================================================================
+
+
+class TestShutdown:
+    @pytest.mark.asyncio
+    async def test_http_pool_closed_when_earlier_step_fails(self, monkeypatch):
+        close_pool = AsyncMock()
+        monkeypatch.setattr("koa.app.close_http_pool", close_pool)
+
+        app = Koa.__new__(Koa)
+        app._initialized = True
+        app._shipment_poller = MagicMock(stop=AsyncMock(side_effect=RuntimeError("boom")))
+        for name in (
+            "_calendar_sync",
+            "_cron_service",
+            "_email_handler",
+            "_mcp_manager",
+            "_orchestrator",
+            "_database",
+        ):
+            setattr(app, name, None)
+
+        await app.shutdown()
+
+        close_pool.assert_awaited_once()
+        assert app._initialized is False
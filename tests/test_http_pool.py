@@ -0,0 +1,185 @@
+"""Tests for koa.http_pool — shared pooled HTTP clients"""
+
+import asyncio
+
+import pytest
+
+from koa.http_pool import HTTPClientPool
+
+
+class _KeepAliveServer:
+    """Minimal HTTP/1.1 server that counts accepted TCP connections."""
+
+    def __init__(self):
+        self.connections = 0
+        self._server = None
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request = await reader.readuntil(b"\r\n\r\n")
+                if not request:
+                    break
+                body = b"ok"
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: keep-alive\r\n\r\n" + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/"
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+
+
+@pytest.mark.asyncio
+async def test_borrowed_client_reuses_connection():
+    pool = HTTPClientPool()
+    async with _KeepAliveServer() as server:
+        for _ in range(5):
+            async with pool.client(timeout=5.0) as client:
+                resp = await client.get(server.url)
+                assert resp.text == "ok"
+        await pool.aclose()
+
+    assert server.connections == 1
+    stats = pool.stats()
+    assert stats == {}  # reset after aclose
+
+
+@pytest.mark.asyncio
+async def test_stats_report_reuse_per_host():
+    pool = HTTPClientPool()
+    async with _KeepAliveServer() as server:
+        async with pool.client() as client:
+            await client.get(server.url)
+        async with pool.client(timeout=10.0, headers={"User-Agent": "test"}) as client:
+            await client.get(server.url)
+            await client.get(server.url)
+
+        stats = pool.stats()["127.0.0.1"]
+        await pool.aclose()
+
+    assert stats == {"requests": 3, "new_connections": 1, "reused_connections": 2}
+
+
+@pytest.mark.asyncio
+async def test_same_profile_returns_same_client():
+    pool = HTTPClientPool()
+    a = pool.get_client(timeout=10.0, follow_redirects=True)
+    b = pool.get_client(timeout=10.0, follow_redirects=True)
+    c = pool.get_client(timeout=10.0)
+    assert a is b
+    assert a is not c
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_survives_block_exit():
+    pool = HTTPClientPool()
+    async with pool.client() as client:
+        pass
+    assert not client.is_closed
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_idle_hosts_evicted_beyond_limit():
+    pool = HTTPClientPool(max_hosts=1)
+    async with _KeepAliveServer() as server:
+        localhost_url = server.url.replace("127.0.0.1", "localhost")
+        async with pool.client() as client:
+            await client.get(server.url)
+            await client.get(localhost_url)
+        assert list(pool.stats()) == ["localhost"]
+        await pool.aclose()
+
+
+class _CookieServer(_KeepAliveServer):
+    """Sets a cookie on every response and echoes the request's Cookie header."""
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request = await reader.readuntil(b"\r\n\r\n")
+                cookie = b""
+                for line in request.split(b"\r\n"):
+                    if line.lower().startswith(b"cookie:"):
+                        cookie = line.split(b":", 1)[1].strip()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nSet-Cookie: session=tenantA; Path=/\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (len(cookie), cookie)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.mark.asyncio
+async def test_pooled_clients_do_not_share_cookies():
+    pool = HTTPClientPool()
+    async with _CookieServer() as server:
+        async with pool.client() as client:
+            first = await client.get(server.url)
+            second = await client.get(server.url)
+            explicit = await client.get(server.url, headers={"Cookie": "k=v"})
+        await pool.aclose()
+
+    assert first.cookies["session"] == "tenantA"
+    assert second.text == ""
+    assert explicit.text == "k=v"
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_counts_in_flight_until_closed():
+    pool = HTTPClientPool()
+    async with _KeepAliveServer() as server:
+        client = pool.get_client()
+        async with client.stream("GET", server.url) as resp:
+            assert pool._transport.in_flight("127.0.0.1") == 1
+            await resp.aread()
+        assert pool._transport.in_flight("127.0.0.1") == 0
+
+        await client.get(server.url)
+        assert pool._transport.in_flight("127.0.0.1") == 0
+        await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_event_loop_change_closes_old_connections():
+    pool = HTTPClientPool()
+    disconnected = asyncio.Event()
+
+    class _Server(_KeepAliveServer):
+        async def _handle(self, reader, writer):
+            await super()._handle(reader, writer)
+            disconnected.set()
+
+    async with _Server() as server:
+
+        def use_pool_on_other_loop():
+            async def request():
+                await pool.get_client().get(server.url)
+
+            asyncio.run(request())
+
+        await asyncio.to_thread(use_pool_on_other_loop)
+        old_transport = pool._transport
+        assert server.connections == 1
+        assert not disconnected.is_set()
+
+        pool.get_client()
+        await asyncio.wait_for(disconnected.wait(), timeout=5.0)
+        assert pool._transport is not old_transport
+        await pool.aclose()
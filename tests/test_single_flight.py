@@ -0,0 +1,101 @@
+"""Tests for koa.single_flight — coalescing identical concurrent calls"""
+
+import asyncio
+
+import pytest
+
+from koa.observability.metrics import configure_metrics, get_metrics_registry
+from koa.single_flight import SingleFlight
+
+
+class _Backend:
+    def __init__(self, delay=0.02, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+
+    async def fetch(self, key):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error:
+            raise self.error
+        return {"key": key}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call_and_get_copies():
+    backend = _Backend()
+    flight = SingleFlight("test", share=dict)
+
+    results = await asyncio.gather(*(flight.do("a", lambda: backend.fetch("a")) for _ in range(4)))
+    assert backend.calls == 1
+    assert results == [{"key": "a"}] * 4
+    assert len({id(r) for r in results}) == 4
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller():
+    backend = _Backend(error=ValueError("boom"))
+    flight = SingleFlight("test")
+
+    results = await asyncio.gather(
+        *(flight.do("a", lambda: backend.fetch("a")) for _ in range(3)), return_exceptions=True
+    )
+    assert backend.calls == 1
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_others():
+    backend = _Backend(delay=0.05)
+    flight = SingleFlight("test")
+
+    first = asyncio.ensure_future(flight.do("a", lambda: backend.fetch("a")))
+    second = asyncio.ensure_future(flight.do("a", lambda: backend.fetch("a")))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == {"key": "a"}
+    assert first.cancelled()
+    assert (backend.calls, backend.cancelled) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_call_is_cancelled_when_every_caller_leaves():
+    backend = _Backend(delay=5)
+    flight = SingleFlight("test")
+
+    callers = [asyncio.ensure_future(flight.do("a", lambda: backend.fetch("a"))) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert backend.cancelled == 1
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_coalesced_calls_are_counted():
+    configure_metrics(enabled=True)
+    try:
+        before = get_metrics_registry().snapshot()["counters"]
+        flight = SingleFlight("metrics-test")
+        backend = _Backend()
+        await asyncio.gather(*(flight.do("a", lambda: backend.fetch("a")) for _ in range(3)))
+        after = get_metrics_registry().snapshot()["counters"]
+    finally:
+        configure_metrics(enabled=False)
+
+    def delta(role):
+        key = f"koa_single_flight_calls_total{{name=metrics-test,role={role}}}"
+        return after.get(key, 0) - before.get(key, 0)
+
+    assert (delta("leader"), delta("coalesced")) == (1, 2)
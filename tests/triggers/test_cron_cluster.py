@@ -0,0 +1,198 @@
+"""Multi-node cron: partitioning, claims and takeover.
+
+The Postgres tests need a migrated database and run only when
+``KOA_TEST_DATABASE_URL`` is set.
+"""
+
+import asyncio
+import os
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from koa.triggers.cron.cluster import CronCluster
+from koa.triggers.cron.models import CronJob, CronJobState, EverySchedule
+from koa.triggers.cron.pg_store import PostgresCronJobStore
+from koa.triggers.cron.service import CronService
+
+PG_DSN = os.environ.get("KOA_TEST_DATABASE_URL")
+
+
+def _job(job_id: str, next_run: int) -> CronJob:
+    return CronJob(
+        id=job_id,
+        name=job_id,
+        schedule=EverySchedule(every_ms=60_000),
+        state=CronJobState(next_run_at_ms=next_run),
+    )
+
+
+def _cluster(node_id: str, nodes) -> CronCluster:
+    cluster = CronCluster(db=MagicMock(), node_id=node_id)
+    cluster._live_nodes = list(nodes)
+    return cluster
+
+
+class TestPartitioning:
+    def test_every_job_has_exactly_one_owner(self):
+        nodes = ["n1", "n2", "n3"]
+        clusters = [_cluster(node, nodes) for node in nodes]
+        for i in range(500):
+            owners = [c.node_id for c in clusters if c.owns(f"job-{i}")]
+            assert len(owners) == 1
+
+    def test_jobs_spread_evenly(self):
+        cluster = _cluster("n1", ["n1", "n2", "n3", "n4"])
+        counts = cluster.shard_counts([f"job-{i}" for i in range(10_000)])
+        assert all(2_000 < count < 3_000 for count in counts.values())
+
+    def test_losing_a_node_only_moves_its_jobs(self):
+        job_ids = [f"job-{i}" for i in range(2_000)]
+        before = _cluster("n1", ["n1", "n2", "n3"])
+        after = _cluster("n1", ["n1", "n2"])
+        for job_id in job_ids:
+            if before.owner_of(job_id) != "n3":
+                assert after.owner_of(job_id) == before.owner_of(job_id)
+
+
+@pytest.mark.asyncio
+async def test_service_fires_only_claimed_jobs_and_defers_the_rest():
+    store = PostgresCronJobStore(db=MagicMock())
+    now = int(time.time() * 1000)
+    for i in range(20):
+        store.add(_job(f"job-{i}", now - 1_000))
+
+    cluster = _cluster("n1", ["n1", "n2"])
+    cluster.claim = AsyncMock(side_effect=lambda jobs: jobs[: len(jobs) // 2])
+    cluster.release = AsyncMock()
+    executor = MagicMock()
+    executor.execute = AsyncMock()
+    service = CronService(store=store, executor=executor, cluster=cluster)
+
+    await service._fire_due_jobs()
+
+    offered = cluster.claim.await_args.args[0]
+    assert offered and all(cluster.owns(job.id) for job in offered)
+    executed = {call.args[0].id for call in executor.execute.await_args_list}
+    assert executed == {job.id for job in offered[: len(offered) // 2]}
+    assert {call.args[0] for call in cluster.release.await_args_list} == executed
+    # Everything not fired is re-checked after one heartbeat interval
+    assert {job_id for _, job_id in service._deferred} == {f"job-{i}" for i in range(20)} - executed
+
+
+# ----------------------------------------------------------------------
+# Against Postgres
+# ----------------------------------------------------------------------
+
+pg = pytest.mark.skipif(not PG_DSN, reason="KOA_TEST_DATABASE_URL not set")
+
+
+@pytest.fixture
+async def db():
+    from koa.db import Database
+
+    database = Database(PG_DSN, min_size=1, max_size=4)
+    await database.initialize()
+    await database.execute("DELETE FROM cron_jobs WHERE id LIKE 'cluster-test-%'")
+    await database.execute("DELETE FROM tenant_default.cron_nodes")
+    yield database
+    await database.execute("DELETE FROM cron_jobs WHERE id LIKE 'cluster-test-%'")
+    await database.execute("DELETE FROM tenant_default.cron_nodes")
+    await database.close()
+
+
+async def _seed(db, count: int, next_run: int):
+    store = PostgresCronJobStore(db=db)
+    await store.load()
+    for i in range(count):
+        store.add(_job(f"cluster-test-{i}", next_run))
+    await store.save()
+    return store
+
+
+@pg
+@pytest.mark.asyncio
+async def test_concurrent_claims_have_a_single_winner(db):
+    store = await _seed(db, 50, 1_000)
+    jobs = store.list()
+    a = CronCluster(db, node_id="a")
+    b = CronCluster(db, node_id="b")
+
+    won_a, won_b = await asyncio.gather(a.claim(jobs), b.claim(jobs))
+    ids_a = {job.id for job in won_a}
+    ids_b = {job.id for job in won_b}
+    assert not ids_a & ids_b
+    assert ids_a | ids_b == {job.id for job in jobs}
+
+
+@pg
+@pytest.mark.asyncio
+async def test_claim_is_fenced_on_persisted_due_time(db):
+    store = await _seed(db, 1, 1_000)
+    stale = _job("cluster-test-0", 1_000)
+    a = CronCluster(db, node_id="a")
+    b = CronCluster(db, node_id="b")
+
+    # Node a fires the run and persists the next one
+    assert await a.claim([stale])
+    job = store.get("cluster-test-0")
+    job.state.next_run_at_ms = 61_000
+    store.update(job)
+    await store.save()
+    await a.release("cluster-test-0", 1_000)
+
+    # Node b still holds the old copy: it must not fire the same run again
+    assert await b.claim([stale]) == []
+    assert await b.claim([_job("cluster-test-0", 61_000)])
+
+
+@pg
+@pytest.mark.asyncio
+async def test_release_keeps_lease_until_run_is_persisted(db):
+    await _seed(db, 1, 1_000)
+    job = _job("cluster-test-0", 1_000)
+    a = CronCluster(db, node_id="a")
+    b = CronCluster(db, node_id="b")
+
+    assert await a.claim([job])
+    await a.release(job.id, 1_000)  # outcome never saved
+    assert await b.claim([job]) == []
+
+
+@pg
+@pytest.mark.asyncio
+async def test_dead_node_is_taken_over(db):
+    await _seed(db, 1, 1_000)
+    job = _job("cluster-test-0", 1_000)
+    dead = CronCluster(db, node_id="dead", node_ttl_s=0.5, lease_ttl_s=0.5)
+    survivor = CronCluster(db, node_id="survivor", node_ttl_s=0.5)
+
+    await dead.heartbeat()
+    assert set(await survivor.heartbeat()) == {"dead", "survivor"}
+    assert await dead.claim([job])
+    assert await survivor.claim([job]) == []
+
+    await asyncio.sleep(0.7)
+    assert await survivor.heartbeat() == ["survivor"]
+    assert survivor.owns(job.id)
+    assert await survivor.claim([job])
+
+
+@pg
+@pytest.mark.asyncio
+async def test_refresh_pulls_other_nodes_changes(db):
+    store_a = await _seed(db, 2, 1_000)
+    store_b = PostgresCronJobStore(db=db)
+    await store_b.load()
+
+    job = store_a.get("cluster-test-0")
+    job.state.next_run_at_ms = 61_000
+    store_a.update(job)
+    store_a.remove("cluster-test-1")
+    await store_a.save()
+
+    assert await store_b.refresh() == 2
+    assert store_b.get("cluster-test-0").state.next_run_at_ms == 61_000
+    assert store_b.get("cluster-test-1") is None
+    assert [j.id for j in store_b.pop_due_jobs(61_000)] == ["cluster-test-0"]
@@ -0,0 +1,110 @@
+"""Tests for the cron due-time index used by CronJobStore / PostgresCronJobStore."""
+
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from koa.triggers.cron.models import CronJob, CronJobState, EverySchedule
+from koa.triggers.cron.pg_store import PostgresCronJobStore
+from koa.triggers.cron.service import CronService
+from koa.triggers.cron.store import CronJobStore
+
+
+def _job(job_id: str, next_run: int, **kwargs) -> CronJob:
+    return CronJob(
+        id=job_id,
+        name=job_id,
+        schedule=EverySchedule(every_ms=60_000),
+        state=CronJobState(next_run_at_ms=next_run),
+        **kwargs,
+    )
+
+
+@pytest.fixture(params=["file", "postgres"])
+def store(request, tmp_path):
+    if request.param == "file":
+        return CronJobStore(str(tmp_path / "jobs.json"))
+    return PostgresCronJobStore(db=MagicMock())
+
+
+class TestDueIndex:
+    def test_pop_due_returns_only_due_jobs_in_order(self, store):
+        store.add(_job("c", 300))
+        store.add(_job("a", 100))
+        store.add(_job("b", 200))
+        store.add(_job("later", 10_000))
+
+        assert store.get_next_due_time() == 100
+        assert [j.id for j in store.pop_due_jobs(300)] == ["a", "b", "c"]
+        assert store.get_next_due_time() == 10_000
+        assert store.pop_due_jobs(300) == []
+
+    def test_update_replaces_previous_due_time(self, store):
+        job = _job("a", 100)
+        store.add(job)
+        job.state.next_run_at_ms = 500
+        store.update(job)
+
+        assert store.pop_due_jobs(200) == []
+        assert [j.id for j in store.pop_due_jobs(500)] == ["a"]
+
+    def test_disabled_running_and_removed_jobs_are_skipped(self, store):
+        disabled = _job("disabled", 100)
+        running = _job("running", 100)
+        store.add(disabled)
+        store.add(running)
+        store.add(_job("removed", 100))
+        store.add(_job("ok", 100))
+
+        disabled.enabled = False
+        store.update(disabled)
+        running.state.running_at_ms = 50
+        store.remove("removed")
+
+        assert [j.id for j in store.pop_due_jobs(100)] == ["ok"]
+        assert store.get_next_due_time() is None
+
+    def test_in_place_reschedule_is_not_lost(self, store):
+        job = _job("a", 100)
+        store.add(job)
+        job.state.next_run_at_ms = 400  # mutated without update()
+
+        assert store.pop_due_jobs(200) == []
+        assert store.get_next_due_time() == 400
+
+    def test_benchmark_idle_tick_with_100k_jobs(self, store):
+        base = 1_000_000
+        for i in range(100_000):
+            store.add(_job(f"j{i}", base + i * 1000))
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            assert store.get_next_due_time() == base
+            assert store.pop_due_jobs(base - 1) == []
+        idle = (time.perf_counter() - start) / 1000
+
+        start = time.perf_counter()
+        scan = store.list()  # what every tick used to do
+        full_scan = time.perf_counter() - start
+        assert len(scan) == 100_000
+
+        due = store.pop_due_jobs(base + 99 * 1000)
+        assert len(due) == 100
+        assert idle < full_scan / 10
+
+
+@pytest.mark.asyncio
+async def test_fire_due_jobs_only_executes_due_jobs(tmp_path):
+    store = CronJobStore(str(tmp_path / "jobs.json"))
+    now = int(time.time() * 1000)
+    store.add(_job("due", now - 1000))
+    store.add(_job("future", now + 3_600_000))
+
+    executor = MagicMock()
+    executor.execute = AsyncMock()
+    service = CronService(store=store, executor=executor)
+    await service._fire_due_jobs()
+
+    executed = [call.args[0].id for call in executor.execute.await_args_list]
+    assert executed == ["due"]
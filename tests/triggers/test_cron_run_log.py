@@ -0,0 +1,130 @@
+"""Tests for CronRunLog tail reads and pruning (file and Postgres backends)."""
+
+import io
+import json
+import os
+
+import pytest
+
+from koa.triggers.cron.models import CronJob, CronRunEntry, EverySchedule
+from koa.triggers.cron.pg_run_log import PostgresCronRunLog
+from koa.triggers.cron.run_log import CronRunLog, _reverse_lines
+
+PG_DSN = os.environ.get("KOA_TEST_DATABASE_URL")
+
+
+def _entry(i: int, status: str = "ok") -> CronRunEntry:
+    return CronRunEntry(ts=1_000 + i, job_id="job", status=status, summary=f"run {i}")
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 64, 1 << 16])
+def test_reverse_lines_yields_offsets_newest_first(block_size):
+    data = b"alpha\nbe\n\ngamma-delta\nlast"
+    got = list(_reverse_lines(io.BytesIO(data), block_size=block_size))
+    assert [line for _, line in got] == [b"last", b"gamma-delta", b"", b"be", b"alpha"]
+    for start, line in got:
+        assert data[start : start + len(line)] == line
+
+
+@pytest.mark.asyncio
+async def test_get_runs_pages_newest_first(tmp_path):
+    log = CronRunLog(str(tmp_path))
+    for i in range(50):
+        await log.append(_entry(i, "error" if i % 5 == 0 else "ok"))
+
+    assert [e.ts for e in await log.get_runs("job", limit=3)] == [1049, 1048, 1047]
+    assert [e.ts for e in await log.get_runs("job", limit=2, offset=10)] == [1039, 1038]
+    errors = await log.get_runs("job", limit=3, offset=1, status_filter="error")
+    assert [e.ts for e in errors] == [1040, 1035, 1030]
+    assert await log.get_runs("missing") == []
+
+
+@pytest.mark.asyncio
+async def test_get_runs_skips_torn_and_blank_lines(tmp_path):
+    log = CronRunLog(str(tmp_path))
+    await log.append(_entry(1))
+    path = log._job_log_path("job")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n{not json\n")
+    await log.append(_entry(2))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"ts": 3, "jobId": "jo')  # torn final write
+
+    assert [e.ts for e in await log.get_runs("job")] == [1002, 1001]
+
+
+@pytest.mark.asyncio
+async def test_prune_keeps_newest_lines(tmp_path):
+    log = CronRunLog(str(tmp_path))
+    for i in range(30):
+        await log.append(_entry(i))
+
+    assert await log.prune("job", keep_lines=10) == 20
+    assert [e.ts for e in await log.get_runs("job", limit=100)] == list(range(1029, 1019, -1))
+    assert await log.prune("job", keep_lines=10) == 0
+
+
+@pytest.mark.asyncio
+async def test_append_prunes_by_size_to_half_the_budget(tmp_path):
+    log = CronRunLog(str(tmp_path))
+    line_size = len(json.dumps(_entry(100).to_dict())) + 1
+    max_bytes = line_size * 20
+
+    for i in range(100, 160):
+        await log.append(_entry(i), max_bytes=max_bytes, keep_lines=1_000)
+
+    size = log._job_log_path("job").stat().st_size
+    assert size <= max_bytes
+    runs = await log.get_runs("job", limit=1_000)
+    assert runs[0].ts == 1159
+    assert [e.ts for e in runs] == list(range(1159, 1159 - len(runs), -1))
+
+
+@pytest.mark.asyncio
+async def test_delete_and_list(tmp_path):
+    log = CronRunLog(str(tmp_path))
+    assert await log.list_job_ids() == []
+    await log.append(_entry(1))
+    assert await log.list_job_ids() == ["job"]
+    await log.delete_log("job")
+    assert await log.list_job_ids() == []
+
+
+# ----------------------------------------------------------------------
+# Against Postgres
+# ----------------------------------------------------------------------
+
+
+@pytest.mark.skipif(not PG_DSN, reason="KOA_TEST_DATABASE_URL not set")
+@pytest.mark.asyncio
+async def test_postgres_run_log_matches_file_backend(tmp_path):
+    from koa.db import Database
+    from koa.triggers.cron.pg_store import PostgresCronJobStore
+
+    db = Database(PG_DSN, min_size=1, max_size=2)
+    await db.initialize()
+    try:
+        await db.execute("DELETE FROM cron_jobs WHERE id = 'job'")
+        store = PostgresCronJobStore(db=db)
+        await store.load()
+        store.add(CronJob(id="job", name="job", schedule=EverySchedule(every_ms=60_000)))
+        await store.save()
+
+        pg_log = PostgresCronRunLog(db)
+        file_log = CronRunLog(str(tmp_path))
+        for i in range(30):
+            entry = _entry(i, "error" if i % 5 == 0 else "ok")
+            await pg_log.append(entry)
+            await file_log.append(entry)
+
+        for kwargs in ({"limit": 5}, {"limit": 4, "offset": 3}, {"status_filter": "error"}):
+            pg_runs = [e.ts for e in await pg_log.get_runs("job", **kwargs)]
+            assert pg_runs == [e.ts for e in await file_log.get_runs("job", **kwargs)]
+
+        assert await pg_log.prune("job", keep_lines=10) == 20
+        assert [e.ts for e in await pg_log.get_runs("job", limit=100)] == list(
+            range(1029, 1019, -1)
+        )
+    finally:
+        await db.execute("DELETE FROM cron_jobs WHERE id = 'job'")
+        await db.close()
@@ -0,0 +1,234 @@
+"""Incremental persistence for CronJobStore (journal) and PostgresCronJobStore (dirty flush)."""
+
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+
+from koa.triggers.cron import store as store_module
+from koa.triggers.cron.models import CronJob, CronJobState, EverySchedule
+from koa.triggers.cron.pg_store import PostgresCronJobStore
+from koa.triggers.cron.store import CronJobStore
+
+
+def _job(job_id: str, next_run: int = 1000) -> CronJob:
+    return CronJob(
+        id=job_id,
+        name=job_id,
+        user_id="u1",
+        schedule=EverySchedule(every_ms=60_000),
+        state=CronJobState(next_run_at_ms=next_run),
+    )
+
+
+class TestFileStoreJournal:
+    @pytest.mark.asyncio
+    async def test_changes_append_to_journal_and_replay(self, tmp_path):
+        path = tmp_path / "jobs.json"
+        store = CronJobStore(str(path))
+        await store.load()
+        store.add(_job("a"))
+        store.add(_job("b"))
+        await store.save()
+        snapshot = path.read_text()
+
+        job = store.get("a")
+        job.state.next_run_at_ms = 5000
+        store.update(job)
+        store.remove("b")
+        await store.save()
+
+        assert path.read_text() == snapshot
+        journal = path.with_suffix(".journal").read_text().splitlines()
+        assert [json.loads(line)["op"] for line in journal] == ["del", "put"]
+
+        reloaded = CronJobStore(str(path))
+        await reloaded.load()
+        assert [j.id for j in reloaded.list(include_disabled=True)] == ["a"]
+        assert reloaded.get("a").state.next_run_at_ms == 5000
+
+    @pytest.mark.asyncio
+    async def test_save_without_changes_writes_nothing(self, tmp_path):
+        path = tmp_path / "jobs.json"
+        store = CronJobStore(str(path))
+        await store.load()
+        store.add(_job("a"))
+        await store.save()
+        await store.save()
+        assert not path.with_suffix(".journal").exists()
+
+    @pytest.mark.asyncio
+    async def test_journal_compacts_into_snapshot(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(store_module, "JOURNAL_COMPACT_MIN", 3)
+        path = tmp_path / "jobs.json"
+        store = CronJobStore(str(path))
+        await store.load()
+        store.add(_job("a"))
+        await store.save()
+
+        job = store.get("a")
+        for i in range(4):
+            job.state.next_run_at_ms = 2000 + i
+            store.update(job)
+            await store.save()
+
+        assert not path.with_suffix(".journal").exists()
+        data = json.loads(path.read_text())
+        assert data["jobs"][0]["state"]["nextRunAtMs"] == 2003
+
+    @pytest.mark.asyncio
+    async def test_torn_journal_line_is_skipped(self, tmp_path):
+        path = tmp_path / "jobs.json"
+        store = CronJobStore(str(path))
+        await store.load()
+        store.add(_job("a"))
+        await store.save()
+        store.add(_job("b"))
+        await store.save()
+        with open(path.with_suffix(".journal"), "a") as f:
+            f.write('{"op": "put", "job": {"id"')
+
+        reloaded = CronJobStore(str(path))
+        await reloaded.load()
+        assert {j.id for j in reloaded.list()} == {"a", "b"}
+
+    @pytest.mark.asyncio
+    async def test_save_after_torn_tail_is_not_lost(self, tmp_path):
+        path = tmp_path / "jobs.json"
+        store = CronJobStore(str(path))
+        await store.load()
+        store.add(_job("a"))
+        await store.save()
+        store.add(_job("b"))
+        await store.save()
+        with open(path.with_suffix(".journal"), "a") as f:
+            f.write('{"op": "put", "job": {"id"')
+
+        restarted = CronJobStore(str(path))
+        await restarted.load()
+        restarted.add(_job("c"))
+        await restarted.save()
+
+        reloaded = CronJobStore(str(path))
+        await reloaded.load()
+        assert {j.id for j in reloaded.list()} == {"a", "b", "c"}
+
+    @pytest.mark.asyncio
+    async def test_crash_between_snapshot_and_journal_unlink(self, tmp_path, monkeypatch):
+        path = tmp_path / "jobs.json"
+        store = CronJobStore(str(path))
+        await store.load()
+        store.add(_job("a"))
+        await store.save()
+        job = store.get("a")
+        job.state.next_run_at_ms = 2000
+        store.update(job)
+        await store.save()
+
+        # Compact after deleting "a"; the process dies once the new snapshot
+        # is in place but before the old journal is removed.
+        store.remove("a")
+        store.add(_job("b"))
+        monkeypatch.setattr(store_module, "JOURNAL_COMPACT_MIN", 0)
+        original_unlink = type(path).unlink
+
+        def crash(self, *args, **kwargs):
+            if self == path.with_suffix(".journal"):
+                raise SystemExit("crash")
+            return original_unlink(self, *args, **kwargs)
+
+        monkeypatch.setattr(type(path), "unlink", crash)
+        with pytest.raises(SystemExit):
+            await store.save()
+        monkeypatch.undo()
+        assert path.with_suffix(".journal").exists()
+
+        reloaded = CronJobStore(str(path))
+        await reloaded.load()
+        assert [j.id for j in reloaded.list(include_disabled=True)] == ["b"]
+
+        # New records after the reload replay on top of the new snapshot.
+        reloaded.add(_job("c"))
+        await reloaded.save()
+        again = CronJobStore(str(path))
+        await again.load()
+        assert {j.id for j in again.list(include_disabled=True)} == {"b", "c"}
+
+
+class _FakeConn:
+    def __init__(self, calls, fail):
+        self._calls = calls
+        self._fail = fail
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def execute(self, query, *args):
+        if self._fail:
+            raise RuntimeError("db down")
+        self._calls.append((" ".join(query.split()), args))
+
+
+class _FakeDB:
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield _FakeConn(self.calls, self.fail)
+
+
+class TestPostgresDirtyFlush:
+    @pytest.mark.asyncio
+    async def test_flushes_only_dirty_jobs_in_one_statement(self):
+        db = _FakeDB()
+        store = PostgresCronJobStore(db)
+        for i in range(5):
+            store.add(_job(f"j{i}"))
+        await store.save()
+        assert len(db.calls) == 1
+        assert sorted(db.calls[0][1][0]) == [f"j{i}" for i in range(5)]
+
+        db.calls.clear()
+        await store.save()
+        assert db.calls == []
+
+        job = store.get("j3")
+        job.state.next_run_at_ms = 9999
+        store.update(job)
+        await store.save()
+        ((query, args),) = db.calls
+        assert query.startswith("INSERT INTO cron_jobs")
+        assert args[0] == ["j3"]
+        assert json.loads(args[4][0])["state"]["nextRunAtMs"] == 9999
+
+    @pytest.mark.asyncio
+    async def test_soft_deletes_are_batched(self):
+        db = _FakeDB()
+        store = PostgresCronJobStore(db)
+        for i in range(3):
+            store.add(_job(f"j{i}"))
+        await store.save()
+        db.calls.clear()
+
+        store.remove("j0")
+        store.remove("j1")
+        await store.save()
+        ((query, args),) = db.calls
+        assert query.startswith("UPDATE cron_jobs SET enabled = false")
+        assert sorted(args[0]) == ["j0", "j1"]
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_retried(self):
+        db = _FakeDB()
+        store = PostgresCronJobStore(db)
+        store.add(_job("a"))
+        db.fail = True
+        await store.save()
+        assert db.calls == []
+
+        db.fail = False
+        await store.save()
+        assert db.calls[0][1][0] == ["a"]
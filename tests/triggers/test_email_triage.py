@@ -0,0 +1,263 @@
+"""Tests for micro-batched email triage, sender reputation and dedupe."""
+
+import asyncio
+import json
+import os
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from koa.triggers.email_handler import EmailEventHandler
+from koa.triggers.email_triage import ProcessedEmails, SenderReputation, SenderStats
+
+PG_DSN = os.environ.get("KOA_TEST_DATABASE_URL")
+
+
+class _LLM:
+    """Answers batch prompts with a JSON array; ``drop`` ids are left out."""
+
+    def __init__(self, important=(), drop=()):
+        self.important = set(important)
+        self.drop = set(drop)
+        self.calls = []
+
+    async def chat_completion(self, messages, config=None):
+        user = messages[-1]["content"]
+        self.calls.append(user)
+
+        def verdict(subject):
+            return {"important": subject in self.important, "reason": "r", "summary": subject}
+
+        if "### Email" not in user:
+            subject = user.split("Subject: ")[1].split("\n")[0]
+            return SimpleNamespace(content=json.dumps(verdict(subject)))
+        items = []
+        for i, block in enumerate(user.split("### Email ")[1:], 1):
+            if i in self.drop:
+                continue
+            subject = block.split("Subject: ")[1].split("\n")[0]
+            items.append({"id": i, **verdict(subject)})
+        return SimpleNamespace(content="```json\n" + json.dumps(items) + "\n```")
+
+
+class _FlakyLLM(_LLM):
+    """Fails the first ``failures`` calls."""
+
+    def __init__(self, failures, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+
+    async def chat_completion(self, messages, config=None):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("llm down")
+        return await super().chat_completion(messages, config)
+
+
+class _ReputationDB:
+    def __init__(self, trigger_attached, has_table=True):
+        self.source = {"has_table": has_table, "attached": trigger_attached}
+        self.queries = []
+
+    async def fetchrow(self, query, *args):
+        self.queries.append(query)
+        return self.source
+
+    async def fetch(self, query, *args):
+        self.queries.append(query)
+        return [{"sender": "noise@x", "tapped": 0, "dismissed": 4}]
+
+
+def _handler(llm, **kwargs):
+    handler = EmailEventHandler(llm, "http://callback.invalid", **kwargs)
+    sent = []
+
+    async def send_callback(**kw):
+        sent.append(kw["subject"])
+
+    handler._send_callback = send_callback
+    return handler, sent
+
+
+def _email(n, sender="a@example.com"):
+    return {"message_id": f"m{n}", "sender": sender, "subject": f"s{n}", "snippet": ""}
+
+
+def _async(fn):
+    async def wrapper(*args):
+        return fn(*args)
+
+    return wrapper
+
+
+@pytest.mark.asyncio
+async def test_concurrent_emails_share_one_llm_call():
+    llm = _LLM(important={"s2", "s4"})
+    handler, sent = _handler(llm, batch_window_s=0.05, max_batch_size=16)
+
+    await asyncio.gather(*(handler.handle_email("t", _email(n)) for n in range(5)))
+
+    assert len(llm.calls) == 1
+    assert sorted(sent) == ["s2", "s4"]
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_without_waiting_and_missing_items_retry():
+    llm = _LLM(important={"s1"}, drop={2})
+    handler, sent = _handler(llm, batch_window_s=60, max_batch_size=3)
+
+    await asyncio.wait_for(
+        asyncio.gather(*(handler.handle_email("t", _email(n)) for n in range(3))), timeout=2
+    )
+
+    # One batch call, then the dropped email evaluated on its own.
+    assert len(llm.calls) == 2 and "### Email" not in llm.calls[1]
+    assert sent == ["s1"]
+
+
+@pytest.mark.asyncio
+async def test_duplicates_and_learned_senders(monkeypatch):
+    llm = _LLM()
+    handler, sent = _handler(llm, batch_window_s=0.01, database=object())
+    monkeypatch.setattr(handler._processed, "claim", _async(lambda t, ids: set(ids)))
+    stats = {"noise@x": SenderStats(0, 5), "boss@x": SenderStats(4, 0)}
+    monkeypatch.setattr(
+        handler._reputation, "lookup", _async(lambda t, senders: {s: stats.get(s) for s in senders})
+    )
+
+    await asyncio.gather(
+        handler.handle_email("t", _email(1, "noise@x")),
+        handler.handle_email("t", _email(2, "boss@x")),
+        handler.handle_email("t", _email(2, "boss@x")),
+    )
+
+    assert len(llm.calls) == 1 and "noise@x" not in llm.calls[0]
+    assert sent == ["s2"]
+
+
+@pytest.mark.asyncio
+async def test_failed_evaluation_releases_the_claim(monkeypatch):
+    llm = _FlakyLLM(failures=1, important={"s1"})
+    handler, sent = _handler(llm, batch_window_s=0.01, database=object())
+    monkeypatch.setattr(handler._processed, "claim", _async(lambda t, ids: set(ids)))
+    monkeypatch.setattr(handler._reputation, "lookup", _async(lambda t, senders: {}))
+    released = []
+    release = handler._processed.release
+
+    async def spy(tenant_id, ids):
+        released.append(set(ids))
+        await release(tenant_id, ids)
+
+    monkeypatch.setattr(handler._processed, "release", spy)
+
+    await handler.handle_email("t", _email(1))
+    assert sent == [] and released == [{"m1"}]
+
+    await handler.handle_email("t", _email(1))  # redelivered
+    assert sent == ["s1"] and released == [{"m1"}]
+
+
+@pytest.mark.parametrize(
+    "trigger_attached, table",
+    [(True, "sender_reputation_daily"), (False, "notification_interactions")],
+)
+@pytest.mark.asyncio
+async def test_reputation_counts_raw_interactions_without_trigger(trigger_attached, table):
+    db = _ReputationDB(trigger_attached)
+    reputation = SenderReputation(db)
+    assert (await reputation.lookup("t", ["noise@x"]))["noise@x"].ignored
+    reputation.invalidate("t")
+    await reputation.lookup("t", ["noise@x"])
+    assert [f"FROM tenant_default.{table}" in q for q in db.queries[1:]] == [True, True]
+    assert len(db.queries) == 3
+
+
+@pytest.mark.asyncio
+async def test_reputation_skips_the_query_without_interactions_table():
+    db = _ReputationDB(trigger_attached=False, has_table=False)
+    reputation = SenderReputation(db)
+    assert await reputation.lookup("t", ["noise@x"]) == {"noise@x": SenderStats(0, 0)}
+    reputation.invalidate("t")
+    assert await reputation.lookup("t", ["noise@x"]) == {"noise@x": SenderStats(0, 0)}
+    assert len(db.queries) == 1  # the one-time source check
+
+
+def test_processed_emails_memory_tier_is_bounded():
+    processed = ProcessedEmails(max_entries=2)
+    assert processed.add("t", "a") and not processed.add("t", "a")
+    assert processed.add("t", "b") and processed.add("t", "c")
+    assert len(processed) == 2
+    assert processed.add("u", "a")
+
+
+_INTERACTIONS = "tenant_default.notification_interactions"
+
+
+@pytest.mark.skipif(not PG_DSN, reason="KOA_TEST_DATABASE_URL not set")
+@pytest.mark.asyncio
+async def test_shared_tiers_dedupe_across_replicas_and_aggregate_senders():
+    from koa.db import Database
+
+    db = Database(PG_DSN, min_size=1, max_size=2)
+    await db.initialize()
+    tenant = f"triage-{uuid.uuid4()}"
+    # The interactions table belongs to the notification service; stand one
+    # up (with the migration's trigger) when this database does not have it.
+    created = await db.fetchval(f"SELECT to_regclass('{_INTERACTIONS}')") is None
+    try:
+        first, second = ProcessedEmails(db), ProcessedEmails(db)
+        assert await first.claim(tenant, ["m1", "m2"]) == {"m1", "m2"}
+        assert await second.claim(tenant, ["m2", "m3"]) == {"m3"}
+        await first.release(tenant, ["m2"])
+        assert await second.claim(tenant, ["m2"]) == {"m2"}
+
+        assert await SenderReputation(db).lookup(tenant, ["noise@x"]) == {
+            "noise@x": SenderStats(0, 0)
+        }
+
+        if created:
+            await db.execute(
+                f"""CREATE TABLE {_INTERACTIONS} (
+                        user_id TEXT NOT NULL,
+                        sender TEXT,
+                        action TEXT NOT NULL,
+                        created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                    )"""
+            )
+            await db.execute(
+                f"""CREATE TRIGGER trg_sender_reputation AFTER INSERT ON {_INTERACTIONS}
+                    FOR EACH ROW EXECUTE FUNCTION tenant_default.bump_sender_reputation()"""
+            )
+        await db.execute(
+            f"""INSERT INTO {_INTERACTIONS} (user_id, sender, action, created_at)
+                VALUES ($1, 'noise@x', 'dismissed', NOW()),
+                       ($1, 'noise@x', 'dismissed', NOW()),
+                       ($1, 'noise@x', 'dismissed', NOW() - INTERVAL '3 days'),
+                       ($1, 'noise@x', 'tapped', NOW() - INTERVAL '45 days')""",
+            tenant,
+        )
+        reputation = SenderReputation(db)
+        stats = await reputation.lookup(tenant, ["noise@x", "new@x"])
+        assert stats == {"noise@x": SenderStats(0, 3), "new@x": SenderStats(0, 0)}
+        assert stats["noise@x"].ignored
+
+        # Served from memory until the TTL lapses.
+        await db.execute(
+            "DELETE FROM tenant_default.sender_reputation_daily WHERE user_id = $1", tenant
+        )
+        assert (await reputation.lookup(tenant, ["noise@x"]))["noise@x"].ignored
+        reputation.invalidate(tenant)
+        assert not (await reputation.lookup(tenant, ["noise@x"]))["noise@x"].ignored
+    finally:
+        if created:
+            await db.execute(f"DROP TABLE IF EXISTS {_INTERACTIONS}")
+        else:
+            await db.execute(f"DELETE FROM {_INTERACTIONS} WHERE user_id = $1", tenant)
+        await db.execute(
+            "DELETE FROM tenant_default.processed_email_events WHERE tenant_id = $1", tenant
+        )
+        await db.execute(
+            "DELETE FROM tenant_default.sender_reputation_daily WHERE user_id = $1", tenant
+        )
+        await db.close()